@@ -17,7 +17,9 @@
 
 """Main Qiskit public functionality."""
 
+import importlib
 import pkgutil
+import sys
 
 # First, check for required Python and API version
 from . import util
@@ -30,7 +32,6 @@ from qiskit.circuit import ClassicalRegister
 from qiskit.circuit import QuantumRegister
 from qiskit.circuit import QuantumCircuit
 from qiskit.execute import execute
-from qiskit.compiler import transpile, assemble
 
 # The qiskit.extensions.x imports needs to be placed here due to the
 # mechanism for adding gates dynamically.
@@ -43,19 +44,52 @@ import qiskit.circuit.reset
 # importing the package you want to allow extensions for (in this case `backends`).
 __path__ = pkgutil.extend_path(__path__, __name__)
 
-# Please note these are global instances, not modules.
-from qiskit.providers.basicaer import BasicAer
+from .version import __version__
 
-# Try to import the Aer provider if installed.
-try:
-    from qiskit.providers.aer import Aer
-except ImportError:
-    pass
-# Try to import the IBMQ provider if installed.
-try:
-    from qiskit.providers.ibmq import IBMQ
-except ImportError:
-    pass
+# The compiler, the providers and the versions of the installed qiskit packages
+# are slow to load. They are only loaded the first time they are accessed, from
+# the module where they are defined. Please note BasicAer, Aer and IBMQ are
+# global instances, not modules.
+_LAZY_ATTRIBUTES = {
+    'transpile': 'qiskit.compiler',
+    'assemble': 'qiskit.compiler',
+    'BasicAer': 'qiskit.providers.basicaer',
+    'Aer': 'qiskit.providers.aer',
+    'IBMQ': 'qiskit.providers.ibmq',
+    '__qiskit_version__': 'qiskit.version',
+}
 
-from .version import __version__
-from .version import __qiskit_version__
+
+def __getattr__(name):
+    """Load the lazy attributes of the module the first time they are accessed."""
+    if name in _LAZY_ATTRIBUTES:
+        try:
+            module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+        except ImportError:
+            # The Aer and IBMQ providers are optional.
+            pass
+        else:
+            value = getattr(module, name)
+            globals()[name] = value
+            return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+# Module level __getattr__ is only supported from Python 3.7 (PEP 562). Before,
+# everything is imported eagerly, the providers only if they are installed.
+if sys.version_info < (3, 7):
+    from qiskit.compiler import transpile, assemble
+    from qiskit.providers.basicaer import BasicAer
+    from .version import __qiskit_version__
+    try:
+        from qiskit.providers.aer import Aer
+    except ImportError:
+        pass
+    try:
+        from qiskit.providers.ibmq import IBMQ
+    except ImportError:
+        pass
@@ -17,4 +17,4 @@
 """
 
 from .assemble import assemble
-from .transpile import transpile
+from .transpile import transpile, transpile_iter
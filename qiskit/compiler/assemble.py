@@ -13,6 +13,8 @@
 # that they have been altered from the originals.
 
 """Assemble function for converting a list of circuits into a qobj"""
+from collections.abc import Iterator
+import itertools
 import uuid
 import copy
 
@@ -43,7 +45,9 @@ def assemble(experiments,
 
     Args:
         experiments (QuantumCircuit or list[QuantumCircuit] or Schedule or list[Schedule]):
-            Circuit(s) or pulse schedule(s) to execute
+            Circuit(s) or pulse schedule(s) to execute. Circuits can also be given as an
+            iterator, e.g. the one returned by `transpile_iter()`, in which case they are
+            assembled one at a time as they are produced.
 
         backend (BaseBackend):
             If set, some runtime options are automatically grabbed from
@@ -132,7 +136,8 @@ def assemble(experiments,
         QiskitError: if the input cannot be interpreted as either circuits or schedules
     """
     # Get RunConfig(s) that will be inserted in Qobj to configure the run
-    experiments = experiments if isinstance(experiments, list) else [experiments]
+    if not isinstance(experiments, (list, Iterator)):
+        experiments = [experiments]
     qobj_id, qobj_header, run_config = _parse_run_args(backend, qobj_id, qobj_header,
                                                        shots, memory, max_credits, seed_simulator,
                                                        qubit_lo_freq, meas_lo_freq,
@@ -142,6 +147,17 @@ def assemble(experiments,
                                                        memory_slot_size, rep_time,
                                                        parameter_binds, **run_config)
 
+    if isinstance(experiments, Iterator):
+        # Circuits from an iterator, like the one returned by transpile_iter(), are
+        # assembled one at a time, without holding all of them in memory.
+        first_experiment = next(experiments, None)
+        if isinstance(first_experiment, QuantumCircuit) and not parameter_binds:
+            circuits = itertools.chain([first_experiment], experiments)
+            return assemble_circuits(circuits=_unparameterized_circuits(circuits),
+                                     qobj_id=qobj_id, qobj_header=qobj_header,
+                                     run_config=run_config)
+        experiments = [] if first_experiment is None else [first_experiment] + list(experiments)
+
     # assemble either circuits or schedules
     if all(isinstance(exp, QuantumCircuit) for exp in experiments):
         # If circuits are parameterized, bind parameters and remove from run_config
@@ -256,6 +272,28 @@ def _parse_run_args(backend, qobj_id, qobj_header,
     return qobj_id, qobj_header, run_config
 
 
+def _unparameterized_circuits(circuits):
+    """Yield the circuits of an iterator, checking that they do not have parameters.
+
+    Args:
+        circuits (iterator[QuantumCircuit]): the circuits to check.
+
+    Yields:
+        QuantumCircuit: the circuits of ``circuits``, unchanged.
+
+    Raises:
+        QiskitError: if an experiment is not a circuit, or if a circuit has parameters
+    """
+    for circuit in circuits:
+        if not isinstance(circuit, QuantumCircuit):
+            raise QiskitError("bad input to assemble() function; "
+                              "must be either circuits or schedules")
+        if circuit.parameters:
+            raise QiskitError('Mismatch between run_config.parameter_binds and all circuit '
+                              'parameters. Circuit parameters: {}'.format(circuit.parameters))
+        yield circuit
+
+
 def _expand_parameters(circuits, run_config):
     """Verifies that there is a single common set of parameters shared between
     all circuits and all parameter binds in the run_config. Returns an expanded
@@ -16,9 +16,10 @@
 import warnings
 
 from qiskit.transpiler import Layout, CouplingMap
-from qiskit.tools.parallel import parallel_map
+from qiskit.tools.parallel import parallel_map, parallel_imap
 from qiskit.transpiler.transpile_config import TranspileConfig
 from qiskit.transpiler.transpile_circuit import transpile_circuit
+from qiskit.transpiler.target_cache import get_target_cache
 from qiskit.pulse import Schedule
 from qiskit.circuit.quantumregister import Qubit
 from qiskit import user_config
@@ -30,7 +31,10 @@ def transpile(circuits,
               basis_gates=None, coupling_map=None, backend_properties=None,
               initial_layout=None, seed_transpiler=None,
               optimization_level=None,
-              pass_manager=None):
+              pass_manager=None,
+              routing_method=None,
+              approximation=False,
+              parallel_local_passes=None):
     """transpile one or more circuits, according to some desired
     transpilation targets.
 
@@ -120,6 +124,31 @@ def transpile(circuits,
             pass manager will be used directly (Qiskit will not attempt to
             auto-select a pass manager based on transpile options).
 
+        routing_method (str):
+            The pass inserting the swaps that map the circuit to the coupling map,
+            in optimization levels 1 to 3.
+                'stochastic': StochasticSwap (default)
+                'sabre': SabreSwap. In levels 2 and 3, SabreLayout also refines
+                    the layout chosen, unless an initial_layout is given.
+                'swap_network': SwapNetworkSwap, which routes the dense layers
+                    of commuting two-qubit gates, as in QAOA circuits, with swap
+                    networks.
+
+        approximation (bool):
+            If True, optimization level 3 resynthesizes the two-qubit blocks of
+            the circuit with fewer CX gates than an exact synthesis needs, when
+            that is expected to be more accurate given the CX gate errors of the
+            backend properties. The transpiled circuit is then only
+            approximately equal to the input circuit. Default: False.
+
+        parallel_local_passes (int):
+            If given, the local passes of the optimization levels, that rewrite
+            the gates of the circuit one at a time or in small groups (Unroller,
+            Optimize1qGates, CXCancellation, CommutativeCancellation), run with
+            ParallelTimeSlices on consecutive time slices of at most this number
+            of gates, in a process pool. This parallelizes the transpilation of a
+            single huge circuit; the gates on both sides of a slice boundary are
+            not simplified together.
 
     Returns:
         QuantumCircuit or list[QuantumCircuit]: transpiled circuit(s).
@@ -142,19 +171,22 @@ def transpile(circuits,
     transpile_configs = _parse_transpile_args(circuits, backend, basis_gates, coupling_map,
                                               backend_properties, initial_layout,
                                               seed_transpiler, optimization_level,
-                                              pass_manager)
+                                              pass_manager, routing_method, approximation,
+                                              parallel_local_passes)
     # Check circuit width against number of qubits in coupling_map(s)
-    coupling_maps_list = list(config.coupling_map for config in transpile_configs)
-    for circuit, parsed_coupling_map in zip(circuits, coupling_maps_list):
-        # If coupling_map is not None
-        if isinstance(parsed_coupling_map, CouplingMap):
-            n_qubits = len(circuit.qubits)
-            max_qubits = parsed_coupling_map.size()
-            if n_qubits > max_qubits:
-                raise TranspilerError('Number of qubits ({}) '.format(n_qubits) +
-                                      'in {} '. format(circuit.name) +
-                                      'is greater than maximum ({}) '.format(max_qubits) +
-                                      'in the coupling_map')
+    for circuit, transpile_config in zip(circuits, transpile_configs):
+        _check_circuit_width(circuit, transpile_config.coupling_map)
+    # Compute the tables of the backend(s) before the parallel processes start,
+    # so that they are computed once, instead of once per process
+    if len(circuits) > 1:
+        target_caches = {id(transpile_config.target_cache): transpile_config.target_cache
+                         for transpile_config in transpile_configs
+                         if _needs_target_cache(transpile_config.optimization_level,
+                                                transpile_config.pass_manager,
+                                                transpile_config.initial_layout)}
+        for target_cache in target_caches.values():
+            if target_cache is not None:
+                target_cache.precompute()
     # Transpile circuits in parallel
     circuits = parallel_map(_transpile_circuit, list(zip(circuits, transpile_configs)))
 
@@ -163,7 +195,98 @@ def transpile(circuits,
     return circuits
 
 
+def transpile_iter(circuits,
+                   backend=None,
+                   basis_gates=None, coupling_map=None, backend_properties=None,
+                   initial_layout=None, seed_transpiler=None,
+                   optimization_level=None,
+                   pass_manager=None,
+                   max_pending=None,
+                   routing_method=None,
+                   approximation=False,
+                   parallel_local_passes=None):
+    """Transpile the circuits of an iterable, and return an iterator over the results.
+
+    This is the streaming version of `transpile()`, for batches of circuits too large
+    to be held in memory at once. The circuits are read from `circuits` only as the
+    transpiled circuits are requested, and at most `max_pending` circuits are being
+    transpiled in parallel or waiting to be requested at any time. The transpiled
+    circuits are yielded in the order of `circuits`, so they can be passed directly
+    to `assemble()`, which then assembles them one at a time.
+
+    Unlike in `transpile()`, every argument applies to all the circuits: they cannot
+    be given as a list with one entry per circuit.
+
+    Args:
+        circuits (iterable[QuantumCircuit]): Circuits to transpile. This can be a
+            generator.
+        backend (BaseBackend): see `transpile()`.
+        basis_gates (list[str]): see `transpile()`.
+        coupling_map (CouplingMap or list): see `transpile()`.
+        backend_properties (BackendProperties): see `transpile()`.
+        initial_layout (Layout or dict or list): see `transpile()`.
+        seed_transpiler (int): see `transpile()`.
+        optimization_level (int): see `transpile()`.
+        pass_manager (PassManager): see `transpile()`.
+        max_pending (int): maximum number of circuits being transpiled, or waiting to
+            be yielded, at any time. Defaults to twice the number of processes.
+        routing_method (str): see `transpile()`.
+        approximation (bool): see `transpile()`.
+        parallel_local_passes (int): see `transpile()`.
+
+    Returns:
+        iterator[QuantumCircuit]: the transpiled circuits, in the order of `circuits`.
+
+    Raises:
+        TranspilerError: in case of bad inputs to transpiler or errors in passes
+    """
+    if optimization_level is None:
+        config = user_config.get_config()
+        optimization_level = config.get('transpile_optimization_level', None)
+
+    # Get the options of the backend once, instead of once per circuit
+    if basis_gates is None and getattr(backend, 'configuration', None):
+        basis_gates = getattr(backend.configuration(), 'basis_gates', None)
+    coupling_map = _parse_coupling_map(coupling_map, backend, 1)[0]
+    backend_properties = _parse_backend_properties(backend_properties, backend, 1)[0]
+    if coupling_map is not None and \
+            _needs_target_cache(optimization_level, pass_manager, initial_layout):
+        get_target_cache(coupling_map, backend_properties).precompute()
+
+    def _circuit_config_tuples():
+        for circuit in circuits:
+            transpile_config = _parse_transpile_args([circuit], None, basis_gates, coupling_map,
+                                                     backend_properties, initial_layout,
+                                                     seed_transpiler, optimization_level,
+                                                     pass_manager, routing_method,
+                                                     approximation,
+                                                     parallel_local_passes)[0]
+            _check_circuit_width(circuit, transpile_config.coupling_map)
+            yield circuit, transpile_config
+
+    return parallel_imap(_transpile_circuit, _circuit_config_tuples(), max_pending=max_pending)
+
+
+def _check_circuit_width(circuit, coupling_map):
+    """Raise a TranspilerError if circuit has more qubits than coupling_map."""
+    # If coupling_map is not None
+    if isinstance(coupling_map, CouplingMap):
+        n_qubits = len(circuit.qubits)
+        max_qubits = coupling_map.size()
+        if n_qubits > max_qubits:
+            raise TranspilerError('Number of qubits ({}) '.format(n_qubits) +
+                                  'in {} '. format(circuit.name) +
+                                  'is greater than maximum ({}) '.format(max_qubits) +
+                                  'in the coupling_map')
+
+
 # FIXME: This is a helper function because of parallel tools.
+def _needs_target_cache(optimization_level, pass_manager, initial_layout):
+    """Whether the preset pass manager chooses a layout with DenseLayout or
+    NoiseAdaptiveLayout, which use the tables of the TargetCache."""
+    return pass_manager is None and initial_layout is None and optimization_level in (2, 3)
+
+
 def _transpile_circuit(circuit_config_tuple):
     """Select a PassManager and run a single circuit through it.
 
@@ -183,7 +306,8 @@ def _transpile_circuit(circuit_config_tuple):
 def _parse_transpile_args(circuits, backend,
                           basis_gates, coupling_map, backend_properties,
                           initial_layout, seed_transpiler, optimization_level,
-                          pass_manager):
+                          pass_manager, routing_method, approximation,
+                          parallel_local_passes):
     """Resolve the various types of args allowed to the transpile() function through
     duck typing, overriding args, etc. Refer to the transpile() docstring for details on
     what types of inputs are allowed.
@@ -214,16 +338,29 @@ def _parse_transpile_args(circuits, backend,
 
     pass_manager = _parse_pass_manager(pass_manager, num_circuits)
 
+    routing_method = _parse_routing_method(routing_method, num_circuits)
+
+    approximation = _parse_approximation(approximation, num_circuits)
+
+    parallel_local_passes = _parse_parallel_local_passes(parallel_local_passes, num_circuits)
+
+    target_cache = _parse_target_cache(coupling_map, backend_properties)
+
     transpile_configs = []
     for args in zip(basis_gates, coupling_map, backend_properties, initial_layout,
-                    seed_transpiler, optimization_level, pass_manager):
+                    seed_transpiler, optimization_level, pass_manager, routing_method,
+                    target_cache, approximation, parallel_local_passes):
         transpile_config = TranspileConfig(basis_gates=args[0],
                                            coupling_map=args[1],
                                            backend_properties=args[2],
                                            initial_layout=args[3],
                                            seed_transpiler=args[4],
                                            optimization_level=args[5],
-                                           pass_manager=args[6])
+                                           pass_manager=args[6],
+                                           routing_method=args[7],
+                                           target_cache=args[8],
+                                           approximation=args[9],
+                                           parallel_local_passes=args[10])
         transpile_configs.append(transpile_config)
 
     return transpile_configs
@@ -321,3 +458,38 @@ def _parse_pass_manager(pass_manager, num_circuits):
     if not isinstance(pass_manager, list):
         pass_manager = [pass_manager] * num_circuits
     return pass_manager
+
+
+def _parse_routing_method(routing_method, num_circuits):
+    if not isinstance(routing_method, list):
+        routing_method = [routing_method] * num_circuits
+    for method in routing_method:
+        if method not in (None, 'stochastic', 'sabre', 'swap_network'):
+            raise TranspilerError('Unknown routing method %s.' % method)
+    return routing_method
+
+
+def _parse_approximation(approximation, num_circuits):
+    if not isinstance(approximation, list):
+        approximation = [approximation] * num_circuits
+    return approximation
+
+
+def _parse_parallel_local_passes(parallel_local_passes, num_circuits):
+    if not isinstance(parallel_local_passes, list):
+        parallel_local_passes = [parallel_local_passes] * num_circuits
+    for slice_size in parallel_local_passes:
+        if slice_size is not None and (not isinstance(slice_size, int) or slice_size < 1):
+            raise TranspilerError('parallel_local_passes must be a positive number of gates, '
+                                  'not %s.' % slice_size)
+    return parallel_local_passes
+
+
+def _parse_target_cache(coupling_map, backend_properties):
+    # the circuits with the same coupling map and backend properties share a cache
+    target_caches = {}
+    for cmap, props in zip(coupling_map, backend_properties):
+        if cmap is not None and (id(cmap), id(props)) not in target_caches:
+            target_caches[(id(cmap), id(props))] = get_target_cache(cmap, props)
+    return [target_caches.get((id(cmap), id(props)))
+            for cmap, props in zip(coupling_map, backend_properties)]
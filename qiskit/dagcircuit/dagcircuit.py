@@ -48,6 +48,13 @@ class DAGCircuit:
     def __init__(self):
         """Create an empty circuit."""
 
+        # Modification counter, increased on every change to the dag
+        self._version = 0
+
+        # The op nodes changed and removed since track_changes, or None
+        self._changed_nodes = None
+        self._removed_nodes = None
+
         # Circuit name.  Generally, this corresponds to the name
         # of the QuantumCircuit from which the DAG was generated.
         self.name = None
@@ -82,6 +89,70 @@ class DAGCircuit:
         # TO REMOVE WHEN NODE IS HAVE BEEN REMOVED FULLY
         self._id_to_node = {}
 
+    def __setattr__(self, name, value):
+        # Rebinding a public attribute (e.g. the name) is a modification of the dag
+        if not name.startswith('_'):
+            self._bump_version()
+        super().__setattr__(name, value)
+
+    def _bump_version(self):
+        """Record that the dag has been modified, in a way the changes do not track."""
+        self._version += 1
+        self._changed_nodes = self._removed_nodes = None
+
+    def _record_changes(self, changed=(), removed=()):
+        """Record that the dag has been modified, by changing and removing op nodes."""
+        self._version += 1
+        if self._changed_nodes is not None:
+            self._changed_nodes.difference_update(removed)
+            self._changed_nodes.update(changed)
+            self._removed_nodes.update(removed)
+
+    def _record_removal(self, nodes):
+        """Record that a set of op nodes is being removed, before removing them."""
+        changed = ()
+        if self._changed_nodes is not None:
+            changed = {neighbor
+                       for node in nodes
+                       for neighbor in itertools.chain(self._multi_graph.predecessors(node),
+                                                       self._multi_graph.successors(node))
+                       if neighbor.type == 'op' and neighbor not in nodes}
+        self._record_changes(changed, nodes)
+
+    def track_changes(self, enabled=True):
+        """Start recording the changes to the op nodes of the dag, see `changes`.
+
+        Args:
+            enabled (bool): if False, stop recording the changes instead.
+        """
+        self._changed_nodes = set() if enabled else None
+        self._removed_nodes = set() if enabled else None
+
+    def changes(self):
+        """Returns the changes to the op nodes since `track_changes` was called.
+
+        The changed op nodes are those added or substituted, and those next to
+        a removed op node on a wire. Modifications of the dag that are not
+        only changes to op nodes, like adding a register, stop the recording.
+
+        Returns:
+            tuple(set(DAGNode), set(DAGNode)): the changed op nodes that are
+                still in the dag, and the removed op nodes. None if the
+                changes are not recorded.
+        """
+        if self._changed_nodes is None:
+            return None
+        return set(self._changed_nodes), set(self._removed_nodes)
+
+    @property
+    def version(self):
+        """Returns the modification counter of the dag.
+
+        The counter increases every time the dag is modified through its methods, so
+        two equal readings on the same dag mean the dag did not change in between.
+        """
+        return self._version
+
     def to_networkx(self):
         """Returns a copy of the DAGCircuit in networkx format."""
         return copy.deepcopy(self._multi_graph)
@@ -137,6 +208,7 @@ class DAGCircuit:
             DAGCircuitError: if trying to add duplicate wire
         """
         if wire not in self.wires:
+            self._bump_version()
             self.wires.append(wire)
             self._max_node_id += 1
             input_map_wire = self.input_map[wire] = self._max_node_id
@@ -233,6 +305,7 @@ class DAGCircuit:
         # Add a new operation node to the graph
         self._max_node_id += 1
         new_node = DAGNode(data_dict=node_properties, nid=self._max_node_id)
+        self._record_changes([new_node])
         self._multi_graph.add_node(new_node)
         self._id_to_node[self._max_node_id] = new_node
 
@@ -637,10 +710,12 @@ class DAGCircuit:
                 nodes of n.
         """
 
-        pred_map = {e[2]['wire']: e[0] for e in
-                    self._multi_graph.in_edges(nbunch=node, data=True)}
-        succ_map = {e[2]['wire']: e[1] for e in
-                    self._multi_graph.out_edges(nbunch=node, data=True)}
+        pred_map = {data['wire']: pred
+                    for pred, edges in self._multi_graph.pred[node].items()
+                    for data in edges.values()}
+        succ_map = {data['wire']: succ
+                    for succ, edges in self._multi_graph.succ[node].items()
+                    for data in edges.values()}
         return pred_map, succ_map
 
     def _full_pred_succ_maps(self, pred_map, succ_map, input_circuit,
@@ -786,6 +861,7 @@ class DAGCircuit:
         full_pred_map, full_succ_map = self._full_pred_succ_maps(pred_map, succ_map,
                                                                  input_dag, wire_map)
         # Now that we know the connections, delete node
+        self._record_removal({node})
         self._multi_graph.remove_node(node)
 
         # Iterate over nodes of input_circuit
@@ -827,6 +903,28 @@ class DAGCircuit:
 
                 self._multi_graph.remove_edge(p[0], self.output_map[w])
 
+    def substitute_node(self, node, op):
+        """Replace the operation of an op node, in place.
+
+        Args:
+            node (DAGNode): op node to modify
+            op (Instruction): the new operation, on the same number of qubits and clbits
+
+        Raises:
+            DAGCircuitError: if node is not an op node, or op does not fit its wires
+        """
+        if node.type != 'op':
+            raise DAGCircuitError('Only op nodes can be substituted, not a "%s" node.'
+                                  % node.type)
+        if op.num_qubits != len(node.qargs) or op.num_clbits != len(node.cargs):
+            raise DAGCircuitError('Cannot substitute a %s on %d qubits and %d clbits with '
+                                  'a %s on %d qubits and %d clbits.'
+                                  % (node.name, len(node.qargs), len(node.cargs),
+                                     op.name, op.num_qubits, op.num_clbits))
+        self._record_changes([node])
+        node.data_dict['op'] = op
+        node.name = op.name
+
     def node(self, node_id):
         """Get the node in the dag.
 
@@ -963,12 +1061,133 @@ class DAGCircuit:
         pred_map, succ_map = self._make_pred_succ_maps(node)
 
         # remove from graph and map
+        self._record_removal({node})
         self._multi_graph.remove_node(node)
 
         for w in pred_map.keys():
             self._multi_graph.add_edge(pred_map[w], succ_map[w],
                                        name="%s[%s]" % (w.register.name, w.index), wire=w)
 
+    def remove_op_nodes(self, nodes):
+        """Remove several operation nodes at once.
+
+        Add edges from the predecessors of the nodes to their successors, on
+        each wire, skipping the removed nodes. Faster than removing the nodes
+        one by one when they follow each other, as in a run.
+
+        Args:
+            nodes (iterable(DAGNode)): op nodes to remove
+
+        Raises:
+            DAGCircuitError: if one of the nodes is not an op node
+        """
+        nodes = set(nodes)
+        for node in nodes:
+            if node.type != 'op':
+                raise DAGCircuitError('The method remove_op_nodes only works on op node types. '
+                                      'A "%s" node type was wrongly provided.' % node.type)
+
+        maps = {node: self._make_pred_succ_maps(node) for node in nodes}
+        edges = []
+        for node, (pred_map, _) in maps.items():
+            for wire, pred in pred_map.items():
+                if pred in nodes:
+                    continue
+                succ = node
+                while succ in nodes:
+                    succ = maps[succ][1][wire]
+                edges.append((pred, succ, wire))
+
+        self._record_removal(nodes)
+        self._multi_graph.remove_nodes_from(nodes)
+        for pred, succ, wire in edges:
+            self._multi_graph.add_edge(pred, succ,
+                                       name="%s[%s]" % (wire.register.name, wire.index), wire=wire)
+
+    def substitute_block(self, nodes, instructions):
+        """Replace a block of op nodes with a sequence of operations on their wires.
+
+        The block must be convex: no path from one of its nodes to another
+        goes through a node outside of it.
+
+        Args:
+            nodes (iterable(DAGNode)): op nodes to substitute
+            instructions (list(tuple)): the (op, qargs, cargs) of the new
+                operations, in order, on wires of the nodes
+
+        Returns:
+            list(DAGNode): the new op nodes, in order.
+
+        Raises:
+            DAGCircuitError: if one of the nodes is not an op node, or one of
+                the operations is not on wires of the nodes
+        """
+        nodes = set(nodes)
+        for node in nodes:
+            if node.type != 'op':
+                raise DAGCircuitError('The method substitute_block only works on op node types. '
+                                      'A "%s" node type was wrongly provided.' % node.type)
+        pred_map, succ_map = self._block_pred_succ_maps(nodes)
+        for op, qargs, cargs in instructions:
+            for wire in itertools.chain(qargs, cargs):
+                if wire not in pred_map:
+                    raise DAGCircuitError('The %s operation on %s[%d] is not on a wire of the '
+                                          'block.' % (op.name, wire.register.name, wire.index))
+
+        self._record_removal(nodes)
+        self._multi_graph.remove_nodes_from(nodes)
+        new_nodes = []
+        for op, qargs, cargs in instructions:
+            self._add_op_node(op, qargs, cargs)
+            new_node = self._id_to_node[self._max_node_id]
+            for wire in itertools.chain(qargs, cargs):
+                self._multi_graph.add_edge(pred_map[wire], new_node,
+                                           name="%s[%s]" % (wire.register.name, wire.index),
+                                           wire=wire)
+                pred_map[wire] = new_node
+            new_nodes.append(new_node)
+        for wire, pred in pred_map.items():
+            self._multi_graph.add_edge(pred, succ_map[wire],
+                                       name="%s[%s]" % (wire.register.name, wire.index), wire=wire)
+        return new_nodes
+
+    def _block_pred_succ_maps(self, nodes):
+        """The predecessor and successor of a set of nodes on each of their wires.
+
+        Args:
+            nodes (set(DAGNode)): op nodes
+
+        Returns:
+            tuple(dict): tuple(predecessor_map, successor_map)
+                These map from each wire of the nodes to the first node before
+                (after) them on the wire that is not one of them.
+        """
+        maps = {node: self._make_pred_succ_maps(node) for node in nodes}
+        pred_map = {}
+        succ_map = {}
+        for node, (node_pred_map, _) in maps.items():
+            for wire, pred in node_pred_map.items():
+                if pred in nodes:
+                    continue
+                succ = node
+                while succ in nodes:
+                    succ = maps[succ][1][wire]
+                pred_map[wire] = pred
+                succ_map[wire] = succ
+        return pred_map, succ_map
+
+    def wire_neighbors(self, node):
+        """The predecessor and successor of a node on each of its wires.
+
+        Args:
+            node (DAGNode): a node of the dag
+
+        Returns:
+            tuple(dict): tuple(predecessor_map, successor_map), from each wire
+                of the node to its predecessor (successor) on the wire.
+        """
+        return self._make_pred_succ_maps(node)
+
     def remove_ancestors_of(self, node):
         """Remove all of the ancestor operation nodes of node."""
         anc = nx.ancestors(self._multi_graph, node)
@@ -1126,7 +1345,7 @@ class DAGCircuit:
             cur_layer = next_layer
             next_layer = []
 
-    def collect_runs(self, namelist):
+    def collect_runs(self, namelist, nodes=None):
         """Return a set of non-conditional runs of "op" nodes with the given names.
 
         For example, "... h q[0]; cx q[0],q[1]; cx q[0],q[1]; h q[1]; .."
@@ -1137,29 +1356,56 @@ class DAGCircuit:
         in the circuit's basis.
 
         Nodes must have only one successor to continue the run.
+
+        If nodes is given, only the runs with one of these nodes are
+        collected, without going through the rest of the dag.
         """
         group_list = []
 
-        # Iterate through the nodes of self in topological order
-        # and form tuples containing sequences of gates
-        # on the same qubit(s).
-        topo_ops = list(self.topological_op_nodes())
-        nodes_seen = dict(zip(topo_ops, [False] * len(topo_ops)))
-        for node in topo_ops:
-            if node.name in namelist and node.condition is None \
-                    and not nodes_seen[node]:
-                group = [node]
-                nodes_seen[node] = True
-                s = list(self._multi_graph.successors(node))
-                while len(s) == 1 and \
-                        s[0].type == "op" and \
-                        s[0].name in namelist and \
-                        s[0].condition is None:
-                    group.append(s[0])
-                    nodes_seen[s[0]] = True
-                    s = list(self._multi_graph.successors(s[0]))
-                if len(group) >= 1:
-                    group_list.append(tuple(group))
+        def in_run(node):
+            return node.type == "op" and node.name in namelist and node.condition is None
+
+        def next_node(node):
+            """The next node of the run of node, its single successor if it can be in a run."""
+            s = list(self._multi_graph.successors(node))
+            return s[0] if len(s) == 1 and in_run(s[0]) else None
+
+        if nodes is not None:
+            # go back from the nodes to the first nodes of their runs
+            starts = set()
+            stack = [node for node in nodes if in_run(node)]
+            visited = set()
+            while stack:
+                node = stack.pop()
+                if node in visited:
+                    continue
+                visited.add(node)
+                previous = [pred for pred in self._multi_graph.predecessors(node)
+                            if in_run(pred) and next_node(pred) is node]
+                if previous:
+                    stack.extend(previous)
+                else:
+                    starts.add(node)
+            next_nodes = {}
+        else:
+            # The next node of the run of each node, which is its single
+            # successor, if it can be in a run too.
+            next_nodes = {node: next_node(node)
+                          for node in self._multi_graph.nodes if in_run(node)}
+
+            # A run starts at each node that does not continue the run of another
+            continuing = set(next_nodes.values())
+            starts = [node for node in next_nodes if node not in continuing]
+
+        for node in starts:
+            group = [node]
+            while True:
+                if group[-1] not in next_nodes:
+                    next_nodes[group[-1]] = next_node(group[-1])
+                if next_nodes[group[-1]] is None:
+                    break
+                group.append(next_nodes[group[-1]])
+            group_list.append(tuple(group))
         return set(group_list)
 
     def nodes_on_wire(self, wire, only_ops=False):
@@ -18,7 +18,6 @@ Helper module for simplified Qiskit usage.
 In general we recommend using the SDK modules directly. However, to get something
 running quickly we have provided this wrapper module.
 """
-from qiskit.compiler import transpile, assemble
 
 
 def execute(experiments, backend,
@@ -183,6 +182,9 @@ def execute(experiments, backend,
     Raises:
         QiskitError: if the execution cannot be interpreted as either circuits or schedules
     """
+    # the compiler is imported here so that `import qiskit` does not load the transpiler
+    from qiskit.compiler import transpile, assemble
+
     # transpiling the circuits using given transpile options
     experiments = transpile(experiments,
                             basis_gates=basis_gates,
@@ -21,7 +21,6 @@
 Generic isometries from m to n qubits.
 """
 
-import itertools
 import numpy as np
 
 from qiskit import QuantumRegister
@@ -298,19 +297,14 @@ def _reverse_qubit_state(state, basis_state):
 
 
 def _apply_ucg(m, k, single_qubit_gates):
-    # ToDo: Improve efficiency by parallelizing the gate application. A generalized version of
-    # ToDo: this method should be implemented by the state vector simulator in Qiskit AER.
+    # The rows of m are reshaped such that the first axis is the state of the controls, the second
+    # one the state of the target and the third one the state of the remaining qubits, and the
+    # single-qubit gates are applied together to all of them.
     num_qubits = int(np.log2(m.shape[0]))
     num_col = m.shape[1]
     spacing = 2 ** (num_qubits - k - 1)
-    for j in range(2 ** (num_qubits - 1)):
-        i = (j // spacing) * spacing + j
-        gate_index = i // (2 ** (num_qubits - k))
-        for l in range(num_col):
-            m[np.array([i, i + spacing]), np.array([l, l])] = \
-                np.ndarray.flatten(
-                    single_qubit_gates[gate_index].dot(np.array([[m[i, l]],
-                                                                 [m[i + spacing, l]]]))).tolist()
+    m_view = m.reshape(2 ** k, 2, spacing, num_col)
+    m_view[...] = np.einsum('gab,gbrc->garc', np.asarray(single_qubit_gates), m_view)
     return m
 
 
@@ -322,17 +316,9 @@ def _apply_ucg(m, k, single_qubit_gates):
 
 
 def _apply_diagonal_gate(m, action_qubit_labels, diag):
-    # ToDo: Improve efficiency by parallelizing the gate application. A generalized version of
-    # ToDo: this method should be implemented by the state vector simulator in Qiskit AER.
     num_qubits = int(np.log2(m.shape[0]))
-    num_cols = m.shape[1]
-    basis_states = list(itertools.product([0, 1], repeat=num_qubits))
-    for state in basis_states:
-        state_on_action_qubits = [state[i] for i in action_qubit_labels]
-        diag_index = _bin_to_int(state_on_action_qubits)
-        i = _bin_to_int(state)
-        for j in range(num_cols):
-            m[i, j] = diag[diag_index] * m[i, j]
+    diag_indices = _diag_indices(2 ** num_qubits, action_qubit_labels, num_qubits)
+    m *= np.asarray(diag)[diag_indices, np.newaxis]
     return m
 
 
@@ -347,15 +333,24 @@ def _apply_diagonal_gate(m, action_qubit_labels, diag):
 def _apply_diagonal_gate_to_diag(m_diagonal, action_qubit_labels, diag, num_qubits):
     if not m_diagonal:
         return m_diagonal
-    basis_states = list(itertools.product([0, 1], repeat=num_qubits))
-    for state in basis_states[:len(m_diagonal)]:
-        state_on_action_qubits = [state[i] for i in action_qubit_labels]
-        diag_index = _bin_to_int(state_on_action_qubits)
-        i = _bin_to_int(state)
-        m_diagonal[i] *= diag[diag_index]
+    diag_indices = _diag_indices(len(m_diagonal), action_qubit_labels, num_qubits)
+    m_diagonal[:] = (np.asarray(m_diagonal) * np.asarray(diag)[diag_indices]).tolist()
     return m_diagonal
 
 
+# The index in the diagonal of a diagonal gate acting on the qubits with labels
+# action_qubit_labels of each of the first num_states basis states on num_qubits qubits, i.e.,
+# the integer whose binary digits are the ones of the basis state on the action qubits.
+
+
+def _diag_indices(num_states, action_qubit_labels, num_qubits):
+    states = np.arange(num_states)
+    diag_indices = np.zeros(num_states, dtype=int)
+    for label in action_qubit_labels:
+        diag_indices = 2 * diag_indices + ((states >> (num_qubits - label - 1)) & 1)
+    return diag_indices
+
+
 # Apply a MC single-qubit gate (given by the 2*2 unitary input: gate) with controlling on
 # the qubits with label control_labels and acting on the qubit with label target_label
 # to a matrix m. The input matrix m and the gate have to be of dtype=complex. The qubit labels are
@@ -364,44 +359,19 @@ def _apply_diagonal_gate_to_diag(m_diagonal, action_qubit_labels, diag, num_qubi
 
 
 def _apply_multi_controlled_gate(m, control_labels, target_label, gate):
-    # ToDo: This method should be integrated into the state vector simulator in Qiskit AER.
     num_qubits = int(np.log2(m.shape[0]))
-    num_cols = m.shape[1]
     control_labels.sort()
-    free_qubits = num_qubits - len(control_labels) - 1
-    basis_states_free = list(itertools.product([0, 1], repeat=free_qubits))
-    for state_free in basis_states_free:
-        (e1, e2) = _construct_basis_states(state_free, control_labels, target_label)
-        for l in range(num_cols):
-            m[np.array([e1, e2]), np.array([l, l])] = \
-                np.ndarray.flatten(gate.dot(np.array([[m[e1, l]], [m[e2, l]]]))).tolist()
+    # The basis states with all the controls set and the target not set, and the same basis
+    # states with the target set
+    control_mask = sum(2 ** (num_qubits - label - 1) for label in control_labels)
+    target_bit = 2 ** (num_qubits - target_label - 1)
+    states = np.arange(2 ** num_qubits)
+    e1 = states[((states & control_mask) == control_mask) & ((states & target_bit) == 0)]
+    e2 = e1 + target_bit
+    m[e1], m[e2] = gate[0, 0] * m[e1] + gate[0, 1] * m[e2], gate[1, 0] * m[e1] + gate[1, 1] * m[e2]
     return m
 
 
-# Helper method for _apply_multi_controlled_gate. This constructs the basis states the MG gate
-# is acting on for a specific state state_free of the qubits we neither control nor act on.
-
-
-def _construct_basis_states(state_free, control_labels, target_label):
-    e1 = []
-    e2 = []
-    j = 0
-    for i in range(len(state_free) + len(control_labels) + 1):
-        if i in control_labels:
-            e1.append(1)
-            e2.append(1)
-        elif i == target_label:
-            e1.append(0)
-            e2.append(1)
-        else:
-            e1.append(state_free[j])
-            e2.append(state_free[j])
-            j += 1
-    out1 = _bin_to_int(e1)
-    out2 = _bin_to_int(e2)
-    return out1, out2
-
-
 # Some helper methods:
 
 
@@ -419,33 +389,20 @@ def _reverse_qubit_oder(qubits):
     return [q for q in reversed(qubits)]
 
 
-# Convert list of binary digits to integer
-
-
-def _bin_to_int(binary_digits_as_list):
-    return int("".join(str(x) for x in binary_digits_as_list), 2)
-
-
 def _ct(m):
     return np.transpose(np.conjugate(m))
 
 
 def _get_binary_rep_as_list(n, num_digits):
-    binary_string = np.binary_repr(n).zfill(num_digits)
-    binary = []
-    for line in binary_string:
-        for c in line:
-            binary.append(int(c))
-    return binary[-num_digits:]
+    return [(n >> i) & 1 for i in reversed(range(num_digits))]
 
 
 # absorb a diagonal gate into a UCG
 
 
 def _merge_UCG_and_diag(single_qubit_gates, diag):
-    for (i, gate) in enumerate(single_qubit_gates):
-        single_qubit_gates[i] = \
-            np.array([[diag[2 * i], 0.], [0., diag[2 * i + 1]]]).dot(gate)
+    merged = np.asarray(diag).reshape(-1, 2, 1) * np.asarray(single_qubit_gates)
+    single_qubit_gates[:] = list(merged)
     return single_qubit_gates
 
 
@@ -468,11 +425,7 @@ def _b(k, s):
 # the method k_s(k, s) returns k_s
 
 def _k_s(k, s):
-    if k == 0:
-        return 0
-    else:
-        num_digits = s + 1
-        return _get_binary_rep_as_list(k, num_digits)[0]
+    return (k >> s) & 1
 
 
 # Check if a gate of a special form is equal to the identity gate up to global phase
@@ -483,10 +436,7 @@ def _ucg_is_identity_up_to_global_phase(single_qubit_gates):
         global_phase = 1. / (single_qubit_gates[0][0, 0])
     else:
         return False
-    for gate in single_qubit_gates:
-        if not np.allclose(global_phase * gate, np.eye(2, 2)):
-            return False
-    return True
+    return np.allclose(global_phase * np.asarray(single_qubit_gates), np.eye(2, 2))
 
 
 def _diag_is_identity_up_to_global_phase(diag):
@@ -36,7 +36,6 @@ This gate is represented by a block-diagonal matrix, where each block is a
      [0,   0,  ...., U_(2^k-1)]]
 """
 
-import cmath
 import math
 
 import numpy as np
@@ -99,7 +98,11 @@ class UCG(Gate):
         # diagonal gate is provided in the computational basis of the qubits
         # q[k-1],...,q[0],q_target, decreasingly ordered with respect to the
         # significance of the qubit in the computational basis
-        _, diag = self._dec_ucg()
+        if self.num_qubits == 1:
+            return np.ones(2).tolist()
+        # Only the single-qubit gates of the decomposition are needed for the diagonal,
+        # not the circuit
+        _, diag = self._dec_ucg_help()
         return diag
 
     def _define(self):
@@ -146,10 +149,8 @@ class UCG(Gate):
             # Add single-qubit gate
             circuit.squ(squ, q_target)
             # The number of the control qubit is given by the number of zeros at the end
-            # of the binary representation of (i+1)
-            binary_rep = np.binary_repr(i + 1)
-            num_trailing_zeros = len(binary_rep) - len(binary_rep.rstrip('0'))
-            q_contr_index = num_trailing_zeros
+            # of the binary representation of (i+1), i.e., the position of its lowest set bit
+            q_contr_index = ((i + 1) & -(i + 1)).bit_length() - 1
             # Add C-NOT gate
             if not i == len(single_qubit_gates) - 1:
                 circuit.cx(q_controls[q_contr_index], q_target)
@@ -165,58 +166,60 @@ class UCG(Gate):
         This method finds the single qubit gate arising in the decomposition of UCGs given in
         https://arxiv.org/pdf/quant-ph/0410066.pdf.
         """
-        single_qubit_gates = [gate.astype(complex) for gate in self.params]
+        single_qubit_gates = np.array(self.params, dtype=complex)
         diag = np.ones(2 ** self.num_qubits, dtype=complex)
         num_contr = self.num_qubits - 1
+        rz_00, rz_11 = np.diag(_rz(np.pi / 2))
         for dec_step in range(num_contr):
             num_ucgs = 2 ** dec_step
+            len_ucg = 2 ** (num_contr - dec_step)
+            half = len_ucg // 2
             # The decomposition works recursively and the following loop goes over the different
             # UCGs that arise in the decomposition
             for ucg_index in range(num_ucgs):
-                len_ucg = 2 ** (num_contr - dec_step)
-                for i in range(int(len_ucg / 2)):
-                    shift = ucg_index * len_ucg
-                    a = single_qubit_gates[shift + i]
-                    b = single_qubit_gates[shift + len_ucg // 2 + i]
-                    # Apply the decomposition for UCGs given in equation (3) in
-                    # https://arxiv.org/pdf/quant-ph/0410066.pdf
-                    # to demultiplex one control of all the num_ucgs uniformly-controlled gates
-                    #  with log2(len_ucg) uniform controls
-                    v, u, r = self._demultiplex_single_uc(a, b)
-                    #  replace the single-qubit gates with v,u (the already existing ones
-                    #  are not needed any more)
-                    single_qubit_gates[shift + i] = v
-                    single_qubit_gates[shift + len_ucg // 2 + i] = u
-                    # Now we decompose the gates D as described in Figure 4  in
-                    # https://arxiv.org/pdf/quant-ph/0410066.pdf and merge some of the gates
-                    # into the UCGs and the diagonal at the end of the circuit
-
-                    # Remark: The Rz(pi/2) rotation acting on the target qubit and the Hadamard
-                    # gates arising in the decomposition of D are ignored for the moment (they will
-                    # be added together with the C-NOT gates at the end of the decomposition
-                    # (in the method dec_ucg()))
-                    if ucg_index < num_ucgs - 1:
-                        # Absorb the Rz(pi/2) rotation on the control into the UC-Rz gate and
-                        # merge the UC-Rz rotation with the following UCG,
-                        # which hasn't been decomposed yet.
-                        k = shift + len_ucg + i
-                        single_qubit_gates[k] = \
-                            single_qubit_gates[k].dot(_ct(r)) * _rz(np.pi / 2).item((0, 0))
-                        k = k + len_ucg // 2
-                        single_qubit_gates[k] = \
-                            single_qubit_gates[k].dot(r) * _rz(np.pi / 2).item((1, 1))
-                    else:
-                        # Absorb the Rz(pi/2) rotation on the control into the UC-Rz gate and merge
-                        # the trailing UC-Rz rotation into a diagonal gate at the end of the circuit
-                        for ucg_index_2 in range(num_ucgs):
-                            shift_2 = ucg_index_2 * len_ucg
-                            k = 2 * (i + shift_2)
-                            diag[k] = diag[k] * _ct(r).item((0, 0)) * _rz(np.pi / 2).item((0, 0))
-                            diag[k + 1] = diag[k + 1] * _ct(r).item((1, 1)) * _rz(np.pi / 2).item(
-                                (0, 0))
-                            k = len_ucg + k
-                            diag[k] *= r.item((0, 0)) * _rz(np.pi / 2).item((1, 1))
-                            diag[k + 1] *= r.item((1, 1)) * _rz(np.pi / 2).item((1, 1))
+                shift = ucg_index * len_ucg
+                # The pairs of single-qubit gates [a_i, b_i] of the UCG, for all i at once
+                a = single_qubit_gates[shift:shift + half]
+                b = single_qubit_gates[shift + half:shift + len_ucg]
+                # Apply the decomposition for UCGs given in equation (3) in
+                # https://arxiv.org/pdf/quant-ph/0410066.pdf
+                # to demultiplex one control of all the num_ucgs uniformly-controlled gates
+                #  with log2(len_ucg) uniform controls
+                v, u, r = self._demultiplex_single_uc(a, b)
+                #  replace the single-qubit gates with v,u (the already existing ones
+                #  are not needed any more)
+                single_qubit_gates[shift:shift + half] = v
+                single_qubit_gates[shift + half:shift + len_ucg] = u
+                # Now we decompose the gates D as described in Figure 4  in
+                # https://arxiv.org/pdf/quant-ph/0410066.pdf and merge some of the gates
+                # into the UCGs and the diagonal at the end of the circuit
+
+                # Remark: The Rz(pi/2) rotation acting on the target qubit and the Hadamard
+                # gates arising in the decomposition of D are ignored for the moment (they will
+                # be added together with the C-NOT gates at the end of the decomposition
+                # (in the method dec_ucg()))
+                if ucg_index < num_ucgs - 1:
+                    # Absorb the Rz(pi/2) rotation on the control into the UC-Rz gate and
+                    # merge the UC-Rz rotation with the following UCG,
+                    # which hasn't been decomposed yet.
+                    k = shift + len_ucg
+                    single_qubit_gates[k:k + half] = \
+                        np.matmul(single_qubit_gates[k:k + half], _ct(r)) * rz_00
+                    k = k + half
+                    single_qubit_gates[k:k + half] = \
+                        np.matmul(single_qubit_gates[k:k + half], r) * rz_11
+                else:
+                    # Absorb the Rz(pi/2) rotation on the control into the UC-Rz gate and merge
+                    # the trailing UC-Rz rotation into a diagonal gate at the end of the circuit
+                    r_00, r_11 = r[:, 0, 0], r[:, 1, 1]
+                    for ucg_index_2 in range(num_ucgs):
+                        shift_2 = ucg_index_2 * len_ucg
+                        k = 2 * (np.arange(half) + shift_2)
+                        diag[k] = diag[k] * np.conj(r_00) * rz_00
+                        diag[k + 1] = diag[k + 1] * np.conj(r_11) * rz_00
+                        k = len_ucg + k
+                        diag[k] *= r_00 * rz_11
+                        diag[k + 1] *= r_11 * rz_11
         return single_qubit_gates, diag
 
     def _demultiplex_single_uc(self, a, b):
@@ -224,32 +227,31 @@ class UCG(Gate):
         This mehod implements the decomposition given in equation (3) in
         https://arxiv.org/pdf/quant-ph/0410066.pdf.
         The decomposition is used recursively to decompose uniformly controlled gates.
-        a,b = single qubit unitaries
+        a,b = arrays of single qubit unitaries, of shape (N, 2, 2), decomposed pairwise
         v,u,r = outcome of the decomposition given in the reference mentioned above
-        (see there for the details).
+        (see there for the details), for each pair.
         """
         # The notation is chosen as in https://arxiv.org/pdf/quant-ph/0410066.pdf.
-        x = a.dot(_ct(b))
+        x = np.matmul(a, _ct(b))
         det_x = np.linalg.det(x)
-        x11 = x.item((0, 0)) / cmath.sqrt(det_x)
-        phi = cmath.phase(det_x)
-        r1 = cmath.exp(1j / 2 * (np.pi / 2 - phi / 2 - cmath.phase(x11)))
-        r2 = cmath.exp(1j / 2 * (np.pi / 2 - phi / 2 + cmath.phase(x11) + np.pi))
-        r = np.array([[r1, 0], [0, r2]], dtype=complex)
-        d, u = np.linalg.eig(r.dot(x).dot(r))
+        x11 = x[:, 0, 0] / np.sqrt(det_x)
+        phi = np.angle(det_x)
+        r = np.zeros(x.shape, dtype=complex)
+        r[:, 0, 0] = np.exp(1j / 2 * (np.pi / 2 - phi / 2 - np.angle(x11)))
+        r[:, 1, 1] = np.exp(1j / 2 * (np.pi / 2 - phi / 2 + np.angle(x11) + np.pi))
+        d, u = np.linalg.eig(np.matmul(np.matmul(r, x), r))
         # If d is not equal to diag(i,-i), then we put it into this "standard" form
         # (see eq. (13) in https://arxiv.org/pdf/quant-ph/0410066.pdf) by interchanging
         # the eigenvalues and eigenvectors.
-        if abs(d[0] + 1j) < _EPS:
-            d = np.flip(d, 0)
-            u = np.flip(u, 1)
-        d = np.diag(np.sqrt(d))
-        v = d.dot(_ct(u)).dot(_ct(r)).dot(b)
+        flip = np.abs(d[:, 0] + 1j) < _EPS
+        d[flip] = d[flip, ::-1]
+        u[flip] = u[flip, :, ::-1]
+        v = np.sqrt(d)[:, :, np.newaxis] * np.matmul(np.matmul(_ct(u), _ct(r)), b)
         return v, u, r
 
 
 def _ct(m):
-    return np.transpose(np.conjugate(m))
+    return np.conjugate(np.swapaxes(m, -1, -2))
 
 
 def _h():
@@ -20,7 +20,6 @@ Methods to create random unitaries, states, etc.
 
 import math
 import numpy as np
-from scipy.stats import unitary_group
 
 from qiskit.quantum_info.operators import Operator
 from qiskit.exceptions import QiskitError
@@ -65,6 +64,8 @@ def random_unitary(dim, seed=None):
     Raises:
         QiskitError: if dim is not a positive power of 2.
     """
+    # scipy.stats is slow to import, so it is only imported when needed
+    from scipy.stats import unitary_group
     if seed is not None:
         np.random.seed(seed)
     if dim == 0 or not math.log2(dim).is_integer():
@@ -37,10 +37,17 @@ from qiskit.extensions.standard.u3 import U3Gate
 from qiskit.extensions.standard.cx import CnotGate
 from qiskit.exceptions import QiskitError
 from qiskit.quantum_info.operators.predicates import is_unitary_matrix
-from qiskit.quantum_info.synthesis.weyl import weyl_coordinates
 
 _CUTOFF_PRECISION = 1e-12
 
+# The number of decompositions kept by cached_weyl_decompositions
+MAX_WEYL_CACHE_SIZE = 10 ** 4
+
+# The unitaries equal once rounded to this number of decimals share their decomposition
+_WEYL_CACHE_DECIMALS = 12
+
+_WEYL_CACHE = {}
+
 
 def euler_angles_1q(unitary_matrix):
     """Compute Euler angles for a single-qubit gate.
@@ -92,30 +99,50 @@ def decompose_two_qubit_product_gate(special_unitary_matrix):
     """Decompose U = Ul⊗Ur where U in SU(4), and Ul, Ur in SU(2).
     Throws QiskitError if this isn't possible.
     """
+    L, R = decompose_two_qubit_product_gates(special_unitary_matrix[np.newaxis])
+    return L[0], R[0]
+
+
+def decompose_two_qubit_product_gates(special_unitary_matrices):
+    """Decompose each U = Ul⊗Ur of a stack of matrices, where U in SU(4), and Ul, Ur in SU(2).
+    Throws QiskitError if this isn't possible for one of them.
+
+    Args:
+        special_unitary_matrices (ndarray): the matrices U, of shape (N, 4, 4).
+
+    Returns:
+        tuple(ndarray, ndarray): the matrices Ul and Ur, of shape (N, 2, 2).
+
+    Raises:
+        QiskitError: if one of the matrices is not the tensor product of two
+            single-qubit gates.
+    """
     # extract the right component
-    R = special_unitary_matrix[:2, :2].copy()
-    detR = R[0, 0]*R[1, 1] - R[0, 1]*R[1, 0]
-    if abs(detR) < 0.1:
-        R = special_unitary_matrix[2:, :2].copy()
-        detR = R[0, 0]*R[1, 1] - R[0, 1]*R[1, 0]
-    if abs(detR) < 0.1:
+    R = special_unitary_matrices[:, :2, :2].copy()
+    detR = R[:, 0, 0]*R[:, 1, 1] - R[:, 0, 1]*R[:, 1, 0]
+    small = np.abs(detR) < 0.1
+    R[small] = special_unitary_matrices[small, 2:, :2]
+    detR[small] = R[small, 0, 0]*R[small, 1, 1] - R[small, 0, 1]*R[small, 1, 0]
+    if np.any(np.abs(detR) < 0.1):
         raise QiskitError("decompose_two_qubit_product_gate: unable to decompose: detR < 0.1")
-    R /= np.sqrt(detR)
-
-    # extract the left component
-    temp = np.kron(np.eye(2), R.T.conj())
-    temp = special_unitary_matrix.dot(temp)
-    L = temp[::2, ::2]
-    detL = L[0, 0]*L[1, 1] - L[0, 1]*L[1, 0]
-    if abs(detL) < 0.9:
+    R /= np.sqrt(detR)[:, np.newaxis, np.newaxis]
+
+    # extract the left component, from U.(I⊗R^dag)
+    temp = np.zeros(special_unitary_matrices.shape, dtype=complex)
+    temp[:, :2, :2] = temp[:, 2:, 2:] = np.conj(np.transpose(R, (0, 2, 1)))
+    temp = special_unitary_matrices @ temp
+    L = temp[:, ::2, ::2]
+    detL = L[:, 0, 0]*L[:, 1, 1] - L[:, 0, 1]*L[:, 1, 0]
+    if np.any(np.abs(detL) < 0.9):
         raise QiskitError("decompose_two_qubit_product_gate: unable to decompose: detL < 0.9")
-    L /= np.sqrt(detL)
+    L /= np.sqrt(detL)[:, np.newaxis, np.newaxis]
 
-    temp = np.kron(L, R)
-    deviation = np.abs(np.abs(temp.conj(temp).T.dot(special_unitary_matrix).trace()) - 4)
-    if deviation > 1.E-13:
+    temp = np.einsum('nij,nkl->nikjl', L, R).reshape(special_unitary_matrices.shape)
+    deviation = np.abs(np.abs(np.einsum('nji,nji->n', np.conj(temp),
+                                        special_unitary_matrices)) - 4)
+    if np.any(deviation > 1.E-13):
         raise QiskitError("decompose_two_qubit_product_gate: decomposition failed: "
-                          "deviation too large: {}".format(deviation))
+                          "deviation too large: {}".format(np.max(deviation)))
 
     return L, R
 
@@ -133,6 +160,113 @@ _ipz = np.array([[1j, 0],
                  [0, -1j]], dtype=complex)
 
 
+def weyl_decompositions(unitary_matrices):
+    """Decompose each two-qubit unitary U of a stack as
+    U = (K1l⊗K1r).Exp(i a xx + i b yy + i c zz).(K2l⊗K2r), as in `TwoQubitWeylDecomposition`.
+
+    The unitaries are decomposed together, with a few batched LAPACK calls.
+
+    Args:
+        unitary_matrices (ndarray): the unitaries U, of shape (N, 4, 4).
+
+    Returns:
+        tuple: the Weyl coordinates (a, b, c), of shape (N, 3), and the
+            matrices K1l, K1r, K2l and K2r, of shape (N, 2, 2).
+
+    Raises:
+        QiskitError: if one of the decompositions fails.
+    """
+    pi2 = np.pi/2
+    pi4 = np.pi/4
+    unitary_matrices = np.asarray(unitary_matrices, dtype=complex)
+    num = len(unitary_matrices)
+
+    # Make U be in SU(4)
+    U = unitary_matrices * (np.linalg.det(unitary_matrices)**(-0.25))[:, np.newaxis, np.newaxis]
+
+    Up = _Bd @ U @ _B
+    M2 = np.transpose(Up, (0, 2, 1)) @ Up
+
+    # M2 is a symmetric complex matrix. We need to decompose it as M2 = P D P^T where
+    # P ∈ SO(4), D is diagonal with unit-magnitude elements.
+    # D, P = la.eig(M2)  # this can fail for certain kinds of degeneracy
+    P = np.empty((num, 4, 4))
+    D = np.empty((num, 4), dtype=complex)
+    remaining = np.arange(num)
+    for _ in range(100):  # FIXME: this randomized algorithm is horrendous
+        coefficients = np.random.randn(2, len(remaining), 1, 1)
+        M2real = coefficients[0]*M2[remaining].real + coefficients[1]*M2[remaining].imag
+        _, Pr = np.linalg.eigh(M2real)
+        Dr = np.einsum('nji,njk,nki->ni', Pr, M2[remaining], Pr)
+        diagonalized = np.all(np.isclose((Pr * Dr[:, np.newaxis, :]) @ np.transpose(Pr, (0, 2, 1)),
+                                         M2[remaining], rtol=1.0e-13, atol=1.0e-13), axis=(1, 2))
+        P[remaining[diagonalized]] = Pr[diagonalized]
+        D[remaining[diagonalized]] = Dr[diagonalized]
+        remaining = remaining[~diagonalized]
+        if not remaining.size:
+            break
+    else:
+        raise QiskitError("TwoQubitWeylDecomposition: failed to diagonalize M2")
+
+    d = -np.angle(D)/2
+    d[:, 3] = -d[:, 0]-d[:, 1]-d[:, 2]
+    cs = np.mod((d[:, :3]+d[:, 3:])/2, 2*np.pi)
+
+    # Reorder the eigenvalues to get in the Weyl chamber
+    cstemp = np.mod(cs, pi2)
+    np.minimum(cstemp, pi2-cstemp, cstemp)
+    order = np.argsort(cstemp, axis=1)[:, [1, 2, 0]]
+    rows = np.arange(len(order))[:, np.newaxis]
+    cs = cs[rows, order]
+    d[:, :3] = d[rows, order]
+    P[:, :, :3] = P[rows[:, :, np.newaxis], np.arange(4)[:, np.newaxis], order[:, np.newaxis, :]]
+
+    # Fix the sign of P to be in SO(4)
+    P[np.real(np.linalg.det(P)) < 0, :, -1] *= -1
+
+    # Find K1, K2 so that U = K1.A.K2, with K being product of single-qubit unitaries
+    K1 = _B @ Up @ (P * np.exp(1j*d)[:, np.newaxis, :]) @ _Bd
+    K2 = _B @ np.transpose(P, (0, 2, 1)) @ _Bd
+
+    K1l, K1r = decompose_two_qubit_product_gates(K1)
+    K2l, K2r = decompose_two_qubit_product_gates(K2)
+
+    # Flip into Weyl chamber
+    flip = cs[:, 0] > pi2
+    cs[flip, 0] -= 3*pi2
+    K1l[flip] = K1l[flip] @ _ipy
+    K1r[flip] = K1r[flip] @ _ipy
+    flip = cs[:, 1] > pi2
+    cs[flip, 1] -= 3*pi2
+    K1l[flip] = K1l[flip] @ _ipx
+    K1r[flip] = K1r[flip] @ _ipx
+    conjs = np.zeros(num, dtype=int)
+    flip = cs[:, 0] > pi4
+    cs[flip, 0] = pi2-cs[flip, 0]
+    K1l[flip] = K1l[flip] @ _ipy
+    K2r[flip] = _ipy @ K2r[flip]
+    conjs[flip] += 1
+    flip = cs[:, 1] > pi4
+    cs[flip, 1] = pi2-cs[flip, 1]
+    K1l[flip] = K1l[flip] @ _ipx
+    K2r[flip] = _ipx @ K2r[flip]
+    conjs[flip] += 1
+    flip = cs[:, 2] > pi2
+    cs[flip, 2] -= 3*pi2
+    K1l[flip] = K1l[flip] @ _ipz
+    K1r[flip] = K1r[flip] @ _ipz
+    flip = conjs == 1
+    cs[flip, 2] = pi2-cs[flip, 2]
+    K1l[flip] = K1l[flip] @ _ipz
+    K2r[flip] = _ipz @ K2r[flip]
+    flip = cs[:, 2] > pi4
+    cs[flip, 2] -= pi2
+    K1l[flip] = K1l[flip] @ _ipz
+    K1r[flip] = K1r[flip] @ _ipz
+
+    return cs[:, [1, 0, 2]], K1l, K1r, K2l, K2r
+
+
 class TwoQubitWeylDecomposition:
     """ Decompose two-qubit unitary U = (K1l⊗K1r).Exp(i a xx + i b yy + i c zz).(K2l⊗K2r) ,
     where U ∈ U(4), (K1l|K1r|K2l|K2r) ∈ SU(2), and we stay in the "Weyl Chamber"
@@ -148,93 +282,34 @@ class TwoQubitWeylDecomposition:
 
         The overall decomposition scheme is taken from Drury and Love, arXiv:0806.4015 [quant-ph].
         """
-        pi2 = np.pi/2
-        pi4 = np.pi/4
-
-        # Make U be in SU(4)
-        U = unitary_matrix.copy()
-        U *= la.det(U)**(-0.25)
-
-        Up = _Bd.dot(U).dot(_B)
-        M2 = Up.T.dot(Up)
-
-        # M2 is a symmetric complex matrix. We need to decompose it as M2 = P D P^T where
-        # P ∈ SO(4), D is diagonal with unit-magnitude elements.
-        # D, P = la.eig(M2)  # this can fail for certain kinds of degeneracy
-        for _ in range(100):  # FIXME: this randomized algorithm is horrendous
-            M2real = np.random.randn()*M2.real + np.random.randn()*M2.imag
-            _, P = la.eigh(M2real)
-            D = P.T.dot(M2).dot(P).diagonal()
-            if np.allclose(P.dot(np.diag(D)).dot(P.T), M2, rtol=1.0e-13, atol=1.0e-13):
-                break
-        else:
-            raise QiskitError("TwoQubitWeylDecomposition: failed to diagonalize M2")
-
-        d = -np.angle(D)/2
-        d[3] = -d[0]-d[1]-d[2]
-        cs = np.mod((d[:3]+d[3])/2, 2*np.pi)
-
-        # Reorder the eigenvalues to get in the Weyl chamber
-        cstemp = np.mod(cs, pi2)
-        np.minimum(cstemp, pi2-cstemp, cstemp)
-        order = np.argsort(cstemp)[[1, 2, 0]]
-        cs = cs[order]
-        d[:3] = d[order]
-        P[:, :3] = P[:, order]
-
-        # Fix the sign of P to be in SO(4)
-        if np.real(la.det(P)) < 0:
-            P[:, -1] = -P[:, -1]
-
-        # Find K1, K2 so that U = K1.A.K2, with K being product of single-qubit unitaries
-        K1 = _B.dot(Up).dot(P).dot(np.diag(np.exp(1j*d))).dot(_Bd)
-        K2 = _B.dot(P.T).dot(_Bd)
-
-        K1l, K1r = decompose_two_qubit_product_gate(K1)
-        K2l, K2r = decompose_two_qubit_product_gate(K2)
-
-        K1l = K1l.copy()
-
-        # Flip into Weyl chamber
-        if cs[0] > pi2:
-            cs[0] -= 3*pi2
-            K1l = K1l.dot(_ipy)
-            K1r = K1r.dot(_ipy)
-        if cs[1] > pi2:
-            cs[1] -= 3*pi2
-            K1l = K1l.dot(_ipx)
-            K1r = K1r.dot(_ipx)
-        conjs = 0
-        if cs[0] > pi4:
-            cs[0] = pi2-cs[0]
-            K1l = K1l.dot(_ipy)
-            K2r = _ipy.dot(K2r)
-            conjs += 1
-        if cs[1] > pi4:
-            cs[1] = pi2-cs[1]
-            K1l = K1l.dot(_ipx)
-            K2r = _ipx.dot(K2r)
-            conjs += 1
-        if cs[2] > pi2:
-            cs[2] -= 3*pi2
-            K1l = K1l.dot(_ipz)
-            K1r = K1r.dot(_ipz)
-        if conjs == 1:
-            cs[2] = pi2-cs[2]
-            K1l = K1l.dot(_ipz)
-            K2r = _ipz.dot(K2r)
-        if cs[2] > pi4:
-            cs[2] -= pi2
-            K1l = K1l.dot(_ipz)
-            K1r = K1r.dot(_ipz)
-        self.a = cs[1]
-        self.b = cs[0]
-        self.c = cs[2]
+        coordinates, K1l, K1r, K2l, K2r = weyl_decompositions(
+            np.asarray(unitary_matrix, dtype=complex)[np.newaxis])
+        self._set(coordinates[0], K1l[0], K1r[0], K2l[0], K2r[0])
+
+    def _set(self, coordinates, K1l, K1r, K2l, K2r):
+        self.a, self.b, self.c = coordinates
         self.K1l = K1l
         self.K1r = K1r
         self.K2l = K2l
         self.K2r = K2r
 
+    @classmethod
+    def from_unitaries(cls, unitary_matrices):
+        """Decompose a stack of two-qubit unitaries together, with `weyl_decompositions`.
+
+        Args:
+            unitary_matrices (ndarray): the unitaries, of shape (N, 4, 4).
+
+        Returns:
+            list(TwoQubitWeylDecomposition): the decomposition of each unitary.
+        """
+        decompositions = []
+        for factors in zip(*weyl_decompositions(unitary_matrices)):
+            decomposition = cls.__new__(cls)
+            decomposition._set(*factors)
+            decompositions.append(decomposition)
+        return decompositions
+
     def __repr__(self):
         # FIXME: this is worth making prettier since it's very useful for debugging
         return ("{}\n{}\nUd({}, {}, {})\n{}\n{}\n".format(
@@ -245,6 +320,36 @@ class TwoQubitWeylDecomposition:
             np.array_str(self.K2r)))
 
 
+def cached_weyl_decompositions(unitary_matrices):
+    """The `TwoQubitWeylDecomposition` of each unitary of a stack.
+
+    The decompositions are cached on the unitaries rounded to 12 decimals, so
+    that counting the basis gates of a unitary and then synthesizing it only
+    decomposes it once. The unitaries that are not in the cache are
+    decomposed together, with `TwoQubitWeylDecomposition.from_unitaries`.
+
+    Args:
+        unitary_matrices (ndarray): the unitaries, of shape (N, 4, 4).
+
+    Returns:
+        list(TwoQubitWeylDecomposition): the decomposition of each unitary,
+            which must not be modified.
+    """
+    # adding 0. turns the -0. of rounded negative values into 0.
+    keys = [(np.round(unitary, _WEYL_CACHE_DECIMALS) + 0.).tobytes()
+            for unitary in unitary_matrices]
+    decompositions = {key: _WEYL_CACHE[key] for key in keys if key in _WEYL_CACHE}
+    missing = {key: index for index, key in enumerate(keys) if key not in decompositions}
+    if missing:
+        new_decompositions = TwoQubitWeylDecomposition.from_unitaries(
+            np.asarray(unitary_matrices)[list(missing.values())])
+        decompositions.update(zip(missing, new_decompositions))
+        if len(_WEYL_CACHE) + len(missing) > MAX_WEYL_CACHE_SIZE:
+            _WEYL_CACHE.clear()
+        _WEYL_CACHE.update(zip(missing, new_decompositions))
+    return [decompositions[key] for key in keys]
+
+
 def Ud(a, b, c):
     """Generates the array Exp(i(a xx + b yy + c zz))
     """
@@ -439,7 +544,7 @@ class TwoQubitBasisDecomposer():
         if not is_unitary_matrix(target):
             raise QiskitError("TwoQubitBasisDecomposer: target matrix is not unitary.")
 
-        target_decomposed = TwoQubitWeylDecomposition(target)
+        target_decomposed = cached_weyl_decompositions(target[np.newaxis])[0]
         traces = self.traces(target_decomposed)
         expected_fidelities = [trace_to_fid(traces[i]) * basis_fidelity**i for i in range(4)]
 
@@ -460,20 +565,25 @@ class TwoQubitBasisDecomposer():
 
     def num_basis_gates(self, unitary):
         """ Computes the number of basis gates needed in
-        a decomposition of input unitary
+        a decomposition of input unitary, or of each unitary of an
+        array of shape (N, 4, 4), decomposed together.
         """
         if hasattr(unitary, 'to_operator'):
             unitary = unitary.to_operator().data
         if hasattr(unitary, 'to_matrix'):
             unitary = unitary.to_matrix()
         unitary = np.asarray(unitary, dtype=complex)
-        a, b, c = weyl_coordinates(unitary)[:]
-        traces = [4*(np.cos(a)*np.cos(b)*np.cos(c)+1j*np.sin(a)*np.sin(b)*np.sin(c)),
-                  4*(np.cos(np.pi/4-a)*np.cos(self.basis.b-b)*np.cos(c) +
-                     1j*np.sin(np.pi/4-a)*np.sin(self.basis.b-b)*np.sin(c)),
-                  4*np.cos(c),
-                  4]
-        return np.argmax([trace_to_fid(traces[i]) * self.basis_fidelity**i for i in range(4)])
+        decompositions = cached_weyl_decompositions(unitary.reshape(-1, 4, 4))
+        a, b, c = np.array([[target.a, target.b, target.c] for target in decompositions]).T
+        traces = np.array([4*(np.cos(a)*np.cos(b)*np.cos(c)+1j*np.sin(a)*np.sin(b)*np.sin(c)),
+                           4*(np.cos(np.pi/4-a)*np.cos(self.basis.b-b)*np.cos(c) +
+                              1j*np.sin(np.pi/4-a)*np.sin(self.basis.b-b)*np.sin(c)),
+                           4*np.cos(c),
+                           np.full(len(a), 4)])
+        expected_fidelities = (trace_to_fid(traces) *
+                               self.basis_fidelity**np.arange(4)[:, np.newaxis])
+        counts = np.argmax(expected_fidelities, axis=0)
+        return counts[0] if unitary.ndim == 2 else counts
 
 
 two_qubit_cnot_decompose = TwoQubitBasisDecomposer(CnotGate())
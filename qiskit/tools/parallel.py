@@ -52,6 +52,7 @@ from the multiprocessing library.
 
 import os
 import platform
+from collections import deque
 from multiprocessing import Pool
 from qiskit.exceptions import QiskitError
 from qiskit.util import local_hardware_info
@@ -142,3 +143,63 @@ def parallel_map(  # pylint: disable=dangerous-default-value
         _callback(0)
     Publisher().publish("terra.parallel.finish")
     return results
+
+
+def parallel_imap(  # pylint: disable=dangerous-default-value
+        task, values, task_args=tuple(), task_kwargs={}, num_processes=CPU_COUNT,
+        max_pending=None):
+    """
+    Lazy parallel execution of a mapping of `values` to the function `task`. This
+    is functionally equivalent to::
+
+        for value in values:
+            yield task(value, *task_args, **task_kwargs)
+
+    Unlike `parallel_map`, `values` can be any iterable, including a generator, and it is
+    only consumed as the results are requested. At most `max_pending` values are being
+    processed, or have a result waiting to be requested, at any time, so the memory used
+    stays bounded however many values there are. The results are yielded in the order
+    of `values`.
+
+    On Windows, or if another parallel task is already running, this function defaults
+    to a serial implementation.
+
+    Args:
+        task (func): Function that is to be called for each value in ``values``.
+        values (iterable): Values for which the ``task`` function is to be evaluated.
+        task_args (list): Optional additional arguments to the ``task`` function.
+        task_kwargs (dict): Optional additional keyword argument to the ``task`` function.
+        num_processes (int): Number of processes to spawn.
+        max_pending (int): Maximum number of values submitted to the processes whose
+            result has not been yielded yet. Defaults to twice ``num_processes``.
+
+    Yields:
+        object: The value of ``task(value, *task_args, **task_kwargs)`` for each value
+            in ``values``.
+    """
+    if platform.system() == 'Windows' or num_processes <= 1 \
+       or os.getenv('QISKIT_IN_PARALLEL') != 'FALSE':
+        for value in values:
+            yield task(value, *task_args, **task_kwargs)
+        return
+
+    max_pending = max_pending or 2 * num_processes
+    # The flag is only needed by the worker processes, which inherit it when they start.
+    # Resetting it right away lets the consumer of the results run parallel tasks.
+    os.environ['QISKIT_IN_PARALLEL'] = 'TRUE'
+    try:
+        pool = Pool(processes=num_processes)
+    finally:
+        os.environ['QISKIT_IN_PARALLEL'] = 'FALSE'
+
+    pending = deque()
+    try:
+        for value in values:
+            pending.append(pool.apply_async(task, (value,) + tuple(task_args), task_kwargs))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+    finally:
+        pool.terminate()
+        pool.join()
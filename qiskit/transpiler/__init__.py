@@ -20,5 +20,6 @@ from .exceptions import TranspilerError, TranspilerAccessError
 from .fencedobjs import FencedDAGCircuit, FencedPropertySet
 from .basepasses import AnalysisPass, TransformationPass
 from .coupling import CouplingMap
-from .layout import Layout
+from .layout import Layout, ArrayLayout
+from .target_cache import TargetCache
 from .transpile_circuit import transpile_circuit
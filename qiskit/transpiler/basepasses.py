@@ -53,6 +53,13 @@ class BasePass(metaclass=MetaPass):
     def __init__(self):
         self.requires = []  # List of passes that requires
         self.preserves = []  # List of passes that preserves
+        # If the results of the pass only depend on the DAG, they can be reused for as long as
+        # the DAG is not modified. Set to False for passes that depend on previous runs.
+        self.reusable = True
+        # Keys of the property set that the pass reads and writes. When both are declared,
+        # an analysis pass can run concurrently with the passes it does not conflict with.
+        self.reads = None
+        self.writes = None
         self.property_set = PropertySet()  # This pass's pointer to the pass manager's property set.
         self._hash = None
 
@@ -77,6 +84,25 @@ class BasePass(metaclass=MetaPass):
         """
         raise NotImplementedError
 
+    def conflicts_with(self, other):
+        """Whether this pass and ``other`` cannot run at the same time.
+
+        Two analysis passes conflict when one of them writes a property of the property set
+        that the other one reads or writes. Passes that do not declare the properties they read
+        and write conflict with every other pass.
+
+        Args:
+            other (BasePass): the pass to check against.
+
+        Returns:
+            bool: True if the passes have to run one after the other.
+        """
+        for pass_ in (self, other):
+            if not pass_.is_analysis_pass or pass_.reads is None or pass_.writes is None:
+                return True
+        return bool(set(self.writes) & (set(other.reads) | set(other.writes)) or
+                    set(other.writes) & set(self.reads))
+
     @property
     def is_transformation_pass(self):
         """ If the pass is a TransformationPass, that means that the pass can manipulate the DAG,
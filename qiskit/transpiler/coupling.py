@@ -20,6 +20,8 @@ directed edges indicate which physical qubits are coupled and the permitted dire
 CNOT gates. The object has a distance function that can be used to map quantum circuits
 onto a device with this coupling.
 """
+from functools import lru_cache
+
 import numpy as np
 import scipy.sparse as sp
 import scipy.sparse.csgraph as cs
@@ -48,6 +50,8 @@ class CouplingMap:
         self.graph = nx.DiGraph()
         # a dict of dicts from node pairs to distances
         self._dist_matrix = None
+        # the next physical qubit on a shortest undirected path, by start and end qubits
+        self._next_hop = None
         # a sorted list of physical qubits (integers) in this coupling map
         self._qubit_list = None
         # a sorted list of physical qubits (integers) in this coupling map
@@ -85,6 +89,7 @@ class CouplingMap:
                 "The physical qubit %s is already in the coupling graph" % physical_qubit)
         self.graph.add_node(physical_qubit)
         self._dist_matrix = None  # invalidate
+        self._next_hop = None  # invalidate
         self._qubit_list = None  # invalidate
 
     def add_edge(self, src, dst):
@@ -100,6 +105,7 @@ class CouplingMap:
             self.add_physical_qubit(dst)
         self.graph.add_edge(src, dst)
         self._dist_matrix = None  # invalidate
+        self._next_hop = None  # invalidate
         self._is_symmetric = None  # invalidate
 
     def subgraph(self, nodelist):
@@ -132,22 +138,26 @@ class CouplingMap:
         except nx.exception.NetworkXException:
             return False
 
+    def _fingerprint(self):
+        """The sorted physical qubits and the sorted undirected edges.
+
+        Coupling maps with the same fingerprint have the same distances and paths.
+        """
+        edges = {(src, dst) if src < dst else (dst, src) for src, dst in self.graph.edges()}
+        return tuple(self.physical_qubits), tuple(sorted(edges))
+
     def _compute_distance_matrix(self):
         """Compute the full distance matrix on pairs of nodes.
 
-        The distance map self._dist_matrix is computed from the graph using
-        all_pairs_shortest_path_length.
+        The distance map self._dist_matrix is computed with a breadth first
+        search from every node, and shared between the coupling maps with the
+        same undirected edges. It is read-only.
         """
-        if not self.is_connected():
+        dist_matrix, self._next_hop = _undirected_path_tables(*self._fingerprint())
+        qubits = self.physical_qubits
+        if not qubits or np.isinf(dist_matrix[np.ix_(qubits, qubits)]).any():
             raise CouplingError("coupling graph not connected")
-        lengths = nx.all_pairs_shortest_path_length(self.graph.to_undirected(as_view=True))
-        lengths = dict(lengths)
-        size = len(lengths)
-        cmap = np.zeros((size, size))
-        for idx in range(size):
-            cmap[idx, np.fromiter(lengths[idx].keys(), dtype=int)] = np.fromiter(
-                lengths[idx].values(), dtype=int)
-        self._dist_matrix = cmap
+        self._dist_matrix = dist_matrix
 
     def distance(self, physical_qubit1, physical_qubit2):
         """Returns the undirected distance between physical_qubit1 and physical_qubit2.
@@ -180,12 +190,21 @@ class CouplingMap:
         Raises:
             CouplingError: When there is no path between physical_qubit1, physical_qubit2.
         """
-        try:
-            return nx.shortest_path(self.graph.to_undirected(as_view=True), source=physical_qubit1,
-                                    target=physical_qubit2)
-        except nx.exception.NetworkXNoPath:
-            raise CouplingError(
-                "Nodes %s and %s are not connected" % (str(physical_qubit1), str(physical_qubit2)))
+        if physical_qubit1 not in self.physical_qubits:
+            raise CouplingError("%s not in coupling graph" % (physical_qubit1,))
+        if physical_qubit2 not in self.physical_qubits:
+            raise CouplingError("%s not in coupling graph" % (physical_qubit2,))
+        if self._next_hop is None:
+            _, self._next_hop = _undirected_path_tables(*self._fingerprint())
+        next_hop = self._next_hop[:, physical_qubit2]
+        path = [physical_qubit1]
+        while path[-1] != physical_qubit2:
+            hop = next_hop[path[-1]]
+            if hop < 0:
+                raise CouplingError("Nodes %s and %s are not connected" %
+                                    (str(physical_qubit1), str(physical_qubit2)))
+            path.append(int(hop))
+        return path
 
     @property
     def is_symmetric(self):
@@ -255,3 +274,35 @@ class CouplingMap:
             string += ", ".join(["[%s, %s]" % (src, dst) for (src, dst) in self.get_edges()])
             string += "]"
         return string
+
+
+@lru_cache(maxsize=32)
+def _undirected_path_tables(physical_qubits, edges):
+    """All the shortest undirected paths of a coupling graph.
+
+    The tables are indexed by the labels of the physical qubits, which need not
+    be 0 to n - 1, as in a subgraph: the labels that are not physical qubits
+    are disconnected from all the others.
+
+    Args:
+        physical_qubits (tuple): The sorted physical qubits.
+        edges (tuple): The undirected edges, as pairs of physical qubits.
+
+    Returns:
+        tuple: The distance matrix, with inf between disconnected qubits, and
+            the next hop table: next_hop[i, j] is the qubit after i on a shortest
+            path from i to j, or a negative number if there is no path. Both
+            arrays are read-only, since they are shared between coupling maps.
+    """
+    num_qubits = physical_qubits[-1] + 1 if physical_qubits else 0
+    rows = np.array([edge[0] for edge in edges], dtype=int)
+    cols = np.array([edge[1] for edge in edges], dtype=int)
+    adjacency = sp.coo_matrix((np.ones(len(edges)), (rows, cols)),
+                              shape=(num_qubits, num_qubits)).tocsr()
+    dist, predecessors = cs.shortest_path(adjacency, method='D', directed=False,
+                                          unweighted=True, return_predecessors=True)
+    # The predecessor of i on the path from j to i is the next hop from i to j
+    next_hop = np.ascontiguousarray(predecessors.T)
+    dist.setflags(write=False)
+    next_hop.setflags(write=False)
+    return dist, next_hop
@@ -13,7 +13,7 @@
 # that they have been altered from the originals.
 
 """
-A two-ways dict to represent a layout.
+A two-ways dict to represent a layout, and an array based version for the routing passes.
 
 Layout is the relation between virtual (qu)bits and physical (qu)bits.
 Virtual (qu)bits are tuples, e.g. `(QuantumRegister(3, 'qr'), 2)` or simply `qr[2]`.
@@ -21,6 +21,8 @@ Physical (qu)bits are integers.
 """
 from warnings import warn
 
+import numpy as np
+
 from qiskit.circuit.quantumregister import Qubit
 from qiskit.transpiler.exceptions import LayoutError
 
@@ -337,3 +339,169 @@ class Layout():
             else:
                 raise LayoutError("The list should contain elements of the Bits or NoneTypes")
         return out
+
+
+class ArrayLayout():
+    """A Layout stored in integer arrays, for the hot loops of the routing passes.
+
+    The virtual qubits are numbered by their position in ``virtual_bits``.
+    ``logic_to_phys[i]`` is the physical qubit of the virtual qubit ``i`` and
+    ``phys_to_logic[p]`` is the virtual qubit on the physical qubit ``p``. The
+    physical qubits without a virtual qubit hold idle virtual qubits (``None``
+    in ``virtual_bits``), so the arrays are always a permutation and a swap only
+    updates four entries. The arrays can be handed to compiled code as they are.
+    """
+
+    __slots__ = ('virtual_bits', '_virtual_index', 'logic_to_phys', 'phys_to_logic')
+
+    def __init__(self, virtual_bits, logic_to_phys, phys_to_logic=None):
+        """Create an ArrayLayout.
+
+        Args:
+            virtual_bits (list): The Qubit (or None, for idle) of each virtual index.
+            logic_to_phys (ndarray): The physical qubit of each virtual index.
+            phys_to_logic (ndarray): The virtual index on each physical qubit.
+                Computed from logic_to_phys if not given.
+
+        Raises:
+            LayoutError: if logic_to_phys is not a permutation of the physical qubits.
+        """
+        self.virtual_bits = virtual_bits
+        self._virtual_index = {bit: index for index, bit in enumerate(virtual_bits)
+                               if bit is not None}
+        self.logic_to_phys = np.asarray(logic_to_phys, dtype=np.uint32)
+        if phys_to_logic is None:
+            if len(self.logic_to_phys) != len(virtual_bits) or \
+                    not np.array_equal(np.sort(self.logic_to_phys),
+                                       np.arange(len(virtual_bits))):
+                raise LayoutError('ArrayLayout requires a permutation of the physical qubits.')
+            # The inverse permutation
+            phys_to_logic = np.argsort(self.logic_to_phys)
+        self.phys_to_logic = np.asarray(phys_to_logic, dtype=np.uint32)
+
+    @staticmethod
+    def from_layout(layout, virtual_bits=None, num_physical=None):
+        """Convert a Layout into an ArrayLayout.
+
+        Args:
+            layout (Layout): The layout to convert. Its physical qubits
+                must be integers from 0 to num_physical - 1.
+            virtual_bits (list): The order of the virtual qubits. By default,
+                the order in which they were added to the layout.
+            num_physical (int): The number of physical qubits. By default,
+                one more than the largest physical qubit of the layout.
+
+        Returns:
+            ArrayLayout: A layout with the same map, where the physical qubits
+                without a virtual qubit hold idle virtual qubits.
+
+        Raises:
+            LayoutError: if the virtual_bits do not match the layout.
+        """
+        v2p = layout.get_virtual_bits()
+        if virtual_bits is None:
+            virtual_bits = list(v2p)
+        elif len(virtual_bits) != len(v2p) or any(bit not in v2p for bit in virtual_bits):
+            raise LayoutError('The virtual bits do not match the layout.')
+        if num_physical is None:
+            num_physical = max(layout.get_physical_bits(), default=-1) + 1
+        logic_to_phys = [v2p[bit] for bit in virtual_bits]
+        idle_physical = sorted(set(range(num_physical)) - set(logic_to_phys))
+        virtual_bits = list(virtual_bits) + [None] * len(idle_physical)
+        return ArrayLayout(virtual_bits, logic_to_phys + idle_physical)
+
+    def to_layout(self):
+        """Returns the Layout with the same map, without the idle virtual qubits."""
+        return Layout(self.get_virtual_bits())
+
+    def __repr__(self):
+        """Representation of an ArrayLayout"""
+        return "ArrayLayout(%s)" % self.get_virtual_bits()
+
+    def __getitem__(self, item):
+        item = Layout._cast_tuple_to_bit(item)
+        if isinstance(item, Qubit):
+            if item in self._virtual_index:
+                return self.logic_to_phys.item(self._virtual_index[item])
+        elif isinstance(item, int) and 0 <= item < len(self.phys_to_logic):
+            return self.virtual_bits[self.phys_to_logic[item]]
+        raise KeyError('The item %s does not exist in the Layout' % (item,))
+
+    def __len__(self):
+        return len(self.phys_to_logic)
+
+    def copy(self):
+        """Returns a copy of an ArrayLayout instance."""
+        layout_copy = ArrayLayout.__new__(ArrayLayout)
+        layout_copy.virtual_bits = self.virtual_bits
+        layout_copy._virtual_index = self._virtual_index
+        layout_copy.logic_to_phys = self.logic_to_phys.copy()
+        layout_copy.phys_to_logic = self.phys_to_logic.copy()
+        return layout_copy
+
+    def virtual_index(self, virtual_bit):
+        """Returns the index of virtual_bit in the arrays."""
+        return self._virtual_index[virtual_bit]
+
+    def get_virtual_bits(self):
+        """
+        Returns the dictionary where the keys are virtual (qu)bits and the
+        values are physical (qu)bits.
+        """
+        return {bit: physical for bit, physical
+                in zip(self.virtual_bits, self.logic_to_phys.tolist()) if bit is not None}
+
+    def get_physical_bits(self):
+        """
+        Returns the dictionary where the keys are physical (qu)bits and the
+        values are virtual (qu)bits.
+        """
+        return {physical: self.virtual_bits[index]
+                for physical, index in enumerate(self.phys_to_logic.tolist())}
+
+    def get_registers(self):
+        """
+        Returns the registers in the layout [QuantumRegister(2, 'qr0'), QuantumRegister(3, 'qr1')]
+        Returns:
+            List: A list of Register in the layout
+        """
+        return {bit.register for bit in self._virtual_index}
+
+    def swap(self, left, right):
+        """Swaps the map between left and right.
+        Args:
+            left (Qubit or int): Item to swap with right.
+            right (Qubit or int): Item to swap with left.
+        Raises:
+            LayoutError: If left and right have not the same type.
+        """
+        if type(left) is not type(right):
+            raise LayoutError('The method swap only works with elements of the same type.')
+        if isinstance(left, Qubit):
+            left, right = self[left], self[right]
+        phys_to_logic = self.phys_to_logic
+        logic_left, logic_right = phys_to_logic[left], phys_to_logic[right]
+        phys_to_logic[left], phys_to_logic[right] = logic_right, logic_left
+        self.logic_to_phys[logic_right] = left
+        self.logic_to_phys[logic_left] = right
+
+    def combine_into_edge_map(self, another_layout):
+        """Combines self and another_layout into an "edge map".
+
+        See Layout.combine_into_edge_map.
+
+        Args:
+            another_layout (Layout or ArrayLayout): The other layout to combine.
+        Returns:
+            dict: A "edge map".
+        Raises:
+            LayoutError: another_layout can be bigger than self, but not smaller. Otherwise, raises.
+        """
+        physical_bits = another_layout.get_physical_bits()
+        edge_map = dict()
+        for virtual, physical in self.get_virtual_bits().items():
+            if physical not in physical_bits:
+                raise LayoutError('The wire_map_from_layouts() method does not support when the'
+                                  ' other layout (another_layout) is smaller.')
+            edge_map[virtual] = physical_bits[physical]
+        return edge_map
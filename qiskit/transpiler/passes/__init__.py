@@ -34,6 +34,10 @@ from .commutative_cancellation import CommutativeCancellation
 from .remove_reset_in_zero_state import RemoveResetInZeroState
 from .collect_2q_blocks import Collect2qBlocks
 from .consolidate_blocks import ConsolidateBlocks
+from .template_optimization import TemplateOptimization
+from .worklist_optimization import WorklistOptimization
+from .cx_phase_resynthesis import CXPhaseResynthesis
+from .parallel_time_slices import ParallelTimeSlices
 from .mapping.full_ancilla_allocation import FullAncillaAllocation
 from .mapping.enlarge_with_ancilla import EnlargeWithAncilla
 from .mapping.apply_layout import ApplyLayout
@@ -45,7 +49,11 @@ from .mapping.trivial_layout import TrivialLayout
 from .mapping.set_layout import SetLayout
 from .mapping.dense_layout import DenseLayout
 from .mapping.noise_adaptive_layout import NoiseAdaptiveLayout
+from .mapping.vf2_layout import VF2Layout
 from .mapping.basic_swap import BasicSwap
 from .mapping.lookahead_swap import LookaheadSwap
 from .remove_diagonal_gates_before_measure import RemoveDiagonalGatesBeforeMeasure
 from .mapping.stochastic_swap import StochasticSwap
+from .mapping.sabre_swap import SabreSwap
+from .mapping.sabre_layout import SabreLayout
+from .mapping.swap_network_swap import SwapNetworkSwap
@@ -34,6 +34,11 @@ from qiskit.transpiler.basepasses import AnalysisPass
 class Collect2qBlocks(AnalysisPass):
     """Pass to collect sequences of uninterrupted gates acting on 2 qubits.
     """
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['commutation_set', 'block_list']
+
     def run(self, dag):
         """collect blocks of adjacent gates acting on a pair of "cx" qubits.
 
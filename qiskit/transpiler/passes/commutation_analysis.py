@@ -19,24 +19,55 @@ Property_set['commutation_set'] is a dictionary that describes
 the commutation relations on a given wire, all the gates on a wire
 are grouped into a set of gates that commute.
 
-TODO: the current pass determines commutativity through matrix multiplication.
-A rule-based analysis would be potentially faster, but more limited.
+Two standard gates commute if, on each qubit they share, they are both
+diagonal in the same basis, as given by the table _GATE_BASES. For the other
+pairs, commutativity is determined through matrix multiplication, and the
+result is cached on the names, parameters and relative qubits of the pair.
 """
 
-from collections import defaultdict
+from collections import defaultdict, deque
+import itertools
 import numpy as np
+from qiskit.circuit import Gate, Instruction
 from qiskit.transpiler.exceptions import TranspilerError
 from qiskit.transpiler.basepasses import AnalysisPass
 from qiskit.quantum_info.operators import Operator
 
 _CUTOFF_PRECISION = 1E-10
 
+# For each standard gate, the basis in which it is diagonal on each of its
+# qubits, or None if it is not diagonal in X, Y or Z. The identity ('I') is
+# diagonal in any basis.
+_GATE_BASES = {
+    'id': ('I',),
+    'u1': ('Z',), 'rz': ('Z',), 'z': ('Z',), 's': ('Z',), 'sdg': ('Z',),
+    't': ('Z',), 'tdg': ('Z',),
+    'x': ('X',), 'rx': ('X',),
+    'y': ('Y',), 'ry': ('Y',),
+    'cx': ('Z', 'X'), 'cy': ('Z', 'Y'), 'cz': ('Z', 'Z'), 'ch': ('Z', None),
+    'cu1': ('Z', 'Z'), 'crz': ('Z', 'Z'), 'cu3': ('Z', None), 'rzz': ('Z', 'Z'),
+    'ccx': ('Z', 'Z', 'X'), 'cswap': ('Z', None, None),
+}
+
+# The number of gate pairs whose commutation is kept by _commute
+MAX_COMMUTATION_CACHE_SIZE = 10 ** 5
+
+_COMMUTATION_CACHE = {}
+
 
 class CommutationAnalysis(AnalysisPass):
-    """An analysis pass to find commutation relations between DAG nodes."""
+    """An analysis pass to find commutation relations between DAG nodes.
+
+    When the property set has an `optimization_region`, as in a
+    `WorklistOptimization` loop, only the commutation sets of the nodes of the
+    region are found, with the commutation sets of the other gates in them
+    on their other wires, by going along the wires from the nodes.
+    """
 
     def __init__(self):
         super().__init__()
+        self.reads = ['optimization_region']
+        self.writes = ['commutation_set']
         self.gates_on_wire = {}
 
     def run(self, dag):
@@ -47,6 +78,11 @@ class CommutationAnalysis(AnalysisPass):
         # Initiate the commutation set
         self.property_set['commutation_set'] = defaultdict(list)
 
+        region = self.property_set['optimization_region']
+        if region is not None:
+            self._run_on_region(dag, region)
+            return
+
         # Build a dictionary to keep track of the gates on each qubit
         # The key with format (wire_name) will store the lists of commutation sets
         # The key with format (node, wire_name) will store the index of the commutation set
@@ -91,6 +127,60 @@ class CommutationAnalysis(AnalysisPass):
                 temp_len = len(current_comm_set)
                 self.property_set['commutation_set'][(current_gate, wire_name)] = temp_len - 1
 
+    def _run_on_region(self, dag, region):
+        """Find the commutation sets of the nodes of region, and of the gates in them.
+
+        The commutation sets of a wire are only those found, in no particular
+        order, and the nodes outside of them have no commutation set index.
+        """
+        commutation_set = self.property_set['commutation_set']
+        stack = [(node, wire) for node in region for wire in _node_wires(node)]
+        while stack:
+            node, wire = stack.pop()
+            wire_name = "{0}[{1}]".format(str(wire.register.name), str(wire.index))
+            if (node, wire_name) in commutation_set:
+                continue
+            current_comm_set = _commutation_set_on_wire(dag, node, wire)
+            commutation_set[wire_name].append(current_comm_set)
+            for gate in current_comm_set:
+                commutation_set[(gate, wire_name)] = len(commutation_set[wire_name]) - 1
+                stack.extend((gate, other_wire) for other_wire in _node_wires(gate)
+                             if other_wire != wire)
+
+
+def _commutation_set_on_wire(dag, node, wire):
+    """The commutation set of an op node on one of its wires, as found by going along the wire.
+
+    As in CommutationAnalysis.run, a gate is in the commutation set of the
+    gate before it on the wire if the two commute.
+    """
+    def commute(node1, node2):
+        try:
+            return _commute(node1, node2)
+        except TranspilerError:
+            return False
+
+    gates = deque([node])
+    while True:
+        pred = dag.wire_neighbors(gates[0])[0][wire]
+        if not commute(gates[0], pred):
+            break
+        gates.appendleft(pred)
+    while True:
+        succ = dag.wire_neighbors(gates[-1])[1][wire]
+        if not commute(succ, gates[-1]):
+            break
+        gates.append(succ)
+    return list(gates)
+
+
+def _node_wires(node):
+    """The wires of an op node, with the bits of its condition."""
+    wires = list(itertools.chain(node.qargs, node.cargs))
+    if node.condition is not None:
+        wires.extend(node.condition[0])
+    return wires
+
 
 def _commute(node1, node2):
 
@@ -104,17 +194,72 @@ def _commute(node1, node2):
     if node1.condition or node2.condition:
         return False
 
-    qarg = list(set(node1.qargs + node2.qargs))
-    qbit_num = len(qarg)
+    qarg = list(node1.qargs)
+    qarg.extend(q for q in node2.qargs if q not in node1.qargs)
 
     qarg1 = [qarg.index(q) for q in node1.qargs]
     qarg2 = [qarg.index(q) for q in node2.qargs]
 
-    id_op = Operator(np.eye(2 ** qbit_num))
+    if _commute_by_rules(node1.name, qarg1, node2.name, qarg2):
+        return True
 
-    op12 = id_op.compose(node1.op, qargs=qarg1).compose(node2.op, qargs=qarg2)
-    op21 = id_op.compose(node2.op, qargs=qarg2).compose(node1.op, qargs=qarg1)
+    key = _cache_key(node1.op, qarg1, node2.op, qarg2)
+    if key is None:
+        return _commute_by_matrices(node1.op, qarg1, node2.op, qarg2, len(qarg))
 
-    if_commute = (op12 == op21)
+    if_commute = _COMMUTATION_CACHE.get(key)
+    if if_commute is None:
+        if_commute = _commute_by_matrices(node1.op, qarg1, node2.op, qarg2, len(qarg))
+        if len(_COMMUTATION_CACHE) >= MAX_COMMUTATION_CACHE_SIZE:
+            _COMMUTATION_CACHE.clear()
+        _COMMUTATION_CACHE[key] = if_commute
 
     return if_commute
+
+
+def _commute_by_rules(name1, qarg1, name2, qarg2):
+    """Whether two standard gates are diagonal in the same basis on each shared qubit.
+
+    Returns False when it is not known, rather than when they do not commute.
+    """
+    bases1 = _GATE_BASES.get(name1)
+    bases2 = _GATE_BASES.get(name2)
+    if bases1 is None or bases2 is None:
+        return False
+
+    for basis1, index in zip(bases1, qarg1):
+        if index not in qarg2:
+            continue
+        basis2 = bases2[qarg2.index(index)]
+        if basis1 == 'I' or basis2 == 'I':
+            continue
+        if basis1 is None or basis1 != basis2:
+            return False
+    return True
+
+
+def _cache_key(op1, qarg1, op2, qarg2):
+    """The key of a pair of gates in _COMMUTATION_CACHE, or None if it is not cacheable.
+
+    The gates that are not of a specific class, such as those built from a
+    circuit, may have the same name and parameters and different matrices, and
+    are not cached, and neither are the gates with unhashable parameters.
+    """
+    if op1.__class__ in (Gate, Instruction) or op2.__class__ in (Gate, Instruction):
+        return None
+    key = (type(op1), tuple(op1.params), tuple(qarg1),
+           type(op2), tuple(op2.params), tuple(qarg2))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _commute_by_matrices(op1, qarg1, op2, qarg2, qbit_num):
+    id_op = Operator(np.eye(2 ** qbit_num))
+
+    op12 = id_op.compose(op1, qargs=qarg1).compose(op2, qargs=qarg2)
+    op21 = id_op.compose(op2, qargs=qarg2).compose(op1, qargs=qarg1)
+
+    return op12 == op21
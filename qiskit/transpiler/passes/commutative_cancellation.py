@@ -34,6 +34,10 @@ class CommutativeCancellation(TransformationPass):
     """
     Transformation pass that cancels the redundant
     (self-adjoint) gates through commutation relations
+
+    When the property set has an `optimization_region`, as in a
+    `WorklistOptimization` loop, only the gates on the wires where
+    `CommutationAnalysis` found the commutation relations are cancelled.
     """
 
     def __init__(self):
@@ -67,9 +71,12 @@ class CommutativeCancellation(TransformationPass):
         #    sec_commutation_set_id), the value is the list gates that share the same gate type,
         #    qubits and commutation sets.
 
+        commutation_set = self.property_set['commutation_set']
         for wire in dag.wires:
             wire_name = "{0}[{1}]".format(str(wire.register.name), str(wire.index))
-            wire_commutation_set = self.property_set['commutation_set'][wire_name]
+            if wire_name not in commutation_set:
+                continue
+            wire_commutation_set = commutation_set[wire_name]
 
             for com_set_idx, com_set in enumerate(wire_commutation_set):
                 if com_set[0].type in ['in', 'out']:
@@ -87,8 +94,10 @@ class CommutativeCancellation(TransformationPass):
                     elif num_qargs == 2 and node.qargs[0] == wire:
                         second_op_name = "{0}[{1}]".format(str(node.qargs[1].register.name),
                                                            str(node.qargs[1].index))
+                        if (node, second_op_name) not in commutation_set:
+                            continue
                         q2_key = (node.name, wire_name, second_op_name, com_set_idx,
-                                  self.property_set['commutation_set'][(node, second_op_name)])
+                                  commutation_set[(node, second_op_name)])
                         cancellation_sets[q2_key].append(node)
 
         for cancel_set_key in cancellation_sets:
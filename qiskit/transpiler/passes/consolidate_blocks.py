@@ -19,13 +19,28 @@ Replace each block of consecutive gates by a single Unitary node.
 The blocks are collected by a previous pass, such as Collect2qBlocks.
 """
 
-from qiskit.circuit import QuantumRegister, QuantumCircuit, Qubit
+from collections import OrderedDict
+
+import numpy as np
+
+from qiskit.circuit import Gate, Instruction, Qubit
 from qiskit.dagcircuit import DAGCircuit
+from qiskit.exceptions import QiskitError
 from qiskit.quantum_info.operators import Operator
 from qiskit.quantum_info.synthesis import TwoQubitBasisDecomposer
 from qiskit.extensions import UnitaryGate, CnotGate
 from qiskit.transpiler.basepasses import TransformationPass
 
+# The number of blocks whose number of basis gates is kept by ConsolidateBlocks
+MAX_NUM_BASIS_GATES_CACHE_SIZE = 10 ** 4
+
+_NUM_BASIS_GATES_CACHE = {}
+
+# The number of decomposers, by basis gate and basis fidelity, kept by ConsolidateBlocks
+MAX_DECOMPOSERS_CACHE_SIZE = 10 ** 3
+
+_DECOMPOSERS_CACHE = {}
+
 
 class ConsolidateBlocks(TransformationPass):
     """
@@ -34,16 +49,29 @@ class ConsolidateBlocks(TransformationPass):
     to a potentially more optimal subcircuit.
     Important note: this pass assumes that the 'blocks_list' property that
     it reads is given such that blocks are in topological order.
+
+    With backend properties, the two-qubit blocks on a pair of qubits are
+    decomposed with the fidelity of the basis gate on that pair, into the
+    number of basis gates with the highest expected fidelity, which may be
+    fewer than an exact synthesis needs. Those blocks are then replaced by the
+    unitaries of their approximate decompositions.
     """
-    def __init__(self, kak_basis_gate=CnotGate(), force_consolidate=False):
+    def __init__(self, kak_basis_gate=CnotGate(), force_consolidate=False,
+                 backend_properties=None):
         """
         Args:
             kak_basis_gate (Gate): Basis gate for KAK decomposition.
             force_consolidate (bool): Force block consolidation
+            backend_properties (BackendProperties): If given, the gate error of the
+                basis gate on each pair of qubits sets the basis fidelity of the blocks
+                on them. The qubits of the dag must then be physical qubits.
         """
         super().__init__()
         self.force_consolidate = force_consolidate
-        self.decomposer = TwoQubitBasisDecomposer(kak_basis_gate)
+        self.decomposer = _decomposer(kak_basis_gate, 1.0)
+        self.basis_fidelities = {}
+        if backend_properties is not None:
+            self.basis_fidelities = _basis_fidelities(backend_properties, kak_basis_gate.name)
 
     def run(self, dag):
         """iterate over each block and replace it with an equivalent Unitary
@@ -64,59 +92,131 @@ class ConsolidateBlocks(TransformationPass):
             global_index_map[wire] = global_qregs.index(wire.register) + wire.index
 
         blocks = self.property_set['block_list']
+        # the index of the block of each node in a block
+        block_indices = {nd: index for index, block in enumerate(blocks) for nd in block}
+        next_block = 0
         nodes_seen = set()
 
-        basis_gate_name = self.decomposer.gate.name
+        # the qubits of each block, their positions, and the decomposer of the block
+        blocks_qargs = []
+        block_index_maps = []
+        decomposers = []
+        for block in blocks:
+            block_qargs = set()
+            for nd in block:
+                block_qargs |= set(nd.qargs)
+            blocks_qargs.append(block_qargs)
+            block_index_maps.append(self._block_qargs_to_indices(block_qargs,
+                                                                 global_index_map))
+            basis_fidelity = self.basis_fidelities.get(
+                frozenset(global_index_map[qubit] for qubit in block_qargs), 1.0)
+            decomposers.append(_decomposer(self.decomposer.gate, basis_fidelity))
+        consolidate, unitaries = self._consolidate_blocks(blocks, block_index_maps, decomposers)
 
         for node in dag.topological_op_nodes():
             # skip already-visited nodes or input/output nodes
             if node in nodes_seen or node.type == 'in' or node.type == 'out':
                 continue
+            block_index = block_indices.get(node)
             # check if the node belongs to the next block
-            if blocks and node in blocks[0]:
-                block = blocks[0]
-                # find the qubits involved in this block
-                block_qargs = set()
-                for nd in block:
-                    block_qargs |= set(nd.qargs)
-                # convert block to a sub-circuit, then simulate unitary and add
-                block_width = len(block_qargs)
-                q = QuantumRegister(block_width)
-                subcirc = QuantumCircuit(q)
-                block_index_map = self._block_qargs_to_indices(block_qargs,
-                                                               global_index_map)
-                basis_count = 0
-                for nd in block:
-                    if nd.op.name == basis_gate_name:
-                        basis_count += 1
-                    nodes_seen.add(nd)
-                    subcirc.append(nd.op, [q[block_index_map[i]] for i in nd.qargs])
-                unitary = UnitaryGate(Operator(subcirc))  # simulates the circuit
-                if self.force_consolidate or unitary.num_qubits > 2 or \
-                        self.decomposer.num_basis_gates(unitary) != basis_count:
-
+            if block_index == next_block:
+                block = blocks[block_index]
+                next_block += 1
+                nodes_seen.update(block)
+                block_index_map = block_index_maps[block_index]
+                if consolidate[block_index]:
+                    unitary = unitaries.get(block_index)
+                    if unitary is None:
+                        unitary = _block_unitary(block, block_index_map)
+                    decomposer = decomposers[block_index]
+                    if len(block_index_map) == 2 and decomposer.basis_fidelity < 1:
+                        # the block is replaced by the unitary of its approximate
+                        # decomposition, which is also its definition
+                        approximation = decomposer(unitary)
+                        gate = UnitaryGate(Operator(approximation).data)
+                        gate.definition = approximation
+                    else:
+                        gate = UnitaryGate(unitary)
                     new_dag.apply_operation_back(
-                        unitary, sorted(block_qargs, key=lambda x: block_index_map[x]))
+                        gate, sorted(blocks_qargs[block_index], key=lambda x: block_index_map[x]))
                 else:
                     for nd in block:
-                        nodes_seen.add(nd)
                         new_dag.apply_operation_back(nd.op, nd.qargs, nd.cargs)
-
-                del blocks[0]
-            else:
-                # the node could belong to some future block, but in that case
-                # we simply skip it. It is guaranteed that we will revisit that
-                # future block, via its other nodes
-                for block in blocks[1:]:
-                    if node in block:
-                        break
+            # the node could belong to some future block, but in that case
+            # we simply skip it. It is guaranteed that we will revisit that
+            # future block, via its other nodes
+            elif block_index is None:
                 # freestanding nodes can just be added
-                else:
-                    nodes_seen.add(node)
-                    new_dag.apply_operation_back(node.op, node.qargs, node.cargs)
+                nodes_seen.add(node)
+                new_dag.apply_operation_back(node.op, node.qargs, node.cargs)
 
         return new_dag
 
+    def _consolidate_blocks(self, blocks, block_index_maps, decomposers):
+        """Whether each block should be replaced by its unitary.
+
+        It is, unless it already has the number of basis gates of its unitary.
+        This is known without the unitary when the block has no gate on two
+        qubits other than at most one basis gate, and otherwise the number of
+        basis gates of the unitary of the same gates is cached. The unitaries
+        whose number of basis gates is not cached are decomposed together, for
+        each decomposer.
+
+        Returns:
+            tuple(list(bool), dict): whether to consolidate each block, and the
+                unitaries computed to decide it, by block index.
+        """
+        basis_gate_name = self.decomposer.gate.name
+        consolidate = []
+        basis_counts = {}
+        # the indices of the blocks to count, by cache key, or by block index
+        # for the blocks that are not cacheable
+        to_count = OrderedDict()
+        for index, (block, block_index_map) in enumerate(zip(blocks, block_index_maps)):
+            consolidate.append(True)
+            if self.force_consolidate or len(block_index_map) > 2:
+                continue
+            basis_count = sum(1 for nd in block if nd.op.name == basis_gate_name)
+            if basis_count > 3:
+                continue
+            if basis_count <= 1 and all(len(nd.qargs) == 1 or nd.op.name == basis_gate_name
+                                        for nd in block):
+                consolidate[index] = False
+                continue
+            basis_counts[index] = basis_count
+            key = _block_key(block, block_index_map)
+            if key is None:
+                to_count[index] = [index]
+                continue
+            decomposer = decomposers[index]
+            key = (basis_gate_name, tuple(decomposer.gate.params),
+                   decomposer.basis_fidelity, key)
+            num_basis_gates = _NUM_BASIS_GATES_CACHE.get(key)
+            if num_basis_gates is None:
+                to_count.setdefault(key, []).append(index)
+            else:
+                consolidate[index] = num_basis_gates != basis_count
+
+        unitaries = {}
+        if len(_NUM_BASIS_GATES_CACHE) + len(to_count) > MAX_NUM_BASIS_GATES_CACHE_SIZE:
+            _NUM_BASIS_GATES_CACHE.clear()
+        # the keys to count, by decomposer
+        decomposer_keys = OrderedDict()
+        for key, indices in to_count.items():
+            unitary = _block_unitary(blocks[indices[0]], block_index_maps[indices[0]])
+            for index in indices:
+                unitaries[index] = unitary
+            decomposer_keys.setdefault(decomposers[indices[0]], []).append(key)
+        for decomposer, keys in decomposer_keys.items():
+            all_num_basis_gates = decomposer.num_basis_gates(
+                np.array([unitaries[to_count[key][0]] for key in keys]))
+            for key, num_basis_gates in zip(keys, all_num_basis_gates):
+                if isinstance(key, tuple):
+                    _NUM_BASIS_GATES_CACHE[key] = num_basis_gates
+                for index in to_count[key]:
+                    consolidate[index] = num_basis_gates != basis_counts[index]
+        return consolidate, unitaries
+
     def _block_qargs_to_indices(self, block_qargs, global_index_map):
         """
         Map each qubit in block_qargs to its wire position among the block's wires.
@@ -132,3 +232,90 @@ class ConsolidateBlocks(TransformationPass):
         block_positions = {q: ordered_block_indices.index(global_index_map[q])
                            for q in block_qargs}
         return block_positions
+
+
+def _decomposer(gate, basis_fidelity):
+    """The decomposer on a basis gate with a basis fidelity, kept in _DECOMPOSERS_CACHE."""
+    key = (gate.name, tuple(gate.params), basis_fidelity)
+    decomposer = _DECOMPOSERS_CACHE.get(key)
+    if decomposer is None:
+        if len(_DECOMPOSERS_CACHE) >= MAX_DECOMPOSERS_CACHE_SIZE:
+            _DECOMPOSERS_CACHE.clear()
+        decomposer = TwoQubitBasisDecomposer(gate, basis_fidelity)
+        _DECOMPOSERS_CACHE[key] = decomposer
+    return decomposer
+
+
+def _basis_fidelities(backend_properties, gate_name):
+    """The fidelity of a basis gate on each pair of qubits, from its gate error.
+
+    Returns:
+        dict: the fidelities, by frozenset of the two qubits. When the gate error
+            is given in both directions, the lower one is used.
+    """
+    fidelities = {}
+    for gate in backend_properties.gates:
+        if gate.gate != gate_name or len(gate.qubits) != 2:
+            continue
+        for param in gate.parameters:
+            if param.name == 'gate_error':
+                pair = frozenset(gate.qubits)
+                fidelities[pair] = max(fidelities.get(pair, 0), 1 - param.value)
+    return fidelities
+
+
+def _block_unitary(block, block_index_map):
+    """The unitary of the gates of a block, multiplied with einsum.
+
+    Args:
+        block (list(DAGNode)): the gates of the block, in topological order.
+        block_index_map (dict): the position of each qubit of the block.
+
+    Returns:
+        ndarray: the unitary, with the qubits ordered by their positions.
+    """
+    width = len(block_index_map)
+    dim = 2 ** width
+    # The rows of the unitary, as a tensor with an axis per qubit, the first
+    # one for the last qubit, and an axis for the columns.
+    tensor = np.eye(dim, dtype=complex).reshape((2,) * width + (dim,))
+    for nd in block:
+        num_qubits = len(nd.qargs)
+        matrix = np.reshape(_gate_matrix(nd.op), (2,) * (2 * num_qubits))
+        axes = [width - 1 - block_index_map[qubit] for qubit in nd.qargs]
+        indices_tensor = list(range(width + 1))
+        for position, axis in enumerate(axes):
+            indices_tensor[axis] = width + 1 + position
+        indices_matrix = list(reversed(axes)) + \
+            list(reversed(range(width + 1, width + 1 + num_qubits)))
+        tensor = np.einsum(matrix, indices_matrix, tensor, indices_tensor,
+                           list(range(width + 1)))
+    return tensor.reshape(dim, dim)
+
+
+def _gate_matrix(op):
+    """The matrix of a gate, from its definition if it has no to_matrix."""
+    try:
+        return op.to_matrix()
+    except (AttributeError, QiskitError):
+        return Operator(op).data
+
+
+def _block_key(block, block_index_map):
+    """The key of a block in _NUM_BASIS_GATES_CACHE, or None if it is not cacheable.
+
+    As in CommutationAnalysis, the gates that are not of a specific class, and
+    those with unhashable parameters, are not cached.
+    """
+    key = []
+    for nd in block:
+        if nd.op.__class__ in (Gate, Instruction):
+            return None
+        key.append((type(nd.op), tuple(nd.op.params),
+                    tuple(block_index_map[qubit] for qubit in nd.qargs)))
+    key = tuple(key)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
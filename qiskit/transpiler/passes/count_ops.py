@@ -21,5 +21,10 @@ class CountOps(AnalysisPass):
     """ An analysis pass for counting operations in a DAG circuit.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['count_ops']
+
     def run(self, dag):
         self.property_set['count_ops'] = dag.count_ops()
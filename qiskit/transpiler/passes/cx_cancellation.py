@@ -18,7 +18,12 @@ from qiskit.transpiler.basepasses import TransformationPass
 
 
 class CXCancellation(TransformationPass):
-    """Cancel back-to-back 'cx' gates in dag."""
+    """Cancel back-to-back 'cx' gates in dag.
+
+    When the property set has an `optimization_region`, as in a
+    `WorklistOptimization` loop, only the runs with a node of the region are
+    cancelled.
+    """
 
     def run(self, dag):
         """
@@ -29,7 +34,7 @@ class CXCancellation(TransformationPass):
         Returns:
             DAGCircuit: Transformed DAG.
         """
-        cx_runs = dag.collect_runs(["cx"])
+        cx_runs = dag.collect_runs(["cx"], self.property_set['optimization_region'])
         for cx_run in cx_runs:
             # Partition the cx_run into chunks with equal gate arguments
             partition = []
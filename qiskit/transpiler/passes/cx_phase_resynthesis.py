@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Resynthesis of the blocks of CX and diagonal phase gates with fewer CX gates.
+
+Such a block maps each basis state |x> to exp(i f(x)) |A x>, where A is a
+linear reversible transformation over GF(2) and f a sum of angles times
+parities of the bits of x. It is resynthesized with the GraySynth algorithm
+for the phases, followed by the Patel-Markov-Hayes algorithm for what remains
+of A.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from qiskit.circuit import QuantumCircuit
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.synthesis.gf2_matrix import GF2Matrix
+from qiskit.transpiler.synthesis.graysynth import cnot_synth, _phase_network
+
+_CUTOFF_PRECISION = 1E-10
+
+# The phase-shift gates, with their angle
+_PHASE_GATES = {'t': np.pi / 4, 'tdg': -np.pi / 4, 's': np.pi / 2, 'sdg': -np.pi / 2,
+                'z': np.pi, 'u1': None, 'rz': None}
+
+# The angles that GraySynth can apply with a named gate
+_NAMED_ANGLES = [(np.pi / 4, 't'), (np.pi / 2, 's'), (np.pi, 'z'),
+                 (3 * np.pi / 2, 'sdg'), (7 * np.pi / 4, 'tdg')]
+
+
+class CXPhaseResynthesis(TransformationPass):
+    """
+    Resynthesize the blocks of CX and phase-shift gates (t, tdg, s, sdg, z, u1,
+    rz) of a circuit, and replace those for which fewer CX gates are needed.
+
+    The blocks are collected in a single sweep over the dag. The parity of
+    the inputs held by each qubit of a block is kept as the bits of an integer,
+    and the phases of the same parity are merged before the resynthesis.
+    Replacing rz gates with u1 gates changes the global phase.
+    """
+
+    def __init__(self, coupling_map=None, section_size=2):
+        """
+        Args:
+            coupling_map (CouplingMap): if given, a block is only replaced when
+                the new CX gates are on edges of the coupling map, in either
+                direction. The qubits of the dag must then be physical qubits.
+            section_size (int): the section size of the Patel-Markov-Hayes
+                algorithm.
+        """
+        super().__init__()
+        self.coupling_map = coupling_map
+        self.section_size = section_size
+
+    def run(self, dag):
+        """Run the CXPhaseResynthesis pass on a dag.
+
+        Args:
+            dag (DAGCircuit): the DAG to be optimized.
+
+        Returns:
+            DAGCircuit: the optimized DAG.
+        """
+        edges = None
+        if self.coupling_map is not None:
+            edges = {frozenset(edge) for edge in self.coupling_map.get_edges()}
+
+        for block in _collect_blocks(dag):
+            for nodes in _split_block(block):
+                instructions = self._resynthesize(nodes, edges)
+                if instructions is not None:
+                    dag.substitute_block(nodes, instructions)
+        return dag
+
+    def _resynthesize(self, nodes, edges):
+        """The operations replacing a block, or None if they would not have fewer CX gates."""
+        num_cx = sum(1 for node in nodes if node.name == 'cx')
+        if num_cx < 2:
+            return None
+
+        qubits = []
+        index = {}
+        # the parity of the inputs on each qubit, as the bits of an integer
+        state = []
+        phases = {}
+        for node in nodes:
+            for qubit in node.qargs:
+                if qubit not in index:
+                    index[qubit] = len(qubits)
+                    qubits.append(qubit)
+                    state.append(1 << index[qubit])
+            if node.name == 'cx':
+                state[index[node.qargs[1]]] ^= state[index[node.qargs[0]]]
+            else:
+                parity = state[index[node.qargs[0]]]
+                phases[parity] = phases.get(parity, 0) + _phase_angle(node)
+
+        num_qubits = len(qubits)
+        parities = []
+        angles = []
+        for parity, angle in phases.items():
+            angle %= 2 * np.pi
+            if min(angle, 2 * np.pi - angle) < _CUTOFF_PRECISION:
+                continue
+            parities.append(parity)
+            angles.append(next((name for named_angle, name in _NAMED_ANGLES
+                                if abs(angle - named_angle) < _CUTOFF_PRECISION), angle))
+
+        linear = GF2Matrix([[(row >> col) & 1 for col in range(num_qubits)] for row in state])
+        if parities:
+            cnots = [[(parity >> row) & 1 for parity in parities] for row in range(num_qubits)]
+            circuit, network_state = _phase_network(cnots, angles)
+            linear = linear.dot(network_state.inverse())
+        else:
+            circuit = QuantumCircuit(num_qubits)
+        circuit += cnot_synth(linear, self.section_size)
+
+        new_cx = [qargs for op, qargs, _ in circuit.data if op.name == 'cx']
+        if len(new_cx) >= num_cx:
+            return None
+        if edges is not None and any(
+                frozenset(qubits[qarg.index].index for qarg in qargs) not in edges
+                for qargs in new_cx):
+            return None
+        return [(op, [qubits[qarg.index] for qarg in qargs], [])
+                for op, qargs, _ in circuit.data]
+
+
+def _phase_angle(node):
+    """The angle of a phase-shift gate."""
+    angle = _PHASE_GATES[node.name]
+    if angle is None:
+        angle = float(node.op.params[0])
+    return angle
+
+
+def _is_block_gate(node):
+    """Whether an op node can be in a block of CX and phase-shift gates."""
+    if node.condition is not None or node.cargs:
+        return False
+    if node.name == 'cx':
+        return True
+    if node.name not in _PHASE_GATES:
+        return False
+    try:
+        _phase_angle(node)
+    except TypeError:
+        return False
+    return True
+
+
+def _collect_blocks(dag):
+    """The blocks of CX and phase-shift gates of a dag, each in topological order.
+
+    The op nodes are taken in a topological order where, each time, all the
+    other gates that can come next are taken first, then as many block gates
+    as possible. The gates of each block follow each other in this order, so
+    that no path between two of them goes through a gate outside of it.
+    """
+    in_degree = {}
+    ready = {True: deque(), False: deque()}
+    for node in dag.op_nodes():
+        in_degree[node] = sum(1 for pred in dag.predecessors(node) if pred.type == 'op')
+        if not in_degree[node]:
+            ready[_is_block_gate(node)].append(node)
+
+    def release(node):
+        for succ in dag.successors(node):
+            if succ.type != 'op':
+                continue
+            in_degree[succ] -= 1
+            if not in_degree[succ]:
+                ready[_is_block_gate(succ)].append(succ)
+
+    blocks = []
+    while ready[True] or ready[False]:
+        while ready[False]:
+            release(ready[False].popleft())
+        block = []
+        while ready[True]:
+            node = ready[True].popleft()
+            block.append(node)
+            release(node)
+        if block:
+            blocks.append(block)
+    return blocks
+
+
+def _split_block(block):
+    """The parts of a block on disjoint sets of qubits, each in the order of the block."""
+    parent = {}
+
+    def find(qubit):
+        while parent.setdefault(qubit, qubit) != qubit:
+            parent[qubit] = parent[parent[qubit]]
+            qubit = parent[qubit]
+        return qubit
+
+    for node in block:
+        for qubit in node.qargs[1:]:
+            parent[find(qubit)] = find(node.qargs[0])
+
+    parts = {}
+    for node in block:
+        parts.setdefault(find(node.qargs[0]), []).append(node)
+    return list(parts.values())
@@ -24,6 +24,12 @@ class DAGFixedPoint(AnalysisPass):
         in property_set['dag_fixed_point'] as a boolean.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reusable = False  # compares against the DAG seen in the previous run
+        self.reads = ['_dag_fixed_point_previous_dag']
+        self.writes = ['dag_fixed_point', '_dag_fixed_point_previous_dag']
+
     def run(self, dag):
         if self.property_set['_dag_fixed_point_previous_dag'] is None:
             self.property_set['dag_fixed_point'] = False
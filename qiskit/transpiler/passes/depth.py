@@ -21,5 +21,10 @@ class Depth(AnalysisPass):
     """ An analysis pass for calculating the depth of a DAG circuit.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['depth']
+
     def run(self, dag):
         self.property_set['depth'] = dag.depth()
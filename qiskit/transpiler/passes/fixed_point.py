@@ -31,6 +31,10 @@ class FixedPoint(AnalysisPass):
         """
         super().__init__()
         self._property = property_to_check
+        self.reusable = False  # compares against the value seen in the previous run
+        self.reads = [property_to_check, '_fixed_point_previous_%s' % property_to_check]
+        self.writes = ['%s_fixed_point' % property_to_check,
+                       '_fixed_point_previous_%s' % property_to_check]
 
     def run(self, dag):
         current_value = self.property_set[self._property]
@@ -36,6 +36,8 @@ class CheckCXDirection(AnalysisPass):
             coupling_map (CouplingMap): Directed graph representing a coupling map.
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['is_direction_mapped']
         self.coupling_map = coupling_map
 
     def run(self, dag):
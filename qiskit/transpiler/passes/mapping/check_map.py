@@ -33,6 +33,8 @@ class CheckMap(AnalysisPass):
             coupling_map (CouplingMap): Directed graph representing a coupling map.
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['is_swap_mapped']
         self.coupling_map = coupling_map
 
     def run(self, dag):
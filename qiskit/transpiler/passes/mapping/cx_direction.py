@@ -58,6 +58,9 @@ class CXDirection(TransformationPass):
             TranspilerError: If the circuit cannot be mapped just by flipping the
                 cx nodes.
         """
+        if not self._needs_flip(dag):
+            return dag
+
         new_dag = DAGCircuit()
 
         for layer in dag.serial_layers():
@@ -94,3 +97,13 @@ class CXDirection(TransformationPass):
             new_dag.extend_back(subdag)
 
         return new_dag
+
+    def _needs_flip(self, dag):
+        """Whether any cx node in the dag goes against the coupling map direction."""
+        edges = set(self.coupling_map.get_edges())
+        for cnot_node in dag.named_nodes('cx', 'CX'):
+            physical_q0 = cnot_node.qargs[0].index
+            physical_q1 = cnot_node.qargs[1].index
+            if (physical_q0, physical_q1) not in edges:
+                return True
+        return False
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+#!python
+#cython: language_level = 3
+#distutils: language = c++
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+cimport cython
+import numpy as np
+from libcpp.vector cimport vector
+
+# Kinds of gates, see LookaheadSearch
+cpdef enum GateKind:
+    GATE_SKIP = 0
+    GATE_FREE = 1
+    GATE_TWO_QUBIT = 2
+
+
+cdef inline void swap(unsigned int * logic_to_phys, unsigned int * phys_to_logic,
+                      unsigned int idx1, unsigned int idx2):
+    """ Swaps two physical qubits in a layout.
+    """
+    cdef unsigned int temp1, temp2
+    temp1 = phys_to_logic[idx1]
+    temp2 = phys_to_logic[idx2]
+    phys_to_logic[idx1] = temp2
+    phys_to_logic[idx2] = temp1
+    logic_to_phys[phys_to_logic[idx1]] = idx1
+    logic_to_phys[phys_to_logic[idx2]] = idx2
+
+
+cdef class LookaheadSearch:
+    """ The best first search of the lookahead swap mapper, on integer arrays.
+
+    The gates are numbered by their position in the serial layers of the
+    circuit. The kind of a gate tells how it is mapped:
+
+        GATE_SKIP: gates without qubits, which are dropped.
+        GATE_FREE: gates that can be executed on any layout, once their
+            qubits are not blocked by an earlier gate.
+        GATE_TWO_QUBIT: two-qubit gates, that need their qubits to be
+            coupled.
+
+    The result of the search is a list of events: the index of a gate
+    when it is mapped, or -(i + 1) when a swap on the edge i is added.
+    """
+    cdef int[::1] gate_kinds
+    cdef int[::1] gate_offsets
+    cdef int[::1] gate_qubits
+    cdef int[::1] gate_is_2q
+    cdef const double[:, ::1] dist
+    cdef int[::1] edges
+    cdef unsigned int num_virtual
+    cdef unsigned int max_gates
+
+    def __cinit__(self, int[::1] gate_kinds not None, int[::1] gate_offsets not None,
+                  int[::1] gate_qubits not None, int[::1] gate_is_2q not None,
+                  const double[:, ::1] dist not None, int[::1] edges not None,
+                  unsigned int num_virtual, unsigned int max_gates):
+        """ Init object.
+
+        Args:
+            gate_kinds (ndarray): The kind of each gate.
+            gate_offsets (ndarray): The qubits of the gate i are
+                gate_qubits[gate_offsets[i]:gate_offsets[i+1]].
+            gate_qubits (ndarray): The virtual qubits of the gates.
+            gate_is_2q (ndarray): 1 for the gates with two qubits, else 0.
+            dist (ndarray): The distance matrix of the coupling map.
+            edges (ndarray): Int array of edges in coupling map.
+            num_virtual (int): The number of virtual qubits.
+            max_gates (int): The number of upcoming gates in the distance
+                used to rank the swaps.
+        """
+        self.gate_kinds = gate_kinds
+        self.gate_offsets = gate_offsets
+        self.gate_qubits = gate_qubits
+        self.gate_is_2q = gate_is_2q
+        self.dist = dist
+        self.edges = edges
+        self.num_virtual = num_virtual
+        self.max_gates = max_gates
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef void map_free_gates(self, unsigned int * logic_to_phys, vector[int] * gates,
+                             vector[int] * mapped, vector[int] * remaining):
+        """ Map all gates that can be executed with the current layout.
+        """
+        cdef vector[char] blocked = vector[char](self.num_virtual, 0)
+        cdef size_t idx, kk
+        cdef int gate, kind, start, end
+        cdef char is_blocked
+        for idx in range(gates.size()):
+            gate = gates[0][idx]
+            kind = self.gate_kinds[gate]
+            if kind == GATE_SKIP:
+                continue
+            start = self.gate_offsets[gate]
+            end = self.gate_offsets[gate + 1]
+            is_blocked = 0
+            for kk in range(start, end):
+                if blocked[self.gate_qubits[kk]]:
+                    is_blocked = 1
+                    break
+            if not is_blocked and (kind == GATE_FREE or
+                                   self.dist[logic_to_phys[self.gate_qubits[start]],
+                                             logic_to_phys[self.gate_qubits[start + 1]]] == 1):
+                mapped.push_back(gate)
+            else:
+                for kk in range(start, end):
+                    blocked[self.gate_qubits[kk]] = 1
+                remaining.push_back(gate)
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef double layout_distance(self, unsigned int * logic_to_phys, vector[int] * gates):
+        """ The sum of the distances of the upcoming two-qubit gates.
+        """
+        cdef double distance = 0
+        cdef size_t idx
+        cdef int gate, start
+        for idx in range(min(gates.size(), self.max_gates)):
+            gate = gates[0][idx]
+            if self.gate_kinds[gate] == GATE_TWO_QUBIT:
+                start = self.gate_offsets[gate]
+                distance += self.dist[logic_to_phys[self.gate_qubits[start]],
+                                      logic_to_phys[self.gate_qubits[start + 1]]]
+        return distance
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    cdef unsigned int search(self, vector[unsigned int] * logic_to_phys,
+                             vector[unsigned int] * phys_to_logic, vector[int] * gates,
+                             unsigned int depth, unsigned int width,
+                             vector[int] * events, vector[int] * remaining):
+        """ Search for swaps which allow for application of largest number of gates.
+
+        The layout is updated to the layout after the swaps found, the
+        events of the step are appended to events and the gates that
+        could not be mapped to remaining.
+
+        Returns:
+            int: The number of swaps added.
+        """
+        cdef vector[int] mapped
+        self.map_free_gates(logic_to_phys.data(), gates, &mapped, remaining)
+        events.insert(events.end(), mapped.begin(), mapped.end())
+        if remaining.empty() or depth == 0:
+            return 0
+
+        cdef unsigned int num_edges = self.edges.shape[0] // 2
+        cdef unsigned int num_ranked = min(width, num_edges)
+        cdef vector[double] scores = vector[double](num_edges)
+        cdef vector[char] ranked = vector[char](num_edges, 0)
+        cdef vector[unsigned int] ranked_swaps
+        cdef size_t idx, kk
+        cdef int best
+
+        # Rank the swaps by the distance of the layout they produce
+        for idx in range(num_edges):
+            swap(logic_to_phys.data(), phys_to_logic.data(),
+                 self.edges[2 * idx], self.edges[2 * idx + 1])
+            scores[idx] = self.layout_distance(logic_to_phys.data(), gates)
+            swap(logic_to_phys.data(), phys_to_logic.data(),
+                 self.edges[2 * idx], self.edges[2 * idx + 1])
+        # Like a stable sort, keep the edge order between equal scores
+        for kk in range(num_ranked):
+            best = -1
+            for idx in range(num_edges):
+                if not ranked[idx] and (best == -1 or scores[idx] < scores[best]):
+                    best = idx
+            ranked[best] = 1
+            ranked_swaps.push_back(best)
+
+        cdef vector[unsigned int] trial_logic_to_phys, trial_phys_to_logic
+        cdef vector[unsigned int] best_logic_to_phys, best_phys_to_logic
+        cdef vector[int] trial_events, trial_remaining, best_events, best_remaining
+        cdef unsigned int edge, trial_swaps, best_swaps = 0, best_edge = 0
+        cdef int trial_score, best_score = 0
+        for kk in range(num_ranked):
+            edge = ranked_swaps[kk]
+            trial_logic_to_phys = logic_to_phys[0]
+            trial_phys_to_logic = phys_to_logic[0]
+            swap(trial_logic_to_phys.data(), trial_phys_to_logic.data(),
+                 self.edges[2 * edge], self.edges[2 * edge + 1])
+            trial_events.clear()
+            trial_remaining.clear()
+            trial_swaps = self.search(&trial_logic_to_phys, &trial_phys_to_logic,
+                                      remaining, depth - 1, width,
+                                      &trial_events, &trial_remaining)
+            # Count the mapped two-qubit gates, less the number of added swaps.
+            # Each added swap counts as a two-qubit gate and as 3 ops.
+            trial_score = -3 * <int>trial_swaps
+            for idx in range(trial_events.size()):
+                if trial_events[idx] < 0 or self.gate_is_2q[trial_events[idx]]:
+                    trial_score += 1
+            # ranked_swaps already sorted by distance, so distance is the tie-breaker.
+            if kk == 0 or trial_score > best_score:
+                best_score = trial_score
+                best_edge = edge
+                best_swaps = trial_swaps
+                best_events.swap(trial_events)
+                best_remaining.swap(trial_remaining)
+                best_logic_to_phys.swap(trial_logic_to_phys)
+                best_phys_to_logic.swap(trial_phys_to_logic)
+
+        events.push_back(-<int>best_edge - 1)
+        events.insert(events.end(), best_events.begin(), best_events.end())
+        remaining.swap(best_remaining)
+        logic_to_phys.swap(best_logic_to_phys)
+        phys_to_logic.swap(best_phys_to_logic)
+        return 1 + best_swaps
+
+    def run(self, unsigned int[::1] logic_to_phys not None,
+            unsigned int[::1] phys_to_logic not None,
+            unsigned int depth, unsigned int width):
+        """ Map all the gates, starting from the given layout.
+
+        Args:
+            logic_to_phys (ndarray): The logical to physical array of the
+                initial layout.
+            phys_to_logic (ndarray): The physical to logical array of the
+                initial layout.
+            depth (int): Number of swap layers to search before choosing a result.
+            width (int): Number of swaps to consider at each layer.
+
+        Returns:
+            ndarray: The events of the mapping.
+        """
+        cdef vector[unsigned int] trial_logic_to_phys
+        cdef vector[unsigned int] trial_phys_to_logic
+        cdef vector[int] events, gates, remaining
+        cdef size_t idx
+        for idx in range(<size_t>logic_to_phys.shape[0]):
+            trial_logic_to_phys.push_back(logic_to_phys[idx])
+        for idx in range(<size_t>phys_to_logic.shape[0]):
+            trial_phys_to_logic.push_back(phys_to_logic[idx])
+        for idx in range(<size_t>self.gate_kinds.shape[0]):
+            gates.push_back(idx)
+        while not gates.empty():
+            remaining.clear()
+            self.search(&trial_logic_to_phys, &trial_phys_to_logic, &gates,
+                        depth, width, &events, &remaining)
+            gates.swap(remaining)
+        return np.asarray(events, dtype=np.int32)
+
@@ -16,21 +16,23 @@
 # that they have been altered from the originals.
 
 cimport cython
-from libcpp.set cimport set as cset
-from .utils cimport NLayout, EdgeCollection
+import numpy as np
+from libc.stdlib cimport calloc, free
+from libcpp.vector cimport vector
+from .utils cimport EdgeCollection
 
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef double compute_cost(double[:, ::1] dist, unsigned int * logic_to_phys,
+cdef double compute_cost(const double[:, ::1] dist, unsigned int * logic_to_phys,
                           int[::1] gates, unsigned int num_gates) nogil:
     """ Computes the cost (distance) of a logical to physical mapping.
-    
+
     Args:
         dist (ndarray): An array of doubles that specifies the distance.
         logic_to_phys (int *): Pointer to logical to physical array.
         gates (ndarray): Array of ints giving gates in layer.
         num_gates (int): The number of gates (length of gates//2).
-    
+
     Returns:
         double: The distance calculated.
     """
@@ -42,16 +44,43 @@ cdef double compute_cost(double[:, ::1] dist, unsigned int * logic_to_phys,
         cost += dist[ii,jj]
     return cost
 
-@cython.nonecheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-cdef compute_random_scaling(double[:, ::1] scale, double[:, ::1] cdist2,
-                            double * rand, unsigned int num_qubits):
-    """ Computes the symmetric random scaling (perturbation) matrix, 
+cdef double compute_scaled_cost(double * scale, unsigned int num_qubits,
+                                unsigned int * logic_to_phys,
+                                int[::1] gates, unsigned int num_gates) nogil:
+    """ Computes the cost of a logical to physical mapping with the
+    perturbed distance.
+
+    Args:
+        scale (double *): Pointer to the num_qubits x num_qubits perturbed
+                          distance array.
+        num_qubits (int): Number of physical qubits.
+        logic_to_phys (int *): Pointer to logical to physical array.
+        gates (ndarray): Array of ints giving gates in layer.
+        num_gates (int): The number of gates (length of gates//2).
+
+    Returns:
+        double: The distance calculated.
+    """
+    cdef unsigned int ii, jj, kk
+    cdef double cost = 0.0
+    for kk in range(num_gates):
+        ii = logic_to_phys[gates[2*kk]]
+        jj = logic_to_phys[gates[2*kk+1]]
+        cost += scale[ii*num_qubits+jj]
+    return cost
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void compute_random_scaling(double * scale, const double[:, ::1] cdist2,
+                                 double * rand, unsigned int num_qubits) nogil:
+    """ Computes the symmetric random scaling (perturbation) matrix,
     and places the values in the 'scale' array.
 
     Args:
-        scale (ndarray): An array of doubles where the values are to be stored.
+        scale (double *): Pointer to the num_qubits x num_qubits array
+                          where the values are to be stored.
         cdist2 (ndarray): Array representing the coupling map distance squared.
         rand (double *): Array of rands of length num_qubits*(num_qubits+1)//2.
         num_qubits (int): Number of physical qubits.
@@ -59,116 +88,125 @@ cdef compute_random_scaling(double[:, ::1] scale, double[:, ::1] cdist2,
     cdef size_t ii, jj, idx=0
     for ii in range(num_qubits):
         for jj in range(ii):
-            scale[ii,jj] = rand[idx]*cdist2[ii,jj]
-            scale[jj,ii] = scale[ii,jj]
+            scale[ii*num_qubits+jj] = rand[idx]*cdist2[ii,jj]
+            scale[jj*num_qubits+ii] = scale[ii*num_qubits+jj]
             idx += 1
 
+cdef inline void swap_qubits(unsigned int * logic_to_phys, unsigned int * phys_to_logic,
+                             unsigned int idx1, unsigned int idx2) nogil:
+    """ Swaps two physical qubits in a layout, like NLayout.swap.
+    """
+    cdef unsigned int temp1, temp2
+    temp1 = phys_to_logic[idx1]
+    temp2 = phys_to_logic[idx2]
+    phys_to_logic[idx1] = temp2
+    phys_to_logic[idx2] = temp1
+    logic_to_phys[phys_to_logic[idx1]] = idx1
+    logic_to_phys[phys_to_logic[idx2]] = idx2
+
 
-@cython.nonecheck(False)
 @cython.boundscheck(False)
 @cython.wraparound(False)
-def swap_trial(int num_qubits, NLayout int_layout, int[::1] int_qubit_subset,
-               int[::1] gates, double[:, ::1] cdist2, double[:, ::1] cdist, 
-               int[::1] edges, double[:, ::1] scale, object rng):
-    """ A single iteration of the tchastic swap mapping routine.
+cdef unsigned int swap_trial(unsigned int num_qubits, unsigned int num_logical,
+                             unsigned int * logic_to_phys, unsigned int * phys_to_logic,
+                             int[::1] int_qubit_subset, int[::1] gates,
+                             const double[:, ::1] cdist2, const double[:, ::1] cdist,
+                             int[::1] edges, double * rand,
+                             vector[unsigned int] * opt_edges, double * dist) nogil:
+    """ A single iteration of the stochastic swap mapping routine.
 
     Args:
         num_qubits (int): The number of physical qubits.
-        int_layout (NLayout): The numeric (integer) representation of 
-                              the initial_layout.
+        num_logical (int): The number of logical qubits.
+        logic_to_phys (int *): The logical to physical array of the initial
+                               layout. It is updated to the layout found.
+        phys_to_logic (int *): The physical to logical array of the initial
+                               layout. It is updated to the layout found.
         int_qubit_subset (ndarray): Int ndarray listing qubits in set.
         gates (ndarray): Int array with integers giving qubits on which
                          two-qubits gates act on.
-        cdist2 (ndarray): Array of doubles that gives the square of the 
+        cdist2 (ndarray): Array of doubles that gives the square of the
                           distance graph.
         cdist (ndarray): Array of doubles that gives the distance graph.
         edges (ndarray): Int array of edges in coupling map.
-        scale (ndarray): A double array that holds the perturbed cdist2 array.
-        rng (RandomState): An instance of the NumPy RandomState.
+        rand (double *): Array of rands of length num_qubits*(num_qubits+1)//2
+                         that perturb the distance.
+        opt_edges (vector *): Vector where the optimal edges found are stored.
+        dist (double *): Where the best distance achieved in this trial is stored.
 
     Returns:
-        double: Best distance achieved in this trial.
-        EdgeCollection: Collection of optimal edges found.
-        NLayout: The optimal layout found.
         int: The number of depth steps required in mapping.
     """
-    cdef EdgeCollection opt_edges = EdgeCollection()
-    cdef NLayout optimal_layout, new_layout, trial_layout = int_layout.copy()
-    
     cdef unsigned int num_gates = gates.shape[0]//2
     cdef unsigned int num_edges = edges.shape[0]//2
-    
-    cdef unsigned int need_copy, cost_reduced
+
+    cdef unsigned int cost_reduced, num_available
     cdef unsigned int depth_step = 1
     cdef unsigned int depth_max = 2 * num_qubits + 1
-    cdef double min_cost, new_cost, dist
-    
+    cdef double min_cost, new_cost
+
     cdef unsigned int start_edge, end_edge, start_qubit, end_qubit
     cdef unsigned int optimal_start, optimal_end, optimal_start_qubit, optimal_end_qubit
-    
+
     cdef size_t idx
-    
+
     # Compute randomized distance
-    cdef double[::1] rand = 1.0 + rng.normal(0.0, 1.0/num_qubits,
-                                             size=num_qubits*(num_qubits+1)//2)
-    
-    compute_random_scaling(scale, cdist2, &rand[0], num_qubits)
-    
-    # Convert int qubit array to c++ set
-    cdef cset[unsigned int] qubit_set
-    cdef cset[unsigned int] input_qubit_set
-    
-    for idx in range(<unsigned int>int_qubit_subset.shape[0]):
-        input_qubit_set.insert(int_qubit_subset[idx])
-    
+    cdef double * scale = <double *>calloc(num_qubits*num_qubits, sizeof(double))
+    compute_random_scaling(scale, cdist2, rand, num_qubits)
+
+    # Logical qubits that are still available at this depth
+    cdef unsigned char * qubit_set = <unsigned char *>calloc(num_logical,
+                                                             sizeof(unsigned char))
+
     # Loop over depths from 1 up to a maximum depth
     while depth_step < depth_max:
-        qubit_set = input_qubit_set
+        num_available = 0
+        for idx in range(num_logical):
+            qubit_set[idx] = 0
+        for idx in range(<unsigned int>int_qubit_subset.shape[0]):
+            if not qubit_set[int_qubit_subset[idx]]:
+                qubit_set[int_qubit_subset[idx]] = 1
+                num_available += 1
         # While there are still qubits available
-        while not qubit_set.empty():
+        while num_available:
             # Compute the objective function
-            min_cost = compute_cost(scale, trial_layout.logic_to_phys,
-                                   gates, num_gates)
+            min_cost = compute_scaled_cost(scale, num_qubits, logic_to_phys,
+                                           gates, num_gates)
             # Try to decrease objective function
             cost_reduced = 0
 
             # Loop over edges of coupling graph
-            need_copy = 1
             for idx in range(num_edges):
                 start_edge = edges[2*idx]
                 end_edge = edges[2*idx+1]
-                start_qubit = trial_layout.phys_to_logic[start_edge]
-                end_qubit =  trial_layout.phys_to_logic[end_edge]
+                start_qubit = phys_to_logic[start_edge]
+                end_qubit = phys_to_logic[end_edge]
                 # Are the qubits available?
-                if  qubit_set.count(start_qubit) and qubit_set.count(end_qubit):
+                if qubit_set[start_qubit] and qubit_set[end_qubit]:
                     # Try this edge to reduce the cost
-                    if need_copy:
-                        new_layout = trial_layout.copy()
-                        need_copy = 0
-                    new_layout.swap(start_edge, end_edge)
+                    swap_qubits(logic_to_phys, phys_to_logic, start_edge, end_edge)
                     # Compute the objective function
-                    new_cost = compute_cost(scale, new_layout.logic_to_phys,
-                                   gates, num_gates)
+                    new_cost = compute_scaled_cost(scale, num_qubits, logic_to_phys,
+                                                   gates, num_gates)
+                    swap_qubits(logic_to_phys, phys_to_logic, start_edge, end_edge)
                     # Record progress if we succceed
                     if new_cost < min_cost:
-                        cost_reduced = True
+                        cost_reduced = 1
                         min_cost = new_cost
-                        optimal_layout = new_layout
                         optimal_start = start_edge
                         optimal_end = end_edge
                         optimal_start_qubit = start_qubit
                         optimal_end_qubit = end_qubit
-                        need_copy = 1
-                    else:
-                        new_layout.swap(start_edge, end_edge)
 
             # After going over all edges
             # Were there any good swap choices?
             if cost_reduced:
-                qubit_set.erase(optimal_start_qubit)
-                qubit_set.erase(optimal_end_qubit)
-                trial_layout = optimal_layout
-                opt_edges.add(optimal_start, optimal_end)
+                qubit_set[optimal_start_qubit] = 0
+                qubit_set[optimal_end_qubit] = 0
+                num_available -= 2
+                swap_qubits(logic_to_phys, phys_to_logic, optimal_start, optimal_end)
+                opt_edges.push_back(optimal_start)
+                opt_edges.push_back(optimal_end)
             else:
                 break
 
@@ -176,18 +214,159 @@ def swap_trial(int num_qubits, NLayout int_layout, int[::1] int_qubit_subset,
         # failed to improve the cost.
 
         # Compute the coupling graph distance
-        dist = compute_cost(cdist, trial_layout.logic_to_phys,
-                                   gates, num_gates)
+        dist[0] = compute_cost(cdist, logic_to_phys, gates, num_gates)
         # If all gates can be applied now, we are finished.
         # Otherwise we need to consider a deeper swap circuit
-        if dist == num_gates:
+        if dist[0] == num_gates:
             break
 
         # Increment the depth
         depth_step += 1
 
     # Either we have succeeded at some depth d < dmax or failed
-    dist = compute_cost(cdist, trial_layout.logic_to_phys,
-                                   gates, num_gates)
-    
-    return dist, opt_edges, trial_layout, depth_step
+    dist[0] = compute_cost(cdist, logic_to_phys, gates, num_gates)
+
+    free(scale)
+    free(qubit_set)
+    return depth_step
+
+
+cdef class SwapTrials:
+    """ The trials of the stochastic swap mapping routine for a layer.
+
+    Each trial runs with the GIL released, so that the trials can run
+    on several threads at the same time.
+    """
+    cdef unsigned int num_qubits
+    cdef unsigned int num_gates
+    cdef unsigned int[::1] initial_logic_to_phys
+    cdef unsigned int[::1] initial_phys_to_logic
+    cdef int[::1] int_qubit_subset
+    cdef int[::1] gates
+    cdef const double[:, ::1] cdist2
+    cdef const double[:, ::1] cdist
+    cdef int[::1] edges
+    cdef double[:, ::1] rand
+    cdef unsigned int[:, ::1] logic_to_phys
+    cdef unsigned int[:, ::1] phys_to_logic
+    cdef double[::1] dists
+    cdef unsigned int[::1] depths
+    cdef vector[vector[unsigned int]] opt_edges
+    cdef unsigned int first_optimal
+
+    def __cinit__(self, int num_qubits, unsigned int[::1] logic_to_phys,
+                  unsigned int[::1] phys_to_logic, int[::1] int_qubit_subset,
+                  int[::1] gates, const double[:, ::1] cdist2, const double[:, ::1] cdist,
+                  int[::1] edges, double[:, ::1] rand):
+        """ Init object.
+
+        Args:
+            num_qubits (int): The number of physical qubits.
+            logic_to_phys (ndarray): The logical to physical array of the
+                                     initial layout.
+            phys_to_logic (ndarray): The physical to logical array of the
+                                     initial layout.
+            int_qubit_subset (ndarray): Int ndarray listing qubits in set.
+            gates (ndarray): Int array with integers giving qubits on which
+                             two-qubits gates act on.
+            cdist2 (ndarray): Array of doubles that gives the square of the
+                              distance graph.
+            cdist (ndarray): Array of doubles that gives the distance graph.
+            edges (ndarray): Int array of edges in coupling map.
+            rand (ndarray): Array of doubles with a row of
+                            num_qubits*(num_qubits+1)//2 rands per trial.
+        """
+        cdef unsigned int num_trials = rand.shape[0]
+        self.num_qubits = num_qubits
+        self.num_gates = gates.shape[0]//2
+        self.initial_logic_to_phys = logic_to_phys
+        self.initial_phys_to_logic = phys_to_logic
+        self.int_qubit_subset = int_qubit_subset
+        self.gates = gates
+        self.cdist2 = cdist2
+        self.cdist = cdist
+        self.edges = edges
+        self.rand = rand
+        self.logic_to_phys = np.zeros((num_trials, logic_to_phys.shape[0]), dtype=np.uint32)
+        self.phys_to_logic = np.zeros((num_trials, phys_to_logic.shape[0]), dtype=np.uint32)
+        self.dists = np.zeros(num_trials)
+        self.depths = np.zeros(num_trials, dtype=np.uint32)
+        self.opt_edges.resize(num_trials)
+        self.first_optimal = num_trials
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def run_trial(self, unsigned int trial):
+        """ Run a trial, unless a trial with a lower index already reached
+        depth 1, which can not be improved.
+
+        Args:
+            trial (int): The index of the trial.
+        """
+        if trial > self.first_optimal:
+            return
+        self.logic_to_phys[trial, :] = self.initial_logic_to_phys
+        self.phys_to_logic[trial, :] = self.initial_phys_to_logic
+
+        cdef unsigned int * logic_to_phys = &self.logic_to_phys[trial, 0]
+        cdef unsigned int * phys_to_logic = &self.phys_to_logic[trial, 0]
+        cdef double * rand = &self.rand[trial, 0]
+        cdef vector[unsigned int] * opt_edges = &self.opt_edges[trial]
+        cdef double * dist = &self.dists[trial]
+        cdef unsigned int depth_step
+        with nogil:
+            depth_step = swap_trial(self.num_qubits, self.initial_logic_to_phys.shape[0],
+                                    logic_to_phys, phys_to_logic,
+                                    self.int_qubit_subset, self.gates,
+                                    self.cdist2, self.cdist, self.edges, rand,
+                                    opt_edges, dist)
+        self.depths[trial] = depth_step
+        if depth_step == 1 and dist[0] == self.num_gates and trial < self.first_optimal:
+            self.first_optimal = trial
+
+    @cython.boundscheck(False)
+    @cython.wraparound(False)
+    def run(self, object executor=None):
+        """ Run the trials and return the best result.
+
+        The result is the same as running the trials one after the other and
+        stopping at the first trial that reaches depth 1: the successful trial
+        with the lowest depth, and the lowest index among those.
+
+        Args:
+            executor (Executor): If given, the trials are run on its threads.
+                Otherwise they are run serially.
+
+        Returns:
+            int: The number of trials that a serial run uses.
+            EdgeCollection: Collection of optimal edges found, or None if
+                all trials failed.
+            ndarray: The logical to physical array of the optimal layout found,
+                or None if all trials failed.
+            ndarray: The physical to logical array of the optimal layout found,
+                or None if all trials failed.
+            int: The number of depth steps required in mapping.
+        """
+        cdef unsigned int num_trials = self.rand.shape[0]
+        cdef unsigned int trial, num_used
+        if executor is None:
+            for trial in range(num_trials):
+                self.run_trial(trial)
+                if self.first_optimal == trial:
+                    break
+        else:
+            list(executor.map(self.run_trial, range(num_trials)))
+        num_used = min(self.first_optimal + 1, num_trials)
+
+        cdef int best_trial = -1
+        for trial in range(num_used):
+            if self.dists[trial] == self.num_gates and \
+               (best_trial == -1 or self.depths[trial] < self.depths[best_trial]):
+                best_trial = trial
+        if best_trial == -1:
+            return num_used, None, None, None, None
+
+        cdef EdgeCollection best_edges = EdgeCollection()
+        best_edges._edges = self.opt_edges[best_trial]
+        return (num_used, best_edges, np.asarray(self.logic_to_phys[best_trial]),
+                np.asarray(self.phys_to_logic[best_trial]), self.depths[best_trial])
@@ -36,18 +36,29 @@ class DenseLayout(AnalysisPass):
     Chooses a Layout by finding the most connected subset of qubits.
     """
 
-    def __init__(self, coupling_map):
+    def __init__(self, coupling_map, backend_prop=None, target_cache=None):
         """
         Chooses a DenseLayout
 
         Args:
             coupling_map (Coupling): directed graph representing a coupling map.
+            backend_prop (BackendProperties): If given, the subset with the
+                lowest CX and readout errors is chosen among the most
+                connected ones.
+            target_cache (TargetCache): If given, the adjacency matrix, the
+                breadth first searches and the errors are taken from it instead
+                of computed. It must be built from the same coupling map and
+                backend properties.
 
         Raises:
             TranspilerError: if invalid options
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['layout']
         self.coupling_map = coupling_map
+        self.backend_prop = backend_prop
+        self.target_cache = target_cache
 
     def run(self, dag):
         """
@@ -63,7 +74,9 @@ class DenseLayout(AnalysisPass):
         num_dag_qubits = sum([qreg.size for qreg in dag.qregs.values()])
         if num_dag_qubits > self.coupling_map.size():
             raise TranspilerError('Number of qubits greater than device.')
-        best_sub = self._best_subset(num_dag_qubits)
+        num_cx = len(dag.twoQ_gates())
+        num_meas = dag.count_ops().get('measure', 0)
+        best_sub = self._best_subset(num_dag_qubits, num_cx, num_meas)
         layout = Layout()
         map_iter = 0
         for qreg in dag.qregs.values():
@@ -72,57 +85,134 @@ class DenseLayout(AnalysisPass):
                 map_iter += 1
         self.property_set['layout'] = layout
 
-    def _best_subset(self, n_qubits):
+    def _best_subset(self, n_qubits, num_cx=0, num_meas=0):
         """Computes the qubit mapping with the best connectivity.
 
+        The candidate subsets are the first n_qubits of a breadth first search
+        from each qubit. Their connections are counted all at once, as the
+        number of entries of the adjacency matrix inside each subset.
+
         Args:
             n_qubits (int): Number of subset qubits to consider.
+            num_cx (int): Number of two-qubit gates, weighting the CX error
+                when backend properties are given.
+            num_meas (int): Number of measurements, weighting the readout
+                error when backend properties are given.
 
         Returns:
             ndarray: Array of qubits to use for best connectivity mapping.
+
+        Raises:
+            TranspilerError: if no connected subset has n_qubits.
         """
         if n_qubits == 1:
             return np.array([0])
 
         device_qubits = self.coupling_map.size()
-
-        cmap = np.asarray(self.coupling_map.get_edges())
-        data = np.ones_like(cmap[:, 0])
-        sp_cmap = sp.coo_matrix((data, (cmap[:, 0], cmap[:, 1])),
-                                shape=(device_qubits, device_qubits)).tocsr()
-        best = 0
-        best_map = None
-        # do bfs with each node as starting point
-        for k in range(sp_cmap.shape[0]):
-            bfs = cs.breadth_first_order(sp_cmap, i_start=k, directed=False,
+        if self.target_cache is not None:
+            cmap, sp_cmap, bfs_orders = self.target_cache.dense_layout_tables()
+        else:
+            cmap, sp_cmap, bfs_orders = connectivity_tables(self.coupling_map)
+
+        # subsets[k] holds the qubits reached first by a bfs from k
+        starts = []
+        subsets = []
+        for k, bfs in enumerate(bfs_orders):
+            if len(bfs) >= n_qubits:
+                starts.append(k)
+                subsets.append(bfs[:n_qubits])
+        if not subsets:
+            raise TranspilerError('No connected subset of %s qubits.' % n_qubits)
+        subsets = np.array(subsets)
+        members = sp.csr_matrix((np.ones(subsets.size, dtype=int),
+                                 (np.repeat(np.arange(len(starts)), n_qubits),
+                                  subsets.ravel())),
+                                shape=(len(starts), device_qubits))
+
+        # (members @ A)[k, j] is the number of edges from the subset k to j
+        connection_counts = _subset_sums(members, sp_cmap)
+        candidates = np.flatnonzero(connection_counts == connection_counts.max())
+        best = candidates[0]
+        if self.backend_prop is not None and len(candidates) > 1:
+            if self.target_cache is not None:
+                cx_errors, readout_errors = self.target_cache.dense_layout_errors()
+            else:
+                cx_errors, readout_errors = error_tables(self.backend_prop, self.coupling_map)
+            errors = np.zeros(len(candidates))
+            if num_cx:
+                errors += num_cx * _subset_sums(members[candidates], cx_errors) / \
+                    np.maximum(connection_counts[candidates], 1)
+            if num_meas:
+                errors += num_meas * (members[candidates] @ readout_errors) / n_qubits
+            best = candidates[np.argmin(errors)]
+        best_map = subsets[best]
+
+        # Return a best mapping that has reduced bandwidth
+        mapping = np.zeros(device_qubits, dtype=int)
+        mapping[best_map] = np.arange(n_qubits)
+        inside = np.zeros(device_qubits, dtype=bool)
+        inside[best_map] = True
+        sub_edges = cmap[inside[cmap[:, 0]] & inside[cmap[:, 1]]]
+        sp_sub_graph = sp.coo_matrix((np.ones(len(sub_edges), dtype=int),
+                                      (mapping[sub_edges[:, 0]], mapping[sub_edges[:, 1]])),
+                                     shape=(n_qubits, n_qubits)).tocsr()
+        perm = cs.reverse_cuthill_mckee(sp_sub_graph)
+        return best_map[perm]
+
+
+def connectivity_tables(coupling_map):
+    """The tables of the coupling map the subset search needs.
+
+    Args:
+        coupling_map (CouplingMap): directed graph representing a coupling map.
+
+    Returns:
+        tuple: The edges, as an array of pairs of qubits, the adjacency matrix,
+            as a sparse matrix, and the breadth first order of the qubits from
+            each qubit.
+    """
+    device_qubits = coupling_map.size()
+    cmap = np.asarray(coupling_map.get_edges())
+    data = np.ones_like(cmap[:, 0])
+    sp_cmap = sp.coo_matrix((data, (cmap[:, 0], cmap[:, 1])),
+                            shape=(device_qubits, device_qubits)).tocsr()
+    bfs_orders = [cs.breadth_first_order(sp_cmap, i_start=k, directed=False,
                                          return_predecessors=False)
+                  for k in range(device_qubits)]
+    return cmap, sp_cmap, bfs_orders
 
-            connection_count = 0
-            sub_graph = []
-            for i in range(n_qubits):
-                node_idx = bfs[i]
-                for j in range(sp_cmap.indptr[node_idx],
-                               sp_cmap.indptr[node_idx + 1]):
-                    node = sp_cmap.indices[j]
-                    for counter in range(n_qubits):
-                        if node == bfs[counter]:
-                            connection_count += 1
-                            sub_graph.append([node_idx, node])
-                            break
-
-            if connection_count > best:
-                best = connection_count
-                best_map = bfs[0:n_qubits]
-                # Return a best mapping that has reduced bandwidth
-                mapping = {}
-                for edge in range(best_map.shape[0]):
-                    mapping[best_map[edge]] = edge
-                new_cmap = [[mapping[c[0]], mapping[c[1]]] for c in sub_graph]
-                rows = [edge[0] for edge in new_cmap]
-                cols = [edge[1] for edge in new_cmap]
-                data = [1]*len(rows)
-                sp_sub_graph = sp.coo_matrix((data, (rows, cols)),
-                                             shape=(n_qubits, n_qubits)).tocsr()
-                perm = cs.reverse_cuthill_mckee(sp_sub_graph)
-                best_map = best_map[perm]
-        return best_map
+
+def error_tables(backend_prop, coupling_map):
+    """The CX error of each edge, as a sparse matrix like the adjacency
+    matrix, and the readout error of each qubit.
+
+    Args:
+        backend_prop (BackendProperties): backend properties object
+        coupling_map (CouplingMap): directed graph representing a coupling map.
+
+    Returns:
+        tuple: The sparse matrix of CX errors, and the array of readout errors.
+    """
+    device_qubits = coupling_map.size()
+    cmap = np.asarray(coupling_map.get_edges())
+    cx_error = {}
+    for gate in backend_prop.gates:
+        if gate.gate == 'cx':
+            for param in gate.parameters:
+                if param.name == 'gate_error':
+                    cx_error[tuple(gate.qubits)] = param.value
+    edge_errors = [cx_error.get((src, dst), cx_error.get((dst, src), 0))
+                   for src, dst in cmap.tolist()]
+    cx_errors = sp.coo_matrix((edge_errors, (cmap[:, 0], cmap[:, 1])),
+                              shape=(device_qubits, device_qubits)).tocsr()
+    readout_errors = np.zeros(device_qubits)
+    for qubit, properties in enumerate(backend_prop.qubits[:device_qubits]):
+        for nduv in properties:
+            if nduv.name == 'readout_error':
+                readout_errors[qubit] = nduv.value
+    return cx_errors, readout_errors
+
+
+def _subset_sums(members, matrix):
+    """The sum of the entries of matrix inside each subset, for each row of members."""
+    return np.asarray((members @ matrix).multiply(members).sum(axis=1)).ravel()
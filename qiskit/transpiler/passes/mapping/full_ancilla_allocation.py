@@ -41,6 +41,8 @@ class FullAncillaAllocation(AnalysisPass):
                 the layout is smaller than the coupling_map.
         """
         super().__init__()
+        self.reads = ['layout']
+        self.writes = ['layout']
         self.coupling_map = coupling_map
         self.layout = layout
         self.ancilla_name = 'ancilla'
@@ -31,7 +31,7 @@ of a narrowed best first/beam search, described as follows:
   layout and mark them as mapped.
 - For all possible SWAP gates, calculate the layout that would result from their
   application and rank them according to the distance of the resulting layout
-  over upcoming gates (see _calc_layout_distance.)
+  over upcoming gates, the sum of the distances of the next two-qubit gates.
 - For the four (SEARCH_WIDTH) highest-ranking SWAPs, repeat the above process on
   the layout that would be generated if they were applied.
 - Repeat this process down to a depth of four (SEARCH_DEPTH) SWAPs away from the
@@ -45,17 +45,24 @@ of a narrowed best first/beam search, described as follows:
 For more details on the algorithm, see Sven's blog post:
 https://medium.com/qiskit/improving-a-quantum-compiler-48410d7a7084
 
+The search runs in a Cython kernel, on integer layouts and on a table of the
+gates.
 """
 
 from copy import deepcopy
 
+import numpy as np
+
 from qiskit.circuit.quantumregister import QuantumRegister
 from qiskit.dagcircuit import DAGCircuit
 from qiskit.extensions.standard import SwapGate
 from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.transpiler.exceptions import TranspilerError
-from qiskit.transpiler.layout import Layout
+from qiskit.transpiler.layout import Layout, ArrayLayout
 from qiskit.dagcircuit import DAGNode
+# pylint: disable=no-name-in-module
+from .cython.lookahead_swap.search import (LookaheadSearch, GATE_SKIP, GATE_FREE,
+                                           GATE_TWO_QUBIT)
 
 
 SEARCH_DEPTH = 4
@@ -65,17 +72,27 @@ SEARCH_WIDTH = 4
 class LookaheadSwap(TransformationPass):
     """Map input circuit onto a backend topology via insertion of SWAPs."""
 
-    def __init__(self, coupling_map, initial_layout=None):
+    def __init__(self, coupling_map, initial_layout=None,
+                 search_depth=SEARCH_DEPTH, search_width=SEARCH_WIDTH):
         """Initialize a LookaheadSwap instance.
 
         Arguments:
             coupling_map (CouplingMap): CouplingMap of the target backend.
             initial_layout (Layout): The initial layout of the DAG to analyze.
+            search_depth (int): Number of SWAP layers to search before choosing a result.
+            search_width (int): Number of SWAPs to consider at each layer.
+
+        Raises:
+            TranspilerError: if the search depth or width is smaller than one.
         """
 
         super().__init__()
+        if search_depth < 1 or search_width < 1:
+            raise TranspilerError('The search depth and width must be at least one.')
         self._coupling_map = coupling_map
         self.initial_layout = initial_layout
+        self.search_depth = search_depth
+        self.search_width = search_width
 
     def run(self, dag):
         """Run one pass of the lookahead mapper on the provided DAG.
@@ -105,19 +122,27 @@ class LookaheadSwap(TransformationPass):
             raise TranspilerError(
                 "Mappers require to have the layout to be the same size as the coupling map")
 
+        if coupling_map._dist_matrix is None:
+            coupling_map._compute_distance_matrix()
+        layout = ArrayLayout.from_layout(self.initial_layout)
+        possible_swaps = coupling_map.get_edges()
+        search = LookaheadSearch(*_gate_table(ordered_virtual_gates, layout),
+                                 coupling_map._dist_matrix,
+                                 np.asarray(possible_swaps, dtype=np.int32).ravel(),
+                                 len(layout), 50 + 10 * len(coupling_map.physical_qubits))
+        events = search.run(layout.logic_to_phys, layout.phys_to_logic,
+                            self.search_depth, self.search_width)
+
+        # Replay the mapped gates and the SWAPs added, in order.
         mapped_gates = []
-        layout = self.initial_layout.copy()
-        gates_remaining = ordered_virtual_gates.copy()
-
-        while gates_remaining:
-            best_step = _search_forward_n_swaps(layout, gates_remaining,
-                                                coupling_map)
-
-            layout = best_step['layout']
-            gates_mapped = best_step['gates_mapped']
-            gates_remaining = best_step['gates_remaining']
-
-            mapped_gates.extend(gates_mapped)
+        for event in events.tolist():
+            if event >= 0:
+                mapped_gates.append(
+                    _transform_gate_for_layout(ordered_virtual_gates[event], layout))
+            else:
+                swap = possible_swaps[-event - 1]
+                mapped_gates.extend(_swap_ops_from_edge(swap, layout))
+                layout.swap(*swap)
 
         # Preserve input DAG's name, regs, wire_map, etc. but replace the graph.
         mapped_dag = _copy_circuit_metadata(dag, coupling_map)
@@ -128,138 +153,38 @@ class LookaheadSwap(TransformationPass):
         return mapped_dag
 
 
-def _search_forward_n_swaps(layout, gates, coupling_map,
-                            depth=SEARCH_DEPTH, width=SEARCH_WIDTH):
-    """Search for SWAPs which allow for application of largest number of gates.
-
-    Arguments:
-        layout (Layout): Map from virtual qubit index to physical qubit index.
-        gates (list): Gates to be mapped.
-        coupling_map (CouplingMap): CouplingMap of the target backend.
-        depth (int): Number of SWAP layers to search before choosing a result.
-        width (int): Number of SWAPs to consider at each layer.
-    Returns:
-        dict: Describes solution step found.
-            layout (Layout): Virtual to physical qubit map after SWAPs.
-            gates_remaining (list): Gates that could not be mapped.
-            gates_mapped (list): Gates that were mapped, including added SWAPs.
-
-    """
-
-    gates_mapped, gates_remaining = _map_free_gates(layout, gates, coupling_map)
-
-    base_step = {'layout': layout,
-                 'swaps_added': 0,
-                 'gates_mapped': gates_mapped,
-                 'gates_remaining': gates_remaining}
-
-    if not gates_remaining or depth == 0:
-        return base_step
-
-    possible_swaps = coupling_map.get_edges()
-
-    def _score_swap(swap):
-        """Calculate the relative score for a given SWAP."""
-        trial_layout = layout.copy()
-        trial_layout.swap(*swap)
-        return _calc_layout_distance(gates, coupling_map, trial_layout)
-
-    ranked_swaps = sorted(possible_swaps, key=_score_swap)
-
-    best_swap, best_step = None, None
-    for swap in ranked_swaps[:width]:
-        trial_layout = layout.copy()
-        trial_layout.swap(*swap)
-        next_step = _search_forward_n_swaps(trial_layout, gates_remaining,
-                                            coupling_map, depth - 1, width)
-
-        # ranked_swaps already sorted by distance, so distance is the tie-breaker.
-        if best_swap is None or _score_step(next_step) > _score_step(best_step):
-            best_swap, best_step = swap, next_step
-
-    best_swap_gate = _swap_ops_from_edge(best_swap, layout)
-    return {
-        'layout': best_step['layout'],
-        'swaps_added': 1 + best_step['swaps_added'],
-        'gates_remaining': best_step['gates_remaining'],
-        'gates_mapped': gates_mapped + best_swap_gate + best_step['gates_mapped'],
-    }
-
-
-def _map_free_gates(layout, gates, coupling_map):
-    """Map all gates that can be executed with the current layout.
+def _gate_table(gates, layout):
+    """Describe the gates with integer arrays, for the LookaheadSearch kernel.
 
     Args:
-        layout (Layout): Map from virtual qubit index to physical qubit index.
-        gates (list): Gates to be mapped.
-        coupling_map (CouplingMap): CouplingMap for target device topology.
+        gates (list): Gates to be mapped, serial layers of the DAG.
+        layout (ArrayLayout): The layout numbering the virtual qubits.
 
     Returns:
-        tuple:
-            mapped_gates (list): ops for gates that can be executed, mapped onto layout.
-            remaining_gates (list): gates that cannot be executed on the layout.
+        tuple: The arrays of the kinds, the qubit offsets, the qubits and
+            the two-qubit flags of the gates.
 
+    Raises:
+        TranspilerError: if a gate acts on more than two qubits.
     """
-
-    blocked_qubits = set()
-
-    mapped_gates = []
-    remaining_gates = []
-
-    for gate in gates:
-        # Gates without a partition (barrier, snapshot, save, load, noise) may
-        # still have associated qubits. Look for them in the qargs.
+    kinds = np.zeros(len(gates), dtype=np.int32)
+    offsets = np.zeros(len(gates) + 1, dtype=np.int32)
+    is_2q = np.zeros(len(gates), dtype=np.int32)
+    qubits = []
+    for index, gate in enumerate(gates):
+        qargs = [n for n in gate['graph'].nodes() if n.type == 'op'][0].qargs
         if not gate['partition']:
-            qubits = [n for n in gate['graph'].nodes() if n.type == 'op'][0].qargs
-
-            if not qubits:
-                continue
-
-            if blocked_qubits.intersection(qubits):
-                blocked_qubits.update(qubits)
-                remaining_gates.append(gate)
-            else:
-                mapped_gate = _transform_gate_for_layout(gate, layout)
-                mapped_gates.append(mapped_gate)
-            continue
-
-        qubits = gate['partition'][0]
-
-        if blocked_qubits.intersection(qubits):
-            blocked_qubits.update(qubits)
-            remaining_gates.append(gate)
-        elif len(qubits) == 1:
-            mapped_gate = _transform_gate_for_layout(gate, layout)
-            mapped_gates.append(mapped_gate)
-        elif coupling_map.distance(*[layout[q] for q in qubits]) == 1:
-            mapped_gate = _transform_gate_for_layout(gate, layout)
-            mapped_gates.append(mapped_gate)
+            gate_qubits = qargs
+            kinds[index] = GATE_FREE if qargs else GATE_SKIP
         else:
-            blocked_qubits.update(qubits)
-            remaining_gates.append(gate)
-
-    return mapped_gates, remaining_gates
-
-
-def _calc_layout_distance(gates, coupling_map, layout, max_gates=None):
-    """Return the sum of the distances of two-qubit pairs in each CNOT in gates
-    according to the layout and the coupling.
-    """
-
-    if max_gates is None:
-        max_gates = 50 + 10 * len(coupling_map.physical_qubits)
-
-    return sum(coupling_map.distance(*[layout[q] for q in gate['partition'][0]])
-               for gate in gates[:max_gates]
-               if gate['partition'] and len(gate['partition'][0]) == 2)
-
-
-def _score_step(step):
-
-    """Count the mapped two-qubit gates, less the number of added SWAPs."""
-    # Each added swap will add 3 ops to gates_mapped, so subtract 3.
-    return len([g for g in step['gates_mapped']
-                if len(g.qargs) == 2]) - 3 * step['swaps_added']
+            gate_qubits = gate['partition'][0]
+            if len(gate_qubits) > 2:
+                raise TranspilerError('LookaheadSwap only supports gates on up to two qubits.')
+            kinds[index] = GATE_TWO_QUBIT if len(gate_qubits) == 2 else GATE_FREE
+        qubits.extend(layout.virtual_index(qubit) for qubit in gate_qubits)
+        offsets[index + 1] = len(qubits)
+        is_2q[index] = len(qargs) == 2
+    return kinds, offsets, np.asarray(qubits, dtype=np.int32), is_2q
 
 
 def _copy_circuit_metadata(source_dag, coupling_map):
@@ -285,7 +210,7 @@ def _transform_gate_for_layout(gate, layout):
     mapped_op_node = deepcopy([n for n in gate['graph'].nodes() if n.type == 'op'][0])
 
     # Workaround until #1816, apply mapped to qargs to both DAGNode and op
-    device_qreg = QuantumRegister(len(layout.get_physical_bits()), 'q')
+    device_qreg = QuantumRegister(len(layout), 'q')
     mapped_qargs = [device_qreg[layout[a]] for a in mapped_op_node.qargs]
     mapped_op_node.qargs = mapped_op_node.op.qargs = mapped_qargs
 
@@ -297,7 +222,7 @@ def _transform_gate_for_layout(gate, layout):
 def _swap_ops_from_edge(edge, layout):
     """Generate list of ops to implement a SWAP gate along a coupling edge."""
 
-    device_qreg = QuantumRegister(len(layout.get_physical_bits()), 'q')
+    device_qreg = QuantumRegister(len(layout), 'q')
     qreg_edge = [device_qreg[i] for i in edge]
 
     # TODO shouldn't be making other nodes not by the DAG!!
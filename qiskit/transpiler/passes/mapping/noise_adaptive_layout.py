@@ -44,8 +44,10 @@ in the transpiler architecture it is best passed around between passes by
 being set in `property_set`.
 """
 
-import math
+import heapq
+
 import networkx as nx
+import numpy as np
 
 from qiskit.transpiler.layout import Layout
 from qiskit.transpiler.basepasses import AnalysisPass
@@ -58,196 +60,205 @@ class NoiseAdaptiveLayout(AnalysisPass):
     data for the backend.
     """
 
-    def __init__(self, backend_prop):
+    def __init__(self, backend_prop, target_cache=None):
         """
         Chooses a Noise Adaptive Layout
 
         Args:
             backend_prop (BackendProperties): backend properties object
+            target_cache (TargetCache): If given, the swap costs are taken from
+                it instead of computed from backend_prop. It must be built
+                from the same backend properties.
 
         Raises:
             TranspilerError: if invalid options
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['layout']
         self.backend_prop = backend_prop
-        self.swap_graph = nx.DiGraph()
-        self.cx_errors = {}
-        self.readout_errors = {}
-        self.available_hw_qubits = []
-        self.gate_list = []
-        self.gate_cost = {}
-        self.swap_paths = {}
-        self.swap_costs = {}
-        self.prog_graph = nx.Graph()
-        self.qarg_to_id = {}
-        self.pending_program_edges = []
-        self.prog2hw = {}
-
-    def _initialize_backend_prop(self):
-        """
-        Extract readout and CNOT errors and compute swap costs.
-        """
-        backend_prop = self.backend_prop
-        for ginfo in backend_prop.gates:
-            if ginfo.gate == 'cx':
-                for item in ginfo.parameters:
-                    if item.name == 'gate_error':
-                        g_reliab = 1.0 - item.value
-                        break
-                    else:
-                        g_reliab = 1.0
-                swap_reliab = pow(g_reliab, 3)
-                swap_reliab = -math.log(swap_reliab) if swap_reliab != 0 else -math.inf
-                self.swap_graph.add_edge(ginfo.qubits[0], ginfo.qubits[1], weight=swap_reliab)
-                self.swap_graph.add_edge(ginfo.qubits[1], ginfo.qubits[0], weight=swap_reliab)
-                self.cx_errors[(ginfo.qubits[0], ginfo.qubits[1])] = g_reliab
-                self.gate_list.append((ginfo.qubits[0], ginfo.qubits[1]))
-        idx = 0
-        for q in backend_prop.qubits:
-            for nduv in q:
-                if nduv.name == 'readout_error':
-                    self.readout_errors[idx] = 1.0 - nduv.value
-                    self.available_hw_qubits.append(idx)
-            idx += 1
-        for edge in self.cx_errors:
-            self.gate_cost[edge] = self.cx_errors[edge] * self.readout_errors[edge[0]] *\
-                self.readout_errors[edge[1]]
-        self.swap_paths, swap_costs_temp = nx.algorithms.shortest_paths.dense.\
-            floyd_warshall_predecessor_and_distance(self.swap_graph, weight='weight')
-        for i in swap_costs_temp:
-            self.swap_costs[i] = {}
-            for j in swap_costs_temp[i]:
-                if (i, j) in self.cx_errors:
-                    self.swap_costs[i][j] = self.cx_errors[(i, j)]
-                elif (j, i) in self.cx_errors:
-                    self.swap_costs[i][j] = self.cx_errors[(j, i)]
-                else:
-                    best_reliab = 0.0
-                    for n in self.swap_graph.neighbors(j):
-                        if (n, j) in self.cx_errors:
-                            reliab = math.exp(-swap_costs_temp[i][n])*self.cx_errors[(n, j)]
-                        else:
-                            reliab = math.exp(-swap_costs_temp[i][n])*self.cx_errors[(j, n)]
-                        if reliab > best_reliab:
-                            best_reliab = reliab
-                    self.swap_costs[i][j] = best_reliab
-
-    def _qarg_to_id(self, qubit):
-        """
-        Converts qarg with name and value to an integer id
-        """
-        return self.qarg_to_id[qubit.register.name + str(qubit.index)]
+        self.target_cache = target_cache
 
-    def _create_program_graph(self, dag):
+    @staticmethod
+    def _create_program_graph(dag):
         """
         Program graph has virtual qubits as nodes.
         Two nodes have an edge if the corresponding virtual qubits
         participate in a 2-qubit gate. The edge is weighted by the
         number of CNOTs between the pair.
         """
-        idx = 0
-        for q in dag.qubits():
-            self.qarg_to_id[q.register.name + str(q.index)] = idx
-            idx += 1
+        qarg_to_id = {qubit: idx for idx, qubit in enumerate(dag.qubits())}
+        prog_graph = nx.Graph()
         for gate in dag.twoQ_gates():
-            qid1 = self._qarg_to_id(gate.qargs[0])
-            qid2 = self._qarg_to_id(gate.qargs[1])
+            qid1 = qarg_to_id[gate.qargs[0]]
+            qid2 = qarg_to_id[gate.qargs[1]]
             min_q = min(qid1, qid2)
             max_q = max(qid1, qid2)
             edge_weight = 1
-            if self.prog_graph.has_edge(min_q, max_q):
-                edge_weight = self.prog_graph[min_q][max_q]['weight'] + 1
-            self.prog_graph.add_edge(min_q, max_q, weight=edge_weight)
-        return idx
-
-    def _select_next_edge(self):
-        """
-        If there is an edge with one endpoint mapped, return it.
-        Else return in the first edge
-        """
-        for edge in self.pending_program_edges:
-            q1_mapped = edge[0] in self.prog2hw
-            q2_mapped = edge[1] in self.prog2hw
-            assert not (q1_mapped and q2_mapped)
-            if q1_mapped or q2_mapped:
-                return edge
-        return self.pending_program_edges[0]
-
-    def _select_best_remaining_cx(self):
-        """
-        Select best remaining CNOT in the hardware for the next program edge.
-        """
-        candidates = []
-        for gate in self.gate_list:
-            chk1 = gate[0] in self.available_hw_qubits
-            chk2 = gate[1] in self.available_hw_qubits
-            if chk1 and chk2:
-                candidates.append(gate)
-        best_reliab = 0
-        best_item = None
-        for item in candidates:
-            if self.gate_cost[item] > best_reliab:
-                best_reliab = self.gate_cost[item]
-                best_item = item
-        return best_item
-
-    def _select_best_remaining_qubit(self, prog_qubit):
-        """
-        Select the best remaining hardware qubit for the next program qubit.
-        """
-        reliab_store = {}
-        for hw_qubit in self.available_hw_qubits:
-            reliab = 1
-            for n in self.prog_graph.neighbors(prog_qubit):
-                if n in self.prog2hw:
-                    reliab *= self.swap_costs[self.prog2hw[n]][hw_qubit]
-            reliab *= self.readout_errors[hw_qubit]
-            reliab_store[hw_qubit] = reliab
-        max_reliab = 0
-        best_hw_qubit = None
-        for hw_qubit in reliab_store:
-            if reliab_store[hw_qubit] > max_reliab:
-                max_reliab = reliab_store[hw_qubit]
-                best_hw_qubit = hw_qubit
-        return best_hw_qubit
+            if prog_graph.has_edge(min_q, max_q):
+                edge_weight = prog_graph[min_q][max_q]['weight'] + 1
+            prog_graph.add_edge(min_q, max_q, weight=edge_weight)
+        return qarg_to_id, prog_graph
 
     def run(self, dag):
         """Main run method for the noise adaptive layout."""
-        self._initialize_backend_prop()
-        num_qubits = self._create_program_graph(dag)
-        if num_qubits > len(self.swap_graph):
+        if self.target_cache is not None:
+            tables = self.target_cache.noise_adaptive_tables()
+        else:
+            tables = reliability_tables(self.backend_prop)
+        gate_list, gate_costs, readout_reliabs, has_readout, swap_reliabs = tables
+
+        qarg_to_id, prog_graph = self._create_program_graph(dag)
+        if len(qarg_to_id) > np.count_nonzero(has_readout):
             raise TranspilerError('Number of qubits greater than device.')
-        for end1, end2, _ in sorted(self.prog_graph.edges(data=True),
-                                    key=lambda x: x[2]['weight'], reverse=True):
-            self.pending_program_edges.append((end1, end2))
-        while self.pending_program_edges:
-            edge = self._select_next_edge()
-            q1_mapped = edge[0] in self.prog2hw
-            q2_mapped = edge[1] in self.prog2hw
-            if (not q1_mapped) and (not q2_mapped):
-                best_hw_edge = self._select_best_remaining_cx()
-                self.prog2hw[edge[0]] = best_hw_edge[0]
-                self.prog2hw[edge[1]] = best_hw_edge[1]
-                self.available_hw_qubits.remove(best_hw_edge[0])
-                self.available_hw_qubits.remove(best_hw_edge[1])
-            elif not q1_mapped:
-                best_hw_qubit = self._select_best_remaining_qubit(edge[0])
-                self.prog2hw[edge[0]] = best_hw_qubit
-                self.available_hw_qubits.remove(best_hw_qubit)
+        program_edges = [(end1, end2) for end1, end2, _ in
+                         sorted(prog_graph.edges(data=True),
+                                key=lambda x: x[2]['weight'], reverse=True)]
+        edge_ranks = {}
+        for rank, (end1, end2) in enumerate(program_edges):
+            edge_ranks.setdefault(end1, []).append(rank)
+            edge_ranks.setdefault(end2, []).append(rank)
+
+        available = has_readout.copy()
+        prog2hw = {}
+        # The hardware CX gates, best first. Once a qubit is taken, it stays
+        # taken, so the gates found unavailable are dropped for good.
+        cx_queue = [(-cost, index) for index, cost in enumerate(gate_costs)]
+        heapq.heapify(cx_queue)
+        # The ranks of the program edges with one endpoint mapped
+        frontier = []
+
+        def _map(prog_qubit, hw_qubit):
+            prog2hw[prog_qubit] = hw_qubit
+            available[hw_qubit] = False
+            for rank in edge_ranks.get(prog_qubit, []):
+                end1, end2 = program_edges[rank]
+                if end1 not in prog2hw or end2 not in prog2hw:
+                    heapq.heappush(frontier, rank)
+
+        def _best_remaining_qubit(prog_qubit):
+            # The reliability of the CNOTs with the mapped neighbors, and of the readout
+            reliabs = readout_reliabs.copy()
+            for neighbor in prog_graph.neighbors(prog_qubit):
+                if neighbor in prog2hw:
+                    reliabs *= swap_reliabs[prog2hw[neighbor]]
+            reliabs[~available] = -1
+            return int(np.argmax(reliabs))
+
+        next_edge = 0
+        while True:
+            # If there is an edge with one endpoint mapped, take the heaviest,
+            # else the heaviest edge left
+            edge = None
+            while frontier:
+                end1, end2 = program_edges[heapq.heappop(frontier)]
+                if end1 not in prog2hw or end2 not in prog2hw:
+                    edge = (end1, end2)
+                    break
+            while edge is None and next_edge < len(program_edges):
+                end1, end2 = program_edges[next_edge]
+                next_edge += 1
+                if end1 not in prog2hw and end2 not in prog2hw:
+                    edge = (end1, end2)
+            if edge is None:
+                break
+
+            if edge[0] not in prog2hw and edge[1] not in prog2hw:
+                best_hw_edge = None
+                while cx_queue and best_hw_edge is None:
+                    _, index = heapq.heappop(cx_queue)
+                    if available[gate_list[index][0]] and available[gate_list[index][1]]:
+                        best_hw_edge = gate_list[index]
+                if best_hw_edge is None:
+                    # No CX left between free qubits, place the ends one by one
+                    best_hw_edge = [_best_remaining_qubit(edge[0])]
+                    available[best_hw_edge[0]] = False
+                    best_hw_edge.append(_best_remaining_qubit(edge[1]))
+                    available[best_hw_edge[0]] = True
+                _map(edge[0], int(best_hw_edge[0]))
+                _map(edge[1], int(best_hw_edge[1]))
+            elif edge[0] not in prog2hw:
+                _map(edge[0], _best_remaining_qubit(edge[0]))
             else:
-                best_hw_qubit = self._select_best_remaining_qubit(edge[1])
-                self.prog2hw[edge[1]] = best_hw_qubit
-                self.available_hw_qubits.remove(best_hw_qubit)
-            new_edges = [x for x in self.pending_program_edges
-                         if not (x[0] in self.prog2hw and x[1] in self.prog2hw)]
-            self.pending_program_edges = new_edges
-        for qid in self.qarg_to_id.values():
-            if qid not in self.prog2hw:
-                self.prog2hw[qid] = self.available_hw_qubits[0]
-                self.available_hw_qubits.remove(self.prog2hw[qid])
+                _map(edge[1], _best_remaining_qubit(edge[1]))
+
+        free_hw_qubits = iter(np.flatnonzero(available).tolist())
         layout = Layout()
-        for q in dag.qubits():
-            pid = self._qarg_to_id(q)
-            hwid = self.prog2hw[pid]
-            layout[q] = hwid
+        for qubit, qid in qarg_to_id.items():
+            if qid not in prog2hw:
+                prog2hw[qid] = next(free_hw_qubits)
+            layout[qubit] = prog2hw[qid]
         self.property_set['layout'] = layout
+
+
+def reliability_tables(backend_prop):
+    """
+    Extract readout and CNOT reliabilities and compute swap reliabilities.
+
+    The reliability of a swap path is the product of the reliabilities of its
+    swaps, each one of three CNOTs: the most reliable paths are the shortest
+    paths for the weights -log(reliability), found with the Floyd-Warshall
+    algorithm on a dense matrix. The tables only depend on the backend
+    properties, so they can be computed once and shared between the runs of
+    the pass: the pass does not modify them.
+
+    Args:
+        backend_prop (BackendProperties): backend properties object
+
+    Returns:
+        tuple: The CX gates, as an array of pairs of qubits, the cost of each
+            one, the readout reliability of each qubit, whether it is known for
+            each qubit, and the swap reliabilities: the reliability of the
+            best CNOT from a qubit to another, after swapping it next to it.
+    """
+    gate_list = []
+    gate_reliabs = []
+    for ginfo in backend_prop.gates:
+        if ginfo.gate == 'cx':
+            g_reliab = 1.0
+            for item in ginfo.parameters:
+                if item.name == 'gate_error':
+                    g_reliab = 1.0 - item.value
+                    break
+            gate_list.append(ginfo.qubits[:2])
+            gate_reliabs.append(g_reliab)
+    num_qubits = max([len(backend_prop.qubits)] + [max(gate) + 1 for gate in gate_list])
+    gate_list = np.array(gate_list, dtype=int).reshape(-1, 2)
+    gate_reliabs = np.array(gate_reliabs, dtype=float)
+
+    readout_reliabs = np.zeros(num_qubits)
+    has_readout = np.zeros(num_qubits, dtype=bool)
+    for idx, qubit in enumerate(backend_prop.qubits):
+        for nduv in qubit:
+            if nduv.name == 'readout_error':
+                readout_reliabs[idx] = 1.0 - nduv.value
+                has_readout[idx] = True
+
+    # cx_reliabs[i, j] is the reliability of the CNOT i-j, or else j-i
+    cx_reliabs = np.zeros((num_qubits, num_qubits))
+    linked = np.zeros((num_qubits, num_qubits), dtype=bool)
+    cx_reliabs[gate_list[:, 1], gate_list[:, 0]] = gate_reliabs
+    cx_reliabs[gate_list[:, 0], gate_list[:, 1]] = gate_reliabs
+    linked[gate_list[:, 0], gate_list[:, 1]] = linked[gate_list[:, 1], gate_list[:, 0]] = True
+
+    # A swap is three CNOTs. The last calibrated direction of a pair counts
+    swap_costs = np.full((num_qubits, num_qubits), np.inf)
+    with np.errstate(divide='ignore'):
+        for (first, second), g_reliab in zip(gate_list.tolist(), gate_reliabs):
+            swap_costs[first, second] = swap_costs[second, first] = -3 * np.log(g_reliab)
+    np.fill_diagonal(swap_costs, 0)
+    for k in range(num_qubits):
+        np.minimum(swap_costs, swap_costs[:, k, None] + swap_costs[None, k, :], out=swap_costs)
+    path_reliabs = np.exp(-swap_costs)
+
+    # The best CNOT from j to a neighbor of j, after swapping i there
+    swap_reliabs = np.empty((num_qubits, num_qubits))
+    for i in range(num_qubits):
+        swap_reliabs[i] = np.max(path_reliabs[i, :, None] * cx_reliabs, axis=0)
+    swap_reliabs[linked] = cx_reliabs[linked]
+
+    gate_costs = gate_reliabs * readout_reliabs[gate_list[:, 0]] * \
+        readout_reliabs[gate_list[:, 1]]
+    for table in (gate_list, gate_costs, readout_reliabs, has_readout, swap_reliabs):
+        table.setflags(write=False)
+    return gate_list, gate_costs, readout_reliabs, has_readout, swap_reliabs
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A pass for choosing a Layout of a circuit onto a Coupling graph, by
+routing the circuit back and forth with the SABRE heuristic.
+
+Routing a circuit from a layout ends in a final layout that suits the end
+of the circuit. Routing the reversed circuit from there ends in a layout
+that suits its beginning. Each round trip refines the initial layout.
+
+Note: even though a 'layout' is not strictly a property of the DAG,
+in the transpiler architecture it is best passed around between passes by
+being set in `property_set`.
+"""
+
+import numpy as np
+
+from qiskit.transpiler.layout import ArrayLayout
+from qiskit.transpiler.basepasses import AnalysisPass
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.transpiler.passes.mapping.sabre_swap import (SabreRouter, dag_gates,
+                                                         reverse_successors)
+
+
+class SabreLayout(AnalysisPass):
+    """
+    Chooses a Layout by routing the circuit forward and backward with the SABRE heuristic.
+    """
+
+    def __init__(self, coupling_map, backend_properties=None, max_iterations=3, seed=None):
+        """
+        Chooses a SabreLayout
+
+        Args:
+            coupling_map (Coupling): directed graph representing a coupling map.
+            backend_properties (BackendProperties): If given, the distance
+                between the qubits is weighted by the CX errors.
+            max_iterations (int): The number of forward and backward routings.
+            seed (int): Seed of the random initial layout, used when the
+                property `layout` is not set.
+        """
+        super().__init__()
+        self.reads = ['layout']
+        self.writes = ['layout']
+        self.coupling_map = coupling_map
+        self.backend_properties = backend_properties
+        self.max_iterations = max_iterations
+        self.seed = seed
+
+    def run(self, dag):
+        """
+        Refine the property `layout`, or a random layout if it is not set.
+
+        Args:
+            dag (DAGCircuit): DAG to find layout for.
+
+        Raises:
+            TranspilerError: if dag wider than self.coupling_map
+        """
+        num_physical = self.coupling_map.size()
+        virtual_bits = dag.qubits()
+        if len(virtual_bits) > num_physical:
+            raise TranspilerError('Number of qubits greater than device.')
+
+        initial_layout = self.property_set['layout']
+        if initial_layout is None:
+            permutation = np.random.RandomState(self.seed).permutation(num_physical)
+            layout = ArrayLayout(virtual_bits + [None] * (num_physical - len(virtual_bits)),
+                                 permutation)
+        else:
+            virtual_to_physical = initial_layout.get_virtual_bits()
+            if any(bit not in virtual_to_physical for bit in virtual_bits):
+                raise TranspilerError('The layout does not cover the qubits of the DAG.')
+            physical = [virtual_to_physical[bit] for bit in virtual_bits]
+            idle_physical = sorted(set(range(num_physical)) - set(physical))
+            layout = ArrayLayout(virtual_bits + [None] * len(idle_physical),
+                                 physical + idle_physical)
+
+        router = SabreRouter(self.coupling_map, self.backend_properties)
+        _, gate_qubits, successors = dag_gates(dag, layout)
+        predecessors = reverse_successors(successors)
+        for _ in range(self.max_iterations):
+            _, layout = router.route(gate_qubits, successors, layout)
+            _, layout = router.route(gate_qubits, predecessors, layout)
+
+        self.property_set['layout'] = layout.to_layout()
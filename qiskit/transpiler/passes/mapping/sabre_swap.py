@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+A pass implementing the SABRE heuristic swap mapper.
+
+The mapper walks through the DAG keeping a front layer: the gates whose
+predecessors have all been mapped. The gates of the front layer that can be
+executed on the current layout are mapped, and their successors join the
+front layer. When none can be executed, a SWAP is added on one of the edges
+touching the qubits of the front layer, the one minimizing
+
+    max(decay(q1), decay(q2)) * (sum_F d / |F| + W * sum_E d / |E|)
+
+where F is the front layer, E is an extended set of the next two-qubit gates
+and d the distance between the physical qubits of a gate after the SWAP. The
+decay of a qubit increases each time it is swapped, so that SWAPs on
+different qubits, which can run in parallel, are preferred.
+
+The distance is the number of hops in the coupling map or, if backend
+properties are given, the length of the path weighted by the CX errors.
+
+For more details on the algorithm, see:
+G. Li, Y. Ding, Y. Xie, "Tackling the Qubit Mapping Problem for NISQ-Era
+Quantum Devices", ASPLOS 2019. https://arxiv.org/abs/1809.02573
+"""
+
+import numpy as np
+
+from qiskit.circuit import Gate
+from qiskit.circuit.quantumregister import QuantumRegister
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.extensions.standard import SwapGate
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.transpiler.layout import Layout, ArrayLayout
+
+EXTENDED_SET_SIZE = 20
+EXTENDED_SET_WEIGHT = 0.5
+DECAY_RATE = 0.001
+DECAY_RESET_INTERVAL = 5
+
+
+class SabreSwap(TransformationPass):
+    """Map input circuit onto a backend topology via insertion of SWAPs,
+    with the SABRE heuristic."""
+
+    def __init__(self, coupling_map, backend_properties=None, heuristic='decay'):
+        """Initialize a SabreSwap instance.
+
+        Args:
+            coupling_map (CouplingMap): CouplingMap of the target backend.
+            backend_properties (BackendProperties): If given, the distance
+                between the qubits is weighted by the CX errors.
+            heuristic (str): The cost of a SWAP, 'basic' (front layer only),
+                'lookahead' (with the extended set) or 'decay' (lookahead,
+                scaled by the decay of the qubits).
+        """
+        super().__init__()
+        self.coupling_map = coupling_map
+        self.backend_properties = backend_properties
+        self.heuristic = heuristic
+
+    def run(self, dag):
+        """Run the SabreSwap pass on `dag`.
+
+        Args:
+            dag (DAGCircuit): DAG to map.
+
+        Returns:
+            DAGCircuit: A mapped DAG.
+
+        Raises:
+            TranspilerError: if the coupling map or the layout are not
+            compatible with the DAG, or if the DAG has a gate on more than two
+            qubits.
+        """
+        if len(dag.qregs) != 1 or dag.qregs.get('q', None) is None:
+            raise TranspilerError('Sabre swap runs on physical circuits only')
+
+        if len(dag.qubits()) > len(self.coupling_map.physical_qubits):
+            raise TranspilerError('The layout does not match the amount of qubits in the DAG')
+
+        three_qubit_gates = dag.threeQ_or_more_gates()
+        if three_qubit_gates:
+            raise TranspilerError('Sabre swap only routes gates on up to two qubits, not %s'
+                                  % three_qubit_gates[0].name)
+
+        router = SabreRouter(self.coupling_map, self.backend_properties, self.heuristic)
+        canonical_register = dag.qregs['q']
+        layout = ArrayLayout.from_layout(Layout.generate_trivial_layout(canonical_register),
+                                         num_physical=self.coupling_map.size())
+        nodes, gate_qubits, successors = dag_gates(dag, layout)
+        events, _ = router.route(gate_qubits, successors, layout.copy())
+
+        # Preserve input DAG's name and cregs, on a register matching the coupling_map
+        new_dag = DAGCircuit()
+        new_dag.name = dag.name
+        device_register = QuantumRegister(self.coupling_map.size(), 'q')
+        new_dag.add_qreg(device_register)
+        for creg in dag.cregs.values():
+            new_dag.add_creg(creg)
+
+        for event in events:
+            if isinstance(event, tuple):
+                new_dag.apply_operation_back(SwapGate(), [device_register[event[0]],
+                                                          device_register[event[1]]], [])
+                layout.swap(*event)
+            else:
+                node = nodes[event]
+                qargs = [device_register[layout[qubit]] for qubit in node.qargs]
+                new_dag.apply_operation_back(node.op, qargs, node.cargs, node.condition)
+
+        return new_dag
+
+
+def dag_gates(dag, layout):
+    """Describe the operations of a DAG for the SabreRouter.
+
+    Args:
+        dag (DAGCircuit): The DAG.
+        layout (ArrayLayout): The layout numbering the qubits of the DAG.
+
+    Returns:
+        tuple: the op nodes in topological order; for each of them, the
+            pair of qubit indices of the two-qubit gates, or None for the
+            operations that do not need routing; and the indices of their
+            successors.
+    """
+    nodes = list(dag.topological_op_nodes())
+    node_index = {node: index for index, node in enumerate(nodes)}
+    gate_qubits = []
+    successors = []
+    for node in nodes:
+        if isinstance(node.op, Gate) and len(node.qargs) == 2:
+            gate_qubits.append((layout.virtual_index(node.qargs[0]),
+                                layout.virtual_index(node.qargs[1])))
+        else:
+            gate_qubits.append(None)
+        successors.append([node_index[successor] for successor in dag.successors(node)
+                           if successor.type == 'op'])
+    return nodes, gate_qubits, successors
+
+
+def reverse_successors(successors):
+    """Returns the successors in the reversed DAG, that is, the predecessors."""
+    predecessors = [[] for _ in successors]
+    for index, node_successors in enumerate(successors):
+        for successor in node_successors:
+            predecessors[successor].append(index)
+    return predecessors
+
+
+class SabreRouter:
+    """The routing of the SABRE mapper, on integer layouts."""
+
+    def __init__(self, coupling_map, backend_properties=None, heuristic='decay',
+                 extended_set_size=EXTENDED_SET_SIZE, extended_set_weight=EXTENDED_SET_WEIGHT,
+                 decay_rate=DECAY_RATE, decay_reset_interval=DECAY_RESET_INTERVAL):
+        """Prepare the distance matrix of the coupling map.
+
+        Args:
+            coupling_map (CouplingMap): CouplingMap of the target backend.
+            backend_properties (BackendProperties): If given, the distance
+                between the qubits is weighted by the CX errors.
+            heuristic (str): 'basic', 'lookahead' or 'decay'.
+            extended_set_size (int): Number of upcoming two-qubit gates in the extended set.
+            extended_set_weight (float): Weight W of the extended set in the cost.
+            decay_rate (float): Increase of the decay of a qubit when it is swapped.
+            decay_reset_interval (int): Number of SWAPs after which the decay is reset.
+
+        Raises:
+            TranspilerError: if the heuristic is not known.
+        """
+        if heuristic not in ('basic', 'lookahead', 'decay'):
+            raise TranspilerError('Heuristic %s not recognized.' % heuristic)
+        self.heuristic = heuristic
+        self.extended_set_size = extended_set_size
+        self.extended_set_weight = extended_set_weight
+        self.decay_rate = decay_rate
+        self.decay_reset_interval = decay_reset_interval
+        self.coupling_map = coupling_map
+
+        num_physical = coupling_map.size()
+        self.neighbors = [sorted(set(coupling_map.graph.successors(physical)) |
+                                 set(coupling_map.graph.predecessors(physical)))
+                          for physical in range(num_physical)]
+        self.adjacency = np.zeros((num_physical, num_physical), dtype=bool)
+        for physical, neighbors in enumerate(self.neighbors):
+            self.adjacency[physical, neighbors] = True
+        if backend_properties is None:
+            if coupling_map._dist_matrix is None:
+                coupling_map._compute_distance_matrix()
+            self.distance = coupling_map._dist_matrix
+        else:
+            self.distance = _error_weighted_distance(coupling_map, backend_properties)
+        # After this many SWAPs without mapping a gate, route a gate along a shortest path
+        self.max_swaps_without_progress = 10 * num_physical
+
+    def route(self, gate_qubits, successors, layout):
+        """Route the operations.
+
+        Args:
+            gate_qubits (list): The pair of qubit indices of each two-qubit gate,
+                or None for the operations that do not need routing.
+            successors (list): The indices of the successors of each operation.
+            layout (ArrayLayout): The initial layout. It is updated with the
+                SWAPs added, to the final layout.
+
+        Returns:
+            tuple: the list of events, the index of an operation when it is
+                mapped or a pair of physical qubits when a SWAP is added; and
+                the final layout.
+        """
+        num_predecessors = [0] * len(gate_qubits)
+        for node_successors in successors:
+            for successor in node_successors:
+                num_predecessors[successor] += 1
+        front_layer = [index for index, count in enumerate(num_predecessors) if count == 0]
+        logic_to_phys = layout.logic_to_phys
+        decay = np.ones(len(layout))
+        events = []
+        num_swaps = 0
+        swaps_since_progress = 0
+
+        while front_layer:
+            executed = [index for index in front_layer
+                        if gate_qubits[index] is None or
+                        self.adjacency[logic_to_phys[gate_qubits[index][0]],
+                                       logic_to_phys[gate_qubits[index][1]]]]
+            if executed:
+                events.extend(executed)
+                executed_set = set(executed)
+                front_layer = [index for index in front_layer if index not in executed_set]
+                for index in executed:
+                    for successor in successors[index]:
+                        num_predecessors[successor] -= 1
+                        if num_predecessors[successor] == 0:
+                            front_layer.append(successor)
+                decay[:] = 1
+                swaps_since_progress = 0
+                continue
+
+            if swaps_since_progress >= self.max_swaps_without_progress:
+                # Give up on the heuristic, bring the qubits of a gate together
+                first, second = gate_qubits[front_layer[0]]
+                path = self.coupling_map.shortest_undirected_path(
+                    logic_to_phys.item(first), logic_to_phys.item(second))
+                for start, end in zip(path[:-2], path[1:-1]):
+                    events.append((start, end))
+                    layout.swap(start, end)
+                swaps_since_progress = 0
+                continue
+
+            swap = self._best_swap(gate_qubits, successors, front_layer, logic_to_phys, decay)
+            events.append(swap)
+            layout.swap(*swap)
+            decay[list(swap)] += self.decay_rate
+            num_swaps += 1
+            swaps_since_progress += 1
+            if num_swaps % self.decay_reset_interval == 0:
+                decay[:] = 1
+
+        return events, layout
+
+    def _extended_set(self, gate_qubits, successors, front_layer):
+        """The first upcoming two-qubit gates after the front layer, in breadth first order."""
+        extended_set = []
+        seen = set(front_layer)
+        to_visit = list(front_layer)
+        while to_visit and len(extended_set) < self.extended_set_size:
+            next_visit = []
+            for index in to_visit:
+                for successor in successors[index]:
+                    if successor not in seen:
+                        seen.add(successor)
+                        next_visit.append(successor)
+                        if gate_qubits[successor] is not None and \
+                                len(extended_set) < self.extended_set_size:
+                            extended_set.append(successor)
+            to_visit = next_visit
+        return extended_set
+
+    def _best_swap(self, gate_qubits, successors, front_layer, logic_to_phys, decay):
+        """The SWAP of lowest cost, on an edge touching a qubit of the front layer."""
+        front_qubits = np.array([gate_qubits[index] for index in front_layer])
+        front_physical = logic_to_phys[front_qubits]
+        candidates = sorted({tuple(sorted((physical, neighbor)))
+                             for physical in np.unique(front_physical).tolist()
+                             for neighbor in self.neighbors[physical]})
+        candidates = np.array(candidates)
+
+        cost = self._swapped_distance(front_physical, candidates).sum(axis=1)
+        if self.heuristic != 'basic':
+            cost /= len(front_layer)
+            extended_set = self._extended_set(gate_qubits, successors, front_layer)
+            if extended_set:
+                extended_physical = logic_to_phys[np.array([gate_qubits[index]
+                                                            for index in extended_set])]
+                cost += self.extended_set_weight * self._swapped_distance(
+                    extended_physical, candidates).sum(axis=1) / len(extended_set)
+            if self.heuristic == 'decay':
+                cost *= np.maximum(decay[candidates[:, 0]], decay[candidates[:, 1]])
+        return tuple(candidates[np.argmin(cost)].tolist())
+
+    def _swapped_distance(self, physical_pairs, candidates):
+        """The distance of the pairs of physical qubits after each candidate SWAP.
+
+        Args:
+            physical_pairs (ndarray): Array of shape (gates, 2).
+            candidates (ndarray): Array of shape (swaps, 2).
+
+        Returns:
+            ndarray: Array of shape (swaps, gates).
+        """
+        first = candidates[:, 0, np.newaxis, np.newaxis]
+        second = candidates[:, 1, np.newaxis, np.newaxis]
+        swapped = np.where(physical_pairs == first, second,
+                           np.where(physical_pairs == second, first, physical_pairs))
+        return self.distance[swapped[:, :, 0], swapped[:, :, 1]]
+
+
+def _error_weighted_distance(coupling_map, backend_properties):
+    """The distance matrix of the coupling map, with edges weighted by their CX error.
+
+    The cost of an edge is -log(1 - error). Its weight is half a hop plus half
+    its cost relative to the mean cost, so that the mean weight is one and
+    error-free edges still count. Edges without a CX error weigh one.
+    """
+    from scipy.sparse import csr_matrix
+    from scipy.sparse.csgraph import shortest_path
+
+    costs = {}
+    for gate in backend_properties.gates:
+        if gate.gate == 'cx':
+            for param in gate.parameters:
+                if param.name == 'gate_error':
+                    error = min(param.value, 1 - 1e-9)
+                    costs[tuple(sorted(gate.qubits))] = -np.log(1 - error)
+    edges = sorted({tuple(sorted(edge)) for edge in coupling_map.get_edges()})
+    known = [costs[edge] for edge in edges if edge in costs]
+    mean_cost = np.mean(known) if known else 0
+    num_physical = coupling_map.size()
+    graph = np.zeros((num_physical, num_physical))
+    for edge in edges:
+        if edge in costs and mean_cost > 0:
+            weight = 0.5 + 0.5 * costs[edge] / mean_cost
+        else:
+            weight = 1
+        graph[edge] = graph[edge[::-1]] = weight
+    return shortest_path(csr_matrix(graph), directed=False)
@@ -33,6 +33,8 @@ class SetLayout(AnalysisPass):
             layout (Layout): the layout to set.
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['layout']
         self.layout = layout
 
     def run(self, dag):
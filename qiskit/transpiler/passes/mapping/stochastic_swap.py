@@ -16,10 +16,11 @@
 A pass implementing the default Qiskit stochastic mapper.
 """
 
+import os
 from logging import getLogger
 from pprint import pformat
-from math import inf
 from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
 from qiskit.circuit.quantumregister import QuantumRegister
@@ -27,11 +28,10 @@ from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.transpiler.exceptions import TranspilerError
 from qiskit.dagcircuit import DAGCircuit
 from qiskit.extensions.standard import SwapGate
-from qiskit.transpiler.layout import Layout
+from qiskit.transpiler.layout import Layout, ArrayLayout
+from qiskit.tools.parallel import CPU_COUNT
 # pylint: disable=no-name-in-module
-from .cython.stochastic_swap.utils import nlayout_from_layout
-# pylint: disable=no-name-in-module
-from .cython.stochastic_swap.swap_trial import swap_trial
+from .cython.stochastic_swap.swap_trial import SwapTrials
 logger = getLogger(__name__)
 
 
@@ -51,7 +51,7 @@ class StochasticSwap(TransformationPass):
     Uses a randomized algorithm.
     """
 
-    def __init__(self, coupling_map, trials=20, seed=None):
+    def __init__(self, coupling_map, trials=20, seed=None, max_workers=None):
         """
         Map a DAGCircuit onto a `coupling_map` using swap gates.
 
@@ -64,13 +64,19 @@ class StochasticSwap(TransformationPass):
                 map.
             trials (int): maximum number of iterations to attempt
             seed (int): seed for random number generator
+            max_workers (int): maximum number of threads running the trials of a
+                layer at the same time. By default, the number of CPUs, or one
+                when already running in a parallel process. The result does
+                not depend on it.
         """
         super().__init__()
         self.coupling_map = coupling_map
         self.trials = trials
         self.seed = seed
+        self.max_workers = max_workers
         self.qregs = None
         self.rng = None
+        self.executor = None
         self.trivial_layout = None
 
     def run(self, dag):
@@ -103,7 +109,17 @@ class StochasticSwap(TransformationPass):
         self.rng = np.random.RandomState(self.seed)
         logger.debug("StochasticSwap RandomState seeded with seed=%s", self.seed)
 
-        new_dag = self._mapper(dag, self.coupling_map, trials=self.trials)
+        max_workers = self.max_workers
+        if max_workers is None:
+            max_workers = 1 if os.getenv('QISKIT_IN_PARALLEL') == 'TRUE' else CPU_COUNT
+        if max_workers > 1:
+            self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        try:
+            new_dag = self._mapper(dag, self.coupling_map, trials=self.trials)
+        finally:
+            if self.executor is not None:
+                self.executor.shutdown()
+                self.executor = None
         return new_dag
 
     def _layer_permutation(self, layer_partition, layout, qubit_subset,
@@ -142,7 +158,8 @@ class StochasticSwap(TransformationPass):
      """
         return _layer_permutation(layer_partition,
                                   layout, qubit_subset,
-                                  coupling, trials, self.rng)
+                                  coupling, trials, self.rng,
+                                  self.executor)
 
     def _layer_update(self, i, best_layout, best_depth,
                       best_circuit, layer_list):
@@ -210,7 +227,7 @@ class StochasticSwap(TransformationPass):
         qubit_subset = self.trivial_layout.get_virtual_bits().keys()
 
         # Find swap circuit to precede each layer of input circuit
-        layout = self.trivial_layout.copy()
+        layout = ArrayLayout.from_layout(self.trivial_layout, num_physical=coupling_graph.size())
 
         # Construct an empty DAGCircuit with the same set of
         # qregs and cregs as the input circuit
@@ -311,13 +328,13 @@ class StochasticSwap(TransformationPass):
 
 
 def _layer_permutation(layer_partition, layout, qubit_subset,
-                       coupling, trials, rng):
+                       coupling, trials, rng, executor=None):
     """Find a swap circuit that implements a permutation for this layer.
 
     Args:
         layer_partition (list): The layer_partition is a list of (qu)bit
             lists and each qubit is a tuple (qreg, index).
-        layout (Layout): The layout is a Layout object mapping virtual
+        layout (Layout or ArrayLayout): The layout mapping virtual
             qubits in the input circuit to physical qubits in the coupling
             graph. It reflects the current positions of the data.
         qubit_subset (list): The qubit_subset is the set of qubits in
@@ -328,9 +345,11 @@ def _layer_permutation(layer_partition, layout, qubit_subset,
             stochastic mapper.
         trials (int): Number of attempts the randomized algorithm makes.
         rng (RandomState): Random number generator.
+        executor (Executor): If given, the trials are run on its threads.
 
     Returns:
         Tuple: success_flag, best_circuit, best_depth, best_layout, trivial_flag
+            where best_layout is an ArrayLayout.
 
     Raises:
         TranspilerError: if anything went wrong.
@@ -345,8 +364,10 @@ def _layer_permutation(layer_partition, layout, qubit_subset,
 
     # The input dag is on a flat canonical register
     # TODO: cleanup the code that is general for multiple qregs below
-    canonical_register = QuantumRegister(len(layout), 'q')
+    canonical_register = QuantumRegister(len(layout.get_virtual_bits()), 'q')
     qregs = OrderedDict({canonical_register.name: canonical_register})
+    if not isinstance(layout, ArrayLayout):
+        layout = ArrayLayout.from_layout(layout, list(canonical_register), coupling.size())
 
     gates = []  # list of lists of tuples [[(register, index), ...], ...]
     for gate_args in layer_partition:
@@ -366,20 +387,11 @@ def _layer_permutation(layer_partition, layout, qubit_subset,
         circ.add_qreg(canonical_register)
         return True, circ, 0, layout, (not bool(gates))
 
-    # Begin loop over trials of randomized algorithm
     num_qubits = len(layout)
-    best_depth = inf  # initialize best depth
-    best_edges = None  # best edges found
-    best_circuit = None  # initialize best swap circuit
-    best_layout = None  # initialize best final layout
-
     cdist2 = coupling._dist_matrix**2
-    # Scaling matrix
-    scale = np.zeros((num_qubits, num_qubits))
 
     int_qubit_subset = regtuple_to_numeric(qubit_subset, qregs)
     int_gates = gates_to_idx(gates, qregs)
-    int_layout = nlayout_from_layout(layout, qregs, coupling.size())
 
     trial_circuit = DAGCircuit()  # SWAP circuit for this trial
     for qubit in layout.get_virtual_bits().keys():
@@ -392,31 +404,29 @@ def _layer_permutation(layer_partition, layout, qubit_subset,
             slice_circuit.add_qreg(qubit.register)
     edges = np.asarray(coupling.get_edges(), dtype=np.int32).ravel()
     cdist = coupling._dist_matrix
-    for trial in range(trials):
-        logger.debug("layer_permutation: trial %s", trial)
-        # This is one Trial --------------------------------------
-        dist, optim_edges, trial_layout, depth_step = swap_trial(num_qubits, int_layout,
-                                                                 int_qubit_subset,
-                                                                 int_gates, cdist2,
-                                                                 cdist, edges, scale,
-                                                                 rng)
-
-        logger.debug("layer_permutation: final distance for this trial = %s", dist)
-        if dist == len(gates) and depth_step < best_depth:
-            logger.debug("layer_permutation: got circuit with improved depth %s",
-                         depth_step)
-            best_edges = optim_edges
-            best_layout = trial_layout
-            best_depth = min(best_depth, depth_step)
-
-        # Break out of trial loop if we found a depth 1 circuit
-        # since we can't improve it further
-        if best_depth == 1:
-            break
+
+    # Draw the random perturbations of all the trials up front, so that the
+    # trials can run in parallel. Each trial uses its own row of the stream.
+    num_rand = num_qubits * (num_qubits + 1) // 2
+    rng_state = rng.get_state()
+    rand = 1.0 + rng.normal(0.0, 1.0 / num_qubits, size=(trials, num_rand))
+
+    # The trials stop early once a trial finds a depth 1 circuit,
+    # since we can't improve it further
+    num_used, best_edges, best_logic_to_phys, best_phys_to_logic, best_depth = \
+        SwapTrials(num_qubits, layout.logic_to_phys, layout.phys_to_logic,
+                   int_qubit_subset, int_gates, cdist2, cdist, edges, rand).run(executor)
+    logger.debug("layer_permutation: used %s trials", num_used)
+
+    # Leave the random number generator as if only the trials used had drawn
+    # numbers, so the result does not depend on the number of threads.
+    if num_used < trials:
+        rng.set_state(rng_state)
+        rng.normal(0.0, 1.0 / num_qubits, size=num_used * num_rand)
 
     # If we have no best circuit for this layer, all of the
     # trials have failed
-    if best_layout is None:
+    if best_edges is None:
         logger.debug("layer_permutation: failed!")
         return False, None, None, None, False
 
@@ -430,8 +440,8 @@ def _layer_permutation(layer_partition, layout, qubit_subset,
 
     # Otherwise, we return our result for this layer
     logger.debug("layer_permutation: success!")
-    best_lay = best_layout.to_layout(qregs)
-    return True, best_circuit, best_depth, best_lay, False
+    best_layout = ArrayLayout(layout.virtual_bits, best_logic_to_phys, best_phys_to_logic)
+    return True, best_circuit, best_depth, best_layout, False
 
 
 def regtuple_to_numeric(items, qregs):
@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+A pass routing the dense layers of commuting two-qubit gates with swap networks.
+
+In QAOA and chemistry-style circuits, most two-qubit gates are diagonal in the
+computational basis, such as cu1, crz, rzz or a cx-u1-cx sequence. Diagonal
+gates commute, so a layer of them can be executed in any order: in particular
+whenever the qubits of a gate happen to be neighbors.
+
+The pass walks the DAG collecting the diagonal gates that can run next into a
+block, until only other operations can run. If the block is dense, its qubits
+are first gathered on a segment of a long path of the coupling map, and then
+the odd-even transposition network is run on the segment: swaps on the even
+edges, then on the odd edges, and so on. It reverses the order of the qubits,
+and each pair of qubits is adjacent at some point, at which its gates are
+executed. A block of n qubits then costs at most n layers of swaps, however
+many gates it has. The sparse blocks and the other gates are routed one gate
+at a time, along shortest paths.
+
+For more details on swap networks, see:
+B. O'Gorman, W. J. Huggins, E. G. Rieffel, K. B. Whaley, "Generalized swap
+networks for near-term quantum computing", https://arxiv.org/abs/1905.05118
+"""
+
+from qiskit.circuit import Gate
+from qiskit.circuit.quantumregister import QuantumRegister
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.extensions.standard import SwapGate
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.exceptions import TranspilerError
+
+# The gates that are diagonal in the computational basis, so commute with each other
+DIAGONAL_GATES = frozenset(['id', 'u1', 'rz', 'z', 's', 'sdg', 't', 'tdg',
+                            'cz', 'cu1', 'crz', 'rzz'])
+
+
+class SwapNetworkSwap(TransformationPass):
+    """Map input circuit onto a backend topology via insertion of SWAPs,
+    with swap networks for the dense layers of commuting gates."""
+
+    def __init__(self, coupling_map):
+        """Initialize a SwapNetworkSwap instance.
+
+        Args:
+            coupling_map (CouplingMap): CouplingMap of the target backend.
+        """
+        super().__init__()
+        self.coupling_map = coupling_map
+
+    def run(self, dag):
+        """Run the SwapNetworkSwap pass on `dag`.
+
+        Args:
+            dag (DAGCircuit): DAG to map.
+
+        Returns:
+            DAGCircuit: A mapped DAG.
+
+        Raises:
+            TranspilerError: if the coupling map or the layout are not
+            compatible with the DAG, or if the DAG has gates on more than
+            two qubits.
+        """
+        if len(dag.qregs) != 1 or dag.qregs.get('q', None) is None:
+            raise TranspilerError('Swap network swap runs on physical circuits only')
+
+        if len(dag.qubits()) > len(self.coupling_map.physical_qubits):
+            raise TranspilerError('The layout does not match the amount of qubits in the DAG')
+
+        # Preserve input DAG's name and cregs, on a register matching the coupling_map
+        new_dag = DAGCircuit()
+        new_dag.name = dag.name
+        device_register = QuantumRegister(self.coupling_map.size(), 'q')
+        new_dag.add_qreg(device_register)
+        for creg in dag.cregs.values():
+            new_dag.add_creg(creg)
+
+        router = _NetworkRouter(self.coupling_map, new_dag, device_register)
+        nodes = list(dag.topological_op_nodes())
+        node_index = {node: index for index, node in enumerate(nodes)}
+        successors = [[] for _ in nodes]
+        wire_successor = [{} for _ in nodes]
+        num_predecessors = [0] * len(nodes)
+        for source, dest, data in dag.edges(nodes):
+            if dest.type == 'op':
+                wire_successor[node_index[source]][data['wire']] = node_index[dest]
+        for index, node in enumerate(nodes):
+            if isinstance(node.op, Gate) and len(node.qargs) > 2:
+                raise TranspilerError('Swap network swap only routes gates on up to two '
+                                      'qubits, not %s' % node.name)
+            successors[index] = sorted(set(wire_successor[index].values()))
+            for successor in successors[index]:
+                num_predecessors[successor] += 1
+
+        front = [index for index in range(len(nodes)) if not num_predecessors[index]]
+
+        def _release(unit):
+            released = []
+            for index in unit:
+                for successor in successors[index]:
+                    num_predecessors[successor] -= 1
+                    if not num_predecessors[successor] and successor not in unit:
+                        released.append(successor)
+            return released
+
+        while front:
+            # Collect the diagonal gates that can run next into a block. The
+            # other operations of the front layer do not share a wire with them.
+            block = []
+            others = []
+            while front:
+                index = front.pop()
+                unit = _diagonal_unit(nodes, wire_successor, num_predecessors, index)
+                if unit is None:
+                    others.append(index)
+                else:
+                    block.append([nodes[unit_index] for unit_index in unit])
+                    front.extend(_release(unit))
+            router.route_block(block)
+            for index in sorted(others):
+                router.route_node(nodes[index])
+                front.extend(_release([index]))
+
+        return new_dag
+
+
+def _diagonal_unit(nodes, wire_successor, num_predecessors, index):
+    """The indices of the nodes of the diagonal gate starting at nodes[index],
+    or None if there is none.
+
+    A diagonal gate is a gate of DIAGONAL_GATES, or a cx, diagonal gates on its
+    target, and the same cx: the cx permutes the basis states, and undoes it.
+    """
+    node = nodes[index]
+    if node.condition is not None or not isinstance(node.op, Gate):
+        return None
+    if node.name in DIAGONAL_GATES:
+        return [index]
+    if node.name != 'cx':
+        return None
+    control, target = node.qargs
+    unit = [index]
+    next_index = wire_successor[index].get(target)
+    while next_index is not None and nodes[next_index].name in DIAGONAL_GATES \
+            and len(nodes[next_index].qargs) == 1 and nodes[next_index].condition is None:
+        unit.append(next_index)
+        next_index = wire_successor[next_index].get(target)
+    if next_index is None or wire_successor[index].get(control) != next_index:
+        return None
+    closing = nodes[next_index]
+    if closing.name != 'cx' or closing.qargs != node.qargs or closing.condition is not None \
+            or num_predecessors[next_index] != 2:
+        return None
+    unit.append(next_index)
+    return unit
+
+
+class _NetworkRouter:
+    """Inserts the swaps and the gates into the mapped DAG, tracking the layout."""
+
+    def __init__(self, coupling_map, new_dag, device_register):
+        self.coupling_map = coupling_map
+        self.new_dag = new_dag
+        self.device_register = device_register
+        num_physical = coupling_map.size()
+        self.logic_to_phys = list(range(num_physical))
+        self.phys_to_logic = list(range(num_physical))
+        self.neighbors = [set() for _ in range(num_physical)]
+        for first, second in coupling_map.get_edges():
+            if first != second:
+                self.neighbors[first].add(second)
+                self.neighbors[second].add(first)
+        self.path = _long_path(self.neighbors)
+
+    def swap(self, first, second):
+        """Swap the physical qubits first and second."""
+        self.new_dag.apply_operation_back(SwapGate(), [self.device_register[first],
+                                                       self.device_register[second]], [])
+        left, right = self.phys_to_logic[first], self.phys_to_logic[second]
+        self.phys_to_logic[first], self.phys_to_logic[second] = right, left
+        self.logic_to_phys[left], self.logic_to_phys[right] = second, first
+
+    def emit(self, node):
+        """Apply the operation of node to the physical qubits of its qubits."""
+        qargs = [self.device_register[self.logic_to_phys[qubit.index]] for qubit in node.qargs]
+        self.new_dag.apply_operation_back(node.op, qargs, node.cargs, node.condition)
+
+    def bring_together(self, first, second):
+        """Swap the logical qubit first along a shortest path, next to second."""
+        path = self.coupling_map.shortest_undirected_path(self.logic_to_phys[first],
+                                                          self.logic_to_phys[second])
+        for hop in range(len(path) - 2):
+            self.swap(path[hop], path[hop + 1])
+
+    def route_node(self, node):
+        """Route a single operation."""
+        if isinstance(node.op, Gate) and len(node.qargs) == 2:
+            self.bring_together(node.qargs[0].index, node.qargs[1].index)
+        self.emit(node)
+
+    def route_block(self, block):
+        """Route a block of diagonal gates, each one a list of nodes."""
+        pending = {}
+        for unit in block:
+            if len(unit[0].qargs) == 1:
+                self.emit(unit[0])
+            else:
+                pair = tuple(sorted(qubit.index for qubit in unit[0].qargs))
+                pending.setdefault(pair, []).append(unit)
+        if not pending:
+            return
+
+        def _execute(pair):
+            for unit in pending.pop(pair):
+                for node in unit:
+                    self.emit(node)
+
+        def _execute_neighbors(logical):
+            for neighbor in self.neighbors[self.logic_to_phys[logical]]:
+                pair = tuple(sorted((logical, self.phys_to_logic[neighbor])))
+                if pair in pending:
+                    _execute(pair)
+
+        for pair in list(pending):
+            if self.logic_to_phys[pair[1]] in self.neighbors[self.logic_to_phys[pair[0]]]:
+                _execute(pair)
+        if not pending:
+            return
+
+        qubits = sorted({qubit for pair in pending for qubit in pair})
+        path_index = {physical: position for position, physical in enumerate(self.path)}
+        positions = sorted(path_index.get(self.logic_to_phys[qubit], -1) for qubit in qubits)
+        num_qubits = len(qubits)
+        if num_qubits > 2 and positions[0] >= 0:
+            # Gather the qubits on the segment of the path where the fewest swaps
+            # bring them, keeping their order
+            offsets = sorted(position - rank for rank, position in enumerate(positions))
+            start = min(max(offsets[num_qubits // 2], 0), len(self.path) - num_qubits)
+            gather_cost = sum(abs(position - start - rank)
+                              for rank, position in enumerate(positions))
+            network_cost = gather_cost + num_qubits * (num_qubits - 1) // 2
+            single_cost = sum(self.coupling_map.distance(self.logic_to_phys[first],
+                                                         self.logic_to_phys[second]) - 1
+                              for first, second in pending)
+            if network_cost < single_cost:
+                self._gather(positions, start, _execute_neighbors)
+                for layer in range(num_qubits):
+                    if not pending:
+                        break
+                    for position in range(start + layer % 2, start + num_qubits - 1, 2):
+                        self.swap(self.path[position], self.path[position + 1])
+                        _execute_neighbors(self.phys_to_logic[self.path[position]])
+                        _execute_neighbors(self.phys_to_logic[self.path[position + 1]])
+
+        # The sparse blocks, one gate at a time
+        for pair in list(pending):
+            if pair in pending:
+                self.bring_together(*pair)
+                _execute(pair)
+
+    def _gather(self, positions, start, execute_neighbors):
+        """Bring the qubits at the path positions to the segment from start, in
+        the same order, by odd-even transposition sort."""
+        path = self.path
+        target = [None] * len(path)
+        for rank, position in enumerate(positions):
+            target[position] = start + rank
+        others = iter(position for position in range(len(path))
+                      if not start <= position < start + len(positions))
+        for position, key in enumerate(target):
+            if key is None:
+                target[position] = next(others)
+        # The order is sorted once an even and an odd layer in a row need no swap
+        layer = 0
+        layers_in_order = 0
+        while layers_in_order < 2:
+            layers_in_order += 1
+            for position in range(layer % 2, len(path) - 1, 2):
+                if target[position] > target[position + 1]:
+                    layers_in_order = 0
+                    self.swap(path[position], path[position + 1])
+                    target[position], target[position + 1] = \
+                        target[position + 1], target[position]
+                    execute_neighbors(self.phys_to_logic[path[position]])
+                    execute_neighbors(self.phys_to_logic[path[position + 1]])
+            layer += 1
+
+
+def _long_path(neighbors):
+    """A long simple path in the graph of neighbors, a Hamiltonian one on lines and
+    grids: a greedy walk going to the neighbor with the fewest free neighbors, from
+    each of the nodes of lowest degree, keeping the longest."""
+    degrees = [len(node_neighbors) for node_neighbors in neighbors]
+    if not degrees:
+        return []
+    starts = [node for node, degree in enumerate(degrees) if degree == min(degrees)]
+    best = []
+    for start in starts:
+        path = [start]
+        visited = {start}
+        while True:
+            free = [neighbor for neighbor in neighbors[path[-1]] if neighbor not in visited]
+            if not free:
+                break
+            step = min(free, key=lambda node: (sum(neighbor not in visited
+                                                   for neighbor in neighbors[node]), node))
+            path.append(step)
+            visited.add(step)
+        if len(path) > len(best):
+            best = path
+        if len(best) == len(neighbors):
+            break
+    return best
@@ -42,6 +42,8 @@ class TrivialLayout(AnalysisPass):
             TranspilerError: if invalid options
         """
         super().__init__()
+        self.reads = []
+        self.writes = ['layout']
         self.coupling_map = coupling_map
 
     def run(self, dag):
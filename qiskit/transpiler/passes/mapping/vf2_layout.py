@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""A pass for choosing a Layout of a circuit onto a Coupling graph, that needs no swap.
+
+The interaction graph of the circuit has the virtual qubits as nodes, and an
+edge between the qubits of each two-qubit gate. A layout needs no swap when
+it maps every edge of the interaction graph to an edge of the coupling graph,
+that is, when it is a subgraph monomorphism. The pass searches for one with
+a VF2-style backtracking: the virtual qubits are mapped one at a time, each
+one to a neighbor of the physical qubits of its mapped neighbors.
+
+The search can take exponential time, so it stops after `call_limit`
+candidate physical qubits were tried, or after `time_limit` seconds. If no
+layout is found, the property `layout` is left unset, so another layout pass
+can run. The reason the search stopped is in the property
+`VF2Layout_stop_reason`.
+
+Note: even though a 'layout' is not strictly a property of the DAG,
+in the transpiler architecture it is best passed around between passes by
+being set in `property_set`.
+"""
+
+import time
+
+from qiskit.transpiler.layout import Layout
+from qiskit.transpiler.basepasses import AnalysisPass
+from qiskit.transpiler.exceptions import TranspilerError
+
+SOLUTION_FOUND = 'solution found'
+NO_SOLUTION_FOUND = 'nonexistent solution'
+MORE_THAN_2Q = '>2q gates in basis'
+CALL_LIMIT = 'call limit reached'
+TIME_LIMIT = 'time limit reached'
+
+
+class VF2Layout(AnalysisPass):
+    """
+    Chooses a Layout that needs no swap, if there is one, by searching for a
+    subgraph monomorphism of the interaction graph into the coupling graph.
+    """
+
+    def __init__(self, coupling_map, backend_prop=None, call_limit=None, time_limit=None,
+                 max_trials=None):
+        """
+        Chooses a VF2Layout
+
+        Args:
+            coupling_map (Coupling): directed graph representing a coupling map.
+            backend_prop (BackendProperties): If given, the layouts found are
+                scored by the CX errors of their gates and the readout errors
+                of their measurements, and the best one is chosen. Otherwise
+                the first layout found is chosen.
+            call_limit (int): Maximum number of candidate physical qubits to
+                try. Unlimited if None.
+            time_limit (float): Maximum search time, in seconds. Unlimited if None.
+            max_trials (int): Maximum number of layouts to score, when
+                backend_prop is given. Unlimited if None.
+        """
+        super().__init__()
+        self.reads = []
+        self.writes = ['layout', 'VF2Layout_stop_reason']
+        self.coupling_map = coupling_map
+        self.backend_prop = backend_prop
+        self.call_limit = call_limit
+        self.time_limit = time_limit
+        self.max_trials = max_trials
+
+    def run(self, dag):
+        """
+        Set the property `layout` to a layout that needs no swap, if one is found.
+
+        Args:
+            dag (DAGCircuit): DAG to find layout for.
+
+        Raises:
+            TranspilerError: if dag wider than self.coupling_map
+        """
+        qubits = dag.qubits()
+        num_physical = self.coupling_map.size()
+        if len(qubits) > num_physical:
+            raise TranspilerError('Number of qubits greater than device.')
+        if dag.threeQ_or_more_gates():
+            self.property_set['VF2Layout_stop_reason'] = MORE_THAN_2Q
+            return
+
+        qubit_index = {qubit: index for index, qubit in enumerate(qubits)}
+        gate_counts = {}
+        for gate in dag.twoQ_gates():
+            edge = tuple(sorted((qubit_index[gate.qargs[0]], qubit_index[gate.qargs[1]])))
+            if edge[0] != edge[1]:
+                gate_counts[edge] = gate_counts.get(edge, 0) + 1
+        measure_counts = [0] * len(qubits)
+        for node in dag.named_nodes('measure'):
+            measure_counts[qubit_index[node.qargs[0]]] += 1
+
+        virtual_adjacency = [set() for _ in qubits]
+        for first, second in gate_counts:
+            virtual_adjacency[first].add(second)
+            virtual_adjacency[second].add(first)
+        physical_adjacency = [set() for _ in range(num_physical)]
+        for first, second in self.coupling_map.get_edges():
+            if first != second:
+                physical_adjacency[first].add(second)
+                physical_adjacency[second].add(first)
+
+        if self.backend_prop is None:
+            cx_errors, readout_errors = {}, [0.0] * num_physical
+        else:
+            cx_errors, readout_errors = self._errors(num_physical)
+
+        search = _MonomorphismSearch(virtual_adjacency, physical_adjacency,
+                                     self.call_limit, self.time_limit)
+        best_mapping = None
+        best_score = None
+        for trial, mapping in enumerate(search.mappings()):
+            if self.backend_prop is None:
+                best_mapping = mapping
+                break
+            score = sum(count * cx_errors.get((mapping[first], mapping[second]), 0.0)
+                        for (first, second), count in gate_counts.items())
+            score += sum(count * readout_errors[mapping[qubit]]
+                         for qubit, count in enumerate(measure_counts) if qubit in mapping)
+            if best_score is None or score < best_score:
+                best_mapping, best_score = mapping, score
+            if self.max_trials is not None and trial + 1 >= self.max_trials:
+                break
+
+        if best_mapping is None:
+            self.property_set['VF2Layout_stop_reason'] = search.stop_reason
+            return
+
+        # The qubits without two-qubit gates go to the free physical qubits
+        # with the lowest readout error
+        free_physical = sorted(set(range(num_physical)) - set(best_mapping.values()),
+                               key=lambda physical: readout_errors[physical])
+        free_physical = iter(free_physical)
+        layout = Layout()
+        for index, qubit in enumerate(qubits):
+            if index in best_mapping:
+                layout[qubit] = best_mapping[index]
+            else:
+                layout[qubit] = next(free_physical)
+        self.property_set['layout'] = layout
+        self.property_set['VF2Layout_stop_reason'] = SOLUTION_FOUND
+
+    def _errors(self, num_physical):
+        """The CX error of each edge, in both directions, and the readout error of each qubit."""
+        cx_errors = {}
+        for gate in self.backend_prop.gates:
+            if gate.gate == 'cx':
+                for param in gate.parameters:
+                    if param.name == 'gate_error':
+                        first, second = gate.qubits
+                        cx_errors[(first, second)] = cx_errors[(second, first)] = param.value
+        readout_errors = [0.0] * num_physical
+        for qubit, properties in enumerate(self.backend_prop.qubits[:num_physical]):
+            for nduv in properties:
+                if nduv.name == 'readout_error':
+                    readout_errors[qubit] = nduv.value
+        return cx_errors, readout_errors
+
+
+class _MonomorphismSearch:
+    """Backtracking search of the subgraph monomorphisms of a graph into another.
+
+    Only the nodes with edges of the first graph are mapped.
+    """
+
+    def __init__(self, virtual_adjacency, physical_adjacency, call_limit=None, time_limit=None):
+        self.virtual_adjacency = virtual_adjacency
+        self.physical_adjacency = physical_adjacency
+        self.call_limit = call_limit
+        self.time_limit = time_limit
+        self.calls = 0
+        self.stop_reason = NO_SOLUTION_FOUND
+
+    def _order(self):
+        """The order to map the virtual qubits in: each one has as many mapped
+        neighbors as possible, to prune the candidates early."""
+        remaining = {node for node, neighbors in enumerate(self.virtual_adjacency) if neighbors}
+        order = []
+        num_mapped_neighbors = [0] * len(self.virtual_adjacency)
+        while remaining:
+            node = max(remaining, key=lambda node: (num_mapped_neighbors[node],
+                                                    len(self.virtual_adjacency[node]), -node))
+            remaining.remove(node)
+            order.append(node)
+            for neighbor in self.virtual_adjacency[node]:
+                num_mapped_neighbors[neighbor] += 1
+        return order
+
+    def _candidates(self, node, mapping, used):
+        """The physical qubits node can be mapped to, given the mapping of its neighbors."""
+        degree = len(self.virtual_adjacency[node])
+        mapped_neighbors = [mapping[neighbor] for neighbor in self.virtual_adjacency[node]
+                            if neighbor in mapping]
+        if mapped_neighbors:
+            candidates = set(self.physical_adjacency[mapped_neighbors[0]])
+            for physical in mapped_neighbors[1:]:
+                candidates &= self.physical_adjacency[physical]
+            candidates = sorted(candidates)
+        else:
+            # Try the best connected physical qubits first
+            candidates = sorted(range(len(self.physical_adjacency)),
+                                key=lambda physical: -len(self.physical_adjacency[physical]))
+        return [physical for physical in candidates
+                if physical not in used and len(self.physical_adjacency[physical]) >= degree]
+
+    def mappings(self):
+        """Yields the monomorphisms, as dicts from virtual to physical qubits,
+        until the search space or the budget is exhausted.
+
+        The reason the search stopped is then in stop_reason.
+        """
+        order = self._order()
+        if not order:
+            self.stop_reason = SOLUTION_FOUND
+            yield {}
+            return
+        if len(order) > len(self.physical_adjacency):
+            return
+        deadline = None if self.time_limit is None else time.time() + self.time_limit
+        mapping = {}
+        used = set()
+        stack = [iter(self._candidates(order[0], mapping, used))]
+        while stack:
+            depth = len(stack) - 1
+            node = order[depth]
+            if node in mapping:
+                used.discard(mapping.pop(node))
+            physical = next(stack[-1], None)
+            if physical is None:
+                stack.pop()
+                continue
+            self.calls += 1
+            if self.call_limit is not None and self.calls > self.call_limit:
+                self.stop_reason = CALL_LIMIT
+                return
+            if deadline is not None and self.calls % 1000 == 0 and time.time() > deadline:
+                self.stop_reason = TIME_LIMIT
+                return
+            mapping[node] = physical
+            used.add(physical)
+            if depth + 1 == len(order):
+                self.stop_reason = SOLUTION_FOUND
+                yield dict(mapping)
+            else:
+                stack.append(iter(self._candidates(order[depth + 1], mapping, used)))
@@ -21,5 +21,10 @@ class NumTensorFactors(AnalysisPass):
     """ An analysis pass for calculating the number of tensor factors of a DAG circuit.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['num_tensor_factors']
+
     def run(self, dag):
         self.property_set['num_tensor_factors'] = dag.num_tensor_factors()
@@ -26,168 +26,75 @@ from qiskit.transpiler.exceptions import TranspilerError
 from qiskit.extensions.standard.u1 import U1Gate
 from qiskit.extensions.standard.u2 import U2Gate
 from qiskit.extensions.standard.u3 import U3Gate
-from qiskit.circuit.gate import Gate
 from qiskit.transpiler.basepasses import TransformationPass
 from qiskit.quantum_info.operators.quaternion import quaternion_from_euler
-from qiskit.dagcircuit import DAGCircuit
-from qiskit.circuit import QuantumRegister, Parameter
+from qiskit.circuit import Parameter
 
 _CHOP_THRESHOLD = 1e-15
 
+# Angles closer than this to a multiple of 2*pi are simplified as such
+_ANGLE_TOLERANCE = 1e-10
+
 
 class Optimize1qGates(TransformationPass):
-    """Simplify runs of single qubit gates in the ["u1", "u2", "u3", "cx", "id"] basis."""
+    """Simplify runs of single qubit gates in the ["u1", "u2", "u3", "cx", "id"] basis.
+
+    The runs of u1 gates are fused by adding their angles. The other runs are
+    fused all at once: the matrices of their gates are multiplied in a batch,
+    and the Z.Y.Z angles of the products are extracted together. The fused
+    gates are then simplified to a u2, u1 or nothing when their angles allow it.
+
+    When the property set has an `optimization_region`, as in a
+    `WorklistOptimization` loop, only the runs with a node of the region are
+    simplified.
+    """
     def run(self, dag):
         """Return a new circuit that has been optimized."""
-        runs = dag.collect_runs(["u1", "u2", "u3"])
+        runs = dag.collect_runs(["u1", "u2", "u3"], self.property_set['optimization_region'])
         runs = _split_runs_on_parameters(runs)
-        for run in runs:
-            right_name = "u1"
-            right_parameters = (0, 0, 0)  # (theta, phi, lambda)
-
-            for current_node in run:
-                left_name = current_node.name
-                if (current_node.condition is not None
-                        or len(current_node.qargs) != 1
-                        or left_name not in ["u1", "u2", "u3", "id"]):
-                    raise TranspilerError("internal error")
-                if left_name == "u1":
-                    left_parameters = (0, 0, current_node.op.params[0])
-                elif left_name == "u2":
-                    left_parameters = (np.pi / 2, current_node.op.params[0],
-                                       current_node.op.params[1])
-                elif left_name == "u3":
-                    left_parameters = tuple(current_node.op.params)
-                else:
-                    left_name = "u1"  # replace id with u1
-                    left_parameters = (0, 0, 0)
-                # If there are any sympy objects coming from the gate convert
-                # to numpy.
-                left_parameters = tuple([float(x) for x in left_parameters])
-                # Compose gates
-                name_tuple = (left_name, right_name)
-                if name_tuple == ("u1", "u1"):
-                    # u1(lambda1) * u1(lambda2) = u1(lambda1 + lambda2)
-                    right_parameters = (0, 0, right_parameters[2] +
-                                        left_parameters[2])
-                elif name_tuple == ("u1", "u2"):
-                    # u1(lambda1) * u2(phi2, lambda2) = u2(phi2 + lambda1, lambda2)
-                    right_parameters = (np.pi / 2, right_parameters[1] +
-                                        left_parameters[2], right_parameters[2])
-                elif name_tuple == ("u2", "u1"):
-                    # u2(phi1, lambda1) * u1(lambda2) = u2(phi1, lambda1 + lambda2)
-                    right_name = "u2"
-                    right_parameters = (np.pi / 2, left_parameters[1],
-                                        right_parameters[2] + left_parameters[2])
-                elif name_tuple == ("u1", "u3"):
-                    # u1(lambda1) * u3(theta2, phi2, lambda2) =
-                    #     u3(theta2, phi2 + lambda1, lambda2)
-                    right_parameters = (right_parameters[0], right_parameters[1] +
-                                        left_parameters[2], right_parameters[2])
-                elif name_tuple == ("u3", "u1"):
-                    # u3(theta1, phi1, lambda1) * u1(lambda2) =
-                    #     u3(theta1, phi1, lambda1 + lambda2)
-                    right_name = "u3"
-                    right_parameters = (left_parameters[0], left_parameters[1],
-                                        right_parameters[2] + left_parameters[2])
-                elif name_tuple == ("u2", "u2"):
-                    # Using Ry(pi/2).Rz(2*lambda).Ry(pi/2) =
-                    #    Rz(pi/2).Ry(pi-2*lambda).Rz(pi/2),
-                    # u2(phi1, lambda1) * u2(phi2, lambda2) =
-                    #    u3(pi - lambda1 - phi2, phi1 + pi/2, lambda2 + pi/2)
-                    right_name = "u3"
-                    right_parameters = (np.pi - left_parameters[2] -
-                                        right_parameters[1], left_parameters[1] +
-                                        np.pi / 2, right_parameters[2] +
-                                        np.pi / 2)
-                elif name_tuple[1] == "nop":
-                    right_name = left_name
-                    right_parameters = left_parameters
-                else:
-                    # For composing u3's or u2's with u3's, use
-                    # u2(phi, lambda) = u3(pi/2, phi, lambda)
-                    # together with the qiskit.mapper.compose_u3 method.
-                    right_name = "u3"
-                    # Evaluate the symbolic expressions for efficiency
-                    right_parameters = Optimize1qGates.compose_u3(left_parameters[0],
-                                                                  left_parameters[1],
-                                                                  left_parameters[2],
-                                                                  right_parameters[0],
-                                                                  right_parameters[1],
-                                                                  right_parameters[2])
-                    # Why evalf()? This program:
-                    #   OPENQASM 2.0;
-                    #   include "qelib1.inc";
-                    #   qreg q[2];
-                    #   creg c[2];
-                    #   u3(0.518016983430947*pi,1.37051598592907*pi,1.36816383603222*pi) q[0];
-                    #   u3(1.69867232277986*pi,0.371448347747471*pi,0.461117217930936*pi) q[0];
-                    #   u3(0.294319836336836*pi,0.450325871124225*pi,1.46804720442555*pi) q[0];
-                    #   measure q -> c;
-                    # took >630 seconds (did not complete) to optimize without
-                    # calling evalf() at all, 19 seconds to optimize calling
-                    # evalf() AFTER compose_u3, and 1 second to optimize
-                    # calling evalf() BEFORE compose_u3.
-                # 1. Here down, when we simplify, we add f(theta) to lambda to
-                # correct the global phase when f(theta) is 2*pi. This isn't
-                # necessary but the other steps preserve the global phase, so
-                # we continue in that manner.
-                # 2. The final step will remove Z rotations by 2*pi.
-                # 3. Note that is_zero is true only if the expression is exactly
-                # zero. If the input expressions have already been evaluated
-                # then these final simplifications will not occur.
-                # TODO After we refactor, we should have separate passes for
-                # exact and approximate rewriting.
-
-                # Y rotation is 0 mod 2*pi, so the gate is a u1
-                if np.mod(right_parameters[0], (2 * np.pi)) == 0 \
-                        and right_name != "u1":
-                    right_name = "u1"
-                    right_parameters = (0, 0, right_parameters[1] +
-                                        right_parameters[2] +
-                                        right_parameters[0])
-                # Y rotation is pi/2 or -pi/2 mod 2*pi, so the gate is a u2
-                if right_name == "u3":
-                    # theta = pi/2 + 2*k*pi
-                    if np.mod((right_parameters[0] - np.pi / 2), (2 * np.pi)) == 0:
-                        right_name = "u2"
-                        right_parameters = (np.pi / 2, right_parameters[1],
-                                            right_parameters[2] +
-                                            (right_parameters[0] - np.pi / 2))
-                    # theta = -pi/2 + 2*k*pi
-                    if np.mod((right_parameters[0] + np.pi / 2), (2 * np.pi)) == 0:
-                        right_name = "u2"
-                        right_parameters = (np.pi / 2, right_parameters[1] +
-                                            np.pi, right_parameters[2] -
-                                            np.pi + (right_parameters[0] +
-                                                     np.pi / 2))
-                # u1 and lambda is 0 mod 2*pi so gate is nop (up to a global phase)
-                if right_name == "u1" and np.mod(right_parameters[2], (2 * np.pi)) == 0:
-                    right_name = "nop"
-
-            # Replace the the first node in the run with a dummy DAG which contains a dummy
-            # qubit. The name is irrelevant, because substitute_node_with_dag will take care of
-            # putting it in the right place.
-            run_qarg = QuantumRegister(1, 'q')[0]
-            new_op = Gate(name="", num_qubits=1, params=[])
-            if right_name == "u1":
-                new_op = U1Gate(right_parameters[2])
-            if right_name == "u2":
-                new_op = U2Gate(right_parameters[1], right_parameters[2])
-            if right_name == "u3":
-                new_op = U3Gate(*right_parameters)
-
-            if right_name != 'nop':
-                new_dag = DAGCircuit()
-                new_dag.add_qreg(run_qarg.register)
-                new_dag.apply_operation_back(new_op, [run_qarg], [])
-                dag.substitute_node_with_dag(run[0], new_dag)
-
-            # Delete the other nodes in the run
-            for current_node in run[1:]:
-                dag.remove_op_node(current_node)
-            if right_name == "nop":
-                dag.remove_op_node(run[0])
+        if not runs:
+            return dag
+
+        names = []
+        angles = np.empty((len(runs), 3))  # (theta, phi, lambda) of each fused run
+        products = []  # (index, angles) of the runs fused by multiplying their matrices
+        for index, run in enumerate(runs):
+            run_angles = _run_angles(run)
+            if len(run) == 1:
+                names.append(run[0].name)
+                angles[index] = run_angles[0]
+            elif all(node.name == "u1" for node in run):
+                # u1(lambda1) * u1(lambda2) = u1(lambda1 + lambda2)
+                names.append("u1")
+                angles[index] = (0, 0, run_angles[:, 2].sum())
+            else:
+                names.append("u3")
+                products.append((index, run_angles))
+        if products:
+            indices, run_angles = zip(*products)
+            angles[list(indices)] = _fuse_runs(run_angles)
+
+        names = _simplify(np.array(names, dtype=object), angles)
+
+        for run, name, (theta, phi, lam) in zip(runs, names, angles):
+            new_op = None
+            if name == "u1":
+                new_op = U1Gate(lam)
+            if name == "u2":
+                new_op = U2Gate(phi, lam)
+            if name == "u3":
+                new_op = U3Gate(theta, phi, lam)
+
+            if len(run) == 1 and _is_same_gate(run[0], name, new_op):
+                # Nothing to simplify, leave the dag untouched
+                continue
+
+            # Replace the operation of the first node in the run, and delete the others
+            if name != 'nop':
+                dag.substitute_node(run[0], new_op)
+                dag.remove_op_nodes(run[1:])
+            else:
+                dag.remove_op_nodes(run)
 
         return dag
 
@@ -236,6 +143,132 @@ class Optimize1qGates(TransformationPass):
         return out_angles
 
 
+def _run_angles(run):
+    """The (theta, phi, lambda) angles of the gates of a run, as u3 gates."""
+    run_angles = np.empty((len(run), 3))
+    for index, node in enumerate(run):
+        if (node.condition is not None
+                or len(node.qargs) != 1
+                or node.name not in ["u1", "u2", "u3"]):
+            raise TranspilerError("internal error")
+        # If there are any sympy objects coming from the gate convert
+        # to numpy.
+        params = [float(param) for param in node.op.params]
+        if node.name == "u1":
+            run_angles[index] = (0, 0, params[0])
+        elif node.name == "u2":
+            # u2(phi, lambda) = u3(pi/2, phi, lambda)
+            run_angles[index] = (np.pi / 2, params[0], params[1])
+        else:
+            run_angles[index] = params
+    return run_angles
+
+
+def _u3_matrices(angles):
+    """The matrices of u3 gates, given their angles as the rows of an array."""
+    theta, phi, lam = angles.T
+    cos, sin = np.cos(theta / 2), np.sin(theta / 2)
+    matrices = np.empty((len(angles), 2, 2), dtype=complex)
+    matrices[:, 0, 0] = cos
+    matrices[:, 0, 1] = -np.exp(1j * lam) * sin
+    matrices[:, 1, 0] = np.exp(1j * phi) * sin
+    matrices[:, 1, 1] = np.exp(1j * (phi + lam)) * cos
+    return matrices
+
+
+def _fuse_runs(run_angles):
+    """The angles of the u3 gates equal, up to a global phase, to runs of u3 gates.
+
+    The runs are padded with identities to the next power of two of their
+    length, and those of the same padded length are multiplied together, by
+    halving them with a batched matrix product.
+
+    Args:
+        run_angles (list[ndarray]): the angles of the gates of each run.
+
+    Returns:
+        ndarray: the (theta, phi, lambda) angles of each run.
+    """
+    lengths = np.array([len(angles) for angles in run_angles])
+    matrices = _u3_matrices(np.concatenate(run_angles))
+    starts = np.cumsum(lengths) - lengths
+    padded_lengths = 1 << np.ceil(np.log2(lengths)).astype(int)
+
+    products = np.empty((len(run_angles), 2, 2), dtype=complex)
+    for padded_length in np.unique(padded_lengths):
+        runs = np.flatnonzero(padded_lengths == padded_length)
+        rows = np.repeat(np.arange(len(runs)), lengths[runs])
+        columns = np.arange(len(rows)) - np.repeat(np.cumsum(lengths[runs]) - lengths[runs],
+                                                   lengths[runs])
+        batch = np.tile(np.eye(2, dtype=complex), (len(runs), padded_length, 1, 1))
+        batch[rows, columns] = matrices[np.repeat(starts[runs], lengths[runs]) + columns]
+        while batch.shape[1] > 1:
+            # The later gates of a run multiply the earlier ones on the left
+            batch = batch[:, 1::2] @ batch[:, 0::2]
+        products[runs] = batch[:, 0]
+
+    return _zyz_angles(products)
+
+
+def _zyz_angles(unitaries):
+    """The (theta, phi, lambda) angles of u3 gates equal to unitaries up to a global phase."""
+    determinants = unitaries[:, 0, 0] * unitaries[:, 1, 1] - \
+        unitaries[:, 0, 1] * unitaries[:, 1, 0]
+    special = unitaries / np.sqrt(determinants)[:, np.newaxis, np.newaxis]
+    # special = exp(-i(phi + lambda)/2) u3(theta, phi, lambda), up to a sign
+    theta = 2 * np.arctan2(np.abs(special[:, 1, 0]), np.abs(special[:, 0, 0]))
+    phi_plus_lambda = 2 * np.angle(special[:, 1, 1])
+    phi_minus_lambda = 2 * np.angle(special[:, 1, 0])
+    angles = np.stack([theta, (phi_plus_lambda + phi_minus_lambda) / 2,
+                       (phi_plus_lambda - phi_minus_lambda) / 2], axis=1)
+    angles[np.abs(angles) < _CHOP_THRESHOLD] = 0
+    return angles
+
+
+def _is_multiple_of_2pi(angles):
+    """Whether each angle is a multiple of 2*pi, up to _ANGLE_TOLERANCE."""
+    remainders = np.mod(angles, 2 * np.pi)
+    return (remainders < _ANGLE_TOLERANCE) | (2 * np.pi - remainders < _ANGLE_TOLERANCE)
+
+
+def _simplify(names, angles):
+    """Simplify fused gates to u2, u1 or nothing ('nop') when their angles allow it.
+
+    The angles are modified in place, and the new names are returned. As when
+    the gates are fused, f(theta) is added to lambda to correct the global
+    phase when f(theta) is a multiple of 2*pi.
+    """
+    theta, phi, lam = angles.T
+
+    # Y rotation is 0 mod 2*pi, so the gate is a u1
+    is_u1 = (names != "u1") & _is_multiple_of_2pi(theta)
+    lam[is_u1] += phi[is_u1] + theta[is_u1]
+    theta[is_u1] = phi[is_u1] = 0
+    names[is_u1] = "u1"
+
+    # Y rotation is pi/2 or -pi/2 mod 2*pi, so the gate is a u2
+    # theta = pi/2 + 2*k*pi
+    is_u2 = (names == "u3") & _is_multiple_of_2pi(theta - np.pi / 2)
+    lam[is_u2] += theta[is_u2] - np.pi / 2
+    # theta = -pi/2 + 2*k*pi
+    is_u2_minus = (names == "u3") & _is_multiple_of_2pi(theta + np.pi / 2)
+    phi[is_u2_minus] += np.pi
+    lam[is_u2_minus] += theta[is_u2_minus] + np.pi / 2 - np.pi
+    theta[is_u2 | is_u2_minus] = np.pi / 2
+    names[is_u2 | is_u2_minus] = "u2"
+
+    # u1 and lambda is 0 mod 2*pi so gate is nop (up to a global phase)
+    names[(names == "u1") & _is_multiple_of_2pi(lam)] = "nop"
+    return names
+
+
+def _is_same_gate(node, name, op):
+    """Whether the gate ``op`` named ``name`` is the gate already in ``node``."""
+    if op is None or name != node.name:
+        return False
+    return all(float(new) == float(old) for new, old in zip(op.params, node.op.params))
+
+
 def _split_runs_on_parameters(runs):
     """Finds runs containing parameterized gates and splits them into sequential
     runs excluding the parameterized gates.
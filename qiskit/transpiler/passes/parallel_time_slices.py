@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Pass for running a local transformation pass on time slices of a large circuit, in parallel.
+"""
+
+from qiskit.dagcircuit import DAGCircuit
+from qiskit.tools.parallel import parallel_map
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.passmanager import run_local_pass
+
+
+class ParallelTimeSlices(TransformationPass):
+    """
+    Runs a local transformation pass on consecutive time slices of the dag, in parallel.
+
+    The op nodes of the dag are split, in topological order, into slices of at most
+    `slice_size` nodes. Each slice is transformed on its own in a process pool and the
+    transformed slices are composed back in order. Passes that only rewrite gates locally,
+    like Unroller, Optimize1qGates, CXCancellation or CommutativeCancellation, stay correct
+    but cannot simplify across the boundary between two slices.
+
+    The slices only depend on the dag and on `slice_size`, so the result does not depend
+    on the number of processes that run them.
+    """
+
+    def __init__(self, local_pass, slice_size=10000):
+        """
+        Args:
+            local_pass (TransformationPass): pass to run on each slice. Its requirements
+                are run on each slice as well.
+            slice_size (int): maximum number of op nodes in a slice. Dags that are not
+                larger than this are transformed as a whole.
+        """
+        super().__init__()
+        self.local_pass = local_pass
+        self.slice_size = slice_size
+
+    def run(self, dag):
+        """
+        Run the local pass on each time slice of the dag.
+
+        Args:
+            dag (DAGCircuit): the directed acyclic graph to run on.
+        Returns:
+            DAGCircuit: Transformed DAG.
+        """
+        if dag.size() <= self.slice_size:
+            return run_local_pass(dag, self.local_pass)
+
+        slices = parallel_map(run_local_pass, _time_slices(dag, self.slice_size),
+                              task_args=(self.local_pass,))
+
+        new_dag = _empty_dag_like(dag)
+        for dag_slice in slices:
+            new_dag.extend_back(dag_slice)
+        return new_dag
+
+
+def _time_slices(dag, slice_size):
+    """Split the op nodes of dag, in topological order, into dags of slice_size nodes."""
+    slices = []
+    for index, node in enumerate(dag.topological_op_nodes()):
+        if index % slice_size == 0:
+            dag_slice = _empty_dag_like(dag)
+            slices.append(dag_slice)
+        dag_slice.apply_operation_back(node.op, node.qargs, node.cargs, node.condition)
+    return slices
+
+
+def _empty_dag_like(dag):
+    """Return an empty dag with the name and the registers of dag."""
+    new_dag = DAGCircuit()
+    new_dag.name = dag.name
+    for qreg in dag.qregs.values():
+        new_dag.add_qreg(qreg)
+    for creg in dag.cregs.values():
+        new_dag.add_creg(creg)
+    return new_dag
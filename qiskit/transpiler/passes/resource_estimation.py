@@ -30,6 +30,8 @@ class ResourceEstimation(AnalysisPass):
     def __init__(self):
         super().__init__()
         self.requires += [Depth(), Width(), Size(), CountOps(), NumTensorFactors()]
+        self.reads = []
+        self.writes = []
 
     def run(self, _):
         pass
@@ -21,5 +21,10 @@ class Size(AnalysisPass):
     """ An analysis pass for calculating the size of a DAG circuit.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['size']
+
     def run(self, dag):
         self.property_set['size'] = dag.size()
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Peephole optimization with templates.
+
+A template is a circuit equal to the identity, such as two CX gates on the
+same qubits. Any sequence of more than half of its gates, taken cyclically,
+is equal to the inverse of the other gates, which is shorter. Rules replacing
+a pattern circuit with an equal circuit of fewer gates can also be given
+directly.
+
+The rules are compiled into patterns indexed by the name and the number of
+qubits of their first gate, and looked up at each gate of the circuit, in a
+single sweep. After each replacement, the gates around it are looked at
+again, until no pattern matches.
+"""
+
+from collections import deque, namedtuple
+
+import numpy as np
+
+from qiskit.circuit import QuantumCircuit, QuantumRegister
+from qiskit.extensions.standard import (HGate, XGate, YGate, ZGate, SGate, SdgGate, TGate,
+                                        TdgGate, CnotGate, CyGate, CzGate, SwapGate,
+                                        ToffoliGate)
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.exceptions import TranspilerError
+
+_CUTOFF_PRECISION = 1E-10
+
+# A gate of a pattern, on the qubits of the pattern with the given indices.
+# The qubits are numbered in order of first appearance in the pattern, and
+# the anchor is the index of a qubit of the gate that an earlier gate is on.
+_PatternGate = namedtuple('_PatternGate', ['name', 'params', 'qubits', 'anchor'])
+
+# A pattern, as a tuple of _PatternGate, and its replacement, as a list of
+# (Gate, qubit indices)
+_Rule = namedtuple('_Rule', ['pattern', 'replacement'])
+
+
+def standard_templates():
+    """The templates used by TemplateOptimization by default.
+
+    Returns:
+        list(QuantumCircuit): the self-inverse standard gates applied twice,
+            and the S and T gates followed by their inverse.
+    """
+    templates = []
+    for gates in [[HGate()] * 2, [XGate()] * 2, [YGate()] * 2, [ZGate()] * 2,
+                  [SGate(), SdgGate()], [TGate(), TdgGate()],
+                  [CnotGate()] * 2, [CyGate()] * 2, [CzGate()] * 2, [SwapGate()] * 2,
+                  [ToffoliGate()] * 2]:
+        qr = QuantumRegister(gates[0].num_qubits, 'q')
+        template = QuantumCircuit(qr)
+        for gate in gates:
+            template.append(gate, qr[:])
+        templates.append(template)
+    return templates
+
+
+class TemplateOptimization(TransformationPass):
+    """
+    Replace the sequences of gates matching the patterns of templates or
+    rules with equal sequences of fewer gates.
+    """
+
+    def __init__(self, templates=None, rules=None):
+        """
+        Args:
+            templates (list(QuantumCircuit)): circuits equal to the identity.
+                Defaults to `standard_templates()` when no rules are given.
+            rules (list(tuple(QuantumCircuit, QuantumCircuit))): pairs of a
+                pattern circuit and an equal circuit on the same qubits, with
+                fewer gates, replacing it.
+
+        Raises:
+            TranspilerError: if a circuit has an operation on classical bits,
+                or the gates of a pattern are not all connected by their
+                qubits, or a replacement is not shorter than its pattern.
+        """
+        super().__init__()
+        if templates is None:
+            templates = standard_templates() if rules is None else []
+
+        compiled = []
+        for template in templates:
+            gates = _circuit_gates(template)
+            for start in range(len(gates)):
+                rotated = gates[start:] + gates[:start]
+                for length in range(len(gates) // 2 + 1, len(gates) + 1):
+                    replacement = [(op.inverse(), qubits)
+                                   for op, qubits in reversed(rotated[length:])]
+                    rule = _compile_rule(rotated[:length], replacement)
+                    if rule is not None:
+                        compiled.append(rule)
+        for pattern, replacement in rules or []:
+            pattern = _circuit_gates(pattern)
+            replacement = _circuit_gates(replacement)
+            if len(replacement) >= len(pattern):
+                raise TranspilerError('The replacement of a pattern of %d gates has %d gates.'
+                                      % (len(pattern), len(replacement)))
+            rule = _compile_rule(pattern, replacement)
+            if rule is None:
+                raise TranspilerError('The gates of a pattern must be connected by their '
+                                      'qubits, and its replacement must be on its qubits.')
+            compiled.append(rule)
+
+        # the rules by name and number of qubits of their first gate, the
+        # longest patterns first
+        self._rules = {}
+        seen = set()
+        for rule in sorted(compiled, key=lambda rule: -len(rule.pattern)):
+            if rule.pattern in seen:
+                continue
+            seen.add(rule.pattern)
+            first = rule.pattern[0]
+            self._rules.setdefault((first.name, len(first.qubits)), []).append(rule)
+        self._max_length = max((len(rule.pattern) for rule in compiled), default=0)
+
+    def run(self, dag):
+        """Run the TemplateOptimization pass on a dag.
+
+        Args:
+            dag (DAGCircuit): the DAG to be optimized.
+
+        Returns:
+            DAGCircuit: the optimized DAG.
+        """
+        # A rank for each node, greater than the ranks of its ancestors
+        ranks = {}
+        worklist = deque()
+        for node in dag.topological_nodes():
+            ranks[node] = 1 + max((ranks[pred] for pred in dag.predecessors(node)), default=-1)
+            if node.type == 'op':
+                worklist.append(node)
+
+        removed = set()
+        while worklist:
+            node = worklist.popleft()
+            if node in removed or node.condition is not None:
+                continue
+            for rule in self._rules.get((node.name, len(node.qargs)), []):
+                match = self._match(dag, rule, node, ranks)
+                if match is None:
+                    continue
+                nodes, qubits = match
+                neighbors = {neighbor
+                             for nd in nodes
+                             for neighbor in list(dag.predecessors(nd)) + list(dag.successors(nd))
+                             if neighbor.type == 'op' and neighbor not in nodes}
+                new_nodes = dag.substitute_block(
+                    nodes, [(op, [qubits[index] for index in indices], [])
+                            for op, indices in rule.replacement])
+                removed.update(nodes)
+                _update_ranks(dag, new_nodes, ranks)
+                worklist.extendleft(reversed(
+                    self._to_revisit(dag, new_nodes, neighbors, ranks)))
+                break
+        return dag
+
+    def _match(self, dag, rule, node, ranks):
+        """The nodes matching the pattern of a rule from node, and its qubits.
+
+        Returns:
+            tuple(list(DAGNode), list(Qubit)): the matched nodes, and the qubit
+                of the dag for each qubit of the pattern, or None if the
+                pattern does not match.
+        """
+        first = rule.pattern[0]
+        if not _gate_matches(first, node):
+            return None
+        qubits = list(node.qargs)
+        # the last matched node on each qubit of the pattern
+        last = [node] * len(qubits)
+        nodes = [node]
+        # the nodes before the matched nodes on the qubits that a gate
+        # after the first one is the first on
+        fresh_preds = []
+        for gate in rule.pattern[1:]:
+            candidate = dag.wire_neighbors(last[gate.anchor])[1][qubits[gate.anchor]]
+            if candidate.type != 'op' or not _gate_matches(gate, candidate):
+                return None
+            pred_map = dag.wire_neighbors(candidate)[0]
+            for index, qubit in zip(gate.qubits, candidate.qargs):
+                if index < len(qubits):
+                    if qubits[index] != qubit or pred_map[qubit] is not last[index]:
+                        return None
+                    last[index] = candidate
+                else:
+                    if qubit in qubits:
+                        return None
+                    qubits.append(qubit)
+                    last.append(candidate)
+                    if pred_map[qubit].type == 'op':
+                        fresh_preds.append(pred_map[qubit])
+            nodes.append(candidate)
+
+        # the matched nodes must not be separated by other nodes, which is
+        # only possible through the nodes before them on these qubits
+        min_rank = min(ranks[nd] for nd in nodes)
+        matched = set(nodes)
+        stack = fresh_preds
+        visited = set()
+        while stack:
+            pred = stack.pop()
+            if pred in matched:
+                return None
+            if pred in visited or ranks[pred] <= min_rank:
+                continue
+            visited.add(pred)
+            stack.extend(dag.predecessors(pred))
+        return nodes, qubits
+
+    def _to_revisit(self, dag, new_nodes, neighbors, ranks):
+        """The nodes from which a pattern could match after a replacement.
+
+        These are the new nodes, the nodes following the replaced ones, and
+        the nodes at most the length of the longest pattern before them.
+        """
+        to_revisit = set(new_nodes) | neighbors
+        frontier = set(new_nodes) | neighbors
+        for _ in range(self._max_length - 1):
+            frontier = {pred for nd in frontier for pred in dag.predecessors(nd)
+                        if pred.type == 'op'} - to_revisit
+            to_revisit |= frontier
+        return sorted(to_revisit, key=lambda nd: ranks[nd])
+
+
+def _circuit_gates(circuit):
+    """The gates of a template or rule circuit, with the indices of their qubits.
+
+    Returns:
+        list(tuple(Instruction, list(int))): each gate of the circuit, and the
+            indices of its qubits in the circuit.
+
+    Raises:
+        TranspilerError: if the circuit has an operation on classical bits.
+    """
+    qubits = {qubit: index for index, qubit in enumerate(circuit.qubits)}
+    gates = []
+    for op, qargs, cargs in circuit.data:
+        if cargs or op.control is not None:
+            raise TranspilerError('The %s operation of a template or rule depends on '
+                                  'classical bits.' % op.name)
+        gates.append((op, [qubits[qubit] for qubit in qargs]))
+    return gates
+
+
+def _compile_rule(pattern, replacement):
+    """A rule, with its qubits numbered in order of first appearance.
+
+    Returns:
+        _Rule: the rule, or None if the gates of the pattern are not
+            connected by their qubits, or the replacement is on other qubits.
+    """
+    numbering = {}
+    pattern_gates = []
+    for op, qubits in pattern:
+        anchor = next((numbering[qubit] for qubit in qubits if qubit in numbering), None)
+        if anchor is None and numbering:
+            return None
+        for qubit in qubits:
+            numbering.setdefault(qubit, len(numbering))
+        pattern_gates.append(_PatternGate(op.name, tuple(op.params),
+                                          tuple(numbering[qubit] for qubit in qubits),
+                                          anchor))
+    if any(qubit not in numbering for _, qubits in replacement for qubit in qubits):
+        return None
+    return _Rule(tuple(pattern_gates),
+                 [(op, [numbering[qubit] for qubit in qubits]) for op, qubits in replacement])
+
+
+def _gate_matches(gate, node):
+    """Whether a node is an unconditional gate with the name and parameters of a pattern gate."""
+    if node.name != gate.name or node.condition is not None or node.cargs or \
+            len(node.qargs) != len(gate.qubits) or len(node.op.params) != len(gate.params):
+        return False
+    for param, gate_param in zip(node.op.params, gate.params):
+        if param == gate_param:
+            continue
+        try:
+            if np.isclose(float(param), float(gate_param), atol=_CUTOFF_PRECISION):
+                continue
+        except TypeError:
+            pass
+        return False
+    return True
+
+
+def _update_ranks(dag, new_nodes, ranks):
+    """Rank the new nodes of a replacement, and raise the ranks of the nodes after them."""
+    stack = []
+    for node in new_nodes:
+        ranks[node] = 1 + max(ranks[pred] for pred in dag.predecessors(node))
+        stack.append(node)
+    while stack:
+        node = stack.pop()
+        for succ in dag.successors(node):
+            if ranks[succ] <= ranks[node]:
+                ranks[succ] = ranks[node] + 1
+                stack.append(succ)
@@ -21,5 +21,10 @@ class Width(AnalysisPass):
     """ An analysis pass for calculating the width of a DAG circuit.
     """
 
+    def __init__(self):
+        super().__init__()
+        self.reads = []
+        self.writes = ['width']
+
     def run(self, dag):
         self.property_set['width'] = dag.width()
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Pass for running optimization passes until they stop changing the circuit,
+revisiting only the regions that changed.
+"""
+
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.passmanager import run_local_pass
+from qiskit.transpiler.propertyset import PropertySet
+
+
+class WorklistOptimization(TransformationPass):
+    """
+    Runs optimization passes in a loop until none of them changes the dag.
+
+    The dag records the op nodes that each pass changes. The next time a pass
+    runs, it gets the op nodes changed since its previous run, with their
+    neighbors, as the `optimization_region` of its property set, and is
+    skipped when there are none. The passes that support it, like
+    Optimize1qGates, CXCancellation and CommutativeCancellation, only look at
+    the dag around the region, so that the iterations after the first one
+    only cost as much as the changes. The other passes run on the whole dag.
+
+    A pass that returns a new dag, instead of modifying the one it is given,
+    makes all the passes run on the whole dag again. The loop stops after
+    `max_iteration` iterations even if the passes still change the dag.
+    """
+
+    def __init__(self, passes, max_iteration=1000):
+        """
+        Args:
+            passes (list(TransformationPass)): the passes to run in a loop. Their
+                requirements are run before them, with the same region.
+            max_iteration (int): maximum number of times the loop runs the passes.
+        """
+        super().__init__()
+        self.passes = passes
+        self.max_iteration = max_iteration
+
+    def run(self, dag):
+        """
+        Run the passes until they do not change the dag.
+
+        Args:
+            dag (DAGCircuit): the directed acyclic graph to run on.
+        Returns:
+            DAGCircuit: Transformed DAG.
+        """
+        # The op nodes changed since each pass last ran, or None if the whole dag must be
+        # looked at
+        pending = [None] * len(self.passes)
+        for _ in range(self.max_iteration):
+            if not any(changed is None or changed for changed in pending):
+                break
+            for index, pass_ in enumerate(self.passes):
+                changed = pending[index]
+                if changed is not None and not changed:
+                    continue
+                property_set = PropertySet()
+                if changed is not None:
+                    property_set['optimization_region'] = _region(dag, changed)
+                dag.track_changes()
+                new_dag = run_local_pass(dag, pass_, property_set)
+                changes = dag.changes() if new_dag is dag else None
+                dag = new_dag
+                pending[index] = set()
+                for other_index, other_changed in enumerate(pending):
+                    if changes is None:
+                        pending[other_index] = None
+                    elif other_changed is not None:
+                        other_changed -= changes[1]
+                        other_changed |= changes[0]
+        dag.track_changes(False)
+        return dag
+
+
+def _region(dag, changed):
+    """The changed op nodes of dag, and the op nodes next to them."""
+    region = set(changed)
+    for node in changed:
+        region.update(pred for pred in dag.predecessors(node) if pred.type == 'op')
+        region.update(succ for succ in dag.successors(node) if succ.type == 'op')
+    return region
@@ -13,13 +13,13 @@
 
 """PassManager class for the transpiler."""
 
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 from collections import OrderedDict
 from time import time
 
 from qiskit.dagcircuit import DAGCircuit
 from qiskit.converters import circuit_to_dag, dag_to_circuit
-from qiskit.visualization import pass_manager_drawer
 from .propertyset import PropertySet
 from .basepasses import BasePass
 from .fencedobjs import FencedPropertySet, FencedDAGCircuit
@@ -30,7 +30,8 @@ class PassManager():
     """A PassManager schedules the passes"""
 
     def __init__(self, passes=None,
-                 max_iteration=None):
+                 max_iteration=None,
+                 max_workers=None):
         """
         Initialize an empty PassManager object (with no passes scheduled).
 
@@ -39,6 +40,8 @@ class PassManager():
                 None.
             max_iteration (int): The schedule looping iterates until the condition is met or until
                 max_iteration is reached.
+            max_workers (int): Maximum number of threads used to run independent analysis passes
+                at the same time. The default is None (passes run one after the other).
         """
         # the pass manager's schedule of passes, including any control-flow.
         # Populated via PassManager.append().
@@ -54,7 +57,7 @@ class PassManager():
         self.valid_passes = set()
 
         # pass manager's overriding options for the passes it runs (for debugging)
-        self.passmanager_options = {'max_iteration': max_iteration}
+        self.passmanager_options = {'max_iteration': max_iteration, 'max_workers': max_workers}
 
         # The property log_passes allows to log and time the passes as they run in the pass manager
         self.log_passes = False
@@ -74,11 +77,13 @@ class PassManager():
         passset_level = {k: v for k, v in passset_options.items() if v is not None}
         return {**default, **passmanager_level, **passset_level}
 
-    def append(self, passes, max_iteration=None, **flow_controller_conditions):
+    def append(self, passes, max_iteration=None, max_workers=None, **flow_controller_conditions):
         """
         Args:
             passes (list[BasePass] or BasePass): pass(es) to be added to schedule
             max_iteration (int): max number of iterations of passes. Default: 1000
+            max_workers (int): max number of threads to run independent analysis passes at
+                the same time. Default: None (one after the other)
             flow_controller_conditions (kwargs): See add_flow_controller(): Dictionary of
             control flow plugins. Default:
 
@@ -94,7 +99,7 @@ class PassManager():
             TranspilerError: if a pass in passes is not a proper pass.
         """
 
-        passset_options = {'max_iteration': max_iteration}
+        passset_options = {'max_iteration': max_iteration, 'max_workers': max_workers}
 
         options = self._join_options(passset_options)
 
@@ -135,7 +140,7 @@ class PassManager():
 
         for passset in self.working_list:
             for pass_ in passset:
-                dag = self._do_pass(pass_, dag, passset.options)
+                dag = self._do_scheduled(pass_, dag, passset.options)
 
         circuit = dag_to_circuit(dag)
         circuit.name = name
@@ -143,8 +148,16 @@ class PassManager():
 
     def draw(self, filename, style=None, raw=False):
         """ Draw the pass manager"""
+        # pylint: disable=cyclic-import
+        from qiskit.visualization import pass_manager_drawer
         pass_manager_drawer(self, filename=filename, style=style, raw=raw)
 
+    def _do_scheduled(self, scheduled, dag, options):
+        """Do a scheduled pass, or a scheduled group of passes that can run at the same time."""
+        if isinstance(scheduled, list):
+            return self._do_concurrent_passes(scheduled, dag, options)
+        return self._do_pass(scheduled, dag, options)
+
     def _do_pass(self, pass_, dag, options):
         """Do a pass and its "requires".
 
@@ -160,16 +173,53 @@ class PassManager():
         """
 
         # First, do the requires of pass_
-        for required_pass in pass_.requires:
-            dag = self._do_pass(required_pass, dag, options)
+        requires = pass_.requires
+        if (options.get('max_workers') or 1) > 1:
+            requires = _concurrent_schedule(requires)
+        for required_pass in requires:
+            dag = self._do_scheduled(required_pass, dag, options)
 
         # Run the pass itself, if not already run
         if pass_ not in self.valid_passes:
-            dag = self._run_this_pass(pass_, dag)
+            version = dag.version
+            new_dag = self._run_this_pass(pass_, dag)
+            dag_modified = new_dag is not dag or new_dag.version != version
+            dag = new_dag
 
             # update the valid_passes property
-            self._update_valid_passes(pass_)
+            self._update_valid_passes(pass_, dag_modified)
+
+        return dag
+
+    def _do_concurrent_passes(self, passes, dag, options):
+        """Do a group of analysis passes that do not conflict with each other, at the same time.
+
+        Args:
+            passes (list[BasePass]): Passes to do. None of them has requires.
+            dag (DAGCircuit): The dag on which the passes are ran.
+            options (dict): PassManager options.
+        Returns:
+            DAGCircuit: The same input dag.
+        """
+        passes = [pass_ for pass_ in passes if pass_ not in self.valid_passes]
+        if len(passes) < 2:
+            for pass_ in passes:
+                dag = self._do_pass(pass_, dag, options)
+            return dag
+
+        if self.log_passes:
+            # the logs are shared by all the passes in the group
+            for log in ('pass_raw_log', 'pass_log'):
+                if self.property_set[log] is None:
+                    self.property_set[log] = []
+
+        with ThreadPoolExecutor(max_workers=options['max_workers']) as executor:
+            futures = [executor.submit(self._run_this_pass, pass_, dag) for pass_ in passes]
+            for future in futures:
+                future.result()
 
+        for pass_ in passes:
+            self._update_valid_passes(pass_)
         return dag
 
     def _run_this_pass(self, pass_, dag):
@@ -190,10 +240,15 @@ class PassManager():
             raise TranspilerError("I dont know how to handle this type of pass")
         return dag
 
-    def _update_valid_passes(self, pass_):
+    def _update_valid_passes(self, pass_, dag_modified=True):
         self.valid_passes.add(pass_)
         if not pass_.is_analysis_pass:  # Analysis passes preserve all
-            self.valid_passes.intersection_update(set(pass_.preserves))
+            preserved = set(pass_.preserves)
+            if not dag_modified:
+                # The dag is unchanged, so the analyses already run on it still hold
+                preserved.update(valid_pass for valid_pass in self.valid_passes
+                                 if valid_pass.is_analysis_pass and valid_pass.reusable)
+            self.valid_passes.intersection_update(preserved)
 
     def passes(self):
         """
@@ -321,11 +376,17 @@ class FlowController():
 
 
 class FlowControllerLinear(FlowController):
-    """The basic controller runs the passes one after the other."""
+    """The basic controller runs the passes one after the other.
+
+    If the ``max_workers`` option is larger than one, consecutive passes that do not conflict
+    with each other are grouped in a list, so the pass manager can run them at the same time.
+    """
 
     def __init__(self, passes, options):  # pylint: disable=super-init-not-called
         self.passes = self._passes = passes
         self.options = options
+        if (options.get('max_workers') or 1) > 1:
+            self.passes = _concurrent_schedule(passes)
 
 
 class DoWhileController(FlowController):
@@ -362,6 +423,63 @@ class ConditionalController(FlowController):
                 yield pass_
 
 
+def run_local_pass(dag, local_pass, property_set=None):
+    """Run a pass and, before it, its requirements on a dag, outside of a PassManager.
+
+    Args:
+        dag (DAGCircuit): the dag to run the passes on.
+        local_pass (BasePass): the pass to run.
+        property_set (PropertySet): the property set shared by the pass and its
+            requirements. A fresh one by default.
+
+    Returns:
+        DAGCircuit: the dag returned by the pass, or the dag it was given if it
+            is an analysis pass.
+    """
+    if property_set is None:
+        property_set = PropertySet()
+    for required_pass in local_pass.requires:
+        dag = run_local_pass(dag, required_pass, property_set)
+    local_pass.property_set = property_set
+    new_dag = local_pass.run(dag)
+    if local_pass.is_analysis_pass:
+        return dag
+    return new_dag
+
+
+def _concurrent_schedule(passes):
+    """Group consecutive analysis passes that can run at the same time.
+
+    Args:
+        passes (list[BasePass]): passes in running order.
+
+    Returns:
+        list: The passes, where each list of passes can run at the same time.
+    """
+    schedule = []
+    group = []
+    for pass_ in passes:
+        if (pass_.requires or not pass_.is_analysis_pass
+                or pass_.reads is None or pass_.writes is None):
+            schedule.extend(_close_group(group))
+            schedule.append(pass_)
+            group = []
+        elif any(pass_.conflicts_with(other) for other in group):
+            schedule.extend(_close_group(group))
+            group = [pass_]
+        else:
+            group.append(pass_)
+    schedule.extend(_close_group(group))
+    return schedule
+
+
+def _close_group(group):
+    """A group of a single pass is scheduled as a pass."""
+    if len(group) == 1:
+        return group
+    return [group] if group else []
+
+
 # Default controllers
 FlowController.add_flow_controller('condition', ConditionalController)
 FlowController.add_flow_controller('do_while', DoWhileController)
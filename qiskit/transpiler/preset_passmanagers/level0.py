@@ -32,6 +32,7 @@ from qiskit.transpiler.passes import FullAncillaAllocation
 from qiskit.transpiler.passes import EnlargeWithAncilla
 from qiskit.transpiler.passes import RemoveResetInZeroState
 from qiskit.transpiler.passes import ApplyLayout
+from qiskit.transpiler.passes import ParallelTimeSlices
 
 
 def level_0_pass_manager(transpile_config):
@@ -56,6 +57,11 @@ def level_0_pass_manager(transpile_config):
     coupling_map = transpile_config.coupling_map
     initial_layout = transpile_config.initial_layout
     seed_transpiler = transpile_config.seed_transpiler
+    slice_size = getattr(transpile_config, 'parallel_local_passes', None)
+
+    def _local(pass_):
+        # run a local pass on time slices of the circuit in parallel, if asked to
+        return ParallelTimeSlices(pass_, slice_size) if slice_size else pass_
 
     # 1. Use trivial layout if no layout given
     _given_layout = SetLayout(initial_layout)
@@ -69,7 +75,7 @@ def level_0_pass_manager(transpile_config):
     _embed = [FullAncillaAllocation(coupling_map), EnlargeWithAncilla(), ApplyLayout()]
 
     # 3. Unroll to the basis
-    _unroll = Unroller(basis_gates)
+    _unroll = _local(Unroller(basis_gates))
 
     # 4. Swap to fit the coupling map
     _swap_check = CheckMap(coupling_map)
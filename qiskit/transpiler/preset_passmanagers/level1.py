@@ -30,6 +30,8 @@ from qiskit.transpiler.passes import SetLayout
 from qiskit.transpiler.passes import TrivialLayout
 from qiskit.transpiler.passes import BarrierBeforeFinalMeasurements
 from qiskit.transpiler.passes import StochasticSwap
+from qiskit.transpiler.passes import SabreSwap
+from qiskit.transpiler.passes import SwapNetworkSwap
 from qiskit.transpiler.passes import FullAncillaAllocation
 from qiskit.transpiler.passes import EnlargeWithAncilla
 from qiskit.transpiler.passes import FixedPoint
@@ -37,6 +39,7 @@ from qiskit.transpiler.passes import Depth
 from qiskit.transpiler.passes import RemoveResetInZeroState
 from qiskit.transpiler.passes import Optimize1qGates
 from qiskit.transpiler.passes import ApplyLayout
+from qiskit.transpiler.passes import ParallelTimeSlices
 
 
 def level_1_pass_manager(transpile_config):
@@ -63,6 +66,13 @@ def level_1_pass_manager(transpile_config):
     coupling_map = transpile_config.coupling_map
     initial_layout = transpile_config.initial_layout
     seed_transpiler = transpile_config.seed_transpiler
+    backend_properties = transpile_config.backend_properties
+    routing_method = getattr(transpile_config, 'routing_method', None)
+    slice_size = getattr(transpile_config, 'parallel_local_passes', None)
+
+    def _local(pass_):
+        # run a local pass on time slices of the circuit in parallel, if asked to
+        return ParallelTimeSlices(pass_, slice_size) if slice_size else pass_
 
     # 1. Use trivial layout if no layout given
     _given_layout = SetLayout(initial_layout)
@@ -79,7 +89,7 @@ def level_1_pass_manager(transpile_config):
     _embed = [FullAncillaAllocation(coupling_map), EnlargeWithAncilla(), ApplyLayout()]
 
     # 4. Unroll to the basis
-    _unroll = Unroller(basis_gates)
+    _unroll = _local(Unroller(basis_gates))
 
     # 5. Swap to fit the coupling map
     _swap_check = CheckMap(coupling_map)
@@ -87,9 +97,16 @@ def level_1_pass_manager(transpile_config):
     def _swap_condition(property_set):
         return not property_set['is_swap_mapped']
 
+    if routing_method == 'sabre':
+        _router = SabreSwap(coupling_map, backend_properties)
+    elif routing_method == 'swap_network':
+        _router = SwapNetworkSwap(coupling_map)
+    else:
+        _router = StochasticSwap(coupling_map, trials=20, seed=seed_transpiler)
+
     _swap = [BarrierBeforeFinalMeasurements(),
              Unroll3qOrMore(),
-             StochasticSwap(coupling_map, trials=20, seed=seed_transpiler),
+             _router,
              Decompose(SwapGate)]
 
     # 6. Fix any bad CX directions
@@ -107,7 +124,7 @@ def level_1_pass_manager(transpile_config):
     def _opt_control(property_set):
         return not property_set['depth_fixed_point']
 
-    _opt = [Optimize1qGates(), CXCancellation()]
+    _opt = [_local(Optimize1qGates()), _local(CXCancellation())]
 
     pm1 = PassManager()
     if coupling_map:
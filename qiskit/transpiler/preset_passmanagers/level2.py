@@ -30,16 +30,20 @@ from qiskit.transpiler.passes import CXDirection
 from qiskit.transpiler.passes import SetLayout
 from qiskit.transpiler.passes import DenseLayout
 from qiskit.transpiler.passes import NoiseAdaptiveLayout
+from qiskit.transpiler.passes import VF2Layout
 from qiskit.transpiler.passes import BarrierBeforeFinalMeasurements
 from qiskit.transpiler.passes import StochasticSwap
+from qiskit.transpiler.passes import SabreSwap
+from qiskit.transpiler.passes import SwapNetworkSwap
+from qiskit.transpiler.passes import SabreLayout
 from qiskit.transpiler.passes import FullAncillaAllocation
 from qiskit.transpiler.passes import EnlargeWithAncilla
-from qiskit.transpiler.passes import FixedPoint
-from qiskit.transpiler.passes import Depth
 from qiskit.transpiler.passes import RemoveResetInZeroState
 from qiskit.transpiler.passes import Optimize1qGates
 from qiskit.transpiler.passes import CommutativeCancellation
 from qiskit.transpiler.passes import ApplyLayout
+from qiskit.transpiler.passes import WorklistOptimization
+from qiskit.transpiler.passes import ParallelTimeSlices
 
 
 def level_2_pass_manager(transpile_config):
@@ -48,9 +52,11 @@ def level_2_pass_manager(transpile_config):
     gate cancellation using commutativity rules.
 
     This pass manager applies the user-given initial layout. If none is given, and
-    device calibration information is available, the circuit is mapped to the qubits
-    with best readouts and to CX gates with highest fidelity. Otherwise, a layout on
-    the most densely connected qubits is used.
+    a layout that needs no swap is found within a search budget, that is used (the
+    one with the lowest errors, if device calibration information is available).
+    Otherwise, if device calibration information is available, the circuit is mapped
+    to the qubits with best readouts and to CX gates with highest fidelity. Otherwise,
+    a layout on the most densely connected qubits is used.
     The pass manager then transforms the circuit to match the coupling constraints.
     It is then unrolled to the basis, and any flipped cx directions are fixed.
     Finally, optimizations in the form of commutative gate cancellation and redundant
@@ -69,16 +75,31 @@ def level_2_pass_manager(transpile_config):
     initial_layout = transpile_config.initial_layout
     seed_transpiler = transpile_config.seed_transpiler
     backend_properties = transpile_config.backend_properties
+    routing_method = getattr(transpile_config, 'routing_method', None)
+    target_cache = getattr(transpile_config, 'target_cache', None)
+    slice_size = getattr(transpile_config, 'parallel_local_passes', None)
 
-    # 1. Layout on good qubits if calibration info available, otherwise on dense links
+    def _local(pass_):
+        # run a local pass on time slices of the circuit in parallel, if asked to
+        return ParallelTimeSlices(pass_, slice_size) if slice_size else pass_
+
+    # 1. Layout without swaps if found, else on good qubits if calibration info
+    # available, otherwise on dense links
     _given_layout = SetLayout(initial_layout)
 
     def _choose_layout_condition(property_set):
         return not property_set['layout']
 
-    _choose_layout = DenseLayout(coupling_map)
+    # If the circuit fits the coupling map without swaps, use such a layout
+    _perfect_layout = VF2Layout(coupling_map, backend_properties, call_limit=int(3e4))
+
+    _choose_layout = DenseLayout(coupling_map, target_cache=target_cache)
     if backend_properties:
-        _choose_layout = NoiseAdaptiveLayout(backend_properties)
+        _choose_layout = NoiseAdaptiveLayout(backend_properties, target_cache=target_cache)
+    if routing_method == 'sabre':
+        _choose_layout = [_choose_layout,
+                          SabreLayout(coupling_map, backend_properties,
+                                      seed=seed_transpiler)]
 
     # 2. Extend dag/layout with ancillas using the full coupling map
     _embed = [FullAncillaAllocation(coupling_map), EnlargeWithAncilla(), ApplyLayout()]
@@ -89,13 +110,20 @@ def level_2_pass_manager(transpile_config):
     def _swap_condition(property_set):
         return not property_set['is_swap_mapped']
 
+    if routing_method == 'sabre':
+        _router = SabreSwap(coupling_map, backend_properties)
+    elif routing_method == 'swap_network':
+        _router = SwapNetworkSwap(coupling_map)
+    else:
+        _router = StochasticSwap(coupling_map, trials=20, seed=seed_transpiler)
+
     _swap = [BarrierBeforeFinalMeasurements(),
              Unroll3qOrMore(),
-             StochasticSwap(coupling_map, trials=20, seed=seed_transpiler),
+             _router,
              Decompose(SwapGate)]
 
     # 4. Unroll to the basis
-    _unroll = Unroller(basis_gates)
+    _unroll = _local(Unroller(basis_gates))
 
     # 5. Fix any bad CX directions
     # _direction_check = CheckCXDirection(coupling_map)  # TODO
@@ -107,17 +135,14 @@ def level_2_pass_manager(transpile_config):
     # 6. Remove zero-state reset
     _reset = RemoveResetInZeroState()
 
-    # 7. 1q rotation merge and commutative cancellation iteratively until no more change in depth
-    _depth_check = [Depth(), FixedPoint('depth')]
-
-    def _opt_control(property_set):
-        return not property_set['depth_fixed_point']
-
-    _opt = [Optimize1qGates(), CommutativeCancellation()]
+    # 7. 1q rotation merge and commutative cancellation iteratively until no more change,
+    # revisiting only the gates around the changes
+    _opt = _local(WorklistOptimization([Optimize1qGates(), CommutativeCancellation()]))
 
     pm2 = PassManager()
     if coupling_map:
         pm2.append(_given_layout)
+        pm2.append(_perfect_layout, condition=_choose_layout_condition)
         pm2.append(_choose_layout, condition=_choose_layout_condition)
         pm2.append(_embed)
     pm2.append(_unroll)
@@ -127,6 +152,6 @@ def level_2_pass_manager(transpile_config):
         # pm2.append(_direction_check)  # TODO
         pm2.append(_direction, condition=_direction_condition)
     pm2.append(_reset)
-    pm2.append(_depth_check + _opt, do_while=_opt_control)
+    pm2.append(_opt)
 
     return pm2
@@ -28,7 +28,11 @@ from qiskit.transpiler.passes import CXDirection
 from qiskit.transpiler.passes import SetLayout
 from qiskit.transpiler.passes import DenseLayout
 from qiskit.transpiler.passes import NoiseAdaptiveLayout
+from qiskit.transpiler.passes import VF2Layout
 from qiskit.transpiler.passes import StochasticSwap
+from qiskit.transpiler.passes import SabreSwap
+from qiskit.transpiler.passes import SwapNetworkSwap
+from qiskit.transpiler.passes import SabreLayout
 from qiskit.transpiler.passes import BarrierBeforeFinalMeasurements
 from qiskit.transpiler.passes import FullAncillaAllocation
 from qiskit.transpiler.passes import EnlargeWithAncilla
@@ -41,7 +45,9 @@ from qiskit.transpiler.passes import OptimizeSwapBeforeMeasure
 from qiskit.transpiler.passes import RemoveDiagonalGatesBeforeMeasure
 from qiskit.transpiler.passes import Collect2qBlocks
 from qiskit.transpiler.passes import ConsolidateBlocks
+from qiskit.transpiler.passes import CXPhaseResynthesis
 from qiskit.transpiler.passes import ApplyLayout
+from qiskit.transpiler.passes import ParallelTimeSlices
 
 
 def level_3_pass_manager(transpile_config):
@@ -50,13 +56,18 @@ def level_3_pass_manager(transpile_config):
     gate cancellation using commutativity rules and unitary synthesis.
 
     This pass manager applies the user-given initial layout. If none is given, and
-    device calibration information is available, the circuit is mapped to the qubits
-    with best readouts and to CX gates with highest fidelity. Otherwise, a layout on
-    the most densely connected qubits is used.
+    a layout that needs no swap is found within a search budget, that is used (the
+    one with the lowest errors, if device calibration information is available).
+    Otherwise, if device calibration information is available, the circuit is mapped
+    to the qubits with best readouts and to CX gates with highest fidelity. Otherwise,
+    a layout on the most densely connected qubits is used.
     The pass manager then transforms the circuit to match the coupling constraints.
     It is then unrolled to the basis, and any flipped cx directions are fixed.
     Finally, optimizations in the form of commutative gate cancellation, resynthesis
-    of two-qubit unitary blocks, and redundant reset removal are performed.
+    of CX and phase gate blocks and of two-qubit unitary blocks, and redundant reset
+    removal are performed. If approximation is enabled and device calibration
+    information is available, the two-qubit blocks are resynthesized with the
+    number of CX gates that maximizes their expected fidelity on their qubits.
     Note: in simulators where coupling_map=None, only the unrolling and optimization
     stages are done.
 
@@ -71,16 +82,32 @@ def level_3_pass_manager(transpile_config):
     initial_layout = transpile_config.initial_layout
     seed_transpiler = transpile_config.seed_transpiler
     backend_properties = transpile_config.backend_properties
+    routing_method = getattr(transpile_config, 'routing_method', None)
+    target_cache = getattr(transpile_config, 'target_cache', None)
+    approximation = getattr(transpile_config, 'approximation', False)
+    slice_size = getattr(transpile_config, 'parallel_local_passes', None)
 
-    # 1. Layout on good qubits if calibration info available, otherwise on dense links
+    def _local(pass_):
+        # run a local pass on time slices of the circuit in parallel, if asked to
+        return ParallelTimeSlices(pass_, slice_size) if slice_size else pass_
+
+    # 1. Layout without swaps if found, else on good qubits if calibration info
+    # available, otherwise on dense links
     _given_layout = SetLayout(initial_layout)
 
     def _choose_layout_condition(property_set):
         return not property_set['layout']
 
-    _choose_layout = DenseLayout(coupling_map)
+    # If the circuit fits the coupling map without swaps, use such a layout
+    _perfect_layout = VF2Layout(coupling_map, backend_properties, call_limit=int(1e5))
+
+    _choose_layout = DenseLayout(coupling_map, target_cache=target_cache)
     if backend_properties:
-        _choose_layout = NoiseAdaptiveLayout(backend_properties)
+        _choose_layout = NoiseAdaptiveLayout(backend_properties, target_cache=target_cache)
+    if routing_method == 'sabre':
+        _choose_layout = [_choose_layout,
+                          SabreLayout(coupling_map, backend_properties,
+                                      seed=seed_transpiler)]
 
     # 2. Extend dag/layout with ancillas using the full coupling map
     _embed = [FullAncillaAllocation(coupling_map), EnlargeWithAncilla(), ApplyLayout()]
@@ -91,12 +118,19 @@ def level_3_pass_manager(transpile_config):
     def _swap_condition(property_set):
         return not property_set['is_swap_mapped']
 
+    if routing_method == 'sabre':
+        _router = SabreSwap(coupling_map, backend_properties)
+    elif routing_method == 'swap_network':
+        _router = SwapNetworkSwap(coupling_map)
+    else:
+        _router = StochasticSwap(coupling_map, trials=20, seed=seed_transpiler)
+
     _swap = [BarrierBeforeFinalMeasurements(),
              Unroll3qOrMore(),
-             StochasticSwap(coupling_map, trials=20, seed=seed_transpiler)]
+             _router]
 
     # 4. Unroll to the basis
-    _unroll = Unroller(basis_gates)
+    _unroll = _local(Unroller(basis_gates))
 
     # 5. 1q rotation merge and commutative cancellation iteratively until no more change in depth
     _depth_check = [Depth(), FixedPoint('depth')]
@@ -105,9 +139,11 @@ def level_3_pass_manager(transpile_config):
         return not property_set['depth_fixed_point']
 
     _opt = [RemoveResetInZeroState(),
-            Collect2qBlocks(), ConsolidateBlocks(),
-            Unroller(basis_gates),  # unroll unitaries
-            Optimize1qGates(), CommutativeCancellation(),
+            CXPhaseResynthesis(coupling_map),
+            Collect2qBlocks(),
+            ConsolidateBlocks(backend_properties=backend_properties if approximation else None),
+            _local(Unroller(basis_gates)),  # unroll unitaries
+            _local(Optimize1qGates()), _local(CommutativeCancellation()),
             OptimizeSwapBeforeMeasure(), RemoveDiagonalGatesBeforeMeasure()]
 
     if coupling_map:
@@ -117,6 +153,7 @@ def level_3_pass_manager(transpile_config):
     pm3 = PassManager()
     if coupling_map:
         pm3.append(_given_layout)
+        pm3.append(_perfect_layout, condition=_choose_layout_condition)
         pm3.append(_choose_layout, condition=_choose_layout_condition)
         pm3.append(_embed)
     pm3.append(_unroll)
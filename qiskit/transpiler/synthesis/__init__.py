@@ -16,3 +16,4 @@
 
 
 from .graysynth import graysynth, cnot_synth
+from .gf2_matrix import GF2Matrix
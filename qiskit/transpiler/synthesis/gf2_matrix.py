@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Matrices over GF(2), with the bits of each row packed in 64-bit words.
+
+The row operations of the synthesis algorithms for linear reversible circuits
+are XORs of a few words, done for many rows at once with NumPy.
+"""
+
+import numpy as np
+
+from qiskit.exceptions import QiskitError
+
+_WORD_SIZE = 64
+_SHIFTS = np.arange(_WORD_SIZE, dtype=np.uint64)
+_ONE = np.uint64(1)
+# The number of bits set in each byte
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.int64)
+# The ufuncs are generated at runtime, so pylint cannot find their reduce method
+_XOR_REDUCE = np.bitwise_xor.reduce  # pylint: disable=no-member
+_OR_REDUCE = np.bitwise_or.reduce  # pylint: disable=no-member
+
+
+class GF2Matrix:
+    """A matrix over GF(2), with the bits of each row packed in 64-bit words.
+
+    The bit of column j of a row is bit j % 64 of word j // 64 of the row.
+    """
+
+    def __init__(self, data):
+        """
+        Args:
+            data (list[list] or ndarray or GF2Matrix): a matrix of 0 and 1.
+
+        Raises:
+            QiskitError: if data is not two-dimensional.
+        """
+        if isinstance(data, GF2Matrix):
+            self.num_rows, self.num_cols = data.num_rows, data.num_cols
+            self.words = data.words.copy()
+            return
+        bits = np.asarray(data)
+        if bits.ndim != 2:
+            raise QiskitError('A GF2Matrix must be built from a two-dimensional matrix, '
+                              'not one of shape {}'.format(bits.shape))
+        self.num_rows, self.num_cols = bits.shape
+        self.words = _pack(bits.astype(bool))
+
+    @classmethod
+    def identity(cls, size):
+        """The identity matrix of the given size."""
+        return cls(np.eye(size, dtype=bool))
+
+    @property
+    def shape(self):
+        """The number of rows and columns of the matrix."""
+        return self.num_rows, self.num_cols
+
+    def __getitem__(self, index):
+        row, col = index
+        return int((self.words[row, col // _WORD_SIZE] >> np.uint64(col % _WORD_SIZE)) & _ONE)
+
+    def __eq__(self, other):
+        return isinstance(other, GF2Matrix) and self.shape == other.shape and \
+            np.array_equal(self.words, other.words)
+
+    def __repr__(self):
+        return 'GF2Matrix({})'.format(self.to_array().tolist())
+
+    def copy(self):
+        """A copy of the matrix."""
+        return GF2Matrix(self)
+
+    def to_array(self):
+        """The matrix, as an ndarray of 0 and 1."""
+        bits = (self.words[:, :, np.newaxis] >> _SHIFTS) & _ONE
+        return bits.reshape(self.num_rows, -1)[:, :self.num_cols].astype(int)
+
+    def row(self, index):
+        """A row of the matrix, as an ndarray of 0 and 1."""
+        bits = (self.words[index][:, np.newaxis] >> _SHIFTS) & _ONE
+        return bits.reshape(-1)[:self.num_cols].astype(int)
+
+    def row_key(self, index):
+        """A hashable value equal for the rows with the same bits."""
+        return self.words[index].tobytes()
+
+    def row_weights(self):
+        """The number of ones in each row, as an ndarray."""
+        bytes_ = self.words.view(np.uint8).reshape(self.num_rows, 8 * self.words.shape[1])
+        return _POPCOUNT[bytes_].sum(axis=1)
+
+    def row_xor(self, target, source):
+        """Add the source rows to the target rows.
+
+        Args:
+            target (int or list[int]): the rows to modify, all different.
+            source (int or list[int]): the rows added to them, one for all the
+                targets or one for each, not among the targets.
+        """
+        self.words[target] ^= self.words[source]
+
+    def swap_rows(self, row1, row2):
+        """Swap two rows of the matrix."""
+        self.words[[row1, row2]] = self.words[[row2, row1]]
+
+    def nonzero_rows(self, col, start=0):
+        """The rows from start with a one in column col, as an ndarray."""
+        bits = (self.words[start:, col // _WORD_SIZE] >> np.uint64(col % _WORD_SIZE)) & _ONE
+        return start + np.nonzero(bits)[0]
+
+    def sub_rows(self, start, stop):
+        """The bits of columns start to stop of each row, as the bits of an integer.
+
+        Returns:
+            list[int]: bit k of the integer of a row is the bit of its column start + k.
+        """
+        values = np.zeros(self.num_rows, dtype=np.uint64)
+        for col in range(start, stop):
+            bits = (self.words[:, col // _WORD_SIZE] >> np.uint64(col % _WORD_SIZE)) & _ONE
+            values |= bits << np.uint64(col - start)
+        return values.tolist()
+
+    def columns(self, cols):
+        """The matrix of some of the columns.
+
+        Args:
+            cols (list[int] or ndarray): the indices of the columns, or a mask of them.
+
+        Returns:
+            GF2Matrix: the matrix of the columns, in order.
+        """
+        cols = np.asarray(cols)
+        if cols.dtype == bool and cols.all():
+            return self.copy()
+        return GF2Matrix(self.to_array()[:, cols])
+
+    def transpose(self):
+        """The transposed matrix."""
+        return GF2Matrix(self.to_array().T)
+
+    def dot(self, other):
+        """The product of this matrix by another.
+
+        Args:
+            other (GF2Matrix): the matrix to multiply by, on the right.
+
+        Returns:
+            GF2Matrix: the product of the two matrices.
+
+        Raises:
+            QiskitError: if the number of columns of this matrix is not the
+                number of rows of the other.
+        """
+        if self.num_cols != other.num_rows:
+            raise QiskitError('Cannot multiply a matrix of shape {} by one of shape {}'.format(
+                self.shape, other.shape))
+        selected = np.where(self.to_array().astype(bool)[:, :, np.newaxis],
+                            other.words[np.newaxis, :, :], np.uint64(0))
+        result = GF2Matrix(np.zeros((self.num_rows, other.num_cols), dtype=bool))
+        result.words = _XOR_REDUCE(selected, axis=1)
+        return result
+
+    def is_upper_triangular(self):
+        """Whether all the entries below the diagonal are zero."""
+        return not np.any(np.tril(self.to_array(), -1))
+
+    def rank(self):
+        """The rank of the matrix."""
+        work = self.copy()
+        rank = 0
+        for col in range(self.num_cols):
+            rows = work.nonzero_rows(col, rank)
+            if not rows.size:
+                continue
+            work.swap_rows(rank, rows[0])
+            work.row_xor(rows[1:], rank)
+            rank += 1
+            if rank == self.num_rows:
+                break
+        return rank
+
+    def inverse(self):
+        """The inverse of the matrix, by gauss-jordan elimination.
+
+        Returns:
+            GF2Matrix: the inverse matrix.
+
+        Raises:
+            QiskitError: if the matrix is not square and invertible.
+        """
+        if self.num_rows != self.num_cols:
+            raise QiskitError('Only a square matrix can be inverted, not one of shape {}'.format(
+                self.shape))
+        work = self.copy()
+        inverse = GF2Matrix.identity(self.num_rows)
+        for col in range(self.num_cols):
+            rows = work.nonzero_rows(col, col)
+            if not rows.size:
+                raise QiskitError('The matrix is not invertible.')
+            if rows[0] != col:
+                work.swap_rows(col, rows[0])
+                inverse.swap_rows(col, rows[0])
+            rows = work.nonzero_rows(col)
+            rows = rows[rows != col]
+            work.row_xor(rows, col)
+            inverse.row_xor(rows, col)
+        return inverse
+
+
+def _pack(bits):
+    """The rows of a boolean matrix, packed in 64-bit words."""
+    num_rows, num_cols = bits.shape
+    num_words = -(-num_cols // _WORD_SIZE)
+    padded = np.zeros((num_rows, num_words * _WORD_SIZE), dtype=np.uint64)
+    padded[:, :num_cols] = bits
+    padded = padded.reshape(num_rows, num_words, _WORD_SIZE) << _SHIFTS
+    return _OR_REDUCE(padded, axis=2)
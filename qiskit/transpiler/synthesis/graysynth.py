@@ -18,10 +18,14 @@ circuits with efficient CNOT cost, and the Patel-Hayes-Markov algorithm
 for optimal synthesis of linear (CNOT-only) reversible circuits.
 """
 
-import copy
 import numpy as np
 from qiskit.circuit import QuantumCircuit
+from qiskit.extensions.standard import CnotGate, TGate, TdgGate, SGate, SdgGate, ZGate, U1Gate
 from qiskit.exceptions import QiskitError
+from qiskit.transpiler.synthesis.gf2_matrix import GF2Matrix
+
+# The named phase-shift gates
+_PHASE_GATES = {'t': TGate, 'tdg': TdgGate, 's': SGate, 'sdg': SdgGate, 'z': ZGate}
 
 
 def graysynth(cnots, angles, section_size=2):
@@ -51,7 +55,8 @@ def graysynth(cnots, angles, section_size=2):
     Quantum Science and Technology 4.1 (2018): 015002.
 
     Args:
-        cnots (list[list]): a matrix whose columns are the parities to be synthesized
+        cnots (list[list] or ndarray or GF2Matrix): a matrix whose columns are the parities
+            to be synthesized
             e.g.
                 [[0, 1, 1, 1, 1, 1],
                  [1, 0, 0, 1, 1, 1],
@@ -66,7 +71,8 @@ def graysynth(cnots, angles, section_size=2):
             have to be 't', 'tdg', 's', 'sdg' or 'z'.
 
         section_size (int): the size of every section, used in _lwr_cnot_synth(), in the
-            Patel–Markov–Hayes algorithm. section_size must be a factor of n_qubits.
+            Patel–Markov–Hayes algorithm. The last section is smaller when section_size
+            is not a factor of n_qubits.
 
     Returns:
         QuantumCircuit: the quantum circuit
@@ -74,109 +80,102 @@ def graysynth(cnots, angles, section_size=2):
     Raises:
         QiskitError: when dimensions of cnots and angles don't align
     """
-    n_qubits = len(cnots)
+    qcir, state = _phase_network(cnots, angles)
+    # Undo the linear transformation of the parity network
+    for instruction in cnot_synth(state.inverse(), section_size).data:
+        qcir._append(*instruction)
+    return qcir
+
+
+def _phase_network(cnots, angles):
+    """
+    The parity network of graysynth, applying the phase-shift gates, before the
+    linear transformation it leaves the qubits in is undone.
+
+    Args:
+        cnots (list[list] or ndarray or GF2Matrix): a matrix whose columns are the parities
+            to be synthesized
+        angles (list): the phase-shift gates applied to the parities, as in graysynth
 
-    # Create a quantum circuit on n_qubits
+    Returns:
+        tuple(QuantumCircuit, GF2Matrix): the circuit, and the n x n matrix of
+            the linear transformation it implements
+
+    Raises:
+        QiskitError: when dimensions of cnots and angles don't align
+    """
+    cnots = GF2Matrix(cnots)
+    n_qubits = cnots.num_rows
+
+    # Create a quantum circuit on n_qubits. The gates are appended to the
+    # qubits directly, since converting the indices costs O(n_qubits) each time.
     qcir = QuantumCircuit(n_qubits)
+    qubits = qcir.qubits
 
-    if len(cnots[0]) != len(angles):
+    if cnots.num_cols != len(angles):
         raise QiskitError('Size of "cnots" and "angles" do not match.')
 
-    range_list = list(range(n_qubits))
-    epsilon = n_qubits
-    sta = []
-    cnots_copy = np.transpose(np.array(copy.deepcopy(cnots)))
-    state = np.eye(n_qubits).astype('int')  # This matrix keeps track of the state in the algorithm
+    # The phase-shift gates still to be applied, by parity
+    pending = {}
+    parities = cnots.transpose()
+    for index, angle in enumerate(angles):
+        pending.setdefault(parities.row_key(index), []).append(angle)
+    state = GF2Matrix.identity(n_qubits)  # This matrix keeps track of the state in the algorithm
+
+    def apply_phases(qubit):
+        """Apply the phase-shift gates of the parity of the qubit."""
+        for angle in pending.pop(state.row_key(qubit), []):
+            if angle in _PHASE_GATES:
+                gate = _PHASE_GATES[angle]()
+            else:
+                gate = U1Gate(angle % (2 * np.pi))
+            qcir._append(gate, [qubits[qubit]], [])
 
     # Check if some phase-shift gates can be applied, before adding any C-NOT gates
     for qubit in range(n_qubits):
-        index = 0
-        for icnots in cnots_copy:
-            if np.array_equal(icnots, state[qubit]):
-                if angles[index] == 't':
-                    qcir.t(qubit)
-                elif angles[index] == 'tdg':
-                    qcir.tdg(qubit)
-                elif angles[index] == 's':
-                    qcir.s(qubit)
-                elif angles[index] == 'sdg':
-                    qcir.sdg(qubit)
-                elif angles[index] == 'z':
-                    qcir.z(qubit)
-                else:
-                    qcir.u1(angles[index] % np.pi, qubit)
-                del angles[index]
-                cnots_copy = np.delete(cnots_copy, index, axis=0)
-                if index == len(cnots_copy):
-                    break
-                index -= 1
-            index += 1
+        apply_phases(qubit)
 
     # Implementation of the pseudo-code (Algorithm 1) in the aforementioned paper
-    sta.append([cnots, range_list, epsilon])
-    while sta != []:
+    epsilon = n_qubits
+    sta = [[cnots, list(range(n_qubits)), epsilon]]
+    while sta:
         [cnots, ilist, qubit] = sta.pop()
-        if cnots == []:
+        if not cnots.num_cols:
             continue
         elif 0 <= qubit < n_qubits:
             condition = True
             while condition:
                 condition = False
-                for j in range(n_qubits):
-                    if (j != qubit) and (sum(cnots[j]) == len(cnots[j])):
-                        condition = True
-                        qcir.cx(j, qubit)
-                        state[qubit] ^= state[j]
-                        index = 0
-                        for icnots in cnots_copy:
-                            if np.array_equal(icnots, state[qubit]):
-                                if angles[index] == 't':
-                                    qcir.t(qubit)
-                                elif angles[index] == 'tdg':
-                                    qcir.tdg(qubit)
-                                elif angles[index] == 's':
-                                    qcir.s(qubit)
-                                elif angles[index] == 'sdg':
-                                    qcir.sdg(qubit)
-                                elif angles[index] == 'z':
-                                    qcir.z(qubit)
-                                else:
-                                    qcir.u1(angles[index] % np.pi, qubit)
-                                del angles[index]
-                                cnots_copy = np.delete(cnots_copy, index, axis=0)
-                                if index == len(cnots_copy):
-                                    break
-                                index -= 1
-                            index += 1
-                        for x in _remove_duplicates(sta + [[cnots, ilist, qubit]]):
-                            [cnotsp, _, _] = x
-                            if cnotsp == []:
-                                continue
-                            for ttt in range(len(cnotsp[j])):
-                                cnotsp[j][ttt] ^= cnotsp[qubit][ttt]
-        if ilist == []:
+                # Only the row j of cnots changes in the loop, after it is checked
+                weights = cnots.row_weights()
+                for j in np.nonzero(weights == cnots.num_cols)[0].tolist():
+                    if j == qubit:
+                        continue
+                    condition = True
+                    qcir._append(CnotGate(), [qubits[j], qubits[qubit]], [])
+                    state.row_xor(qubit, j)
+                    apply_phases(qubit)
+                    for cnotsp, _, _ in sta + [[cnots, ilist, qubit]]:
+                        if cnotsp.num_cols:
+                            cnotsp.row_xor(j, qubit)
+        if not ilist:
             continue
         # See line 18 in pseudo-code of Algorithm 1 in the aforementioned paper
         # this choice of j maximizes the size of the largest subset (S_0 or S_1)
         # and the larger a subset, the closer it gets to the ideal in the
         # Gray code of one CNOT per string.
-        j = ilist[np.argmax([[max(row.count(0), row.count(1)) for row in cnots][k] for k in ilist])]
-        cnots0 = []
-        cnots1 = []
-        for y in list(map(list, zip(*cnots))):
-            if y[j] == 0:
-                cnots0.append(y)
-            elif y[j] == 1:
-                cnots1.append(y)
-        cnots0 = list(map(list, zip(*cnots0)))
-        cnots1 = list(map(list, zip(*cnots1)))
+        weights = cnots.row_weights()
+        weights = weights[ilist]
+        j = ilist[np.argmax(np.maximum(weights, cnots.num_cols - weights))]
+        ones = cnots.row(j).astype(bool)
+        cnots0 = cnots.columns(~ones)
+        cnots1 = cnots.columns(ones)
         if qubit == epsilon:
             sta.append([cnots1, list(set(ilist).difference([j])), j])
         else:
             sta.append([cnots1, list(set(ilist).difference([j])), qubit])
         sta.append([cnots0, list(set(ilist).difference([j])), qubit])
-    qcir += cnot_synth(state, section_size)
-    return qcir
+    return qcir, state
 
 
 def cnot_synth(state, section_size=2):
@@ -191,10 +190,11 @@ def cnot_synth(state, section_size=2):
     Quantum Information & Computation 8.3 (2008): 282-294.
 
     Args:
-        state (list[list] or ndarray): n x n matrix, describing the state
-            of the input circuit
+        state (list[list] or ndarray or GF2Matrix): n x n matrix, describing
+            the state of the input circuit
         section_size (int): the size of each section, used in _lwr_cnot_synth(), in the
-            Patel–Markov–Hayes algorithm. section_size must be a factor of n_qubits.
+            Patel–Markov–Hayes algorithm. The last section is smaller when section_size
+            is not a factor of n_qubits.
 
     Returns:
         QuantumCircuit: a CNOT-only circuit implementing the
@@ -203,22 +203,23 @@ def cnot_synth(state, section_size=2):
     Raises:
         QiskitError: when variable "state" isn't of type numpy.matrix
     """
-    if not isinstance(state, (list, np.ndarray)):
-        raise QiskitError('state should be of type list or numpy.ndarray, '
+    if not isinstance(state, (list, np.ndarray, GF2Matrix)):
+        raise QiskitError('state should be of type list, numpy.ndarray or GF2Matrix, '
                           'but was of the type {}'.format(type(state)))
-    state = np.array(state)
+    state = GF2Matrix(state)
     # Synthesize lower triangular part
     [state, circuit_l] = _lwr_cnot_synth(state, section_size)
-    state = np.transpose(state)
+    state = state.transpose()
     # Synthesize upper triangular part
     [state, circuit_u] = _lwr_cnot_synth(state, section_size)
     circuit_l.reverse()
     for i in circuit_u:
         i.reverse()
     # Convert the list into a circuit of C-NOT gates
-    circ = QuantumCircuit(state.shape[0])
+    circ = QuantumCircuit(state.num_rows)
+    qubits = circ.qubits
     for i in circuit_u + circuit_l:
-        circ.cx(i[0], i[1])
+        circ._append(CnotGate(), [qubits[i[0]], qubits[i[1]]], [])
     return circ
 
 
@@ -241,64 +242,51 @@ def _lwr_cnot_synth(state, section_size):
     Quantum Information & Computation 8.3 (2008): 282-294.
 
     Args:
-        state (ndarray): n x n matrix, describing a linear quantum circuit
+        state (GF2Matrix): n x n matrix, describing a linear quantum circuit
         section_size (int): the section size the matrix columns are divided into
 
     Returns:
-        numpy.matrix: n by n matrix, describing the state of the output circuit
+        GF2Matrix: n by n matrix, describing the state of the output circuit
         list: a k by 2 list of C-NOT operations that need to be applied
     """
     circuit = []
-    n_qubits = state.shape[0]
+    n_qubits = state.num_rows
 
     # If the matrix is already an upper triangular one,
     # there is no need for any transformations
-    if np.allclose(state, np.triu(state)):
+    if state.is_upper_triangular():
         return [state, circuit]
     # Iterate over column sections
     for sec in range(1, int(np.ceil(n_qubits/section_size)+1)):
-        # Remove duplicate sub-rows in section sec
+        sec_start = (sec-1)*section_size
+        sec_stop = min(sec*section_size, n_qubits)
+        # Remove duplicate sub-rows in section sec. A row is only added to an
+        # earlier one, which is not modified, so all the additions are done at once.
         patt = {}
-        for row in range((sec-1)*section_size, n_qubits):
-            sub_row_patt = copy.deepcopy(state[row, (sec-1)*section_size:sec*section_size])
-            if np.sum(sub_row_patt) == 0:
+        sources = []
+        targets = []
+        sub_rows = state.sub_rows(sec_start, sec_stop)
+        for row in range(sec_start, n_qubits):
+            sub_row_patt = sub_rows[row]
+            if sub_row_patt == 0:
                 continue
-            if str(sub_row_patt) not in patt:
-                patt[str(sub_row_patt)] = row
+            if sub_row_patt not in patt:
+                patt[sub_row_patt] = row
             else:
-                state[row, :] ^= state[patt[str(sub_row_patt)], :]
-                circuit.append([patt[str(sub_row_patt)], row])
+                sources.append(patt[sub_row_patt])
+                targets.append(row)
+        state.row_xor(targets, sources)
+        circuit.extend([source, target] for source, target in zip(sources, targets))
         # Use gaussian elimination for remaining entries in column section
-        for col in range((sec-1)*section_size, sec*section_size):
-            # Check if 1 on diagonal
-            diag_one = 1
-            if state[col, col] == 0:
-                diag_one = 0
+        for col in range(sec_start, sec_stop):
             # Remove ones in rows below column col
-            for row in range(col+1, n_qubits):
-                if state[row, col] == 1:
-                    if diag_one == 0:
-                        state[col, :] ^= state[row, :]
-                        circuit.append([row, col])
-                        diag_one = 1
-                    state[row, :] ^= state[col, :]
-                    circuit.append([col, row])
+            rows = state.nonzero_rows(col, col+1)
+            if not rows.size:
+                continue
+            # Check if 1 on diagonal
+            if not state[col, col]:
+                state.row_xor(col, rows[0])
+                circuit.append([int(rows[0]), col])
+            state.row_xor(rows, col)
+            circuit.extend([col, row] for row in rows.tolist())
     return [state, circuit]
-
-
-def _remove_duplicates(lists):
-    """
-    Remove duplicates in list
-
-    Args:
-        lists (list): a list which may contain duplicate elements.
-
-    Returns:
-        list: a list which contains only unique elements.
-    """
-
-    unique_list = []
-    for element in lists:
-        if element not in unique_list:
-            unique_list.append(element)
-    return unique_list
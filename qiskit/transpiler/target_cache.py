@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""
+Tables precomputed from a coupling map and backend properties, shared by the
+transpilations for a same backend.
+
+The layout and routing passes compute tables that only depend on the backend:
+the distance matrix of the coupling map, the swap costs of `NoiseAdaptiveLayout`
+and the adjacency matrix of `DenseLayout`. A `TargetCache` computes each of
+them once, and is reused by the `transpile()` calls with the same coupling map
+and backend properties, until the properties change.
+
+When the circuits are transpiled in parallel, the tables are computed before
+the worker processes start, so that they inherit them. A `TargetCache` is
+pickled as its coupling map and backend properties only, and unpickled as the
+cache of the process for those, which is only built if the process does not
+have it yet.
+"""
+
+from collections import OrderedDict
+
+from qiskit.transpiler.coupling import CouplingMap
+from qiskit.transpiler.exceptions import CouplingError, TranspilerError
+
+# The number of target caches kept by get_target_cache
+MAX_TARGET_CACHES = 8
+
+_TARGET_CACHES = OrderedDict()
+
+
+class TargetCache:
+    """
+    The tables of a coupling map and backend properties, computed on first use.
+
+    The tables are shared between the passes using them, so they must not be
+    modified, and neither must the coupling map and the backend properties.
+    """
+
+    def __init__(self, coupling_map, backend_properties=None):
+        """
+        Create a target cache. Use `get_target_cache` to share it between the
+        transpilations instead.
+
+        Args:
+            coupling_map (CouplingMap): directed graph representing a coupling map.
+            backend_properties (BackendProperties): properties of the backend, if any.
+        """
+        self.coupling_map = coupling_map
+        self.backend_properties = backend_properties
+        self._tables = {}
+
+    @classmethod
+    def from_backend(cls, backend):
+        """
+        Get the target cache of the coupling map and the current properties of a backend.
+
+        Args:
+            backend (BaseBackend): a backend with a coupling map.
+
+        Returns:
+            TargetCache: the cache shared by the transpilations for backend.
+
+        Raises:
+            TranspilerError: if the backend has no coupling map.
+        """
+        coupling_map = getattr(backend.configuration(), 'coupling_map', None)
+        if coupling_map is None:
+            raise TranspilerError('The backend %s has no coupling map.' % backend.name())
+        properties = backend.properties() if hasattr(backend, 'properties') else None
+        return get_target_cache(CouplingMap(coupling_map), properties)
+
+    def _table(self, name, compute):
+        """Get the table name, computing it with compute() if it is not yet."""
+        if name not in self._tables:
+            self._tables[name] = compute()
+        return self._tables[name]
+
+    def distance_matrix(self):
+        """
+        The distance matrix of the coupling map.
+
+        Returns:
+            ndarray: the undirected distance between each pair of qubits.
+
+        Raises:
+            CouplingError: if the coupling map is not connected.
+        """
+        if self.coupling_map._dist_matrix is None:
+            self.coupling_map._compute_distance_matrix()
+        return self.coupling_map._dist_matrix
+
+    def dense_layout_tables(self):
+        """
+        The edges, adjacency matrix and breadth first searches of the coupling
+        map, used by `DenseLayout`.
+
+        Returns:
+            tuple: see `dense_layout.connectivity_tables`.
+        """
+        # pylint: disable=cyclic-import
+        from qiskit.transpiler.passes.mapping.dense_layout import connectivity_tables
+        return self._table('dense_layout', lambda: connectivity_tables(self.coupling_map))
+
+    def dense_layout_errors(self):
+        """
+        The CX and readout errors, as used by `DenseLayout`.
+
+        Returns:
+            tuple: see `dense_layout.error_tables`.
+
+        Raises:
+            TranspilerError: if there are no backend properties.
+        """
+        # pylint: disable=cyclic-import
+        from qiskit.transpiler.passes.mapping.dense_layout import error_tables
+        self._check_properties()
+        return self._table('dense_layout_errors',
+                           lambda: error_tables(self.backend_properties, self.coupling_map))
+
+    def noise_adaptive_tables(self):
+        """
+        The reliabilities and swap costs used by `NoiseAdaptiveLayout`.
+
+        Returns:
+            tuple: see `noise_adaptive_layout.reliability_tables`.
+
+        Raises:
+            TranspilerError: if there are no backend properties.
+        """
+        # pylint: disable=cyclic-import
+        from qiskit.transpiler.passes.mapping.noise_adaptive_layout import reliability_tables
+        self._check_properties()
+        return self._table('noise_adaptive',
+                           lambda: reliability_tables(self.backend_properties))
+
+    def precompute(self):
+        """
+        Compute all the tables, for instance before worker processes start.
+
+        The distance matrix is skipped if the coupling map is not connected.
+        """
+        try:
+            self.distance_matrix()
+        except CouplingError:
+            pass
+        self.dense_layout_tables()
+        if self.backend_properties is not None:
+            self.dense_layout_errors()
+            self.noise_adaptive_tables()
+
+    def _check_properties(self):
+        if self.backend_properties is None:
+            raise TranspilerError('The target cache has no backend properties.')
+
+    def __reduce__(self):
+        return get_target_cache, (self.coupling_map, self.backend_properties)
+
+
+def get_target_cache(coupling_map, backend_properties=None):
+    """
+    Get the target cache of a coupling map and backend properties.
+
+    The last MAX_TARGET_CACHES caches are kept, and the same cache is returned
+    for coupling maps with the same edges, in the same order, and properties
+    with the same values.
+
+    Args:
+        coupling_map (CouplingMap): directed graph representing a coupling map.
+        backend_properties (BackendProperties): properties of the backend, if any.
+
+    Returns:
+        TargetCache: the shared cache.
+    """
+    key = (coupling_map.size(), tuple(coupling_map.get_edges()),
+           _properties_fingerprint(backend_properties))
+    target_cache = _TARGET_CACHES.pop(key, None)
+    if target_cache is None:
+        target_cache = TargetCache(coupling_map, backend_properties)
+    _TARGET_CACHES[key] = target_cache
+    while len(_TARGET_CACHES) > MAX_TARGET_CACHES:
+        _TARGET_CACHES.popitem(last=False)
+    return target_cache
+
+
+def _properties_fingerprint(backend_properties):
+    """The values of the backend properties, that the tables depend on.
+
+    The calibration dates are left out, since new calibrations with the same
+    values give the same tables.
+    """
+    if backend_properties is None:
+        return None
+    gates = tuple((gate.gate, tuple(gate.qubits),
+                   tuple((param.name, param.value) for param in gate.parameters))
+                  for gate in backend_properties.gates)
+    qubits = tuple(tuple((nduv.name, nduv.value) for nduv in properties)
+                   for properties in backend_properties.qubits)
+    return backend_properties.backend_name, gates, qubits
@@ -146,4 +146,17 @@ def _get_qiskit_versions():
     return out_dict
 
 
-__qiskit_version__ = _get_qiskit_versions()
+def __getattr__(name):
+    """Look up the versions of the qiskit packages the first time they are read.
+
+    This runs ``pip freeze``, which is too slow to be done at import time.
+    """
+    if name == '__qiskit_version__':
+        globals()[name] = _get_qiskit_versions()
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+# Module level __getattr__ is only supported from Python 3.7 (PEP 562).
+if sys.version_info < (3, 7):
+    __qiskit_version__ = _get_qiskit_versions()
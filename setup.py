@@ -37,9 +37,9 @@ REQUIREMENTS = [
 ]
 
 # Add Cython extensions here
-CYTHON_EXTS = ['utils', 'swap_trial']
-CYTHON_MODULE = 'qiskit.transpiler.passes.mapping.cython.stochastic_swap'
-CYTHON_SOURCE_DIR = 'qiskit/transpiler/passes/mapping/cython/stochastic_swap'
+CYTHON_EXTS = ['stochastic_swap/utils', 'stochastic_swap/swap_trial', 'lookahead_swap/search']
+CYTHON_MODULE = 'qiskit.transpiler.passes.mapping.cython'
+CYTHON_SOURCE_DIR = 'qiskit/transpiler/passes/mapping/cython'
 
 INCLUDE_DIRS = []
 # Extra link args
@@ -59,7 +59,7 @@ else:
 EXT_MODULES = []
 # Add Cython Extensions
 for ext in CYTHON_EXTS:
-    mod = Extension(CYTHON_MODULE + '.' + ext,
+    mod = Extension(CYTHON_MODULE + '.' + ext.replace('/', '.'),
                     sources=[CYTHON_SOURCE_DIR + '/' + ext + '.pyx'],
                     include_dirs=INCLUDE_DIRS,
                     extra_compile_args=COMPILER_FLAGS,
@@ -17,15 +17,18 @@
 import unittest
 
 import numpy as np
+from scipy.linalg import block_diag
 from qiskit.quantum_info.random import random_unitary
 
 from qiskit import BasicAer
 from qiskit import QuantumCircuit
 from qiskit import QuantumRegister
 from qiskit import execute
-from qiskit.test import QiskitTestCase
+from qiskit.test import QiskitTestCase, slow_test
 from qiskit.compiler import transpile
 from qiskit.quantum_info.operators.predicates import matrix_equal
+from qiskit.extensions.quantum_initializer.isometry import (_apply_ucg, _apply_diagonal_gate,
+                                                            _apply_multi_controlled_gate)
 
 
 class TestIsometry(QiskitTestCase):
@@ -59,6 +62,41 @@ class TestIsometry(QiskitTestCase):
                 iso_desired = iso
                 self.assertTrue(matrix_equal(iso_from_circuit, iso_desired, ignore_phase=True))
 
+    @slow_test
+    def test_isometry_num_qubits(self):
+        """Tests for the decomposition of state preparations and unitaries on more qubits"""
+        for num_qubits, num_q_input in [(6, 0), (8, 0), (4, 4), (5, 5)]:
+            with self.subTest(num_qubits=num_qubits, num_q_input=num_q_input):
+                iso = random_unitary(2 ** num_qubits, seed=num_qubits).data[:, :2 ** num_q_input]
+                q = QuantumRegister(num_qubits)
+                qc = QuantumCircuit(q)
+                qc.iso(iso, q[:num_q_input], q[num_q_input:])
+                qc = transpile(qc, basis_gates=['u1', 'u3', 'u2', 'cx', 'id'])
+                simulator = BasicAer.get_backend('unitary_simulator')
+                unitary = execute(qc, simulator).result().get_unitary(qc)
+                self.assertTrue(matrix_equal(unitary[:, :2 ** num_q_input], iso,
+                                             ignore_phase=True))
+
+    def test_apply_gates_to_matrix(self):
+        """Tests for the application of gates to the isometry during the decomposition"""
+        num_qubits = 4
+        m = random_unitary(2 ** num_qubits, seed=7).data[:, :3]
+        gates = [random_unitary(2, seed=i).data for i in range(4)]
+        # a UCG controlled by the two most significant qubits
+        ucg = np.kron(block_diag(*gates), np.eye(2))
+        self.assertTrue(np.allclose(_apply_ucg(m.copy(), 2, gates), ucg.dot(m)))
+        # a diagonal gate on the qubits with labels 2 and 0 (label 0 is the most significant)
+        diag = np.exp(1j * np.arange(4))
+        diag_gate = np.diag([diag[2 * ((i >> 1) & 1) + (i >> 3)] for i in range(16)])
+        self.assertTrue(np.allclose(_apply_diagonal_gate(m.copy(), [2, 0], diag),
+                                    diag_gate.dot(m)))
+        # a gate on the qubit with label 1, controlled by the ones with labels 0 and 3
+        mcg = np.eye(16, dtype=complex)
+        for free in [0, 2]:
+            mcg[np.ix_([9 + free, 13 + free], [9 + free, 13 + free])] = gates[0]
+        self.assertTrue(np.allclose(_apply_multi_controlled_gate(m.copy(), [0, 3], 1, gates[0]),
+                                    mcg.dot(m)))
+
 
 if __name__ == '__main__':
     unittest.main()
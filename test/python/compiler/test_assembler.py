@@ -257,6 +257,30 @@ class TestCircuitAssembler(QiskitTestCase):
         self.assertEqual(qobj.experiments[5].instructions[0].params, [1])
         self.assertEqual(qobj.experiments[5].instructions[1].params, [1])
 
+    def test_assemble_circuits_from_iterator(self):
+        """Verify circuits from an iterator are assembled as from a list."""
+        qr = QuantumRegister(2, name='q')
+        cr = ClassicalRegister(2, name='c')
+        circuits = []
+        for name in ['circ0', 'circ1', 'circ2']:
+            circ = QuantumCircuit(qr, cr, name=name)
+            circ.h(qr[0])
+            circ.cx(qr[0], qr[1])
+            circ.measure(qr, cr)
+            circuits.append(circ)
+
+        qobj = assemble((circ for circ in circuits), shots=100, qobj_id='iterator')
+
+        self.assertEqual(qobj, assemble(circuits, shots=100, qobj_id='iterator'))
+
+    def test_assemble_parameterized_circuits_from_iterator(self):
+        """Verify unbound circuits from an iterator raise an error."""
+        qr = QuantumRegister(1)
+        circ = QuantumCircuit(qr)
+        circ.rz(Parameter('x'), qr[0])
+
+        self.assertRaises(QiskitError, assemble, iter([circ]))
+
 
 class TestPulseAssembler(QiskitTestCase):
     """Tests for assembling schedules to qobj."""
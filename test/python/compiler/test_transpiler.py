@@ -22,7 +22,7 @@ from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
 from qiskit import BasicAer
 from qiskit.extensions.standard import CnotGate
 from qiskit.transpiler import PassManager
-from qiskit.compiler import transpile
+from qiskit.compiler import transpile, transpile_iter
 from qiskit.converters import circuit_to_dag
 from qiskit.test import QiskitTestCase, Path
 from qiskit.test.mock import FakeMelbourne, FakeRueschlikon
@@ -478,6 +478,35 @@ class TestTranspile(QiskitTestCase):
         expected = QuantumCircuit(QuantumRegister(2, 'q'))
         self.assertEqual(after, expected)
 
+    def test_transpile_iter(self):
+        """transpile_iter yields the same circuits as transpile, in order."""
+        backend = FakeMelbourne()
+        circuits = []
+        for num_qubits in range(2, 6):
+            qr = QuantumRegister(num_qubits, 'qr')
+            circuit = QuantumCircuit(qr, name='circuit%d' % num_qubits)
+            circuit.h(qr[0])
+            for qubit in range(1, num_qubits):
+                circuit.cx(qr[0], qr[qubit])
+            circuits.append(circuit)
+
+        expected = transpile(circuits, backend=backend, seed_transpiler=42)
+        result = transpile_iter(iter(circuits), backend=backend, seed_transpiler=42,
+                                max_pending=2)
+
+        self.assertNotIsInstance(result, list)
+        self.assertEqual(list(result), expected)
+
+    def test_transpile_iter_too_wide(self):
+        """transpile_iter raises when a circuit is wider than the coupling map."""
+        qr = QuantumRegister(3)
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[2])
+
+        result = transpile_iter([circuit], coupling_map=[[0, 1]])
+
+        self.assertRaises(TranspilerError, list, result)
+
     def test_pass_manager_empty(self):
         """Test passing an empty PassManager() to the transpiler.
 
@@ -603,3 +632,11 @@ class TestTranspile(QiskitTestCase):
 
         with self.assertRaises(TranspilerError):
             transpile(qc, coupling_map=cmap)
+
+    def test_unknown_routing_method(self):
+        """Verify an unknown routing method raises error"""
+        qc = QuantumCircuit(2)
+        qc.cx(0, 1)
+
+        with self.assertRaises(TranspilerError):
+            transpile(qc, coupling_map=[[0, 1]], routing_method='teleport')
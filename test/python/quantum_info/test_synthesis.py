@@ -21,7 +21,7 @@ import scipy.linalg as la
 from qiskit import execute
 from qiskit.circuit import QuantumCircuit, QuantumRegister
 from qiskit.extensions import UnitaryGate
-from qiskit.extensions.standard import (HGate, IdGate, SdgGate, SGate, U3Gate,
+from qiskit.extensions.standard import (CnotGate, HGate, IdGate, SdgGate, SGate, U3Gate,
                                         XGate, YGate, ZGate)
 from qiskit.providers.basicaer import UnitarySimulatorPy
 from qiskit.quantum_info.operators import Operator, Pauli
@@ -29,7 +29,8 @@ from qiskit.quantum_info.random import random_unitary
 from qiskit.quantum_info.synthesis import (two_qubit_cnot_decompose, euler_angles_1q,
                                            TwoQubitBasisDecomposer)
 from qiskit.quantum_info.synthesis.two_qubit_decompose import (TwoQubitWeylDecomposition,
-                                                               Ud)
+                                                               Ud, cached_weyl_decompositions)
+from qiskit.quantum_info.synthesis import two_qubit_decompose
 from qiskit.test import QiskitTestCase
 
 
@@ -272,6 +273,17 @@ class TestTwoQubitWeylDecomposition(QiskitTestCase):
                         a = Ud(aaa, aaa, ccc)
                         self.check_two_qubit_weyl_decomposition(k1 @ a @ k2)
 
+    def test_two_qubit_weyl_decompositions_batch(self, nsamples=10):
+        """Verify a stack of unitaries decomposed together matches their decompositions"""
+        unitaries = np.array([random_unitary(4).data for _ in range(nsamples)] +
+                             [Ud(np.pi/4, 0, 0), Ud(np.pi/4, np.pi/4, np.pi/4), np.eye(4)])
+        for unitary, decomp in zip(unitaries, TwoQubitWeylDecomposition.from_unitaries(unitaries)):
+            with self.subTest(unitary=unitary):
+                expected = TwoQubitWeylDecomposition(unitary)
+                self.assertTrue(np.allclose([decomp.a, decomp.b, decomp.c],
+                                            [expected.a, expected.b, expected.c]))
+                self.check_two_qubit_weyl_decomposition(unitary)
+
 
 class TestTwoQubitDecomposeExact(QiskitTestCase):
     """Test TwoQubitBasisDecomposer() for exact decompositions
@@ -427,6 +439,25 @@ class TestTwoQubitDecomposeExact(QiskitTestCase):
         U = execute(qc, sim).result().get_unitary()
         self.assertEqual(two_qubit_cnot_decompose.num_basis_gates(U), 3)
 
+    def test_num_basis_gates_batch(self):
+        """Verify the number of basis gates of a stack of unitaries"""
+        unitaries = np.array([np.kron(random_unitary(2).data, random_unitary(2).data),
+                              Operator(CnotGate()).data,
+                              Ud(np.pi/4, np.pi/8, 0),
+                              random_unitary(4).data])
+        self.assertEqual(list(two_qubit_cnot_decompose.num_basis_gates(unitaries)), [0, 1, 2, 3])
+
+    def test_decomposition_cached(self):
+        """Verify counting the basis gates of a unitary and synthesizing it decomposes it once"""
+        unitary = random_unitary(4).data
+        two_qubit_cnot_decompose.num_basis_gates(unitary)
+        cache_size = len(two_qubit_decompose._WEYL_CACHE)
+        decomp = cached_weyl_decompositions(unitary[np.newaxis])[0]
+        self.assertIs(cached_weyl_decompositions(unitary.copy()[np.newaxis])[0], decomp)
+        self.check_exact_decomposition(unitary, two_qubit_cnot_decompose)
+
+        self.assertEqual(len(two_qubit_decompose._WEYL_CACHE), cache_size)
+
 # FIXME: need to write tests for the approximate decompositions
 
 
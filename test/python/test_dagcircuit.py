@@ -345,6 +345,25 @@ class TestDagOperations(QiskitTestCase):
         self.assertEqual(expected,
                          [(i.name, i.qargs) for i in self.dag.topological_op_nodes()])
 
+    def test_remove_op_nodes(self):
+        """Test remove_op_nodes links the remaining nodes on each wire."""
+        self.dag.apply_operation_back(HGate(), [self.qubit0])
+        self.dag.apply_operation_back(CnotGate(), [self.qubit0, self.qubit1])
+        self.dag.apply_operation_back(HGate(), [self.qubit0])
+        self.dag.apply_operation_back(XGate(), [self.qubit0])
+        self.dag.apply_operation_back(CnotGate(), [self.qubit1, self.qubit0])
+        self.dag.apply_operation_back(XGate(), [self.qubit1])
+
+        op_nodes = [node for node in self.dag.topological_op_nodes()]
+        self.dag.remove_op_nodes([op_nodes[3], op_nodes[1], op_nodes[2]])
+
+        expected = [('h', [self.qubit0]),
+                    ('cx', [self.qubit1, self.qubit0]),
+                    ('x', [self.qubit1])]
+        self.assertEqual(expected,
+                         [(i.name, i.qargs) for i in self.dag.topological_op_nodes()])
+        self.assertEqual(len(list(self.dag.edges())), 9)
+
     def test_remove_non_op_node(self):
         """Try to remove a non-op node with remove_op_node method."""
         self.dag.apply_operation_back(HGate(), [self.qubit0])
@@ -352,6 +371,39 @@ class TestDagOperations(QiskitTestCase):
         in_node = next(self.dag.topological_nodes())
         self.assertRaises(DAGCircuitError, self.dag.remove_op_node, in_node)
 
+    def test_version_increases_on_modification(self):
+        """The version of the dag changes when the dag is modified."""
+        version = self.dag.version
+        h_node = self.dag.apply_operation_back(HGate(), [self.qubit0])
+        self.assertGreater(self.dag.version, version)
+
+        version = self.dag.version
+        self.dag.remove_op_node(h_node)
+        self.assertGreater(self.dag.version, version)
+
+    def test_version_unchanged_on_read(self):
+        """The version of the dag does not change when the dag is only read."""
+        self.dag.apply_operation_back(HGate(), [self.qubit0])
+        version = self.dag.version
+        self.dag.depth()
+        self.dag.count_ops()
+        list(self.dag.topological_op_nodes())
+        self.assertEqual(self.dag.version, version)
+
+    def test_track_changes(self):
+        """The changes to the op nodes are recorded after track_changes() is called."""
+        h_node = self.dag.apply_operation_back(HGate(), [self.qubit0])
+        x_node = self.dag.apply_operation_back(XGate(), [self.qubit0])
+        self.assertIsNone(self.dag.changes())
+
+        self.dag.track_changes()
+        cx_node = self.dag.apply_operation_back(CnotGate(), [self.qubit0, self.qubit1])
+        self.dag.remove_op_node(x_node)
+        self.assertEqual(self.dag.changes(), ({h_node, cx_node}, {x_node}))
+
+        self.dag.add_qreg(QuantumRegister(1, 'qr2'))
+        self.assertIsNone(self.dag.changes())
+
     def test_dag_collect_runs(self):
         """Test the collect_runs method with 3 different gates."""
         self.dag.apply_operation_back(U1Gate(3.14), [self.qubit0])
@@ -410,6 +462,18 @@ class TestDagOperations(QiskitTestCase):
             self.assertEqual(['h'], [x.name for x in run])
             self.assertEqual([[self.qubit0]], [x.qargs for x in run])
 
+    def test_dag_collect_runs_from_nodes(self):
+        """Test collect_runs with nodes, which only collects the runs with these nodes."""
+        self.dag.apply_operation_back(HGate(), [self.qubit0])
+        u1_node = self.dag.apply_operation_back(U1Gate(3.14), [self.qubit0])
+        self.dag.apply_operation_back(U1Gate(3.14), [self.qubit0])
+        self.dag.apply_operation_back(U1Gate(3.14), [self.qubit1])
+        collected_runs = self.dag.collect_runs(['h', 'u1'], [u1_node])
+        self.assertEqual(len(collected_runs), 1)
+        run = collected_runs.pop()
+        self.assertEqual(['h', 'u1', 'u1'], [x.name for x in run])
+        self.assertIn(run, self.dag.collect_runs(['h', 'u1']))
+
 
 class TestDagLayers(QiskitTestCase):
     """Test finding layers on the dag"""
@@ -613,6 +677,36 @@ class TestDagSubstitute(QiskitTestCase):
 
         self.assertEqual(self.dag.count_ops()['h'], 5)
 
+    def test_substitute_node(self):
+        """The method substitute_node() replaces the operation of a node in place."""
+        x_node = self.dag.op_nodes(op=XGate).pop()
+
+        self.dag.substitute_node(x_node, U1Gate(0.1))
+
+        self.assertEqual(x_node.name, 'u1')
+        self.assertEqual(x_node.op, U1Gate(0.1))
+        self.assertEqual(self.dag.count_ops(), {'h': 1, 'cx': 1, 'u1': 1})
+        with self.assertRaises(DAGCircuitError):
+            self.dag.substitute_node(x_node, CnotGate())
+
+    def test_substitute_block(self):
+        """The method substitute_block() replaces consecutive nodes with operations."""
+        cx_node = self.dag.op_nodes(op=CnotGate).pop()
+        x_node = self.dag.op_nodes(op=XGate).pop()
+
+        new_nodes = self.dag.substitute_block([x_node, cx_node],
+                                              [(XGate(), [self.qubit0], []),
+                                               (CnotGate(), [self.qubit0, self.qubit1], [])])
+
+        expected = [('h', [self.qubit0]),
+                    ('x', [self.qubit0]),
+                    ('cx', [self.qubit0, self.qubit1])]
+        self.assertEqual(expected,
+                         [(i.name, i.qargs) for i in self.dag.topological_op_nodes()])
+        self.assertEqual([node.name for node in new_nodes], ['x', 'cx'])
+        with self.assertRaises(DAGCircuitError):
+            self.dag.substitute_block(new_nodes, [(XGate(), [self.qubit2], [])])
+
     def test_substitute_circuit_one_front(self):
         """The method substitute_node_with_dag() replaces a leaf-in-the-front node with a DAG."""
         pass
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Tests for the cost of `import qiskit`."""
+
+import json
+import subprocess
+import sys
+import unittest
+
+from qiskit.test import QiskitTestCase
+
+# Modules that are slow to import and that `import qiskit` should not load.
+HEAVY_MODULES = ['networkx', 'scipy.stats', 'qiskit.compiler', 'qiskit.dagcircuit',
+                 'qiskit.transpiler', 'qiskit.visualization', 'qiskit.providers.basicaer',
+                 'qiskit.providers.aer', 'qiskit.providers.ibmq']
+
+
+def _modules_loaded_by(statement):
+    """Run statement in a fresh interpreter and return the modules it loaded."""
+    code = "import json, sys\n%s\nprint(json.dumps(list(sys.modules)))" % statement
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(output.decode('utf8').splitlines()[-1])
+
+
+@unittest.skipIf(sys.version_info < (3, 7), 'Lazy imports require Python 3.7 (PEP 562)')
+class TestImport(QiskitTestCase):
+    """Test that `import qiskit` defers the heavy imports."""
+
+    def test_import_qiskit_is_lazy(self):
+        """import qiskit does not load the compiler, the providers or the visualizations."""
+        modules = _modules_loaded_by('import qiskit')
+
+        for module in HEAVY_MODULES:
+            with self.subTest(module=module):
+                self.assertNotIn(module, modules)
+
+    def test_lazy_attributes(self):
+        """The lazy attributes are imported when they are accessed."""
+        modules = _modules_loaded_by('from qiskit import BasicAer, transpile, assemble')
+
+        self.assertIn('qiskit.providers.basicaer', modules)
+        self.assertIn('qiskit.compiler', modules)
+
+    def test_qiskit_version_is_lazy(self):
+        """The versions of the qiskit packages are looked up when they are read."""
+        code = ("import qiskit, qiskit.version\n"
+                "print('__qiskit_version__' in vars(qiskit.version))\n"
+                "print(qiskit.__qiskit_version__['qiskit-terra'] == qiskit.__version__)")
+        output = subprocess.check_output([sys.executable, '-c', code])
+
+        self.assertEqual(output.decode('utf8').split(), ['False', 'True'])
+
+    def test_qiskit_version_is_a_dict(self):
+        """__qiskit_version__ is a plain dict, computed once."""
+        import qiskit
+        from qiskit.version import __qiskit_version__
+
+        self.assertIsInstance(qiskit.__qiskit_version__, dict)
+        self.assertIs(qiskit.__qiskit_version__, __qiskit_version__)
+
+    def test_missing_attribute(self):
+        """Accessing an attribute that does not exist raises AttributeError."""
+        import qiskit
+
+        with self.assertRaises(AttributeError):
+            qiskit.not_an_attribute  # pylint: disable=pointless-statement
+
+
+if __name__ == '__main__':
+    unittest.main()
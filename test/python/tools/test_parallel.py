@@ -16,7 +16,7 @@
 import os
 import time
 
-from qiskit.tools.parallel import parallel_map
+from qiskit.tools.parallel import parallel_map, parallel_imap
 from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
 from qiskit.test import QiskitTestCase
 
@@ -28,6 +28,10 @@ def _parfunc(x):
     return x
 
 
+def _square(x):
+    return x * x
+
+
 def _build_simple(_):
     qreg = QuantumRegister(2)
     creg = ClassicalRegister(2)
@@ -53,3 +57,24 @@ class TestParallel(QiskitTestCase):
         out_circs = parallel_map(_build_simple, list(range(10)))
         names = [circ.name for circ in out_circs]
         self.assertEqual(len(names), len(set(names)))
+
+    def test_parallel_imap(self):
+        """Test parallel_imap yields the results in order"""
+        ans = parallel_imap(_square, iter(range(10)), num_processes=2, max_pending=3)
+        self.assertEqual(list(ans), [x * x for x in range(10)])
+        self.assertEqual(os.getenv('QISKIT_IN_PARALLEL', None), 'FALSE')
+
+    def test_parallel_imap_back_pressure(self):
+        """Verify parallel_imap only consumes the values as results are requested"""
+        consumed = []
+
+        def _values():
+            for value in range(100):
+                consumed.append(value)
+                yield value
+
+        ans = parallel_imap(_square, _values(), num_processes=2, max_pending=4)
+        self.assertEqual([next(ans) for _ in range(3)], [0, 1, 4])
+        self.assertLessEqual(len(consumed), 3 + 4)
+        ans.close()
+        self.assertEqual(os.getenv('QISKIT_IN_PARALLEL', None), 'FALSE')
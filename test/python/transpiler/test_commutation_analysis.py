@@ -18,8 +18,10 @@
 import unittest
 
 from qiskit import QuantumRegister, QuantumCircuit
+from qiskit.circuit import Parameter
 from qiskit.transpiler import PropertySet
 from qiskit.transpiler.passes import CommutationAnalysis
+from qiskit.transpiler.passes import commutation_analysis
 from qiskit.converters import circuit_to_dag
 from qiskit.test import QiskitTestCase
 
@@ -286,6 +288,46 @@ class TestCommutationAnalysis(QiskitTestCase):
                     'qr[4]': [[9], [13, 16, 19], [10]]}
         self.assertCommutationSet(self.pset["commutation_set"], expected)
 
+    def test_unbound_diagonal_gates_commute_by_rules(self):
+        """Test the rule table finds unbound rotations commute with a CX"""
+        theta = Parameter('theta')
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.rz(theta, qr[0])
+        circuit.rx(theta, qr[1])
+        circuit.cx(qr[0], qr[1])
+        dag = circuit_to_dag(circuit)
+
+        self.pass_.run(dag)
+
+        expected = {'qr[0]': [[1], [5, 6, 8], [2]],
+                    'qr[1]': [[3], [5, 7, 8], [4]]}
+        self.assertCommutationSet(self.pset["commutation_set"], expected)
+
+    def test_commutation_cached(self):
+        """Test the pairs checked with matrices are cached, and give the same result"""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+        circuit.x(qr[0])
+        circuit.h(qr[0])
+        circuit.h(qr[0])
+        circuit.u3(0.1, 0.2, 0.3, qr[1])
+        circuit.u3(0.1, 0.2, 0.3, qr[1])
+        dag = circuit_to_dag(circuit)
+
+        commutation_analysis._COMMUTATION_CACHE.clear()
+        self.pass_.run(dag)
+        cache_size = len(commutation_analysis._COMMUTATION_CACHE)
+        self.pass_.run(dag)
+
+        self.assertEqual(cache_size, 4)
+        self.assertEqual(len(commutation_analysis._COMMUTATION_CACHE), cache_size)
+        expected = {'qr[0]': [[1], [5], [6], [7, 8], [2]],
+                    'qr[1]': [[3], [9, 10], [4]]}
+        self.assertCommutationSet(self.pset["commutation_set"], expected)
+
 
 if __name__ == '__main__':
     unittest.main()
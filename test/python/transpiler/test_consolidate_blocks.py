@@ -16,6 +16,7 @@
 Tests for the ConsolidateBlocks transpiler pass.
 """
 
+from datetime import datetime
 import unittest
 import numpy as np
 
@@ -23,8 +24,12 @@ from qiskit.circuit import QuantumCircuit, QuantumRegister
 from qiskit.extensions import UnitaryGate
 from qiskit.converters import circuit_to_dag
 from qiskit.execute import execute
+from qiskit.compiler import transpile
 from qiskit.transpiler.passes import ConsolidateBlocks
 from qiskit.providers.basicaer import UnitarySimulatorPy
+from qiskit.providers.models import BackendProperties
+from qiskit.providers.models.backendproperties import Nduv, Gate
+from qiskit.quantum_info.operators import Operator
 from qiskit.quantum_info.operators.measures import process_fidelity
 from qiskit.test import QiskitTestCase
 
@@ -146,6 +151,116 @@ class TestConsolidateBlocks(QiskitTestCase):
         fidelity = process_fidelity(new_dag.op_nodes()[0].op.to_matrix(), unitary.to_matrix())
         self.assertAlmostEqual(fidelity, 1.0, places=7)
 
+    def test_optimal_block_kept(self):
+        """a block with a single cx already has the fewest cx, and is left as it is"""
+        qr = QuantumRegister(2, "qr")
+        qc = QuantumCircuit(qr)
+        qc.u3(0.1, 0.2, 0.3, qr[0])
+        qc.cx(qr[0], qr[1])
+        qc.u1(0.5, qr[1])
+        dag = circuit_to_dag(qc)
+
+        pass_ = ConsolidateBlocks()
+        pass_.property_set['block_list'] = [list(dag.topological_op_nodes())]
+        new_dag = pass_.run(dag)
+
+        self.assertEqual(dag, new_dag)
+
+    def test_reducible_blocks_consolidated(self):
+        """blocks with more cx than needed are consolidated, each time they occur"""
+        qr = QuantumRegister(3, "qr")
+        qc = QuantumCircuit(qr)
+        qc.cx(qr[0], qr[1])
+        qc.u1(0.3, qr[0])
+        qc.cx(qr[0], qr[1])
+        qc.cx(qr[1], qr[2])
+        qc.u1(0.3, qr[1])
+        qc.cx(qr[1], qr[2])
+        dag = circuit_to_dag(qc)
+        nodes = list(dag.topological_op_nodes())
+
+        pass_ = ConsolidateBlocks()
+        pass_.property_set['block_list'] = [nodes[:3], nodes[3:]]
+        new_dag = pass_.run(dag)
+
+        self.assertEqual(new_dag.count_ops(), {'unitary': 2})
+        phase = np.exp(0.3j)
+        for node in new_dag.op_nodes():
+            self.assertTrue(np.allclose(node.op.to_matrix(), np.diag([1, phase, 1, phase])))
+
+    def test_noisy_edge_approximated(self):
+        """a block on a noisy pair of qubits is defined with fewer cx, when that is
+        expected to be more accurate, and the same block on a perfect pair is kept"""
+        calib_time = datetime(year=2019, month=2, day=1, hour=0, minute=0, second=0)
+        p01 = [Nduv(date=calib_time, name='gate_error', unit='', value=0.1)]
+        g01 = Gate(name="CX0_1", gate="cx", parameters=p01, qubits=[0, 1])
+        qubit = [Nduv(date=calib_time, name='readout_error', unit='', value=0.01)]
+        bprop = BackendProperties(last_update_date=calib_time, backend_name="test_backend",
+                                  qubits=[qubit] * 3, backend_version="1.0.0", gates=[g01],
+                                  general=[])
+        qr = QuantumRegister(3, "qr")
+        qc = QuantumCircuit(qr)
+        qc.cx(qr[0], qr[1])
+        qc.u1(0.01, qr[1])
+        qc.cx(qr[0], qr[1])
+        qc.cx(qr[2], qr[1])
+        qc.u1(0.01, qr[1])
+        qc.cx(qr[2], qr[1])
+        dag = circuit_to_dag(qc)
+        nodes = list(dag.topological_op_nodes())
+
+        pass_ = ConsolidateBlocks(backend_properties=bprop)
+        pass_.property_set['block_list'] = [nodes[:3], nodes[3:]]
+        new_dag = pass_.run(dag)
+
+        self.assertEqual(new_dag.count_ops(), {'unitary': 1, 'cx': 2, 'u1': 1})
+        unitary = new_dag.named_nodes('unitary')[0]
+        self.assertEqual(unitary.qargs, [qr[0], qr[1]])
+        self.assertNotIn('cx', [op.name for op, _, _ in unitary.op.definition])
+        self.assertTrue(np.allclose(Operator(unitary.op.definition).data,
+                                    unitary.op.to_matrix()))
+        block_qr = QuantumRegister(2, "block_qr")
+        block = QuantumCircuit(block_qr)
+        block.cx(block_qr[0], block_qr[1])
+        block.u1(0.01, block_qr[1])
+        block.cx(block_qr[0], block_qr[1])
+        fidelity = process_fidelity(Operator(block).data, unitary.op.to_matrix())
+        self.assertGreater(fidelity, 0.99)
+
+    def test_level_3_approximation(self):
+        """optimization level 3 only approximates the blocks on noisy pairs when asked
+        to, and the approximations of all the blocks lose little fidelity"""
+        calib_time = datetime(year=2019, month=2, day=1, hour=0, minute=0, second=0)
+        gates = [Gate(name="CX%d_%d" % tuple(qubits), gate="cx", qubits=qubits,
+                      parameters=[Nduv(date=calib_time, name='gate_error', unit='',
+                                       value=0.05)])
+                 for qubits in [[0, 1], [1, 0]]]
+        qubit = [Nduv(date=calib_time, name='readout_error', unit='', value=0.01)]
+        bprop = BackendProperties(last_update_date=calib_time, backend_name="test_backend",
+                                  qubits=[qubit] * 3, backend_version="1.0.0", gates=gates,
+                                  general=[])
+        qr = QuantumRegister(3, "qr")
+        qc = QuantumCircuit(qr)
+        for i in range(5):
+            qc.cx(qr[0], qr[1])
+            qc.u1(0.01 * (i + 1), qr[1])
+            qc.cx(qr[0], qr[1])
+            qc.h(qr[2])
+            qc.cx(qr[1], qr[2])
+            qc.u1(0.5, qr[2])
+            qc.cx(qr[1], qr[2])
+        basis_gates = ['u1', 'u2', 'u3', 'cx']
+
+        exact = transpile(qc, basis_gates=basis_gates, backend_properties=bprop,
+                          optimization_level=3)
+        approximate = transpile(qc, basis_gates=basis_gates, backend_properties=bprop,
+                                optimization_level=3, approximation=True)
+
+        self.assertAlmostEqual(process_fidelity(Operator(qc).data, Operator(exact).data), 1)
+        self.assertLess(approximate.count_ops()['cx'], exact.count_ops()['cx'])
+        self.assertGreater(process_fidelity(Operator(qc).data, Operator(approximate).data),
+                           0.99)
+
 
 if __name__ == '__main__':
     unittest.main()
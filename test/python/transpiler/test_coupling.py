@@ -112,3 +112,41 @@ class CouplingTest(QiskitTestCase):
         coupling = CouplingMap(coupling_list)
 
         self.assertFalse(coupling.is_symmetric)
+
+    def test_shortest_undirected_path(self):
+        coupling = CouplingMap([[1, 0], [1, 2], [3, 2], [0, 4], [4, 3]])
+        self.assertEqual([0, 1, 2], coupling.shortest_undirected_path(0, 2))
+        self.assertEqual([2, 1, 0], coupling.shortest_undirected_path(2, 0))
+        self.assertEqual([3, 4, 0], coupling.shortest_undirected_path(3, 0))
+        self.assertEqual([1], coupling.shortest_undirected_path(1, 1))
+
+    def test_shortest_undirected_path_after_add_edge(self):
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3]])
+        self.assertEqual([0, 1, 2, 3], coupling.shortest_undirected_path(0, 3))
+        coupling.add_edge(3, 0)
+        self.assertEqual([0, 3], coupling.shortest_undirected_path(0, 3))
+        self.assertEqual(1, coupling.distance(0, 3))
+
+    def test_shortest_undirected_path_not_connected(self):
+        coupling = CouplingMap([[0, 1], [2, 3]])
+        self.assertEqual([1, 0], coupling.shortest_undirected_path(1, 0))
+        self.assertRaises(CouplingError, coupling.shortest_undirected_path, 0, 3)
+        self.assertRaises(CouplingError, coupling.shortest_undirected_path, 0, 7)
+        self.assertRaises(CouplingError, coupling.distance, 0, 1)
+
+    def test_subgraph_paths(self):
+        """Paths and distances on a subgraph use the labels of its qubits."""
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3], [3, 4]]).subgraph([2, 3, 4])
+        self.assertEqual([2, 3, 4], coupling.shortest_undirected_path(2, 4))
+        self.assertEqual([4, 3], coupling.shortest_undirected_path(4, 3))
+        self.assertEqual(2, coupling.distance(4, 2))
+        self.assertRaises(CouplingError, coupling.shortest_undirected_path, 0, 2)
+
+    def test_distance_matrix_shared(self):
+        """Coupling maps with the same undirected edges share read-only tables."""
+        coupling = CouplingMap([[0, 1], [1, 2]])
+        other = CouplingMap([[2, 1], [1, 0], [0, 1]])
+        self.assertEqual(2, coupling.distance(0, 2))
+        self.assertEqual(2, other.distance(2, 0))
+        self.assertIs(coupling._dist_matrix, other._dist_matrix)
+        self.assertFalse(coupling._dist_matrix.flags.writeable)
@@ -88,6 +88,27 @@ class TestCXDirection(QiskitTestCase):
 
         self.assertEqual(dag, after)
 
+    def test_direction_correct_unmodified(self):
+        """ When no CX needs a flip, the DAG is returned without modification
+         qr0:---(+)---
+                 |
+         qr1:----.----
+
+         CouplingMap map: [0] -> [1]
+        """
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        coupling = CouplingMap([[0, 1]])
+        dag = circuit_to_dag(circuit)
+        version = dag.version
+
+        pass_ = CXDirection(coupling)
+        after = pass_.run(dag)
+
+        self.assertIs(dag, after)
+        self.assertEqual(version, after.version)
+
     def test_direction_flip(self):
         """ Flip a CX
          qr0:----.----
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the CXPhaseResynthesis pass"""
+
+import unittest
+import numpy as np
+
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info import Operator
+from qiskit.transpiler import CouplingMap
+from qiskit.transpiler.passes import CXPhaseResynthesis
+from qiskit.test import QiskitTestCase
+
+
+class TestCXPhaseResynthesis(QiskitTestCase):
+    """Test the CXPhaseResynthesis pass."""
+
+    def assertEquivalent(self, circuit, other):
+        """The two circuits have the same unitary, up to a global phase."""
+        expected = Operator(circuit).data
+        actual = Operator(other).data
+        index = np.argmax(np.abs(expected[:, 0]))
+        phase = actual[index, 0] / expected[index, 0]
+        self.assertTrue(np.allclose(actual, phase * expected))
+
+    def test_cx_network(self):
+        """A network of CX gates is replaced with the single CX it is equal to.
+
+        qr0:--.---------.-------
+              |         |
+        qr1:-(+)--.----(+)--.---
+                  |         |
+        qr2:-----(+)-------(+)--
+        """
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+
+        expected = QuantumCircuit(qr)
+        expected.cx(qr[0], qr[2])
+
+        after = CXPhaseResynthesis().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(expected))
+
+    def test_phases_of_same_parity_merged(self):
+        """The phases applied to the same parity are merged, and the CX gates removed."""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.t(qr[1])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[1])
+        circuit.t(qr[1])
+        circuit.cx(qr[0], qr[1])
+
+        after = dag_to_circuit(CXPhaseResynthesis().run(circuit_to_dag(circuit)))
+
+        self.assertEqual(after.count_ops(), {'cx': 2, 's': 1})
+        self.assertEquivalent(circuit, after)
+
+    def test_blocks_split_by_other_gates(self):
+        """The gates on either side of a gate outside of the blocks are not merged."""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[1])
+        circuit.cx(qr[0], qr[1])
+
+        after = CXPhaseResynthesis().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_conditional_gates_kept(self):
+        """Conditional gates are not in the blocks."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(1, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[1]).c_if(cr, 1)
+
+        after = CXPhaseResynthesis().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_coupling_map(self):
+        """A block is not replaced when the new CX gates are not on the coupling map."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        coupling = CouplingMap([[0, 1], [1, 2]])
+
+        after = CXPhaseResynthesis(coupling).run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_random_circuits_equivalent(self):
+        """The optimized circuits have the same unitary and no more CX gates."""
+        qr = QuantumRegister(5, 'qr')
+        rng = np.random.RandomState(17)
+        for _ in range(5):
+            circuit = QuantumCircuit(qr)
+            for _ in range(80):
+                gate = rng.choice(['cx', 'cx', 't', 'sdg', 'z', 'u1', 'h'])
+                qubits = [qr[int(i)] for i in rng.permutation(5)]
+                if gate == 'cx':
+                    circuit.cx(qubits[0], qubits[1])
+                elif gate == 'u1':
+                    circuit.u1(rng.uniform(0, 2 * np.pi), qubits[0])
+                else:
+                    getattr(circuit, gate)(qubits[0])
+
+            after = dag_to_circuit(CXPhaseResynthesis().run(circuit_to_dag(circuit)))
+
+            self.assertLessEqual(after.count_ops()['cx'], circuit.count_ops()['cx'])
+            self.assertEquivalent(circuit, after)
+
+
+if __name__ == '__main__':
+    unittest.main()
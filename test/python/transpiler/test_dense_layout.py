@@ -14,14 +14,30 @@
 
 """Test the DenseLayout pass"""
 
+from datetime import datetime
 import unittest
 
-from qiskit import QuantumRegister, QuantumCircuit
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
 from qiskit.transpiler import CouplingMap
 from qiskit.transpiler.passes import DenseLayout
 from qiskit.converters import circuit_to_dag
 from qiskit.test import QiskitTestCase
 from qiskit.test.mock import FakeTokyo
+from qiskit.providers.models import BackendProperties
+from qiskit.providers.models.backendproperties import Nduv, Gate
+
+
+def make_line_properties(cx_errors, readout_errors):
+    """BackendProperties of a line of qubits, with the given errors."""
+    calib_time = datetime(year=2019, month=2, day=1, hour=0, minute=0, second=0)
+    qubits = [[Nduv(name="readout_error", date=calib_time, unit="", value=error)]
+              for error in readout_errors]
+    gates = [Gate(name="CX%s_%s" % (i, i + 1), gate="cx", qubits=[i, i + 1],
+                  parameters=[Nduv(date=calib_time, name='gate_error', unit='', value=error)])
+             for i, error in enumerate(cx_errors)]
+    return BackendProperties(last_update_date=calib_time, backend_name="test_backend",
+                             qubits=qubits, backend_version="1.0.0", gates=gates,
+                             general=[])
 
 
 class TestDenseLayout(QiskitTestCase):
@@ -72,6 +88,58 @@ class TestDenseLayout(QiskitTestCase):
         self.assertEqual(layout[qr1[1]], 1)
         self.assertEqual(layout[qr1[2]], 0)
 
+    def test_lowest_cx_error(self):
+        """Test picks the connected pair with the lowest CX error.
+        """
+        qr = QuantumRegister(2, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        dag = circuit_to_dag(circuit)
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3]])
+
+        pass_ = DenseLayout(coupling)
+        pass_.run(dag)
+        self.assertEqual({pass_.property_set['layout'][qr[0]],
+                          pass_.property_set['layout'][qr[1]]}, {0, 1})
+
+        backend_prop = make_line_properties([0.5, 0.3, 0.01], [0.01] * 4)
+        pass_ = DenseLayout(coupling, backend_prop)
+        pass_.run(dag)
+        self.assertEqual({pass_.property_set['layout'][qr[0]],
+                          pass_.property_set['layout'][qr[1]]}, {2, 3})
+
+    def test_lowest_readout_error(self):
+        """Test avoids qubits with bad readout when the circuit measures.
+        """
+        qr = QuantumRegister(2, 'q')
+        cr = ClassicalRegister(2, 'c')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.cx(qr[0], qr[1])
+        circuit.measure(qr, cr)
+        dag = circuit_to_dag(circuit)
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3]])
+
+        backend_prop = make_line_properties([0.01] * 3, [0.3, 0.2, 0.01, 0.02])
+        pass_ = DenseLayout(coupling, backend_prop)
+        pass_.run(dag)
+        self.assertEqual({pass_.property_set['layout'][qr[0]],
+                          pass_.property_set['layout'][qr[1]]}, {2, 3})
+
+    def test_large_lattice(self):
+        """Test finds a square and one more qubit in a 20x20 lattice.
+        """
+        edges = [[20 * i + j, 20 * i + j + 1] for i in range(20) for j in range(19)]
+        edges += [[20 * i + j, 20 * i + j + 20] for i in range(19) for j in range(20)]
+        qr = QuantumRegister(5, 'q')
+        circuit = QuantumCircuit(qr)
+        dag = circuit_to_dag(circuit)
+
+        pass_ = DenseLayout(CouplingMap(edges))
+        pass_.run(dag)
+
+        physical = {pass_.property_set['layout'][qubit] for qubit in qr}
+        self.assertEqual(len([edge for edge in edges if set(edge) <= physical]), 5)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the GF2Matrix class"""
+
+import unittest
+import numpy as np
+
+from qiskit.exceptions import QiskitError
+from qiskit.transpiler.synthesis import GF2Matrix, cnot_synth, graysynth
+from qiskit.test import QiskitTestCase
+
+
+def _random_invertible(rng, size):
+    """A random invertible matrix, as a product of row additions."""
+    matrix = np.eye(size, dtype=int)
+    for _ in range(4 * size):
+        source, target = rng.choice(size, 2, replace=False)
+        matrix[target] ^= matrix[source]
+    return matrix
+
+
+class TestGF2Matrix(QiskitTestCase):
+    """Test the GF2Matrix class."""
+
+    def test_round_trip(self):
+        """The matrix is unpacked to the bits it was built from, over several words."""
+        bits = np.random.RandomState(1).randint(2, size=(5, 150))
+        matrix = GF2Matrix(bits)
+
+        self.assertEqual(matrix.shape, (5, 150))
+        self.assertEqual(matrix.words.shape, (5, 3))
+        self.assertTrue(np.array_equal(matrix.to_array(), bits))
+        self.assertTrue(np.array_equal(matrix.row(3), bits[3]))
+        self.assertEqual(matrix[2, 130], bits[2, 130])
+        self.assertTrue(np.array_equal(matrix.row_weights(), bits.sum(axis=1)))
+        self.assertTrue(np.array_equal(matrix.transpose().to_array(), bits.T))
+
+    def test_not_two_dimensional(self):
+        """Only a two-dimensional matrix can be packed."""
+        with self.assertRaises(QiskitError):
+            GF2Matrix([1, 0, 1])
+
+    def test_row_xor(self):
+        """Rows are added to several other rows at once."""
+        bits = np.random.RandomState(2).randint(2, size=(4, 70))
+        matrix = GF2Matrix(bits)
+
+        matrix.row_xor([1, 3], 0)
+        matrix.row_xor(2, 1)
+
+        bits[[1, 3]] ^= bits[0]
+        bits[2] ^= bits[1]
+        self.assertTrue(np.array_equal(matrix.to_array(), bits))
+
+    def test_sub_rows(self):
+        """The bits of a range of columns of each row are packed in an integer."""
+        matrix = GF2Matrix([[1, 0, 1, 1], [0, 1, 0, 0], [1, 1, 1, 0]])
+
+        self.assertEqual(matrix.sub_rows(1, 4), [0b110, 0b001, 0b011])
+
+    def test_dot_inverse_rank(self):
+        """The product of a matrix and its inverse is the identity."""
+        rng = np.random.RandomState(3)
+        bits = _random_invertible(rng, 80)
+        matrix = GF2Matrix(bits)
+
+        inverse = matrix.inverse()
+
+        self.assertEqual(matrix.dot(inverse), GF2Matrix.identity(80))
+        self.assertTrue(np.array_equal(matrix.dot(inverse).to_array(),
+                                       bits.dot(inverse.to_array()) % 2))
+        self.assertEqual(matrix.rank(), 80)
+
+    def test_singular(self):
+        """A singular matrix has a lower rank, and no inverse."""
+        matrix = GF2Matrix([[1, 1, 0], [0, 1, 1], [1, 0, 1]])
+
+        self.assertEqual(matrix.rank(), 2)
+        with self.assertRaises(QiskitError):
+            matrix.inverse()
+
+    def test_synthesis_from_gf2_matrix(self):
+        """cnot_synth and graysynth give the same circuits for a GF2Matrix and a list."""
+        rng = np.random.RandomState(4)
+        bits = _random_invertible(rng, 6)
+        cnots = rng.randint(2, size=(6, 5))
+        cnots[0] = 1
+
+        self.assertEqual(cnot_synth(GF2Matrix(bits)), cnot_synth(bits.tolist()))
+        self.assertEqual(graysynth(GF2Matrix(cnots), ['t'] * 5),
+                         graysynth(cnots.tolist(), ['t'] * 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
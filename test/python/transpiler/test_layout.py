@@ -19,7 +19,7 @@ import unittest
 import warnings
 
 from qiskit.circuit import QuantumRegister, Qubit
-from qiskit.transpiler.layout import Layout
+from qiskit.transpiler.layout import Layout, ArrayLayout
 from qiskit.transpiler.exceptions import LayoutError
 from qiskit.test import QiskitTestCase
 
@@ -784,5 +784,89 @@ class LayoutDeprecatedTest(QiskitTestCase):
         self.assertDictEqual(layout._v2p, expected._v2p)
 
 
+class ArrayLayoutTest(QiskitTestCase):
+    """Test the ArrayLayout class."""
+
+    def setUp(self):
+        self.qr = QuantumRegister(3, 'qr')
+        self.layout = Layout({self.qr[0]: 2, self.qr[1]: 0, self.qr[2]: 4})
+
+    def test_from_layout(self):
+        """The arrays map the virtual bits in order, and idle bits on free physical qubits."""
+        array_layout = ArrayLayout.from_layout(self.layout, num_physical=6)
+
+        self.assertEqual(array_layout.virtual_bits, list(self.qr) + [None, None, None])
+        self.assertEqual(array_layout.logic_to_phys.tolist(), [2, 0, 4, 1, 3, 5])
+        self.assertEqual(array_layout.phys_to_logic.tolist(), [1, 3, 0, 4, 2, 5])
+        self.assertEqual(len(array_layout), 6)
+
+    def test_dict_interface(self):
+        """The dict interface is the same as the one of the Layout."""
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        self.assertEqual(array_layout[self.qr[0]], 2)
+        self.assertEqual(array_layout[4], self.qr[2])
+        self.assertIsNone(array_layout[1])
+        self.assertDictEqual(array_layout.get_virtual_bits(), self.layout.get_virtual_bits())
+        self.assertEqual(array_layout.get_registers(), {self.qr})
+        with self.assertRaises(KeyError):
+            _ = array_layout[5]
+
+    def test_to_layout(self):
+        """Converting back gives the same Layout."""
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        layout = array_layout.to_layout()
+
+        self.assertDictEqual(layout._v2p, self.layout._v2p)
+
+    def test_swap(self):
+        """Swapping in an ArrayLayout is the same as in a Layout."""
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        array_layout.swap(0, 2)
+        array_layout.swap(0, 4)
+        array_layout.swap(self.qr[0], self.qr[2])
+        self.layout.swap(0, 2)
+        self.layout.swap(0, 4)
+        self.layout.swap(self.qr[0], self.qr[2])
+
+        self.assertDictEqual(array_layout.get_virtual_bits(), self.layout.get_virtual_bits())
+        with self.assertRaises(LayoutError):
+            array_layout.swap(0, self.qr[0])
+
+    def test_swap_with_idle(self):
+        """A virtual qubit can be swapped to a free physical qubit."""
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        array_layout.swap(2, 3)
+
+        self.assertEqual(array_layout[self.qr[0]], 3)
+        self.assertIsNone(array_layout[2])
+
+    def test_copy(self):
+        """A copy does not change with the original."""
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        layout_copy = array_layout.copy()
+        array_layout.swap(0, 2)
+
+        self.assertDictEqual(layout_copy.get_virtual_bits(), self.layout.get_virtual_bits())
+
+    def test_combine_into_edge_map(self):
+        """The edge map is the same as the one of the Layout."""
+        qr = QuantumRegister(5, 'q')
+        trivial = Layout.generate_trivial_layout(qr)
+        array_layout = ArrayLayout.from_layout(self.layout)
+
+        self.assertDictEqual(array_layout.combine_into_edge_map(trivial),
+                             self.layout.combine_into_edge_map(trivial))
+
+    def test_not_a_permutation(self):
+        """The arrays must be a permutation."""
+        with self.assertRaises(LayoutError):
+            ArrayLayout(list(self.qr), [0, 0, 1])
+
+
 if __name__ == '__main__':
     unittest.main()
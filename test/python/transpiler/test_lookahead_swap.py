@@ -16,7 +16,11 @@
 
 import unittest
 from qiskit.transpiler.passes import LookaheadSwap
-from qiskit.transpiler import CouplingMap
+from qiskit.transpiler.passes.mapping.lookahead_swap import (_copy_circuit_metadata,
+                                                             _swap_ops_from_edge,
+                                                             _transform_gate_for_layout)
+from qiskit.transpiler import CouplingMap, Layout, ArrayLayout
+from qiskit.transpiler.exceptions import TranspilerError
 from qiskit.converters import circuit_to_dag
 from qiskit import ClassicalRegister, QuantumRegister, QuantumCircuit
 from qiskit.test import QiskitTestCase
@@ -157,6 +161,184 @@ class TestLookaheadSwap(QiskitTestCase):
                       [set(((QuantumRegister(3, 'q'), 0), (QuantumRegister(3, 'q'), 1))),
                        set(((QuantumRegister(3, 'q'), 1), (QuantumRegister(3, 'q'), 2)))])
 
+    def test_same_as_python_search(self):
+        """The compiled search gives the same circuit as the Python search."""
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3], [3, 4], [4, 5], [0, 5], [1, 4]])
+        qr = QuantumRegister(6, 'q')
+        cr = ClassicalRegister(6, 'c')
+        circuit = QuantumCircuit(qr, cr)
+        for i in range(6):
+            circuit.h(qr[i])
+            circuit.cx(qr[i], qr[(3 * i + 1) % 6])
+            circuit.cx(qr[(i + 3) % 6], qr[(5 * i + 2) % 6])
+            circuit.barrier(qr[i], qr[(i + 3) % 6])
+            circuit.measure(qr[(2 * i) % 6], cr[i])
+        dag = circuit_to_dag(circuit)
+
+        for depth, width in [(4, 4), (2, 3), (3, 1)]:
+            with self.subTest(depth=depth, width=width):
+                mapped_dag = LookaheadSwap(coupling, search_depth=depth,
+                                           search_width=width).run(dag)
+
+                self.assertEqual(mapped_dag, _python_lookahead_swap(dag, coupling, depth, width))
+
+    def test_invalid_search_depth(self):
+        """The search depth and width must be at least one."""
+        coupling = CouplingMap([[0, 1]])
+        with self.assertRaises(TranspilerError):
+            LookaheadSwap(coupling, search_depth=0)
+        with self.assertRaises(TranspilerError):
+            LookaheadSwap(coupling, search_width=0)
+
+
+def _python_lookahead_swap(dag, coupling_map, depth, width):
+    """Map dag with the pure Python search."""
+    layout = ArrayLayout.from_layout(Layout.generate_trivial_layout(*dag.qregs.values()))
+    gates_remaining = list(dag.serial_layers())
+    mapped_gates = []
+    while gates_remaining:
+        best_step = _search_forward_n_swaps(layout, gates_remaining, coupling_map, depth, width)
+        layout = best_step['layout']
+        gates_remaining = best_step['gates_remaining']
+        mapped_gates.extend(best_step['gates_mapped'])
+    mapped_dag = _copy_circuit_metadata(dag, coupling_map)
+    for node in mapped_gates:
+        mapped_dag.apply_operation_back(op=node.op, qargs=node.qargs, cargs=node.cargs)
+    return mapped_dag
+
+
+def _search_forward_n_swaps(layout, gates, coupling_map, depth, width):
+    """Search for SWAPs which allow for application of largest number of gates, in the
+    pure Python implementation of the LookaheadSwap search.
+
+    Arguments:
+        layout (ArrayLayout): Map from virtual qubit index to physical qubit index.
+        gates (list): Gates to be mapped.
+        coupling_map (CouplingMap): CouplingMap of the target backend.
+        depth (int): Number of SWAP layers to search before choosing a result.
+        width (int): Number of SWAPs to consider at each layer.
+    Returns:
+        dict: Describes solution step found.
+            layout (ArrayLayout): Virtual to physical qubit map after SWAPs.
+            gates_remaining (list): Gates that could not be mapped.
+            gates_mapped (list): Gates that were mapped, including added SWAPs.
+
+    """
+
+    gates_mapped, gates_remaining = _map_free_gates(layout, gates, coupling_map)
+
+    base_step = {'layout': layout,
+                 'swaps_added': 0,
+                 'gates_mapped': gates_mapped,
+                 'gates_remaining': gates_remaining}
+
+    if not gates_remaining or depth == 0:
+        return base_step
+
+    possible_swaps = coupling_map.get_edges()
+
+    def _score_swap(swap):
+        """Calculate the relative score for a given SWAP."""
+        trial_layout = layout.copy()
+        trial_layout.swap(*swap)
+        return _calc_layout_distance(gates, coupling_map, trial_layout)
+
+    ranked_swaps = sorted(possible_swaps, key=_score_swap)
+
+    best_swap, best_step = None, None
+    for swap in ranked_swaps[:width]:
+        trial_layout = layout.copy()
+        trial_layout.swap(*swap)
+        next_step = _search_forward_n_swaps(trial_layout, gates_remaining,
+                                            coupling_map, depth - 1, width)
+
+        # ranked_swaps already sorted by distance, so distance is the tie-breaker.
+        if best_swap is None or _score_step(next_step) > _score_step(best_step):
+            best_swap, best_step = swap, next_step
+
+    best_swap_gate = _swap_ops_from_edge(best_swap, layout)
+    return {
+        'layout': best_step['layout'],
+        'swaps_added': 1 + best_step['swaps_added'],
+        'gates_remaining': best_step['gates_remaining'],
+        'gates_mapped': gates_mapped + best_swap_gate + best_step['gates_mapped'],
+    }
+
+
+def _map_free_gates(layout, gates, coupling_map):
+    """Map all gates that can be executed with the current layout.
+
+    Args:
+        layout (ArrayLayout): Map from virtual qubit index to physical qubit index.
+        gates (list): Gates to be mapped.
+        coupling_map (CouplingMap): CouplingMap for target device topology.
+
+    Returns:
+        tuple:
+            mapped_gates (list): ops for gates that can be executed, mapped onto layout.
+            remaining_gates (list): gates that cannot be executed on the layout.
+
+    """
+
+    blocked_qubits = set()
+
+    mapped_gates = []
+    remaining_gates = []
+
+    for gate in gates:
+        # Gates without a partition (barrier, snapshot, save, load, noise) may
+        # still have associated qubits. Look for them in the qargs.
+        if not gate['partition']:
+            qubits = [n for n in gate['graph'].nodes() if n.type == 'op'][0].qargs
+
+            if not qubits:
+                continue
+
+            if blocked_qubits.intersection(qubits):
+                blocked_qubits.update(qubits)
+                remaining_gates.append(gate)
+            else:
+                mapped_gate = _transform_gate_for_layout(gate, layout)
+                mapped_gates.append(mapped_gate)
+            continue
+
+        qubits = gate['partition'][0]
+
+        if blocked_qubits.intersection(qubits):
+            blocked_qubits.update(qubits)
+            remaining_gates.append(gate)
+        elif len(qubits) == 1:
+            mapped_gate = _transform_gate_for_layout(gate, layout)
+            mapped_gates.append(mapped_gate)
+        elif coupling_map.distance(*[layout[q] for q in qubits]) == 1:
+            mapped_gate = _transform_gate_for_layout(gate, layout)
+            mapped_gates.append(mapped_gate)
+        else:
+            blocked_qubits.update(qubits)
+            remaining_gates.append(gate)
+
+    return mapped_gates, remaining_gates
+
+
+def _calc_layout_distance(gates, coupling_map, layout, max_gates=None):
+    """Return the sum of the distances of two-qubit pairs in each CNOT in gates
+    according to the layout and the coupling.
+    """
+
+    if max_gates is None:
+        max_gates = 50 + 10 * len(coupling_map.physical_qubits)
+
+    return sum(coupling_map.distance(*[layout[q] for q in gate['partition'][0]])
+               for gate in gates[:max_gates]
+               if gate['partition'] and len(gate['partition'][0]) == 2)
+
+
+def _score_step(step):
+    """Count the mapped two-qubit gates, less the number of added SWAPs."""
+    # Each added swap will add 3 ops to gates_mapped, so subtract 3.
+    return len([g for g in step['gates_mapped']
+                if len(g.qargs) == 2]) - 3 * step['swaps_added']
+
 
 if __name__ == '__main__':
     unittest.main()
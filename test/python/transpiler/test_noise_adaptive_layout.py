@@ -130,6 +130,33 @@ class TestNoiseAdaptiveLayout(QiskitTestCase):
             for qloc in [0, 2]:
                 self.assertNotEqual(initial_layout[qr[qid]], qloc)
 
+    def test_no_remaining_cx(self):
+        """
+        Test that the mapper places an edge even when no hardware CNOT
+        between free qubits is left
+        Machine: (0, 1, 2) and an uncoupled qubit 3
+        """
+        calib_time = datetime(year=2019, month=2, day=1, hour=0, minute=0, second=0)
+        qr = QuantumRegister(4, name='q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[2], qr[3])
+        dag = circuit_to_dag(circuit)
+        qubit_list = [make_qubit_with_error(0.01) for _ in range(4)]
+        p01 = [Nduv(date=calib_time, name='gate_error', unit='', value=0.01)]
+        g01 = Gate(name="CX0_1", gate="cx", parameters=p01, qubits=[0, 1])
+        p12 = [Nduv(date=calib_time, name='gate_error', unit='', value=0.1)]
+        g12 = Gate(name="CX1_2", gate="cx", parameters=p12, qubits=[1, 2])
+        bprop = BackendProperties(last_update_date=calib_time, backend_name="test_backend",
+                                  qubits=qubit_list, backend_version="1.0.0", gates=[g01, g12],
+                                  general=[])
+        nalayout = NoiseAdaptiveLayout(bprop)
+        nalayout.run(dag)
+        initial_layout = nalayout.property_set['layout']
+        self.assertEqual({initial_layout[qr[0]], initial_layout[qr[1]]}, {0, 1})
+        self.assertEqual({initial_layout[qr[2]], initial_layout[qr[3]]}, {2, 3})
+
 
 if __name__ == '__main__':
     unittest.main()
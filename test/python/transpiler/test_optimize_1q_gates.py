@@ -22,7 +22,8 @@ from qiskit import QuantumRegister, QuantumCircuit, ClassicalRegister
 from qiskit.transpiler import PassManager
 from qiskit.compiler import transpile
 from qiskit.transpiler.passes import Optimize1qGates, Unroller
-from qiskit.converters import circuit_to_dag
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info import Operator
 from qiskit.test import QiskitTestCase
 from qiskit.test.mock import FakeRueschlikon
 from qiskit.circuit import Parameter
@@ -228,6 +229,42 @@ class TestOptimize1qGates(QiskitTestCase):
 
         self.assertEqual(circuit_to_dag(expected), after)
 
+    def test_fuse_mixed_runs(self):
+        """Runs of u1, u2 and u3 gates are each fused into a gate equal up to a global phase."""
+        rng = np.random.RandomState(11)
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        for _ in range(4):
+            for qubit in qr:
+                for _ in range(5):
+                    circuit.u3(*rng.uniform(-np.pi, np.pi, 3), qubit)
+                    circuit.u1(rng.uniform(-np.pi, np.pi), qubit)
+                    circuit.u2(*rng.uniform(-np.pi, np.pi, 2), qubit)
+            circuit.cx(qr[0], qr[1])
+            circuit.cx(qr[1], qr[2])
+
+        after = dag_to_circuit(Optimize1qGates().run(circuit_to_dag(circuit)))
+
+        self.assertEqual(after.count_ops()['u3'], 12)
+        expected, result = Operator(circuit).data, Operator(after).data
+        phase = result[0, 0] / expected[0, 0]
+        self.assertTrue(np.allclose(result, phase * expected))
+
+    def test_fused_run_simplified_to_u2(self):
+        """A run fused into a Y rotation of pi/2 becomes a u2."""
+        qr = QuantumRegister(1, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.u3(np.pi / 4, 0.3, 0.2, qr[0])
+        circuit.u1(-0.3, qr[0])
+        circuit.u3(np.pi / 4, 0, 0, qr[0])
+
+        expected = QuantumCircuit(qr)
+        expected.u2(0, 0.2, qr[0])
+
+        after = Optimize1qGates().run(circuit_to_dag(circuit))
+
+        self.assertEqual(circuit_to_dag(expected), after)
+
 
 if __name__ == '__main__':
     unittest.main()
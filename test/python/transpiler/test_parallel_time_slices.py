@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Tests for the ParallelTimeSlices pass."""
+
+import unittest
+
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit, BasicAer, execute
+from qiskit.compiler import transpile
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info.operators.predicates import matrix_equal
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.transpiler.passes import (ParallelTimeSlices, Unroller, Optimize1qGates,
+                                      CXCancellation, CommutativeCancellation)
+from qiskit.test import QiskitTestCase
+
+
+class TestParallelTimeSlices(QiskitTestCase):
+    """Test the ParallelTimeSlices pass."""
+
+    def setUp(self):
+        qr = QuantumRegister(3, 'qr')
+        self.circuit = QuantumCircuit(qr)
+        for _ in range(4):
+            self.circuit.h(qr[0])
+            self.circuit.t(qr[1])
+            self.circuit.cx(qr[0], qr[1])
+            self.circuit.cx(qr[0], qr[1])
+            self.circuit.rz(0.3, qr[2])
+            self.circuit.cz(qr[1], qr[2])
+            self.circuit.x(qr[2])
+
+    def test_small_dag_not_sliced(self):
+        """A dag that fits in one slice is transformed as a whole."""
+        dag = circuit_to_dag(self.circuit)
+        expected = CXCancellation().run(circuit_to_dag(self.circuit))
+
+        result = ParallelTimeSlices(CXCancellation()).run(dag)
+
+        self.assertEqual(result, expected)
+
+    def test_unroller_same_as_whole(self):
+        """Slicing does not change the result of a gate by gate pass."""
+        basis = ['u1', 'u2', 'u3', 'cx']
+        expected = Unroller(basis).run(circuit_to_dag(self.circuit))
+
+        result = ParallelTimeSlices(Unroller(basis), slice_size=5).run(
+            circuit_to_dag(self.circuit))
+
+        self.assertEqual(result, expected)
+
+    def test_optimizations_equivalent(self):
+        """The sliced optimizations preserve the unitary of the circuit."""
+        for local_pass in [Optimize1qGates(), CXCancellation(), CommutativeCancellation()]:
+            with self.subTest(local_pass=local_pass.name()):
+                dag = circuit_to_dag(self.circuit.decompose())
+
+                result = ParallelTimeSlices(local_pass, slice_size=4).run(dag)
+
+                self.assertLess(result.size(), dag.size())
+                self.assertTrue(matrix_equal(_unitary(self.circuit),
+                                             _unitary(dag_to_circuit(result)),
+                                             ignore_phase=True))
+
+    def test_deterministic(self):
+        """The result only depends on the dag and on the slice size."""
+        first = ParallelTimeSlices(CommutativeCancellation(), slice_size=3).run(
+            circuit_to_dag(self.circuit))
+        second = ParallelTimeSlices(CommutativeCancellation(), slice_size=3).run(
+            circuit_to_dag(self.circuit))
+
+        self.assertEqual(first, second)
+
+    def test_registers_and_conditions_kept(self):
+        """Registers and conditions of the dag are kept in the stitched dag."""
+        qr = QuantumRegister(2, 'qr')
+        cr = ClassicalRegister(2, 'cr')
+        circuit = QuantumCircuit(qr, cr, name='conditioned')
+        circuit.h(qr[0])
+        circuit.measure(qr[0], cr[0])
+        circuit.x(qr[1]).c_if(cr, 1)
+        circuit.h(qr[1])
+        circuit.measure(qr[1], cr[1])
+
+        result = ParallelTimeSlices(Unroller(['u2', 'u3']), slice_size=2).run(
+            circuit_to_dag(circuit))
+
+        self.assertEqual(result.name, 'conditioned')
+        self.assertEqual(result.qregs, {'qr': qr})
+        self.assertEqual(result.cregs, {'cr': cr})
+        self.assertEqual([node.condition for node in result.named_nodes('u3')], [(cr, 1)])
+
+    def test_transpile_option(self):
+        """transpile() runs the local passes of every level on time slices."""
+        basis = ['u1', 'u2', 'u3', 'cx']
+        for level in range(4):
+            with self.subTest(optimization_level=level):
+                result = transpile(self.circuit, basis_gates=basis, optimization_level=level,
+                                   seed_transpiler=42, parallel_local_passes=5)
+
+                self.assertTrue(matrix_equal(_unitary(self.circuit), _unitary(result),
+                                             ignore_phase=True))
+                self.assertLessEqual(set(result.count_ops()), set(basis))
+
+    def test_transpile_option_level_0_same_as_whole(self):
+        """At level 0 only the unroller runs sliced, so the result is unchanged."""
+        basis = ['u1', 'u2', 'u3', 'cx']
+        expected = transpile(self.circuit, basis_gates=basis, optimization_level=0)
+
+        result = transpile(self.circuit, basis_gates=basis, optimization_level=0,
+                           parallel_local_passes=5)
+
+        self.assertEqual(result, expected)
+
+    def test_transpile_option_invalid(self):
+        """The slice size given to transpile() must be a positive number of gates."""
+        with self.assertRaises(TranspilerError):
+            transpile(self.circuit, basis_gates=['u3', 'cx'], parallel_local_passes=0)
+
+
+def _unitary(circuit):
+    backend = BasicAer.get_backend('unitary_simulator')
+    return execute(circuit, backend).result().get_unitary()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -20,6 +20,7 @@ import unittest.mock
 
 from qiskit import QuantumRegister, QuantumCircuit
 from qiskit.transpiler import PassManager
+from qiskit.transpiler.passes import Depth, Size, CountOps, FixedPoint, ResourceEstimation
 from qiskit.compiler import transpile
 from qiskit.transpiler import TranspilerAccessError, TranspilerError
 from qiskit.transpiler.passmanager import DoWhileController, ConditionalController, \
@@ -311,15 +312,28 @@ class TestUseCases(SchedulerTestCase):
         and analysis passes need to be re-run"""
         passmanager = PassManager()
         passmanager.append(PassE_AP_NR_NP(argument1=1))
-        passmanager.append(PassA_TP_NR_NP())
+        passmanager.append(PassF_reduce_dag_property())
         passmanager.append(PassE_AP_NR_NP(argument1=1))
         self.assertScheduler(self.circuit, passmanager,
                              ['run analysis pass PassE_AP_NR_NP',
                               'set property as 1',
-                              'run transformation pass PassA_TP_NR_NP',
+                              'run transformation pass PassF_reduce_dag_property',
+                              'dag property = 6',
                               'run analysis pass PassE_AP_NR_NP',
                               'set property as 1'])
 
+    def test_ap_before_and_after_an_unmodifying_tp(self):
+        """A transformation that does not modify the DAG keeps the
+        analysis passes valid"""
+        passmanager = PassManager()
+        passmanager.append(PassE_AP_NR_NP(argument1=1))
+        passmanager.append(PassA_TP_NR_NP())
+        passmanager.append(PassE_AP_NR_NP(argument1=1))
+        self.assertScheduler(self.circuit, passmanager,
+                             ['run analysis pass PassE_AP_NR_NP',
+                              'set property as 1',
+                              'run transformation pass PassA_TP_NR_NP'])
+
     def test_pass_option_precedence(self):
         """The precedence of options is, in order of priority:
          - The passset option
@@ -416,12 +430,13 @@ class TestUseCases(SchedulerTestCase):
     def test_fresh_initial_state(self):
         """New construction gives fresh instance."""
         self.passmanager.append(PassM_AP_NR_NP(argument1=1))
-        self.passmanager.append(PassA_TP_NR_NP())
+        self.passmanager.append(PassF_reduce_dag_property())
         self.passmanager.append(PassM_AP_NR_NP(argument1=1))
         self.assertScheduler(self.circuit, self.passmanager,
                              ['run analysis pass PassM_AP_NR_NP',
                               'self.argument1 = 2',
-                              'run transformation pass PassA_TP_NR_NP',
+                              'run transformation pass PassF_reduce_dag_property',
+                              'dag property = 6',
                               'run analysis pass PassM_AP_NR_NP',
                               'self.argument1 = 2'])
 
@@ -718,5 +733,58 @@ class TestPassManagerReuse(SchedulerTestCase):
         self.assertScheduler(self.circuit, self.passmanager, expected)
 
 
+class TestConcurrentPasses(QiskitTestCase):
+    """Testing the concurrent run of independent analysis passes."""
+
+    def setUp(self):
+        qr = QuantumRegister(2)
+        self.circuit = QuantumCircuit(qr)
+        self.circuit.h(qr[0])
+        self.circuit.cx(qr[0], qr[1])
+        self.circuit.cx(qr[1], qr[0])
+
+    def test_schedule_independent_passes(self):
+        """Analysis passes that do not conflict are grouped."""
+        passmanager = PassManager(max_workers=2)
+        passmanager.append([Depth(), Size(), CountOps()])
+        self.assertEqual(list(passmanager.working_list[0]), [[Depth(), Size(), CountOps()]])
+
+    def test_schedule_conflicting_passes(self):
+        """A pass reading a property written by another pass is not grouped with it."""
+        passmanager = PassManager(max_workers=2)
+        passmanager.append([Depth(), Size(), FixedPoint('depth'), PassE_AP_NR_NP(True)])
+        self.assertEqual(list(passmanager.working_list[0]),
+                         [[Depth(), Size()], FixedPoint('depth'), PassE_AP_NR_NP(True)])
+
+    def test_schedule_serial_by_default(self):
+        """Without max_workers the passes are not grouped."""
+        passmanager = PassManager()
+        passmanager.append([Depth(), Size(), CountOps()])
+        self.assertEqual(list(passmanager.working_list[0]), [Depth(), Size(), CountOps()])
+
+    def test_run_concurrent_passes(self):
+        """The concurrent run gives the same property set as the serial one."""
+        serial = PassManager()
+        serial.append([Depth(), Size(), CountOps(), FixedPoint('depth')])
+        transpile(self.circuit, pass_manager=serial)
+
+        concurrent = PassManager(max_workers=3)
+        concurrent.append([Depth(), Size(), CountOps(), FixedPoint('depth')])
+        transpile(self.circuit, pass_manager=concurrent)
+
+        self.assertEqual(serial.property_set, concurrent.property_set)
+
+    def test_run_concurrent_requires(self):
+        """The requires of a pass also run concurrently."""
+        passmanager = PassManager(max_workers=2)
+        passmanager.append(ResourceEstimation())
+        transpile(self.circuit, pass_manager=passmanager)
+
+        self.assertEqual(passmanager.property_set['size'], 3)
+        self.assertEqual(passmanager.property_set['depth'], 3)
+        self.assertEqual(passmanager.property_set['width'], 2)
+        self.assertDictEqual(passmanager.property_set['count_ops'], {'h': 1, 'cx': 2})
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -62,6 +62,43 @@ class TestFakeBackendTranspiling(QiskitTestCase):
                 )
                 self.assertIsInstance(result, QuantumCircuit)
 
+    def test_sabre_routing(self):
+        """Test the sabre routing method with the optimization levels that support it"""
+        qr = QuantumRegister(5, 'qr')
+        circuit = QuantumCircuit(qr)
+        for i in range(5):
+            circuit.cx(qr[i], qr[(i + 2) % 5])
+            circuit.cx(qr[(i + 3) % 5], qr[i])
+        for backend in [FakeMelbourne(), FakeTokyo()]:
+            for optimization_level in [1, 2, 3]:
+                with self.subTest(backend=backend, optimization_level=optimization_level):
+                    result = transpile(circuit, backend=backend,
+                                       optimization_level=optimization_level,
+                                       routing_method='sabre', seed_transpiler=42)
+                    coupling_map = backend.configuration().coupling_map
+                    for instruction, qargs, _ in result.data:
+                        if instruction.name == 'cx':
+                            self.assertIn([qargs[0].index, qargs[1].index], coupling_map)
+
+    def test_swap_network_routing(self):
+        """Test the swap network routing method with the optimization levels that support it"""
+        qr = QuantumRegister(6, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr)
+        for i in range(6):
+            for j in range(i + 1, 6):
+                circuit.rzz(0.1 * (i + j), qr[i], qr[j])
+        for backend in [FakeMelbourne(), FakeTokyo()]:
+            for optimization_level in [1, 2, 3]:
+                with self.subTest(backend=backend, optimization_level=optimization_level):
+                    result = transpile(circuit, backend=backend,
+                                       optimization_level=optimization_level,
+                                       routing_method='swap_network', seed_transpiler=42)
+                    coupling_map = backend.configuration().coupling_map
+                    for instruction, qargs, _ in result.data:
+                        if instruction.name == 'cx':
+                            self.assertIn([qargs[0].index, qargs[1].index], coupling_map)
+
     # TODO: make these tests more compact with ddt
     def test_initial_layout_1(self):
         """Test that a user-given initial layout is respected,
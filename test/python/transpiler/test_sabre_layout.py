@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the SabreLayout pass"""
+
+import unittest
+
+from qiskit import QuantumRegister, QuantumCircuit
+from qiskit.transpiler import CouplingMap, Layout
+from qiskit.transpiler.passes import SabreLayout
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.converters import circuit_to_dag
+from qiskit.test import QiskitTestCase
+
+
+class TestSabreLayout(QiskitTestCase):
+    """Tests the SabreLayout pass"""
+
+    def setUp(self):
+        self.cmap = CouplingMap([[0, 1], [1, 2], [2, 3], [3, 4], [4, 5]])
+
+    def test_finds_perfect_layout(self):
+        """A line of CXs gets a layout without any distant CX."""
+        qr = QuantumRegister(4, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[2])
+        circuit.cx(qr[2], qr[1])
+        circuit.cx(qr[1], qr[3])
+        circuit.cx(qr[0], qr[2])
+        dag = circuit_to_dag(circuit)
+
+        pass_ = SabreLayout(self.cmap, seed=42)
+        pass_.run(dag)
+        layout = pass_.property_set['layout']
+
+        self.assertEqual(set(layout.get_virtual_bits()), set(qr))
+        for node in dag.twoQ_gates():
+            self.assertEqual(self.cmap.distance(layout[node.qargs[0]],
+                                                layout[node.qargs[1]]), 1)
+
+    def test_starts_from_given_layout(self):
+        """A given layout that needs no swap is kept."""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        dag = circuit_to_dag(circuit)
+
+        pass_ = SabreLayout(self.cmap)
+        pass_.property_set['layout'] = Layout({qr[0]: 4, qr[1]: 3})
+        pass_.run(dag)
+
+        self.assertEqual(pass_.property_set['layout'].get_virtual_bits(), {qr[0]: 4, qr[1]: 3})
+
+    def test_seed_is_reproducible(self):
+        """The same seed gives the same layout."""
+        qr = QuantumRegister(5, 'qr')
+        circuit = QuantumCircuit(qr)
+        for i in range(5):
+            circuit.cx(qr[i], qr[(i + 2) % 5])
+        dag = circuit_to_dag(circuit)
+
+        layouts = []
+        for _ in range(2):
+            pass_ = SabreLayout(self.cmap, seed=7)
+            pass_.run(dag)
+            layouts.append(pass_.property_set['layout'].get_virtual_bits())
+
+        self.assertEqual(layouts[0], layouts[1])
+
+    def test_more_qubits_than_device(self):
+        """A circuit larger than the coupling map raises."""
+        circuit = QuantumCircuit(QuantumRegister(7, 'qr'))
+
+        with self.assertRaises(TranspilerError):
+            SabreLayout(self.cmap).run(circuit_to_dag(circuit))
+
+
+if __name__ == '__main__':
+    unittest.main()
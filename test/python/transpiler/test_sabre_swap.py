@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the SabreSwap pass"""
+
+import unittest
+import numpy as np
+
+from qiskit.transpiler.passes import SabreSwap, CheckMap
+from qiskit.transpiler import CouplingMap
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit, BasicAer, execute
+from qiskit.test import QiskitTestCase
+from qiskit.test.mock import FakeMelbourne
+
+
+def _random_circuit(num_qubits, num_gates, seed):
+    qr = QuantumRegister(num_qubits, 'q')
+    circuit = QuantumCircuit(qr)
+    rng = np.random.RandomState(seed)
+    for _ in range(num_gates):
+        control, target = rng.choice(num_qubits, 2, replace=False).tolist()
+        circuit.cx(qr[control], qr[target])
+        circuit.rx(rng.uniform(0, np.pi), qr[control])
+    return circuit
+
+
+class TestSabreSwap(QiskitTestCase):
+    """ Tests the SabreSwap pass."""
+
+    def assertRoutedEquivalent(self, circuit, routed):
+        """The routed circuit, followed by swaps undoing its permutation, has the same unitary."""
+        qr = routed.qregs[0]
+        undo = QuantumCircuit(qr)
+        phys_to_logic = list(range(len(qr)))
+        for instruction, qargs, _ in routed.data:
+            if instruction.name == 'swap':
+                left, right = qargs[0].index, qargs[1].index
+                phys_to_logic[left], phys_to_logic[right] = \
+                    phys_to_logic[right], phys_to_logic[left]
+        for logic, qubit in enumerate(qr):
+            physical = phys_to_logic.index(logic)
+            if physical != logic:
+                undo.swap(qubit, qr[physical])
+                phys_to_logic[logic], phys_to_logic[physical] = \
+                    phys_to_logic[physical], phys_to_logic[logic]
+
+        backend = BasicAer.get_backend('unitary_simulator')
+        expected = execute(circuit, backend).result().get_unitary()
+        actual = execute(routed + undo, backend).result().get_unitary()
+        index = np.argmax(np.abs(expected[:, 0]))
+        phase = actual[index, 0] / expected[index, 0]
+        self.assertTrue(np.allclose(actual, phase * expected))
+
+    def test_trivial_case(self):
+        """No need to have any swap, the CX are distance 1 to each other
+         q0:--(+)-[U]-(+)-
+               |       |
+         q1:---.-------|--
+                       |
+         q2:-----------.--
+
+         CouplingMap map: [1]--[0]--[2]
+        """
+        coupling = CouplingMap([[0, 1], [0, 2]])
+
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[2])
+
+        dag = circuit_to_dag(circuit)
+        after = SabreSwap(coupling).run(dag)
+
+        self.assertEqual(dag, after)
+
+    def test_a_single_swap(self):
+        """ Adding a swap
+         q0:-------
+
+         q1:--(+)--
+               |
+         q2:---.---
+
+         CouplingMap map: [1]--[0]--[2]
+
+         q0:--X---.---
+              |   |
+         q1:--X---|---
+                  |
+         q2:-----(+)--
+
+        """
+        coupling = CouplingMap([[0, 1], [0, 2]])
+
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[1], qr[2])
+
+        expected = QuantumCircuit(qr)
+        expected.swap(qr[0], qr[1])
+        expected.cx(qr[0], qr[2])
+
+        after = SabreSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertEqual(circuit_to_dag(expected), after)
+
+    def test_keeps_measures_and_conditions(self):
+        """Measurements and conditional gates follow their qubits."""
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3]])
+
+        qr = QuantumRegister(4, 'q')
+        cr = ClassicalRegister(4, 'c')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[3])
+        circuit.measure(qr[0], cr[0])
+        circuit.x(qr[3]).c_if(cr, 1)
+        circuit.measure(qr[3], cr[3])
+
+        after = SabreSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertEqual(after.count_ops()['measure'], 2)
+        self.assertEqual(len(after.named_nodes('x')), 1)
+        self.assertIsNotNone(after.named_nodes('x')[0].condition)
+        check_map = CheckMap(coupling)
+        check_map.run(after)
+        self.assertTrue(check_map.property_set['is_swap_mapped'])
+
+    def test_random_circuit_is_mapped_and_equivalent(self):
+        """A random circuit on a grid is mapped, with the same unitary."""
+        coupling = CouplingMap([[0, 1], [1, 2], [3, 4], [4, 5], [0, 3], [1, 4], [2, 5]])
+        circuit = _random_circuit(6, 20, seed=11)
+
+        for heuristic in ['basic', 'lookahead', 'decay']:
+            with self.subTest(heuristic=heuristic):
+                after = SabreSwap(coupling, heuristic=heuristic).run(circuit_to_dag(circuit))
+
+                check_map = CheckMap(coupling)
+                check_map.run(after)
+                self.assertTrue(check_map.property_set['is_swap_mapped'])
+                self.assertRoutedEquivalent(circuit, dag_to_circuit(after))
+
+    def test_noise_aware(self):
+        """With backend properties, the circuit is mapped."""
+        backend = FakeMelbourne()
+        coupling = CouplingMap(backend.configuration().coupling_map)
+        circuit = _random_circuit(14, 30, seed=5)
+
+        after = SabreSwap(coupling, backend.properties()).run(circuit_to_dag(circuit))
+
+        check_map = CheckMap(coupling)
+        check_map.run(after)
+        self.assertTrue(check_map.property_set['is_swap_mapped'])
+        self.assertEqual(after.count_ops()['cx'], 30)
+
+    def test_more_qubits_than_device(self):
+        """A circuit larger than the coupling map raises."""
+        coupling = CouplingMap([[0, 1]])
+        circuit = QuantumCircuit(QuantumRegister(3, 'q'))
+
+        with self.assertRaises(TranspilerError):
+            SabreSwap(coupling).run(circuit_to_dag(circuit))
+
+    def test_three_qubit_gates(self):
+        """A gate on three qubits raises."""
+        coupling = CouplingMap([[0, 1], [1, 2]])
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.ccx(qr[0], qr[1], qr[2])
+
+        with self.assertRaises(TranspilerError):
+            SabreSwap(coupling).run(circuit_to_dag(circuit))
+
+    def test_unknown_heuristic(self):
+        """An unknown heuristic raises."""
+        coupling = CouplingMap([[0, 1], [1, 2]])
+        circuit = _random_circuit(3, 3, seed=0)
+
+        with self.assertRaises(TranspilerError):
+            SabreSwap(coupling, heuristic='magic').run(circuit_to_dag(circuit))
+
+
+if __name__ == '__main__':
+    unittest.main()
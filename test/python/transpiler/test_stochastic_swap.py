@@ -511,6 +511,23 @@ class TestStochasticSwap(QiskitTestCase):
         with self.assertRaises(TranspilerError):
             _ = pass_.run(dag)
 
+    def test_threads_same_result(self):
+        """The mapped circuit does not depend on the number of threads."""
+        grid = [[4 * row + col, 4 * row + col + 1] for row in range(4) for col in range(3)]
+        grid += [[4 * row + col, 4 * row + col + 4] for row in range(3) for col in range(4)]
+        coupling = CouplingMap(grid)
+        qr = QuantumRegister(16, 'q')
+        circuit = QuantumCircuit(qr)
+        for i in range(16):
+            circuit.h(qr[i])
+            circuit.cx(qr[i], qr[(5 * i + 3) % 16])
+            circuit.cx(qr[(7 * i + 2) % 16], qr[(3 * i + 1) % 16])
+
+        expected = StochasticSwap(coupling, 20, 13, max_workers=1).run(circuit_to_dag(circuit))
+        result = StochasticSwap(coupling, 20, 13, max_workers=4).run(circuit_to_dag(circuit))
+
+        self.assertEqual(result, expected)
+
 
 if __name__ == '__main__':
     unittest.main()
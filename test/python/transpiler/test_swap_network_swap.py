@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the SwapNetworkSwap pass"""
+
+import itertools
+import unittest
+import numpy as np
+
+from qiskit.transpiler.passes import SwapNetworkSwap, CheckMap
+from qiskit.transpiler import CouplingMap
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit, BasicAer, execute
+from qiskit.test import QiskitTestCase
+
+
+def _qaoa_circuit(num_qubits, interaction, seed, size=None):
+    """A QAOA layer with an interaction between every pair of qubits, in a random order."""
+    qr = QuantumRegister(size or num_qubits, 'q')
+    circuit = QuantumCircuit(qr)
+    rng = np.random.RandomState(seed)
+    for i in range(num_qubits):
+        circuit.h(qr[i])
+    pairs = list(itertools.combinations(range(num_qubits), 2))
+    rng.shuffle(pairs)
+    for first, second in pairs:
+        angle = rng.uniform(0, np.pi)
+        if interaction == 'rzz':
+            circuit.rzz(angle, qr[first], qr[second])
+        else:
+            circuit.cx(qr[first], qr[second])
+            circuit.u1(angle, qr[second])
+            circuit.cx(qr[first], qr[second])
+    for i in range(num_qubits):
+        circuit.rx(rng.uniform(0, np.pi), qr[i])
+    return circuit
+
+
+class TestSwapNetworkSwap(QiskitTestCase):
+    """ Tests the SwapNetworkSwap pass."""
+
+    def assertRoutedEquivalent(self, circuit, routed):
+        """The routed circuit, followed by swaps undoing its permutation, has the same unitary."""
+        qr = routed.qregs[0]
+        undo = QuantumCircuit(qr)
+        phys_to_logic = list(range(len(qr)))
+        for instruction, qargs, _ in routed.data:
+            if instruction.name == 'swap':
+                left, right = qargs[0].index, qargs[1].index
+                phys_to_logic[left], phys_to_logic[right] = \
+                    phys_to_logic[right], phys_to_logic[left]
+        for logic, qubit in enumerate(qr):
+            physical = phys_to_logic.index(logic)
+            if physical != logic:
+                undo.swap(qubit, qr[physical])
+                phys_to_logic[logic], phys_to_logic[physical] = \
+                    phys_to_logic[physical], phys_to_logic[logic]
+
+        backend = BasicAer.get_backend('unitary_simulator')
+        expected = execute(circuit, backend).result().get_unitary()
+        actual = execute(routed + undo, backend).result().get_unitary()
+        index = np.argmax(np.abs(expected[:, 0]))
+        phase = actual[index, 0] / expected[index, 0]
+        self.assertTrue(np.allclose(actual, phase * expected))
+
+    def assertMapped(self, dag, coupling):
+        """All the two-qubit gates of dag are on edges of coupling."""
+        check_map = CheckMap(coupling)
+        check_map.run(dag)
+        self.assertTrue(check_map.property_set['is_swap_mapped'])
+
+    def test_trivial_case(self):
+        """No need to have any swap, the CX are distance 1 to each other
+         q0:--(+)-[U]-(+)-
+               |       |
+         q1:---.-------|--
+                       |
+         q2:-----------.--
+
+         CouplingMap map: [1]--[0]--[2]
+        """
+        coupling = CouplingMap([[0, 1], [0, 2]])
+
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[2])
+
+        dag = circuit_to_dag(circuit)
+        after = SwapNetworkSwap(coupling).run(dag)
+
+        self.assertEqual(dag, after)
+
+    def test_a_single_swap(self):
+        """ Adding a swap
+         q0:-------
+
+         q1:--(+)--
+               |
+         q2:---.---
+
+         CouplingMap map: [1]--[0]--[2]
+
+         q0:--X---.---
+              |   |
+         q1:--X---|---
+                  |
+         q2:-----(+)--
+
+        """
+        coupling = CouplingMap([[0, 1], [0, 2]])
+
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[1], qr[2])
+
+        expected = QuantumCircuit(qr)
+        expected.swap(qr[1], qr[0])
+        expected.cx(qr[0], qr[2])
+
+        after = SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertEqual(circuit_to_dag(expected), after)
+
+    def test_all_to_all_on_a_line(self):
+        """An all-to-all layer of rzz on a line takes at most one swap per pair of qubits."""
+        coupling = CouplingMap([[i, i + 1] for i in range(5)])
+        circuit = _qaoa_circuit(6, 'rzz', seed=7)
+
+        after = SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertMapped(after, coupling)
+        self.assertLessEqual(after.count_ops()['swap'], 15)
+        self.assertRoutedEquivalent(circuit, dag_to_circuit(after))
+
+    def test_cx_u1_cx_interactions_on_a_grid(self):
+        """The cx-u1-cx interactions are recognized as diagonal, and routed by the network."""
+        coupling = CouplingMap([[0, 1], [1, 2], [3, 4], [4, 5], [0, 3], [1, 4], [2, 5]])
+        circuit = _qaoa_circuit(6, 'cx', seed=3)
+
+        after = SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertMapped(after, coupling)
+        self.assertLessEqual(after.count_ops()['swap'], 15)
+        self.assertEqual(after.count_ops()['cx'], 30)
+        self.assertRoutedEquivalent(circuit, dag_to_circuit(after))
+
+    def test_qubits_off_the_path(self):
+        """A dense layer on a coupling map without a path through all its qubits is mapped."""
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3], [1, 4]])
+        circuit = _qaoa_circuit(5, 'rzz', seed=5)
+
+        after = SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertMapped(after, coupling)
+        self.assertRoutedEquivalent(circuit, dag_to_circuit(after))
+
+    def test_keeps_measures_and_conditions(self):
+        """Measurements and conditional gates follow their qubits."""
+        coupling = CouplingMap([[0, 1], [1, 2], [2, 3]])
+
+        qr = QuantumRegister(4, 'q')
+        cr = ClassicalRegister(4, 'c')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[3])
+        circuit.measure(qr[0], cr[0])
+        circuit.u1(0.5, qr[3]).c_if(cr, 1)
+        circuit.cu1(0.3, qr[3], qr[1])
+        circuit.measure(qr[3], cr[3])
+
+        after = SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+        self.assertEqual(after.count_ops()['measure'], 2)
+        self.assertEqual(len(after.named_nodes('u1')), 1)
+        self.assertIsNotNone(after.named_nodes('u1')[0].condition)
+        self.assertMapped(after, coupling)
+
+    def test_three_qubit_gates(self):
+        """A gate on three qubits raises."""
+        coupling = CouplingMap([[0, 1], [1, 2]])
+        qr = QuantumRegister(3, 'q')
+        circuit = QuantumCircuit(qr)
+        circuit.ccx(qr[0], qr[1], qr[2])
+
+        with self.assertRaises(TranspilerError):
+            SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+    def test_more_qubits_than_device(self):
+        """A circuit larger than the coupling map raises."""
+        coupling = CouplingMap([[0, 1]])
+        circuit = QuantumCircuit(QuantumRegister(3, 'q'))
+
+        with self.assertRaises(TranspilerError):
+            SwapNetworkSwap(coupling).run(circuit_to_dag(circuit))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -14,6 +14,8 @@
 
 """Test synthesis algorithms"""
 
+import numpy as np
+
 from qiskit.circuit import QuantumCircuit, QuantumRegister
 from qiskit.quantum_info.operators import Operator
 from qiskit.extensions.unitary import UnitaryGate
@@ -110,14 +112,14 @@ class TestGraySynth(QiskitTestCase):
         and only T gates as phase rotations,
 
         And should return the following circuit (or an equivalent one):
-                ┌───┐┌───┐     ┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐     ┌───┐
-        q_0: |0>┤ T ├┤ X ├─────┤ T ├┤ X ├┤ X ├┤ T ├┤ X ├┤ T ├┤ X ├┤ T ├┤ X ├─────┤ X ├
-                ├───┤└─┬─┘┌───┐└───┘└─┬─┘└─┬─┘└───┘└─┬─┘└───┘└─┬─┘└───┘└─┬─┘┌───┐└─┬─┘
-        q_1: |0>┤ X ├──┼──┤ T ├───────■────┼─────────┼─────────┼─────────■──┤ X ├──┼──
-                └─┬─┘  │  └───┘            │         │         │            └─┬─┘  │
-        q_2: |0>──■────┼───────────────────┼─────────■─────────┼──────────────■────┼──
-                       │                   │                   │                   │
-        q_3: |0>───────■───────────────────■───────────────────■───────────────────■──
+                ┌───┐┌───┐     ┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐┌───┐
+        q_0: |0>┤ T ├┤ X ├─────┤ T ├┤ X ├┤ X ├┤ T ├┤ X ├┤ T ├┤ X ├┤ T ├┤ X ├┤ X ├
+                ├───┤└─┬─┘┌───┐└───┘└─┬─┘└─┬─┘└───┘└─┬─┘├───┤└─┬─┘└───┘└─┬─┘└─┬─┘
+        q_1: |0>┤ X ├──┼──┤ T ├───────■────┼─────────┼──┤ X ├──┼─────────┼────■──
+                └─┬─┘  │  └───┘            │         │  └─┬─┘  │         │
+        q_2: |0>──■────┼───────────────────┼─────────■────■────┼─────────┼───────
+                       │                   │                   │         │
+        q_3: |0>───────■───────────────────■───────────────────■─────────■───────
         """
         cnots = [[0, 1, 1, 1, 1, 1],
                  [1, 0, 0, 1, 1, 1],
@@ -142,14 +144,32 @@ class TestGraySynth(QiskitTestCase):
         c_compare.t(q[0])
         c_compare.cx(q[3], q[0])
         c_compare.t(q[0])
-        c_compare.cx(q[1], q[0])
         c_compare.cx(q[2], q[1])
         c_compare.cx(q[3], q[0])
+        c_compare.cx(q[1], q[0])
         unitary_compare = UnitaryGate(Operator(c_compare))
 
         # Check if the two circuits are equivalent
         self.assertEqual(unitary_gray, unitary_compare)
 
+    def test_random_phase_polynomials(self):
+        """The circuits apply the phases to the parities, and no linear transformation."""
+        rng = np.random.RandomState(5)
+        for n_qubits in [2, 3, 4, 5]:
+            parities = rng.permutation(np.arange(1, 2 ** n_qubits))[:5]
+            cnots = [[int(parity >> row) & 1 for parity in parities]
+                     for row in range(n_qubits)]
+            angles = list(rng.uniform(0, 2 * np.pi, len(parities)))
+
+            c_gray = graysynth(cnots, angles)
+
+            phases = [sum(angle for parity, angle in zip(parities, angles)
+                          if bin(parity & state).count('1') % 2)
+                      for state in range(2 ** n_qubits)]
+            expected = np.diag(np.exp(1j * np.array(phases)))
+            self.assertTrue(np.allclose(Operator(c_gray).data, expected))
+            self.assertEqual(len(angles), len(parities))
+
 
 class TestPatelMarkovHayes(QiskitTestCase):
     """Test the Patel-Markov-Hayes algorithm for synthesizing linear
@@ -211,3 +231,15 @@ class TestPatelMarkovHayes(QiskitTestCase):
 
         # Check if the two circuits are equivalent
         self.assertEqual(c_patel, c_compare)
+
+    def test_section_size_not_factor(self):
+        """The last section is smaller when the section size is not a factor of the size."""
+        state = [[1, 1, 0],
+                 [0, 1, 1],
+                 [1, 1, 1]]
+        c_patel = cnot_synth(state)
+
+        result = np.eye(3, dtype=int)
+        for _, qargs, _ in c_patel.data:
+            result[qargs[1].index] ^= result[qargs[0].index]
+        self.assertTrue(np.array_equal(result, state))
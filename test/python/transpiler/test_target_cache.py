@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the TargetCache"""
+
+import pickle
+import unittest
+
+from qiskit import QuantumRegister, QuantumCircuit
+from qiskit.transpiler import CouplingMap, TargetCache
+from qiskit.transpiler.target_cache import get_target_cache
+from qiskit.transpiler.passes import DenseLayout, NoiseAdaptiveLayout
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.converters import circuit_to_dag
+from qiskit.compiler import transpile
+from qiskit.test import QiskitTestCase
+from qiskit.test.mock import FakeMelbourne
+
+
+class TestTargetCache(QiskitTestCase):
+    """Tests the TargetCache."""
+
+    def setUp(self):
+        self.backend = FakeMelbourne()
+        qr = QuantumRegister(5, 'qr')
+        self.circuit = QuantumCircuit(qr)
+        for i in range(4):
+            self.circuit.cx(qr[i], qr[i + 1])
+        self.circuit.cx(qr[4], qr[0])
+
+    def test_shared_between_equal_targets(self):
+        """Test the coupling maps and properties with the same values share a cache."""
+        target_cache = TargetCache.from_backend(self.backend)
+
+        self.assertIs(TargetCache.from_backend(self.backend), target_cache)
+        self.assertIs(get_target_cache(CouplingMap(self.backend.configuration().coupling_map),
+                                       self.backend.properties()),
+                      target_cache)
+
+    def test_new_cache_when_properties_change(self):
+        """Test the cache is not reused once the properties change."""
+        target_cache = TargetCache.from_backend(self.backend)
+        properties = self.backend.properties()
+        properties.gates[0].parameters[0].value += 0.01
+
+        coupling_map = CouplingMap(self.backend.configuration().coupling_map)
+        self.assertIsNot(get_target_cache(coupling_map, properties), target_cache)
+        self.assertIsNot(get_target_cache(coupling_map), target_cache)
+
+    def test_tables_computed_once(self):
+        """Test each table is computed on first use, and then reused."""
+        target_cache = TargetCache(CouplingMap(self.backend.configuration().coupling_map),
+                                   self.backend.properties())
+
+        tables = target_cache.noise_adaptive_tables()
+        self.assertIs(target_cache.noise_adaptive_tables(), tables)
+        self.assertIs(target_cache.dense_layout_tables(), target_cache.dense_layout_tables())
+
+    def test_no_properties(self):
+        """Test the noise tables need backend properties."""
+        target_cache = TargetCache(CouplingMap([[0, 1], [1, 2]]))
+
+        with self.assertRaises(TranspilerError):
+            target_cache.noise_adaptive_tables()
+
+    def test_pickled_as_shared_cache(self):
+        """Test a cache is unpickled as the shared cache of its target, with its tables."""
+        target_cache = TargetCache.from_backend(self.backend)
+        target_cache.precompute()
+
+        self.assertIs(pickle.loads(pickle.dumps(target_cache)), target_cache)
+
+    def test_layouts_with_cache(self):
+        """Test the layout passes choose the same layout with and without the cache."""
+        target_cache = TargetCache.from_backend(self.backend)
+        coupling_map = CouplingMap(self.backend.configuration().coupling_map)
+        properties = self.backend.properties()
+        dag = circuit_to_dag(self.circuit)
+
+        for pass_, cached_pass in [
+                (DenseLayout(coupling_map, properties),
+                 DenseLayout(coupling_map, properties, target_cache=target_cache)),
+                (NoiseAdaptiveLayout(properties),
+                 NoiseAdaptiveLayout(properties, target_cache=target_cache))]:
+            with self.subTest(pass_=type(pass_).__name__):
+                pass_.run(dag)
+                cached_pass.run(dag)
+                self.assertEqual(cached_pass.property_set['layout'].get_virtual_bits(),
+                                 pass_.property_set['layout'].get_virtual_bits())
+
+    def test_transpile_precomputes_tables(self):
+        """Test transpiling several circuits computes the tables of the backend beforehand."""
+        properties = self.backend.properties()
+        properties.gates[0].parameters[0].value += 0.02
+        coupling_map = CouplingMap(self.backend.configuration().coupling_map)
+
+        transpile([self.circuit, self.circuit], coupling_map=coupling_map,
+                  backend_properties=properties, basis_gates=['u1', 'u2', 'u3', 'cx'],
+                  optimization_level=2, seed_transpiler=42)
+
+        target_cache = get_target_cache(coupling_map, properties)
+        self.assertIn('noise_adaptive', target_cache._tables)
+
+    def test_transpile_skips_unused_tables(self):
+        """Test the tables are not computed when the pass manager does not use them."""
+        properties = self.backend.properties()
+        properties.gates[0].parameters[0].value += 0.03
+        coupling_map = CouplingMap(self.backend.configuration().coupling_map)
+
+        transpile([self.circuit, self.circuit], coupling_map=coupling_map,
+                  backend_properties=properties, basis_gates=['u1', 'u2', 'u3', 'cx'],
+                  optimization_level=1, seed_transpiler=42)
+
+        target_cache = get_target_cache(coupling_map, properties)
+        self.assertEqual(target_cache._tables, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
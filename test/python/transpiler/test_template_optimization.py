@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the TemplateOptimization pass"""
+
+import unittest
+import numpy as np
+
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.quantum_info import Operator
+from qiskit.transpiler.passes import TemplateOptimization
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.test import QiskitTestCase
+
+
+class TestTemplateOptimization(QiskitTestCase):
+    """Test the TemplateOptimization pass."""
+
+    def test_standard_templates(self):
+        """The self-inverse gates, and S and T with their inverse, cancel.
+
+        qr0:-[H]--.---------.--[H]--------
+                  |         |
+        qr1:-----(+)-------(+)-[S]-[Sdg]-
+        """
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[0])
+        circuit.s(qr[1])
+        circuit.sdg(qr[1])
+
+        after = TemplateOptimization().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after.size(), 0)
+
+    def test_cancellations_cascade(self):
+        """Gates separated by gates that cancel cancel too, from the middle outward."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.t(qr[2])
+        circuit.swap(qr[1], qr[2])
+        circuit.x(qr[2])
+        circuit.x(qr[2])
+        circuit.swap(qr[1], qr[2])
+        circuit.tdg(qr[2])
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[1])
+
+        expected = QuantumCircuit(qr)
+        expected.h(qr[1])
+
+        after = TemplateOptimization().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(expected))
+
+    def test_gates_on_other_qubits_in_between(self):
+        """The pattern gates must follow each other on their qubits only."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.h(qr[2])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        circuit.h(qr[1])
+        circuit.cx(qr[1], qr[2])
+
+        expected = QuantumCircuit(qr)
+        expected.h(qr[2])
+        expected.cx(qr[1], qr[2])
+        expected.h(qr[1])
+        expected.cx(qr[1], qr[2])
+
+        after = TemplateOptimization().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(expected))
+
+    def test_template_subsequences(self):
+        """More than half of a template is replaced with the inverse of the rest.
+
+        H X H Z is the identity, so H X H is replaced by Z and X H Z by H.
+        """
+        template_qr = QuantumRegister(1, 't')
+        template = QuantumCircuit(template_qr)
+        template.h(template_qr[0])
+        template.x(template_qr[0])
+        template.h(template_qr[0])
+        template.z(template_qr[0])
+
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+        circuit.x(qr[0])
+        circuit.h(qr[0])
+        circuit.x(qr[1])
+        circuit.h(qr[1])
+        circuit.z(qr[1])
+
+        expected = QuantumCircuit(qr)
+        expected.z(qr[0])
+        expected.h(qr[1])
+
+        after = TemplateOptimization(templates=[template]).run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(expected))
+
+    def test_rule(self):
+        """A pattern is replaced with the replacement of its rule, on the matched qubits."""
+        pattern_qr = QuantumRegister(2, 'p')
+        pattern = QuantumCircuit(pattern_qr)
+        pattern.cx(pattern_qr[0], pattern_qr[1])
+        pattern.cx(pattern_qr[1], pattern_qr[0])
+        pattern.cx(pattern_qr[0], pattern_qr[1])
+        replacement = QuantumCircuit(pattern_qr)
+        replacement.swap(pattern_qr[0], pattern_qr[1])
+
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[2], qr[0])
+        circuit.cx(qr[0], qr[2])
+        circuit.cx(qr[2], qr[0])
+        circuit.cx(qr[2], qr[1])
+
+        expected = QuantumCircuit(qr)
+        expected.swap(qr[2], qr[0])
+        expected.cx(qr[2], qr[1])
+
+        after = TemplateOptimization(rules=[(pattern, replacement)]).run(
+            circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(expected))
+
+    def test_pattern_not_matched_around_a_path(self):
+        """A pattern is not matched when a gate outside of it goes between its gates.
+
+        qr0:--.----.-------
+              |    |
+        qr1:-(+)---|----.--
+                   |    |
+        qr2:------(+)--(+)-
+
+        The first and last CX match the pattern cx(0, 1) cx(1, 2), but the middle
+        one must run after the first and before the last.
+        """
+        pattern_qr = QuantumRegister(3, 'p')
+        pattern = QuantumCircuit(pattern_qr)
+        pattern.cx(pattern_qr[0], pattern_qr[1])
+        pattern.cx(pattern_qr[1], pattern_qr[2])
+        replacement = QuantumCircuit(pattern_qr)
+        replacement.h(pattern_qr[0])
+
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[2])
+        circuit.cx(qr[1], qr[2])
+
+        after = TemplateOptimization(rules=[(pattern, replacement)]).run(
+            circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_conditional_gates_kept(self):
+        """Conditional gates are not matched."""
+        qr = QuantumRegister(1, 'qr')
+        cr = ClassicalRegister(1, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.x(qr[0])
+        circuit.x(qr[0]).c_if(cr, 1)
+
+        after = TemplateOptimization().run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_invalid_rules(self):
+        """The replacements must be shorter, and the patterns connected."""
+        pattern_qr = QuantumRegister(2, 'p')
+        pattern = QuantumCircuit(pattern_qr)
+        pattern.h(pattern_qr[0])
+        pattern.h(pattern_qr[1])
+        replacement = QuantumCircuit(pattern_qr)
+
+        with self.assertRaises(TranspilerError):
+            TemplateOptimization(rules=[(pattern, replacement)])
+        with self.assertRaises(TranspilerError):
+            TemplateOptimization(rules=[(replacement, pattern)])
+
+    def test_random_circuits_equivalent(self):
+        """The optimized circuits have the same unitary, and are a fixed point of the pass."""
+        qr = QuantumRegister(4, 'qr')
+        rng = np.random.RandomState(42)
+        for _ in range(5):
+            circuit = QuantumCircuit(qr)
+            for _ in range(100):
+                gate = rng.choice(['h', 's', 'sdg', 't', 'tdg', 'cx', 'cz', 'swap', 'ccx'])
+                qubits = [qr[int(i)] for i in rng.permutation(4)]
+                if gate in ['cx', 'cz', 'swap']:
+                    getattr(circuit, gate)(qubits[0], qubits[1])
+                elif gate == 'ccx':
+                    circuit.ccx(qubits[0], qubits[1], qubits[2])
+                else:
+                    getattr(circuit, gate)(qubits[0])
+
+            after = dag_to_circuit(TemplateOptimization().run(circuit_to_dag(circuit)))
+
+            self.assertLess(len(after.data), len(circuit.data))
+            self.assertTrue(np.allclose(Operator(after).data, Operator(circuit).data))
+            self.assertEqual(TemplateOptimization().run(circuit_to_dag(after)).size(),
+                             len(after.data))
+
+
+if __name__ == '__main__':
+    unittest.main()
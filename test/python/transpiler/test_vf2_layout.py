@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the VF2Layout pass"""
+
+from datetime import datetime
+import unittest
+
+from qiskit import QuantumRegister, ClassicalRegister, QuantumCircuit
+from qiskit.transpiler import CouplingMap
+from qiskit.transpiler.passes import VF2Layout
+from qiskit.transpiler.exceptions import TranspilerError
+from qiskit.converters import circuit_to_dag
+from qiskit.compiler import transpile
+from qiskit.test import QiskitTestCase
+from qiskit.test.mock import FakeTokyo
+from qiskit.providers.models import BackendProperties
+from qiskit.providers.models.backendproperties import Nduv, Gate
+
+
+class TestVF2Layout(QiskitTestCase):
+    """Tests the VF2Layout pass"""
+
+    def setUp(self):
+        self.cmap20 = CouplingMap(FakeTokyo().configuration().coupling_map)
+
+    def assertLayoutNeedsNoSwap(self, dag, layout, coupling_map):
+        """Every two-qubit gate of dag is on an edge of coupling_map."""
+        for gate in dag.twoQ_gates():
+            self.assertEqual(coupling_map.distance(layout[gate.qargs[0]],
+                                                   layout[gate.qargs[1]]), 1)
+
+    def test_ring_in_20q_coupling(self):
+        """Test finds a layout of a ring of 8 qubits in a 20q coupling map."""
+        qr = QuantumRegister(8, 'qr')
+        circuit = QuantumCircuit(qr)
+        for i in range(8):
+            circuit.cx(qr[i], qr[(i + 1) % 8])
+        dag = circuit_to_dag(circuit)
+
+        pass_ = VF2Layout(self.cmap20)
+        pass_.run(dag)
+
+        self.assertEqual(pass_.property_set['VF2Layout_stop_reason'], 'solution found')
+        layout = pass_.property_set['layout']
+        self.assertEqual(len(set(layout[qubit] for qubit in qr)), 8)
+        self.assertLayoutNeedsNoSwap(dag, layout, self.cmap20)
+
+    def test_idle_qubits_are_placed(self):
+        """Test qubits without two-qubit gates also get a physical qubit."""
+        qr = QuantumRegister(2, 'qr')
+        idle = QuantumRegister(3, 'idle')
+        circuit = QuantumCircuit(qr, idle)
+        circuit.cx(qr[0], qr[1])
+        circuit.h(idle[0])
+
+        pass_ = VF2Layout(CouplingMap([[0, 1], [1, 2], [2, 3], [3, 4]]))
+        pass_.run(circuit_to_dag(circuit))
+
+        layout = pass_.property_set['layout']
+        self.assertEqual(len(set(layout.get_virtual_bits().values())), 5)
+        self.assertEqual(abs(layout[qr[0]] - layout[qr[1]]), 1)
+
+    def test_no_solution(self):
+        """Test a triangle does not fit in a line, and no layout is set."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        circuit.cx(qr[2], qr[0])
+
+        pass_ = VF2Layout(CouplingMap([[0, 1], [1, 2], [2, 3]]))
+        pass_.run(circuit_to_dag(circuit))
+
+        self.assertIsNone(pass_.property_set['layout'])
+        self.assertEqual(pass_.property_set['VF2Layout_stop_reason'], 'nonexistent solution')
+
+    def test_call_limit(self):
+        """Test the search stops at the call limit, and no layout is set."""
+        qr = QuantumRegister(5, 'qr')
+        circuit = QuantumCircuit(qr)
+        for i in range(5):
+            for j in range(i + 1, 5):
+                circuit.cx(qr[i], qr[j])
+
+        pass_ = VF2Layout(self.cmap20, call_limit=10)
+        pass_.run(circuit_to_dag(circuit))
+
+        self.assertIsNone(pass_.property_set['layout'])
+        self.assertEqual(pass_.property_set['VF2Layout_stop_reason'], 'call limit reached')
+
+    def test_three_qubit_gates(self):
+        """Test circuits with three-qubit gates are not handled."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.ccx(qr[0], qr[1], qr[2])
+
+        pass_ = VF2Layout(self.cmap20)
+        pass_.run(circuit_to_dag(circuit))
+
+        self.assertIsNone(pass_.property_set['layout'])
+        self.assertEqual(pass_.property_set['VF2Layout_stop_reason'], '>2q gates in basis')
+
+    def test_lowest_error(self):
+        """Test picks the layout with the lowest errors, among those needing no swap."""
+        calib_time = datetime(year=2019, month=2, day=1, hour=0, minute=0, second=0)
+        qubits = [[Nduv(name="readout_error", date=calib_time, unit="", value=error)]
+                  for error in [0.01, 0.01, 0.01, 0.01, 0.2]]
+        gates = [Gate(name="CX%s_%s" % (i, i + 1), gate="cx", qubits=[i, i + 1],
+                      parameters=[Nduv(date=calib_time, name='gate_error', unit='',
+                                       value=error)])
+                 for i, error in enumerate([0.3, 0.01, 0.01, 0.01])]
+        backend_prop = BackendProperties(last_update_date=calib_time,
+                                         backend_name="test_backend", qubits=qubits,
+                                         backend_version="1.0.0", gates=gates, general=[])
+        qr = QuantumRegister(3, 'qr')
+        cr = ClassicalRegister(3, 'cr')
+        circuit = QuantumCircuit(qr, cr)
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[1], qr[2])
+        circuit.measure(qr, cr)
+
+        pass_ = VF2Layout(CouplingMap([[0, 1], [1, 2], [2, 3], [3, 4]]), backend_prop)
+        pass_.run(circuit_to_dag(circuit))
+
+        layout = pass_.property_set['layout']
+        self.assertEqual(sorted(layout[qubit] for qubit in qr), [1, 2, 3])
+
+    def test_more_qubits_than_device(self):
+        """Test a circuit larger than the coupling map raises."""
+        circuit = QuantumCircuit(QuantumRegister(3, 'qr'))
+
+        with self.assertRaises(TranspilerError):
+            VF2Layout(CouplingMap([[0, 1]])).run(circuit_to_dag(circuit))
+
+    def test_transpile_skips_routing(self):
+        """Test a circuit that fits the coupling map is transpiled without swaps."""
+        qr = QuantumRegister(12, 'qr')
+        circuit = QuantumCircuit(qr)
+        for i in range(11):
+            circuit.cx(qr[i], qr[i + 1])
+        for optimization_level in [2, 3]:
+            with self.subTest(optimization_level=optimization_level):
+                result = transpile(circuit, coupling_map=self.cmap20,
+                                   basis_gates=['u1', 'u2', 'u3', 'cx'],
+                                   optimization_level=optimization_level, seed_transpiler=42)
+                self.assertEqual(result.count_ops()['cx'], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
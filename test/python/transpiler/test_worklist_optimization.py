@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+# This code is part of Qiskit.
+#
+# (C) Copyright IBM 2019.
+#
+# This code is licensed under the Apache License, Version 2.0. You may
+# obtain a copy of this license in the LICENSE.txt file in the root directory
+# of this source tree or at http://www.apache.org/licenses/LICENSE-2.0.
+#
+# Any modifications or derivative works of this code must retain this
+# copyright notice, and modified files need to carry a notice indicating
+# that they have been altered from the originals.
+
+"""Test the WorklistOptimization pass"""
+
+import unittest
+import numpy as np
+
+from qiskit import QuantumRegister, QuantumCircuit
+from qiskit.converters import circuit_to_dag, dag_to_circuit
+from qiskit.extensions.standard import HGate
+from qiskit.quantum_info import Operator
+from qiskit.transpiler import PassManager
+from qiskit.transpiler.basepasses import TransformationPass
+from qiskit.transpiler.passes import (WorklistOptimization, Optimize1qGates, CXCancellation,
+                                      CommutativeCancellation, CommutationAnalysis, Size,
+                                      FixedPoint)
+from qiskit.transpiler.propertyset import PropertySet
+from qiskit.test import QiskitTestCase
+
+
+class CountingPass(TransformationPass):
+    """A pass recording the optimization regions it runs with."""
+
+    def __init__(self):
+        super().__init__()
+        self.regions = []
+
+    def run(self, dag):
+        self.regions.append(self.property_set['optimization_region'])
+        return dag
+
+
+class ReplaceH(TransformationPass):
+    """A pass replacing every H gate with a new one, so that it always changes the dag."""
+
+    def run(self, dag):
+        for node in dag.named_nodes('h'):
+            dag.substitute_node(node, HGate())
+        return dag
+
+
+def _random_circuit(qr, rng, size):
+    """A random circuit of gates that Optimize1qGates and CommutativeCancellation simplify."""
+    circuit = QuantumCircuit(qr)
+    for _ in range(size):
+        gate = rng.choice(['u1', 'u3', 'h', 'x', 'z', 't', 'cx'])
+        qubits = [qr[int(i)] for i in rng.permutation(len(qr))]
+        if gate == 'cx':
+            circuit.cx(qubits[0], qubits[1])
+        elif gate == 'u1':
+            circuit.u1(rng.uniform(0, np.pi), qubits[0])
+        elif gate == 'u3':
+            circuit.u3(*rng.uniform(0, np.pi, 3), qubits[0])
+        else:
+            getattr(circuit, gate)(qubits[0])
+    return circuit
+
+
+class TestWorklistOptimization(QiskitTestCase):
+    """Test the WorklistOptimization pass."""
+
+    def test_fixed_point(self):
+        """The result has the same unitary, and the passes do not change it anymore."""
+        qr = QuantumRegister(3, 'qr')
+        rng = np.random.RandomState(7)
+        for _ in range(5):
+            circuit = _random_circuit(qr, rng, 60)
+
+            passmanager = PassManager()
+            passmanager.append(WorklistOptimization([Optimize1qGates(),
+                                                     CommutativeCancellation()]))
+            after = passmanager.run(circuit)
+
+            again = PassManager()
+            again.append([Optimize1qGates(), CommutativeCancellation()])
+            self.assertEqual(circuit_to_dag(again.run(after)), circuit_to_dag(after))
+            expected = Operator(circuit).data
+            actual = Operator(after).data
+            index = np.argmax(np.abs(expected[:, 0]))
+            phase = actual[index, 0] / expected[index, 0]
+            self.assertTrue(np.allclose(actual, phase * expected))
+
+    def test_same_result_as_loop(self):
+        """The passes give the same circuit as when they run on the whole dag in a loop."""
+        qr = QuantumRegister(3, 'qr')
+        rng = np.random.RandomState(11)
+
+        def _loop_control(property_set):
+            return not property_set['size_fixed_point']
+
+        for _ in range(5):
+            circuit = _random_circuit(qr, rng, 60)
+
+            loop = PassManager()
+            loop.append([Size(), FixedPoint('size'), Optimize1qGates(), CXCancellation()],
+                        do_while=_loop_control)
+            worklist = PassManager()
+            worklist.append(WorklistOptimization([Optimize1qGates(), CXCancellation()]))
+
+            self.assertEqual(circuit_to_dag(worklist.run(circuit)),
+                             circuit_to_dag(loop.run(circuit)))
+
+    def test_unchanged_dag(self):
+        """The passes run once on the whole dag when they do not change it."""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[1])
+        counting = CountingPass()
+
+        after = WorklistOptimization([CXCancellation(), counting]).run(circuit_to_dag(circuit))
+
+        self.assertEqual(counting.regions, [None])
+        self.assertEqual(after, circuit_to_dag(circuit))
+
+    def test_region_of_changes(self):
+        """After a change, the passes run on the changed nodes and their neighbors.
+
+        qr0:-[H]--.----.--[X]-
+                  |    |
+        qr1:-----(+)--(+)-----
+        """
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+        circuit.cx(qr[0], qr[1])
+        circuit.cx(qr[0], qr[1])
+        circuit.x(qr[0])
+        counting = CountingPass()
+
+        after = WorklistOptimization([counting, CXCancellation()]).run(circuit_to_dag(circuit))
+
+        self.assertEqual(len(counting.regions), 2)
+        self.assertIsNone(counting.regions[0])
+        self.assertEqual({node.name for node in counting.regions[1]}, {'h', 'x'})
+        self.assertEqual([node.name for node in after.topological_op_nodes()], ['h', 'x'])
+
+    def test_max_iteration(self):
+        """A pass that always changes the dag stops after max_iteration iterations."""
+        qr = QuantumRegister(1, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.h(qr[0])
+
+        after = WorklistOptimization([ReplaceH()], max_iteration=5).run(circuit_to_dag(circuit))
+
+        self.assertEqual(after, circuit_to_dag(circuit))
+        self.assertIsNone(after.changes())
+
+    def test_optimize_1q_gates_region(self):
+        """Optimize1qGates only merges the runs with a node of the optimization region."""
+        qr = QuantumRegister(2, 'qr')
+        circuit = QuantumCircuit(qr)
+        circuit.u1(0.1, qr[0])
+        circuit.u1(0.2, qr[0])
+        circuit.u1(0.3, qr[1])
+        circuit.u1(0.4, qr[1])
+        dag = circuit_to_dag(circuit)
+        region = {node for node in dag.op_nodes() if node.qargs == [qr[0]]}
+
+        pass_ = Optimize1qGates()
+        pass_.property_set = PropertySet()
+        pass_.property_set['optimization_region'] = region
+        after = dag_to_circuit(pass_.run(dag))
+
+        expected = QuantumCircuit(qr)
+        expected.u1(0.1 + 0.2, qr[0])
+        expected.u1(0.3, qr[1])
+        expected.u1(0.4, qr[1])
+        self.assertEqual(circuit_to_dag(after), circuit_to_dag(expected))
+
+    def test_commutation_analysis_region(self):
+        """The commutation sets of the region nodes are the same as on the whole dag."""
+        qr = QuantumRegister(3, 'qr')
+        circuit = _random_circuit(qr, np.random.RandomState(3), 40)
+        dag = circuit_to_dag(circuit)
+        region = set(dag.op_nodes()[::7])
+
+        full = CommutationAnalysis()
+        full.property_set = PropertySet()
+        full.run(dag)
+        local = CommutationAnalysis()
+        local.property_set = PropertySet()
+        local.property_set['optimization_region'] = region
+        local.run(dag)
+
+        full_sets = full.property_set['commutation_set']
+        local_sets = local.property_set['commutation_set']
+        for node in region:
+            for qubit in node.qargs:
+                wire_name = "{0}[{1}]".format(qubit.register.name, qubit.index)
+                self.assertEqual(local_sets[wire_name][local_sets[(node, wire_name)]],
+                                 full_sets[wire_name][full_sets[(node, wire_name)]])
+
+
+if __name__ == '__main__':
+    unittest.main()